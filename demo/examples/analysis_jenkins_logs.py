@@ -5,8 +5,8 @@ This extends the original analysis_jenkins_errors.py to include JSON-based promp
 
 This script demonstrates:
 1. Parsing Jenkins logs with structured data extraction.
-2. Converting parsed data to JSON format.
-3. Using JSON data in LLM prompts for better context and analysis.
+2. Compressing the parsed data into a compact text rendering.
+3. Using the compressed data in LLM prompts for better context at a fraction of the tokens.
 4. Comparing traditional error parsing vs structured JenkinsParser approach.
 5. Displaying results with colored terminal output for better readability.
 
@@ -20,6 +20,7 @@ import os
 from dotenv import load_dotenv
 from colorama import Fore, Style, init
 from langops import ParserRegistry, LLMRegistry
+from langops.parser.compress import compress_bundle
 
 # Load environment variables from .env file
 load_dotenv()
@@ -71,14 +72,19 @@ def analyze_jenkins_errors_with_json(log_path: str, build_id: str, timestamp: st
         print(Fore.YELLOW + "⚠️  No errors found." + Style.RESET_ALL)
         return
 
-    print(Fore.MAGENTA + Style.BRIGHT + "\n🔄 Converting to JSON format for LLM analysis..." + Style.RESET_ALL)
+    print(Fore.MAGENTA + Style.BRIGHT + "\n🔄 Compressing parsed logs for LLM analysis..." + Style.RESET_ALL)
     
-    # Method 1: Get clean JSON using Pydantic serialization
-    json_data = parsed_data.model_dump_json(indent=2)
-    print(Fore.CYAN + "📄 JSON structure preview:" + Style.RESET_ALL)
-    print(Fore.WHITE + Style.DIM + (json_data[:300] + "..." if len(json_data) > 300 else json_data) + Style.RESET_ALL)
+    # Render the bundle as compact text instead of dumping it as JSON: repeated lines are
+    # collapsed, timestamps/IDs/paths stripped and long stack traces elided.
+    compressed = compress_bundle(parsed_data)
+    print(Fore.CYAN + "📄 Compressed log preview:" + Style.RESET_ALL)
+    print(Fore.WHITE + Style.DIM + (compressed.text[:300] + "..." if len(compressed.text) > 300 else compressed.text) + Style.RESET_ALL)
+    print(
+        Fore.WHITE + "   Tokens: " + Fore.YELLOW + f"{compressed.original_tokens}" + Fore.WHITE + " as JSON → "
+        + Fore.GREEN + f"{compressed.tokens}" + Fore.WHITE + f" compressed ({compressed.ratio:.1f}× fewer)" + Style.RESET_ALL
+    )
 
-    print(Fore.BLUE + Style.BRIGHT + "\n🤖 Querying LLM with structured JSON prompt..." + Style.RESET_ALL)
+    print(Fore.BLUE + Style.BRIGHT + "\n🤖 Querying LLM with compressed log prompt..." + Style.RESET_ALL)
     
     # Create enhanced prompt with JSON data
     llm_prompt = f"""You are a Jenkins CI/CD expert. Analyze this build failure data and provide actionable insights.
@@ -87,9 +93,9 @@ def analyze_jenkins_errors_with_json(log_path: str, build_id: str, timestamp: st
 - Build ID: {build_id}
 - Timestamp: {timestamp}
 
-**Structured Log Data:**
-```json
-{json_data}
+**Parsed Log Data** (one line per distinct message; "×N" marks N similar lines, `<*>` their varying part):
+```text
+{compressed.text}
 ```
 
 **Analysis Requirements:**
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmarks JenkinsParser against the frozen copy of its original implementation
+(tests/langops/parser/jenkins_legacy.py) on a synthetic Jenkins log, and checks that
+both produce identical results.
+
+Usage:
+    python demo/parser/jenkins_parser_benchmark.py [lines]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from langops.core.types import SeverityLevel  # noqa: E402
+from langops.parser.jenkins_parser import JenkinsParser  # noqa: E402
+from tests.langops.parser.jenkins_legacy import (  # noqa: E402
+    LegacyJenkinsParser,
+    build_corpus,
+)
+
+
+def timed(parser, data, min_severity):
+    start = time.perf_counter()
+    result = parser.parse(data, min_severity=min_severity)
+    return result, time.perf_counter() - start
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    data = build_corpus(lines=lines, seed=0)
+    print(f"Corpus: {lines} lines")
+
+    for min_severity in (SeverityLevel.INFO, SeverityLevel.WARNING):
+        legacy, legacy_time = timed(LegacyJenkinsParser(), data, min_severity)
+        current, current_time = timed(JenkinsParser(), data, min_severity)
+        identical = legacy.model_dump_json() == current.model_dump_json()
+        print(f"\nmin_severity={min_severity.value}")
+        print(
+            f"  original:      {legacy_time:8.3f}s  {lines / legacy_time:12.0f} lines/s"
+        )
+        print(
+            f"  JenkinsParser: {current_time:8.3f}s  {lines / current_time:12.0f} lines/s"
+        )
+        print(
+            f"  speedup: {legacy_time / current_time:.1f}x  identical output: {identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
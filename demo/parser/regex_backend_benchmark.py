@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Compares the installed regex backends ('re', and 'regex' / 're2' when installed) on the
+same synthetic Jenkins corpus for every built-in pattern set.
+
+Usage:
+    python demo/parser/regex_backend_benchmark.py [lines]
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from langops.parser.utils.pattern_set import PatternSet  # noqa: E402
+from langops.parser.utils.regex_backend import (  # noqa: E402
+    available_backends,
+    compare_backends,
+)
+from tests.langops.parser.jenkins_legacy import build_corpus  # noqa: E402
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    corpus = build_corpus(lines=lines, seed=0).splitlines()
+    print(f"Corpus: {lines} lines, backends: {', '.join(available_backends())}")
+
+    for source in ("jenkins", "github_actions", "gitlab_ci", "azure_devops"):
+        print(f"\n{source}")
+        for timing in compare_backends(PatternSet.for_source(source), corpus):
+            print(
+                f"  {timing.backend:6s} {timing.seconds:8.3f}s "
+                f"{timing.lines_per_second:12.0f} lines/s  "
+                f"fallbacks: {timing.fallbacks:3d}  same results: {timing.agrees}"
+            )
+
+
+if __name__ == "__main__":
+    main()
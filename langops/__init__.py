@@ -1,14 +1,37 @@
-# Exposing Core Components
-from langops.core import BaseAlert, BaseParser, BasePrompt, BaseLLM
+from typing import TYPE_CHECKING
+from langops.core.lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover
+    # Exposing Core Components
+    from langops.core import BaseAlert, BaseParser, BasePrompt, BaseLLM
 
-# Exposing Registries
-from langops.prompt.registry import PromptRegistry
-from langops.parser.registry import ParserRegistry
-from langops.llm.registry import LLMRegistry
-from langops.alert.registry import AlertRegistry
+    # Exposing Registries
+    from langops.prompt.registry import PromptRegistry
+    from langops.parser.registry import ParserRegistry
+    from langops.llm.registry import LLMRegistry
+    from langops.alert.registry import AlertRegistry
 
-# Exposing types and constants
-from langops.core.types import LLMResponse, RenderedPrompt, PromptRole
+    # Exposing types and constants
+    from langops.core.types import LLMResponse, RenderedPrompt, PromptRole
+
+# Public names are imported from their module on first access (PEP 562), so that
+# `import langops` does not load openai, httpx or pydantic.
+__getattr__, __dir__ = lazy_exports(
+    "langops",
+    {
+        "BaseAlert": "langops.core.base_alert",
+        "BaseParser": "langops.core.base_parser",
+        "BasePrompt": "langops.core.base_prompt",
+        "BaseLLM": "langops.core.base_llm",
+        "PromptRegistry": "langops.prompt.registry",
+        "ParserRegistry": "langops.parser.registry",
+        "LLMRegistry": "langops.llm.registry",
+        "AlertRegistry": "langops.alert.registry",
+        "LLMResponse": "langops.core.types",
+        "RenderedPrompt": "langops.core.types",
+        "PromptRole": "langops.core.types",
+    },
+)
 
 __version__ = "0.1.0"
 __author__ = "Adi Roth"
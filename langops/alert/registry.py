@@ -1,4 +1,5 @@
-from typing import Type, Dict, Optional, Callable, List
+from typing import Type, MutableMapping, Optional, Callable, List
+from langops.core.lazy import LazyRegistry
 
 # Alert registry for langops.alert
 
@@ -8,7 +9,9 @@ class AlertRegistry:
     Registry for alert classes. Allows registration and retrieval of alerts by name.
     """
 
-    _registry: Dict[str, Type] = {}
+    # Plugins from other distributions are listed from the 'langops.alerts'
+    # entry-point group and imported when they are looked up.
+    _registry: MutableMapping[str, Type] = LazyRegistry(group="langops.alerts")
 
     @classmethod
     def register(cls, name: Optional[str] = None) -> Callable[[Type], Type]:
@@ -1,8 +1,25 @@
-from langops.core.base_llm import BaseLLM
-from langops.core.base_alert import BaseAlert
-from langops.core.base_parser import BaseParser
-from langops.core.base_prompt import BasePrompt
-from langops.core.types import RenderedPrompt, LLMResponse, PromptRole
+from typing import TYPE_CHECKING
+from langops.core.lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover
+    from langops.core.base_llm import BaseLLM
+    from langops.core.base_alert import BaseAlert
+    from langops.core.base_parser import BaseParser
+    from langops.core.base_prompt import BasePrompt
+    from langops.core.types import RenderedPrompt, LLMResponse, PromptRole
+
+__getattr__, __dir__ = lazy_exports(
+    "langops.core",
+    {
+        "BaseLLM": "langops.core.base_llm",
+        "BaseAlert": "langops.core.base_alert",
+        "BaseParser": "langops.core.base_parser",
+        "BasePrompt": "langops.core.base_prompt",
+        "RenderedPrompt": "langops.core.types",
+        "LLMResponse": "langops.core.types",
+        "PromptRole": "langops.core.types",
+    },
+)
 
 __name__ = "langops.core"
 __version__ = "0.1.0"
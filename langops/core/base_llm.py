@@ -1,7 +1,63 @@
+import asyncio
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from langops.core.metrics import CallRecord, LLMMetrics, active_metrics, usage_tokens
+from langops.core.streaming import (
+    AsyncLLMStream,
+    LLMStream,
+    StreamEvent,
+    StreamObserver,
+)
 from langops.core.types import LLMResponse
 
+if TYPE_CHECKING:  # pragma: no cover
+    from langops.llm.rate_limit import RateLimiter
+    from langops.llm.response_cache import ResponseCache
+    from langops.llm.single_flight import SingleFlight
+
+T = TypeVar("T")
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine to completion from synchronous code.
+
+    Args:
+        coroutine (Coroutine): The coroutine to run.
+
+    Returns:
+        T: The result of the coroutine.
+
+    Raises:
+        RuntimeError: If called from a running event loop; await the async API instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    coroutine.close()
+    raise RuntimeError(
+        "Cannot run synchronously inside a running event loop; use the async method."
+    )
+
 
 class BaseLLM(ABC):
     """
@@ -9,8 +65,25 @@ class BaseLLM(ABC):
 
     This interface allows switching between different LLM providers by implementing this class.
     Supports both synchronous and asynchronous completion methods.
+
+    Attributes:
+        response_cache (Optional[ResponseCache]): Cache of provider responses. Subclasses
+            opt in by routing provider calls through `_cached_complete` and
+            `_cached_acomplete`.
+        rate_limiter (Optional[RateLimiter]): Limits shared by the bulk completions of
+            this client. A limiter with `max_concurrency` is created per batch if None.
+        single_flight (Optional[SingleFlight]): Coalesces concurrent identical requests
+            into one provider call, on the same opt-in path as `response_cache`.
+        metrics (Optional[LLMMetrics]): Registry recording the calls of this client,
+            on the same opt-in path. The process-wide registry of `enable_metrics` is
+            used if None; nothing is recorded if both are None.
     """
 
+    response_cache: Optional["ResponseCache"] = None
+    rate_limiter: Optional["RateLimiter"] = None
+    single_flight: Optional["SingleFlight"] = None
+    metrics: Optional[LLMMetrics] = None
+
     @abstractmethod
     def complete(self, prompt: str, **kwargs: Any) -> LLMResponse:  # pragma: no cover
         """
@@ -45,6 +118,461 @@ class BaseLLM(ABC):
             "Async completion is not implemented for this LLM client."
         )
 
+    def stream(self, prompt: Any, **kwargs: Any) -> LLMStream:
+        """
+        Streams a completion, yielding text deltas as they arrive.
+
+        The default implementation calls `complete` and yields its text as a single
+        delta; providers with a streaming API override it.
+
+        Args:
+            prompt (Any): The input prompt for the LLM.
+            **kwargs: Additional provider-specific arguments.
+
+        Returns:
+            LLMStream: Iterator of text deltas whose `response` holds the aggregated
+            LLMResponse once exhausted.
+        """
+
+        def events() -> Iterator[StreamEvent]:
+            response = self.complete(prompt, **kwargs)
+            yield response.text, response.metadata
+
+        return LLMStream(events())
+
+    def astream(self, prompt: Any, **kwargs: Any) -> AsyncLLMStream:
+        """
+        Asynchronously streams a completion, yielding text deltas as they arrive.
+
+        The default implementation awaits `acomplete` and yields its text as a single
+        delta; providers with a streaming API override it.
+
+        Args:
+            prompt (Any): The input prompt for the LLM.
+            **kwargs: Additional provider-specific arguments.
+
+        Returns:
+            AsyncLLMStream: Async iterator of text deltas whose `response` holds the
+            aggregated LLMResponse once exhausted.
+        """
+
+        async def events() -> AsyncIterator[StreamEvent]:
+            response = await self.acomplete(prompt, **kwargs)
+            yield response.text, response.metadata
+
+        return AsyncLLMStream(events())
+
+    def cache_request(self, prompt: Any, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Describes a request for the response cache key.
+
+        Subclasses that transform the prompt before sending it should describe the
+        transformed messages, so that equivalent prompts share a cache entry.
+
+        Args:
+            prompt (Any): The input prompt.
+            **kwargs: The sampling and provider arguments of the call.
+
+        Returns:
+            Dict[str, Any]: JSON-serializable description of the request.
+        """
+        return {
+            "provider": type(self).__name__,
+            "model": getattr(self, "model", None),
+            "messages": prompt,
+            "params": kwargs,
+        }
+
+    def _request_key(self, prompt: Any, kwargs: Dict[str, Any]) -> str:
+        """Hashes a request like the response cache does."""
+        from langops.llm.response_cache import ResponseCache
+
+        return ResponseCache.key(self.cache_request(prompt, **kwargs))
+
+    @staticmethod
+    def _shared_response(response: LLMResponse) -> LLMResponse:
+        """Copies a response delivered to a coalesced caller."""
+        metadata = dict(response.metadata)
+        metadata["coalesced"] = True
+        return LLMResponse(text=response.text, raw=response.raw, metadata=metadata)
+
+    def _active_metrics(self) -> Optional[LLMMetrics]:
+        """Returns the registry recording the calls of this client, if any."""
+        return self.metrics if self.metrics is not None else active_metrics()
+
+    def _record_call(
+        self,
+        metrics: LLMMetrics,
+        latency: float,
+        response: Optional[LLMResponse] = None,
+        error: Optional[BaseException] = None,
+        stream: bool = False,
+    ) -> None:
+        """Records a call; tokens only count when the provider answered it."""
+        metadata = response.metadata if response is not None else {}
+        cache = metadata.get("cache")
+        hit = isinstance(cache, Mapping) and bool(cache.get("hit"))
+        coalesced = bool(metadata.get("coalesced"))
+        prompt_tokens, completion_tokens = (
+            (None, None) if hit or coalesced else usage_tokens(metadata.get("usage"))
+        )
+        metrics.record(
+            CallRecord(
+                provider=type(self).__name__,
+                model=getattr(self, "model", None),
+                latency=latency,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                error=type(error).__name__ if error is not None else None,
+                cache=(
+                    ("hit" if hit else "miss") if isinstance(cache, Mapping) else None
+                ),
+                coalesced=coalesced,
+                stream=stream,
+                queue_time=metadata.get("queue_time"),
+                retries=metadata.get("retries") or 0,
+                time_to_first_token=metadata.get("time_to_first_token"),
+            )
+        )
+
+    def _stream_observer(self) -> Optional[StreamObserver]:
+        """
+        Returns the `on_finish` callback recording a stream, None without metrics.
+        Providers pass it to the LLMStream or AsyncLLMStream they return.
+        """
+        metrics = self._active_metrics()
+        if metrics is None:
+            return None
+        start = time.perf_counter()
+
+        def on_finish(
+            response: Optional[LLMResponse], error: Optional[BaseException]
+        ) -> None:
+            self._record_call(
+                metrics, time.perf_counter() - start, response, error, stream=True
+            )
+
+        return on_finish
+
+    @staticmethod
+    def _timed(response: LLMResponse, start: float) -> LLMResponse:
+        """Adds the wall-clock seconds of a provider call to the response metadata."""
+        response.metadata["latency"] = time.perf_counter() - start
+        return response
+
+    def _cached_complete(
+        self,
+        prompt: Any,
+        kwargs: Dict[str, Any],
+        complete: Callable[[], LLMResponse],
+    ) -> LLMResponse:
+        """
+        Returns the cached response for a request, calling `complete` on a miss.
+
+        With `single_flight`, concurrent identical requests share one call of
+        `complete`; the callers that joined it receive a copy of the response whose
+        metadata has "coalesced": True. Streaming calls (`stream=True`) and instances
+        without a cache or single-flight always call `complete`. Fresh responses get
+        the seconds `complete` took as "latency" metadata, and the call is recorded in
+        the active metrics registry.
+
+        Args:
+            prompt (Any): The input prompt.
+            kwargs (Dict[str, Any]): The arguments of the call.
+            complete (Callable[[], LLMResponse]): Calls the provider.
+
+        Returns:
+            LLMResponse: The cached, shared or fresh response.
+        """
+        metrics = self._active_metrics()
+        if metrics is None:
+            return self._cache_or_call(prompt, kwargs, complete)
+        start = time.perf_counter()
+        try:
+            response = self._cache_or_call(prompt, kwargs, complete)
+        except Exception as e:
+            self._record_call(metrics, time.perf_counter() - start, error=e)
+            raise
+        self._record_call(metrics, time.perf_counter() - start, response)
+        return response
+
+    def _cache_or_call(
+        self,
+        prompt: Any,
+        kwargs: Dict[str, Any],
+        complete: Callable[[], LLMResponse],
+    ) -> LLMResponse:
+        cache = self.response_cache
+        flight = self.single_flight
+        if (cache is None and flight is None) or kwargs.get("stream"):
+            start = time.perf_counter()
+            return self._timed(complete(), start)
+        key = self._request_key(prompt, kwargs)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        def call() -> LLMResponse:
+            start = time.perf_counter()
+            response = self._timed(complete(), start)
+            if cache is None:
+                return response
+            return cache.put(key, response, response.metadata["latency"])
+
+        if flight is None:
+            return call()
+        response, shared = flight.do(key, call)
+        return self._shared_response(response) if shared else response
+
+    async def _cached_acomplete(
+        self,
+        prompt: Any,
+        kwargs: Dict[str, Any],
+        acomplete: Callable[[], Awaitable[LLMResponse]],
+    ) -> LLMResponse:
+        """
+        Asynchronous counterpart of `_cached_complete`. A coalesced caller that is
+        cancelled stops waiting; the shared call is cancelled once all callers are.
+
+        Args:
+            prompt (Any): The input prompt.
+            kwargs (Dict[str, Any]): The arguments of the call.
+            acomplete (Callable[[], Awaitable[LLMResponse]]): Calls the provider.
+
+        Returns:
+            LLMResponse: The cached, shared or fresh response.
+        """
+        metrics = self._active_metrics()
+        if metrics is None:
+            return await self._acache_or_call(prompt, kwargs, acomplete)
+        start = time.perf_counter()
+        try:
+            response = await self._acache_or_call(prompt, kwargs, acomplete)
+        except Exception as e:
+            self._record_call(metrics, time.perf_counter() - start, error=e)
+            raise
+        self._record_call(metrics, time.perf_counter() - start, response)
+        return response
+
+    async def _acache_or_call(
+        self,
+        prompt: Any,
+        kwargs: Dict[str, Any],
+        acomplete: Callable[[], Awaitable[LLMResponse]],
+    ) -> LLMResponse:
+        cache = self.response_cache
+        flight = self.single_flight
+        if (cache is None and flight is None) or kwargs.get("stream"):
+            start = time.perf_counter()
+            return self._timed(await acomplete(), start)
+        key = self._request_key(prompt, kwargs)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def call() -> LLMResponse:
+            start = time.perf_counter()
+            response = self._timed(await acomplete(), start)
+            if cache is None:
+                return response
+            return cache.put(key, response, response.metadata["latency"])
+
+        if flight is None:
+            return await call()
+        response, shared = await flight.ado(key, call)
+        return self._shared_response(response) if shared else response
+
+    def _estimate_tokens(self, prompt: Any, kwargs: Mapping[str, Any]) -> int:
+        """
+        Estimates the tokens a request counts against a tokens-per-minute limit: the
+        prompt tokens counted locally, plus the requested completion budget.
+
+        Args:
+            prompt (Any): The input prompt.
+            kwargs (Mapping[str, Any]): The arguments of the call.
+
+        Returns:
+            int: The estimated token count.
+        """
+        from langops.llm.tokens import token_counter
+
+        counter = token_counter(getattr(self, "model", None))
+        if isinstance(prompt, str) or (
+            isinstance(prompt, list) and all(isinstance(m, Mapping) for m in prompt)
+        ):
+            tokens = counter.count_prompt(prompt)
+        else:
+            tokens = counter.count(json.dumps(prompt, default=str))
+        completion = (
+            kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") or 0
+        )
+        return tokens + int(completion)
+
+    def _throttle_delay(self, error: BaseException) -> Optional[float]:
+        """
+        Classifies a provider error for the rate limiter.
+
+        Args:
+            error (BaseException): The error raised by a request.
+
+        Returns:
+            Optional[float]: None if the error is not a rate limit, otherwise the delay
+            requested by the provider in seconds (0 if unknown).
+        """
+        return None
+
+    async def _abulk_request(
+        self, prompt: Any, kwargs: Dict[str, Any], client: Any
+    ) -> Tuple[LLMResponse, Mapping[str, str]]:
+        """
+        Sends one request of a bulk completion.
+
+        Subclasses override this to call the provider directly (bypassing
+        `response_cache`, which bulk completions consult first) and to return the
+        response headers for the rate limiter.
+
+        Args:
+            prompt (Any): The input prompt.
+            kwargs (Dict[str, Any]): The arguments of the call.
+            client (Any): The client of the batch, if the subclass uses one.
+
+        Returns:
+            Tuple[LLMResponse, Mapping[str, str]]: The response and its headers.
+        """
+        return await self.acomplete(prompt, **kwargs), {}
+
+    async def aiter_complete_many(
+        self,
+        prompts: Sequence[Any],
+        *,
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+        client: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Tuple[int, Union[LLMResponse, Exception]]]:
+        """
+        Completes many prompts concurrently, yielding results as they complete.
+
+        Requests go through `rate_limiter` (adaptive concurrency, requests and tokens per
+        minute, retries of rate-limited requests). Closing the iterator cancels the
+        requests still pending.
+
+        Args:
+            prompts (Sequence[Any]): The input prompts.
+            max_concurrency (int): Concurrency limit when no `rate_limiter` is set.
+            return_exceptions (bool): Yield errors as results instead of raising the first
+                one (which cancels the other requests).
+            client (Any): Client for the batch, passed to `_abulk_request`.
+            **kwargs: Additional arguments for every call.
+
+        Yields:
+            Tuple[int, LLMResponse | Exception]: The index of the prompt and its result.
+        """
+        from langops.llm.rate_limit import RateLimiter
+
+        limiter = self.rate_limiter or RateLimiter(max_concurrency=max_concurrency)
+
+        async def complete(index: int, prompt: Any) -> Tuple[int, Any]:
+            async def request() -> LLMResponse:
+                return await limiter.call(
+                    lambda: self._abulk_request(prompt, kwargs, client),
+                    self._estimate_tokens(prompt, kwargs),
+                    self._throttle_delay,
+                )
+
+            try:
+                return index, await self._cached_acomplete(prompt, kwargs, request)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return index, e
+
+        pending = {
+            asyncio.ensure_future(complete(index, prompt))
+            for index, prompt in enumerate(prompts)
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def acomplete_many(
+        self,
+        prompts: Sequence[Any],
+        *,
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+        client: Any = None,
+        **kwargs: Any,
+    ) -> List[Union[LLMResponse, Exception]]:
+        """
+        Completes many prompts concurrently and returns the results in prompt order.
+
+        Args:
+            prompts (Sequence[Any]): The input prompts.
+            max_concurrency (int): Concurrency limit when no `rate_limiter` is set.
+            return_exceptions (bool): Return errors as results instead of raising the first
+                one.
+            client (Any): Client for the batch, passed to `_abulk_request`.
+            **kwargs: Additional arguments for every call.
+
+        Returns:
+            List[LLMResponse | Exception]: One result per prompt, in order.
+        """
+        results: List[Any] = [None] * len(prompts)
+        async for index, result in self.aiter_complete_many(
+            prompts,
+            max_concurrency=max_concurrency,
+            return_exceptions=return_exceptions,
+            client=client,
+            **kwargs,
+        ):
+            results[index] = result
+        return results
+
+    def complete_many(
+        self,
+        prompts: Sequence[Any],
+        *,
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> List[Union[LLMResponse, Exception]]:
+        """
+        Synchronous counterpart of `acomplete_many`.
+
+        Args:
+            prompts (Sequence[Any]): The input prompts.
+            max_concurrency (int): Concurrency limit when no `rate_limiter` is set.
+            return_exceptions (bool): Return errors as results instead of raising the first
+                one.
+            **kwargs: Additional arguments for every call.
+
+        Returns:
+            List[LLMResponse | Exception]: One result per prompt, in order.
+
+        Raises:
+            RuntimeError: If called from a running event loop.
+        """
+        return run_sync(
+            self.acomplete_many(
+                prompts,
+                max_concurrency=max_concurrency,
+                return_exceptions=return_exceptions,
+                **kwargs,
+            )
+        )
+
     @staticmethod
     def format_prompt(base_prompt: str, variables: Optional[Dict[str, str]]) -> str:
         """
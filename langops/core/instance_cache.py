@@ -0,0 +1,265 @@
+"""
+Memoization of configured components (parsers, LLM clients) shared by the registries, so
+that request handlers reuse warm instances instead of rebuilding them.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple, Type, cast
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Converts a configuration value into a hashable equivalent.
+
+    Mappings become sorted tuples of items, lists and tuples become tuples and sets
+    become frozensets, recursively. Other values must be hashable already.
+
+    Args:
+        value (Any): The configuration value.
+
+    Returns:
+        Hashable: A hashable value equal for equal configurations.
+
+    Raises:
+        TypeError: If the value, or a value nested in it, is not hashable.
+    """
+    if isinstance(value, Mapping):
+        return (
+            Mapping,
+            tuple(
+                sorted(
+                    ((key, freeze(item)) for key, item in value.items()),
+                    key=lambda pair: repr(pair[0]),
+                )
+            ),
+        )
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(freeze(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    hash(value)
+    return cast(Hashable, value)
+
+
+class InstanceCache:
+    """
+    Thread-safe, optionally size-bounded LRU cache of constructed components.
+
+    Instances are keyed by registry name, component class and a frozen copy of the
+    configuration keyword arguments. Each key is constructed at most once even under
+    concurrent first requests; different keys are constructed in parallel.
+
+    Attributes:
+        maxsize (Optional[int]): Maximum number of cached instances, None for unbounded.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that constructed a new instance.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None) -> None:
+        """
+        Args:
+            maxsize (Optional[int]): Maximum number of cached instances, None for unbounded.
+
+        Raises:
+            ValueError: If maxsize is not positive.
+        """
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self._pending: Dict[Tuple[Hashable, ...], threading.Lock] = {}
+        self._lock = threading.Lock()
+        # Bumped by `invalidate`, so instances whose construction overlapped an
+        # invalidation are returned but not cached.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.maxsize = maxsize
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: Optional[int]) -> None:
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("maxsize must be positive or None")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    @staticmethod
+    def key(name: str, component: type, config: Mapping[str, Any]) -> Tuple[Any, ...]:
+        """
+        Builds the cache key of a configured component.
+
+        Args:
+            name (str): The registry name.
+            component (type): The registered class.
+            config (Mapping[str, Any]): The constructor keyword arguments.
+
+        Returns:
+            Tuple: The hashable cache key.
+
+        Raises:
+            TypeError: If a configuration value is not hashable.
+        """
+        try:
+            return (name, component, freeze(config))
+        except TypeError as e:
+            raise TypeError(
+                f"Configuration of '{name}' cannot be used as a cache key: {e}"
+            ) from e
+
+    def _evict(self) -> None:
+        while self._maxsize is not None and len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def get_or_create(
+        self,
+        name: str,
+        component: type,
+        config: Mapping[str, Any],
+    ) -> Any:
+        """
+        Returns the cached instance for a configuration, constructing it on a miss.
+
+        Args:
+            name (str): The registry name.
+            component (type): The registered class.
+            config (Mapping[str, Any]): The constructor keyword arguments.
+
+        Returns:
+            Any: The shared instance.
+
+        Raises:
+            TypeError: If a configuration value is not hashable.
+        """
+        key = self.key(name, component, config)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            pending = self._pending.setdefault(key, threading.Lock())
+
+        with pending:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                generation = self._generation
+            try:
+                instance = component(**config)
+            except BaseException:
+                with self._lock:
+                    self._pending.pop(key, None)
+                raise
+            with self._lock:
+                self.misses += 1
+                if generation == self._generation:
+                    self._entries[key] = instance
+                    self._evict()
+                self._pending.pop(key, None)
+            return instance
+
+    def invalidate(
+        self, name: Optional[str] = None, config: Optional[Mapping[str, Any]] = None
+    ) -> int:
+        """
+        Drops cached instances. Callers still holding an instance keep using it, and
+        instances under construction when this is called are not cached.
+
+        Args:
+            name (Optional[str]): Drop only instances registered under this name.
+                Drops everything if None.
+            config (Optional[Mapping[str, Any]]): With a name, drop only the instance
+                built with exactly this configuration.
+
+        Returns:
+            int: The number of instances dropped.
+        """
+        frozen = freeze(config) if config is not None else None
+        with self._lock:
+            self._generation += 1
+            keys = [
+                key
+                for key in self._entries
+                if (name is None or key[0] == name)
+                and (frozen is None or key[2] == frozen)
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class InstanceCacheMixin:
+    """
+    Adds shared, configured instances to a registry class.
+
+    Each registry using the mixin gets its own InstanceCache. Only registries of
+    components that are safe to share between callers (stateless or thread-safe per
+    call) should use it; per-request builders such as prompts must not.
+
+    Components are looked up in the registry's `_registry` mapping; registries may set
+    `_component_kind`, the name of their components in error messages.
+    """
+
+    _registry: Mapping[str, Type]
+    _instances: InstanceCache
+    _component_kind = "component"
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._instances = InstanceCache()
+
+    @classmethod
+    def get_instance(cls, name: str, **config: Any) -> Any:
+        """
+        Retrieve a shared instance of a registered component, constructing it on first use.
+
+        Instances are memoized by name, class and configuration, so repeated calls with
+        the same keyword arguments return the same object.
+
+        Args:
+            name (str): Name of the registered component.
+            **config: Keyword arguments passed to the constructor.
+
+        Returns:
+            Any: The shared instance.
+
+        Raises:
+            KeyError: If no component is registered under the name.
+            TypeError: If a configuration value is not hashable.
+        """
+        component = cls._registry.get(name)
+        if component is None:
+            raise KeyError(f"No {cls._component_kind} registered under '{name}'")
+        return cls._instances.get_or_create(name, component, config)
+
+    @classmethod
+    def invalidate_instances(cls, name: Optional[str] = None, **config: Any) -> int:
+        """
+        Drop shared instances so that the next `get_instance` call constructs new ones.
+
+        Args:
+            name (str, optional): Drop only instances of this component. Drops all if not
+                provided.
+            **config: With a name, drop only the instance built with this configuration.
+
+        Returns:
+            int: The number of instances dropped.
+        """
+        return cls._instances.invalidate(name, config or None)
+
+    @classmethod
+    def set_max_instances(cls, maxsize: Optional[int]) -> None:
+        """
+        Bound the number of shared instances; least recently used ones are dropped first.
+
+        Args:
+            maxsize (int, optional): Maximum number of instances, None for unbounded.
+        """
+        cls._instances.maxsize = maxsize
@@ -0,0 +1,195 @@
+"""
+Helpers that defer importing heavy submodules (openai, pydantic models, yaml) until a name
+is first used, so that `import langops` and parser-only processes start fast.
+"""
+
+import importlib
+import sys
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Type,
+)
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Builds the module-level `__getattr__` and `__dir__` (PEP 562) of a package whose
+    public names are imported from their submodule on first access.
+
+    Args:
+        package (str): The `__name__` of the package.
+        exports (Dict[str, str]): Public name to defining module mapping.
+
+    Returns:
+        Tuple[Callable, Callable]: The `__getattr__` and `__dir__` functions.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name), name)
+        # Later lookups find the attribute directly and skip __getattr__.
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
+
+
+def _entry_points(group: str) -> Dict[str, Any]:
+    """
+    Returns the entry points of a group by name, without importing them.
+
+    Args:
+        group (str): The entry-point group, e.g. 'langops.parsers'.
+
+    Returns:
+        Dict[str, EntryPoint]: Entry point name to entry point; the first distribution
+        declaring a name wins.
+    """
+    # importlib.metadata scans installed distributions, so it is only imported once a
+    # registry is first queried.
+    from importlib.metadata import entry_points
+
+    found: Dict[str, Any] = {}
+    for entry_point in entry_points(group=group):
+        found.setdefault(entry_point.name, entry_point)
+    return found
+
+
+class LazyRegistry(MutableMapping[str, Type]):
+    """
+    Registry mapping that imports the modules of the built-in components on first read,
+    and plugins declared as entry points only when they are looked up.
+
+    Built-in components register themselves with a class decorator when their module is
+    imported. Since packages no longer import those modules eagerly, the registry imports
+    them the first time it is queried (lookups, listing, membership, clearing). Registering
+    does not trigger the import, so importing one component module does not pull in the
+    others. Entries registered before the built-ins are loaded take precedence over
+    built-ins with the same name.
+
+    Components shipped in separate distributions are discovered through the entry-point
+    `group`. Their names are listed from the installed package metadata, and the object
+    an entry point refers to is loaded, and stored under the entry point name, the first
+    time that name is looked up. Registered classes take precedence over entry points
+    with the same name.
+
+    Args:
+        modules (Iterable[str]): Modules defining the built-in components.
+        group (Optional[str]): Entry-point group of the plugins, e.g. 'langops.parsers'.
+    """
+
+    def __init__(
+        self, modules: Iterable[str] = (), group: Optional[str] = None
+    ) -> None:
+        self.modules: Tuple[str, ...] = tuple(modules)
+        self.group = group
+        self._entries: Dict[str, Type] = {}
+        self._plugins: Dict[str, Any] = {}
+        self._loaded = not self.modules and group is None
+        self._loading = False
+        self._lock = threading.RLock()
+
+    def load(self) -> None:
+        """Imports the built-in component modules and discovers plugins once."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded or self._loading:
+                return
+            self._loading = True
+            registered = dict(self._entries)
+            try:
+                for module_name in self.modules:
+                    importlib.import_module(module_name)
+                if self.group is not None:
+                    self._plugins = _entry_points(self.group)
+            finally:
+                self._loading = False
+            self._entries.update(registered)
+            self._loaded = True
+
+    def _load_plugin(self, key: str) -> Type:
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            # Importing the plugin module may register the class itself; the object the
+            # entry point refers to is what the name resolves to either way.
+            value: Type = self._plugins[key].load()
+            self._entries[key] = value
+            self._plugins.pop(key, None)
+            return value
+
+    def _names(self) -> Dict[str, None]:
+        self.load()
+        names = dict.fromkeys(self._entries)
+        names.update(dict.fromkeys(self._plugins))
+        return names
+
+    def plugins(self) -> Dict[str, str]:
+        """
+        Returns the entry-point plugins that have not been loaded yet.
+
+        Returns:
+            Dict[str, str]: Plugin name to entry point value ('module:attribute').
+        """
+        self.load()
+        return {
+            key: entry_point.value
+            for key, entry_point in self._plugins.items()
+            if key not in self._entries
+        }
+
+    def __getitem__(self, key: str) -> Type:
+        self.load()
+        if key not in self._entries and key in self._plugins:
+            return self._load_plugin(key)
+        return self._entries[key]
+
+    def __setitem__(self, key: str, value: Type) -> None:
+        # Registering does not load the built-ins, see the class docstring.
+        self._entries[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        self.load()
+        found = self._plugins.pop(key, None) is not None
+        if self._entries.pop(key, None) is None and not found:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        self.load()
+        return key in self._entries or key in self._plugins
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names())
+
+    def __len__(self) -> int:
+        return len(self._names())
+
+    def __repr__(self) -> str:
+        self.load()
+        return repr(self._entries)
+
+    def copy(self) -> Dict[str, Type]:
+        """Returns a plain dict of every entry, loading all plugins."""
+        return dict(self.items())
+
+    def clear(self) -> None:
+        self.load()
+        self._plugins.clear()
+        self._entries.clear()
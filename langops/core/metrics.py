@@ -0,0 +1,389 @@
+"""
+Metrics of LLM calls: latency histograms, token usage, errors and cache hit rates.
+"""
+
+import bisect
+import math
+import threading
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Upper bounds in seconds of the latency buckets, spanning cached answers to long
+# generations.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram, as exported to Prometheus.
+
+    Quantiles are interpolated linearly within their bucket, like Prometheus'
+    `histogram_quantile`, so their precision is that of the buckets.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Upper bounds of the finite buckets.
+        count (int): Observations.
+        sum (float): Sum of the observations.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """
+        Returns the (upper bound, observations at or below it) pairs, ending with
+        (inf, count).
+        """
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (math.inf,), self._counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates a quantile of the observations.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            Optional[float]: The estimate, None without observations. Quantiles in the
+            overflow bucket are reported as the highest finite bound.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        lower, below = 0.0, 0
+        for bound, total in self.cumulative():
+            if total >= rank and total > below:
+                if math.isinf(bound):
+                    return self.buckets[-1] if self.buckets else None
+                return lower + (bound - lower) * (rank - below) / (total - below)
+            lower, below = bound, total
+        return None  # pragma: no cover
+
+
+@dataclass
+class CallRecord:
+    """
+    Measurements of one LLM call.
+
+    Attributes:
+        provider (str): The client class, e.g. "OpenAILLM".
+        model (Optional[str]): The model.
+        latency (float): Wall-clock seconds of the call, including cache lookups,
+            queueing and retries.
+        prompt_tokens (Optional[int]): Prompt tokens reported by the provider.
+        completion_tokens (Optional[int]): Completion tokens reported by the provider.
+        error (Optional[str]): Type name of the error raised, None on success.
+        cache (Optional[str]): "hit" or "miss" with a response cache, else None.
+        coalesced (bool): Whether the response was shared from an identical call.
+        stream (bool): Whether the call was streamed.
+        queue_time (Optional[float]): Seconds spent waiting for rate limits.
+        retries (int): Retries after rate limits.
+        time_to_first_token (Optional[float]): Seconds to the first streamed token.
+    """
+
+    provider: str
+    model: Optional[str]
+    latency: float
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    error: Optional[str] = None
+    cache: Optional[str] = None
+    coalesced: bool = False
+    stream: bool = False
+    queue_time: Optional[float] = None
+    retries: int = 0
+    time_to_first_token: Optional[float] = None
+
+
+MetricsCallback = Callable[[CallRecord], None]
+
+
+@dataclass
+class _Series:
+    """Aggregates of the calls of one provider and model."""
+
+    latency: Histogram
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    coalesced: int = 0
+    retries: int = 0
+    queue_time: float = 0.0
+    errors: Dict[str, int] = field(default_factory=dict)
+
+
+def usage_tokens(usage: Any) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Reads the prompt and completion tokens of a provider usage object or mapping.
+
+    Args:
+        usage (Any): The `usage` metadata of a response.
+
+    Returns:
+        Tuple[Optional[int], Optional[int]]: Prompt and completion tokens.
+    """
+    if usage is None:
+        return None, None
+    if isinstance(usage, Mapping):
+        prompt, completion = usage.get("prompt_tokens"), usage.get("completion_tokens")
+    else:
+        prompt = getattr(usage, "prompt_tokens", None)
+        completion = getattr(usage, "completion_tokens", None)
+    return (
+        prompt if isinstance(prompt, int) else None,
+        completion if isinstance(completion, int) else None,
+    )
+
+
+def _label(value: Optional[str]) -> str:
+    text = "" if value is None else str(value)
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class LLMMetrics:
+    """
+    Thread-safe registry aggregating LLM calls per provider and model.
+
+    Clients record a CallRecord per call when the registry is set as their `metrics`,
+    or enabled process-wide with `enable_metrics`. Callbacks receive every record, e.g.
+    to forward them to another metrics system.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Latency bucket bounds in seconds.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        callbacks: Sequence[MetricsCallback] = (),
+    ) -> None:
+        """
+        Args:
+            buckets (Sequence[float]): Latency bucket bounds in seconds. Defaults to
+                DEFAULT_BUCKETS.
+            callbacks (Sequence[MetricsCallback]): Called with every record. Defaults to
+                none.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._callbacks: List[MetricsCallback] = list(callbacks)
+
+    def add_callback(self, callback: MetricsCallback) -> None:
+        """Calls `callback` with every record from now on."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback: MetricsCallback) -> None:
+        """Stops calling `callback`."""
+        with self._lock:
+            self._callbacks.remove(callback)
+
+    def record(self, record: CallRecord) -> None:
+        """
+        Aggregates a call and passes it to the callbacks. A failing callback is
+        reported with a RuntimeWarning and does not affect the call.
+
+        Args:
+            record (CallRecord): The measurements of the call.
+        """
+        key = (record.provider, record.model or "")
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(Histogram(self.buckets))
+            series.calls += 1
+            series.latency.observe(record.latency)
+            series.prompt_tokens += record.prompt_tokens or 0
+            series.completion_tokens += record.completion_tokens or 0
+            series.retries += record.retries
+            series.queue_time += record.queue_time or 0.0
+            if record.cache == "hit":
+                series.cache_hits += 1
+            elif record.cache == "miss":
+                series.cache_misses += 1
+            if record.coalesced:
+                series.coalesced += 1
+            if record.error is not None:
+                series.errors[record.error] = series.errors.get(record.error, 0) + 1
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback(record)
+            except Exception as e:
+                warnings.warn(
+                    f"LLM metrics callback {callback!r} failed: {e!r}",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarizes the calls per provider and model.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each "provider/model", the calls, errors
+            by type, error rate, latency p50/p95/p99 in seconds, token totals, cache
+            hit rate (None without a cache), coalesced calls, retries and queue time.
+        """
+        with self._lock:
+            items = sorted(self._series.items())
+            summary = {}
+            for (provider, model), series in items:
+                errors = sum(series.errors.values())
+                lookups = series.cache_hits + series.cache_misses
+                summary[f"{provider}/{model}"] = {
+                    "calls": series.calls,
+                    "errors": dict(series.errors),
+                    "error_rate": errors / series.calls,
+                    "p50": series.latency.quantile(0.5),
+                    "p95": series.latency.quantile(0.95),
+                    "p99": series.latency.quantile(0.99),
+                    "prompt_tokens": series.prompt_tokens,
+                    "completion_tokens": series.completion_tokens,
+                    "cache_hit_rate": series.cache_hits / lookups if lookups else None,
+                    "coalesced": series.coalesced,
+                    "retries": series.retries,
+                    "queue_time": series.queue_time,
+                }
+        return summary
+
+    def to_prometheus(self, prefix: str = "langops_llm") -> str:
+        """
+        Exports the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of the metric names. Defaults to "langops_llm".
+
+        Returns:
+            str: The exposition, ending with a newline.
+        """
+        counters = [
+            ("calls_total", "LLM calls.", lambda s: s.calls),
+            ("prompt_tokens_total", "Prompt tokens.", lambda s: s.prompt_tokens),
+            (
+                "completion_tokens_total",
+                "Completion tokens.",
+                lambda s: s.completion_tokens,
+            ),
+            ("cache_hits_total", "Response cache hits.", lambda s: s.cache_hits),
+            ("cache_misses_total", "Response cache misses.", lambda s: s.cache_misses),
+            (
+                "coalesced_total",
+                "Calls sharing an identical call.",
+                lambda s: s.coalesced,
+            ),
+            ("retries_total", "Retries after rate limits.", lambda s: s.retries),
+            (
+                "queue_seconds_total",
+                "Seconds spent waiting for rate limits.",
+                lambda s: s.queue_time,
+            ),
+        ]
+        with self._lock:
+            items = sorted(self._series.items())
+            lines: List[str] = []
+            for name, help_text, value in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for (provider, model), series in items:
+                    labels = f'provider="{_label(provider)}",model="{_label(model)}"'
+                    lines.append(
+                        f"{prefix}_{name}{{{labels}}} {_number(value(series))}"
+                    )
+            lines.append(f"# HELP {prefix}_errors_total LLM call errors by type.")
+            lines.append(f"# TYPE {prefix}_errors_total counter")
+            for (provider, model), series in items:
+                labels = f'provider="{_label(provider)}",model="{_label(model)}"'
+                for error, count in sorted(series.errors.items()):
+                    lines.append(
+                        f'{prefix}_errors_total{{{labels},error="{_label(error)}"}} '
+                        f"{count}"
+                    )
+            name = f"{prefix}_latency_seconds"
+            lines.append(f"# HELP {name} LLM call latency in seconds.")
+            lines.append(f"# TYPE {name} histogram")
+            for (provider, model), series in items:
+                labels = f'provider="{_label(provider)}",model="{_label(model)}"'
+                for bound, total in series.latency.cumulative():
+                    lines.append(
+                        f'{name}_bucket{{{labels},le="{_number(bound)}"}} {total}'
+                    )
+                lines.append(f"{name}_sum{{{labels}}} {_number(series.latency.sum)}")
+                lines.append(f"{name}_count{{{labels}}} {series.latency.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Forgets every aggregate; callbacks are kept."""
+        with self._lock:
+            self._series.clear()
+
+
+_active: Optional[LLMMetrics] = None
+
+
+def enable_metrics(metrics: Optional[LLMMetrics] = None) -> LLMMetrics:
+    """
+    Records the calls of every LLM client without its own `metrics` into a
+    process-wide registry.
+
+    Args:
+        metrics (Optional[LLMMetrics]): The registry. Defaults to the current one, or a
+            new one.
+
+    Returns:
+        LLMMetrics: The process-wide registry.
+    """
+    global _active
+    _active = metrics or _active or LLMMetrics()
+    return _active
+
+
+def disable_metrics() -> None:
+    """Stops process-wide recording; clients with their own `metrics` still record."""
+    global _active
+    _active = None
+
+
+def active_metrics() -> Optional[LLMMetrics]:
+    """
+    Returns the process-wide registry, None while metrics are disabled.
+
+    Returns:
+        Optional[LLMMetrics]: The registry.
+    """
+    return _active
@@ -0,0 +1,261 @@
+"""
+Streamed LLM completions: iterators of text deltas that aggregate the final response.
+"""
+
+import asyncio
+import time
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+)
+from langops.core.types import LLMResponse
+
+# A provider stream yields (text delta, metadata) pairs. The delta may be empty for
+# chunks that only carry metadata, e.g. the final usage chunk.
+StreamEvent = Tuple[str, Mapping[str, Any]]
+
+# Called once when a stream ends, with the aggregated response or the error raised.
+StreamObserver = Callable[[Optional[LLMResponse], Optional[BaseException]], None]
+
+
+class _StreamState:
+    """Aggregates the events of a stream into the final response."""
+
+    def __init__(
+        self,
+        metadata: Optional[Mapping[str, Any]],
+        on_finish: Optional[StreamObserver] = None,
+    ) -> None:
+        self.on_finish = on_finish
+        self.parts: List[str] = []
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+        self.started_at: Optional[float] = None
+        self.first_token_at: Optional[float] = None
+        self.response: Optional[LLMResponse] = None
+
+    def start(self) -> None:
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+
+    def add(self, event: StreamEvent) -> str:
+        delta, metadata = event
+        if delta and self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        if delta:
+            self.parts.append(delta)
+        self.metadata.update(metadata)
+        return delta
+
+    def finish(self) -> LLMResponse:
+        now = time.perf_counter()
+        started_at = self.started_at if self.started_at is not None else now
+        self.metadata["time_to_first_token"] = (
+            self.first_token_at - started_at
+            if self.first_token_at is not None
+            else None
+        )
+        self.metadata["total_time"] = now - started_at
+        self.response = LLMResponse(text="".join(self.parts), metadata=self.metadata)
+        self._notify(self.response, None)
+        return self.response
+
+    def fail(self, error: BaseException) -> None:
+        self._notify(None, error)
+
+    def _notify(
+        self, response: Optional[LLMResponse], error: Optional[BaseException]
+    ) -> None:
+        on_finish, self.on_finish = self.on_finish, None
+        if on_finish is not None:
+            on_finish(response, error)
+
+
+class LLMStream:
+    """
+    Iterator over the text deltas of a streamed completion.
+
+    The request is sent when iteration starts. Once the provider stream is exhausted,
+    `response` holds the aggregated LLMResponse, whose metadata carries the provider
+    metadata (usage, finish reason, ...), `time_to_first_token` and `total_time` in
+    seconds. Closing the stream, or leaving its `with` block, closes the underlying
+    HTTP stream.
+
+    Args:
+        events (Iterator[StreamEvent]): Provider stream of (delta, metadata) pairs,
+            typically a generator that closes its HTTP stream in a `finally` block.
+        metadata (Optional[Mapping[str, Any]]): Initial metadata of the response.
+        on_finish (Optional[StreamObserver]): Called once with the aggregated response
+            when the stream is exhausted, or with the error that ended it.
+    """
+
+    def __init__(
+        self,
+        events: Iterator[StreamEvent],
+        metadata: Optional[Mapping[str, Any]] = None,
+        on_finish: Optional[StreamObserver] = None,
+    ) -> None:
+        self._events = events
+        self._state = _StreamState(metadata, on_finish)
+
+    @property
+    def response(self) -> Optional[LLMResponse]:
+        """The aggregated response, None until the stream is exhausted."""
+        return self._state.response
+
+    def __iter__(self) -> "LLMStream":
+        return self
+
+    def __next__(self) -> str:
+        self._state.start()
+        while True:
+            try:
+                delta = self._state.add(next(self._events))
+            except StopIteration:
+                if self._state.response is None:
+                    self._state.finish()
+                raise
+            except Exception as e:
+                self._state.fail(e)
+                raise
+            if delta:
+                return delta
+
+    def collect(self) -> LLMResponse:
+        """
+        Consumes the remaining deltas and returns the aggregated response.
+
+        Returns:
+            LLMResponse: The aggregated response.
+        """
+        for _ in self:
+            pass
+        return self._state.response  # type: ignore[return-value]
+
+    def close(self) -> None:
+        """Stops the stream and closes the underlying HTTP stream."""
+        close = getattr(self._events, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> "LLMStream":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class AsyncLLMStream:
+    """
+    Asynchronous counterpart of LLMStream.
+
+    Cancelling the task consuming the stream, closing the stream (also from another
+    task) or leaving its `async with` block closes the underlying HTTP stream.
+
+    Args:
+        events (AsyncIterator[StreamEvent]): Provider stream of (delta, metadata) pairs,
+            typically an async generator that closes its HTTP stream in a `finally`
+            block.
+        metadata (Optional[Mapping[str, Any]]): Initial metadata of the response.
+        on_finish (Optional[StreamObserver]): Called once with the aggregated response
+            when the stream is exhausted, or with the error that ended it.
+    """
+
+    def __init__(
+        self,
+        events: AsyncIterator[StreamEvent],
+        metadata: Optional[Mapping[str, Any]] = None,
+        on_finish: Optional[StreamObserver] = None,
+    ) -> None:
+        self._events = events
+        self._state = _StreamState(metadata, on_finish)
+        self._step: "Optional[asyncio.Future[StreamEvent]]" = None
+        self._closed = False
+
+    @property
+    def response(self) -> Optional[LLMResponse]:
+        """The aggregated response, None until the stream is exhausted."""
+        return self._state.response
+
+    def __aiter__(self) -> "AsyncLLMStream":
+        return self
+
+    async def __anext__(self) -> str:
+        self._state.start()
+        while True:
+            if self._closed:
+                raise StopAsyncIteration
+            # Each step runs as a task so that `aclose` can interrupt a pending read
+            # from another task; cancelling the consumer cancels the step as well.
+            self._step = asyncio.ensure_future(self._events.__anext__())
+            try:
+                event = await self._step
+            except StopAsyncIteration:
+                if self._state.response is None:
+                    self._state.finish()
+                raise
+            except asyncio.CancelledError:
+                if self._closed:
+                    # The read was interrupted by `aclose` from another task.
+                    raise StopAsyncIteration from None
+                raise
+            except Exception as e:
+                self._state.fail(e)
+                raise
+            finally:
+                self._step = None
+            delta = self._state.add(event)
+            if delta:
+                return delta
+
+    async def collect(self) -> LLMResponse:
+        """
+        Consumes the remaining deltas and returns the aggregated response.
+
+        Returns:
+            LLMResponse: The aggregated response.
+        """
+        async for _ in self:
+            pass
+        return self._state.response  # type: ignore[return-value]
+
+    async def aclose(self) -> None:
+        """
+        Stops the stream and closes the underlying HTTP stream. A task waiting for the
+        next delta stops iterating.
+        """
+        self._closed = True
+        step = self._step
+        if step is not None and not step.done():
+            # The events are being read by another task: cancel the read, which runs
+            # the cleanup of the provider stream, and wait for it to finish.
+            step.cancel()
+            await asyncio.wait([step])
+            return
+        aclose = getattr(self._events, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    async def __aenter__(self) -> "AsyncLLMStream":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
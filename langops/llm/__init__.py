@@ -1,5 +1,21 @@
+from typing import TYPE_CHECKING
+from langops.core.lazy import lazy_exports
 from langops.llm.registry import LLMRegistry
-from langops.llm.openai_llm import OpenAILLM
+
+if TYPE_CHECKING:  # pragma: no cover
+    from langops.llm.analysis import MapReduceAnalyzer
+    from langops.llm.openai_llm import OpenAILLM
+    from langops.llm.response_cache import ResponseCache
+
+# OpenAILLM pulls in the openai and httpx stack, so it is imported on first access.
+__getattr__, __dir__ = lazy_exports(
+    "langops.llm",
+    {
+        "OpenAILLM": "langops.llm.openai_llm",
+        "ResponseCache": "langops.llm.response_cache",
+        "MapReduceAnalyzer": "langops.llm.analysis",
+    },
+)
 
 __name__ = "langops.llm"
 __version__ = "0.1.0"
@@ -10,4 +26,4 @@ __description__ = (
     "Designed for extensibility and modularity, supporting decorators, registries, "
     "and OpenAI LLM integration."
 )
-__all__ = ["LLMRegistry", "OpenAILLM"]
+__all__ = ["LLMRegistry", "OpenAILLM", "ResponseCache", "MapReduceAnalyzer"]
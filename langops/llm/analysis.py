@@ -0,0 +1,467 @@
+"""
+Map-reduce analysis of parsed pipeline logs too large for a single prompt.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from langops.core.base_llm import BaseLLM
+from langops.core.types import LLMResponse
+from langops.llm.response_cache import ResponseCache
+from langops.llm.tokens import TokenCounter, token_counter
+
+MAP_INSTRUCTIONS = (
+    "You are analyzing part {part} of {parts} of the parsed logs of a {source} "
+    "pipeline run. List the errors and warnings of this part with their stages and "
+    "likely causes. Be concise; keep line numbers, file names and error codes."
+)
+REDUCE_INSTRUCTIONS = (
+    "You are merging partial analyses of the logs of a {source} pipeline run. "
+    "Combine them into one concise analysis: merge duplicate errors, keep stages, "
+    "line numbers and error codes, and order the issues by importance."
+)
+FINAL_INSTRUCTIONS = (
+    "You are writing the root-cause report of a {source} pipeline run from analyses "
+    "of its logs. Identify the root cause and separate it from downstream failures, "
+    "cite the stages and line numbers involved, and suggest a fix."
+)
+
+# (LLM call arguments, prompts) of one level of the analysis.
+_Batch = Tuple[Dict[str, Any], List[List[Dict[str, str]]]]
+
+
+@dataclass
+class LogChunk:
+    """
+    A part of a parsed bundle analyzed by one map call.
+
+    Attributes:
+        index (int): Position of the chunk in the bundle.
+        stages (List[str]): Names of the stages the chunk covers.
+        text (str): The rendered log entries.
+        tokens (int): Estimated tokens of `text`.
+    """
+
+    index: int
+    stages: List[str]
+    text: str
+    tokens: int
+
+
+@dataclass
+class AnalysisReport:
+    """
+    Result of a map-reduce analysis.
+
+    Attributes:
+        text (str): The root-cause report; empty if the bundle has no log entries.
+        response (Optional[LLMResponse]): The response of the final call.
+        chunks (List[LogChunk]): The chunks of the map level.
+        levels (List[List[str]]): The outputs of each level, from the map summaries
+            to the report.
+        calls (int): LLM calls made.
+        cached (int): Calls answered from the partial-result cache.
+    """
+
+    text: str
+    response: Optional[LLMResponse] = None
+    chunks: List[LogChunk] = field(default_factory=list)
+    levels: List[List[str]] = field(default_factory=list)
+    calls: int = 0
+    cached: int = 0
+
+
+class AnalysisError(RuntimeError):
+    """
+    Raised when calls of an analysis level fail. Completed calls are cached, so running
+    the analysis again only redoes the failed ones.
+
+    Attributes:
+        level (int): The failed level, 0 for the map level.
+        failures (Dict[int, Exception]): Error of each failed call by position.
+        completed (int): Calls of the level that succeeded.
+    """
+
+    def __init__(
+        self, level: int, failures: Dict[int, Exception], completed: int
+    ) -> None:
+        self.level = level
+        self.failures = failures
+        self.completed = completed
+        first = next(iter(failures.values()))
+        super().__init__(
+            f"{len(failures)} call(s) of analysis level {level} failed "
+            f"({completed} completed and cached): {first}"
+        )
+
+
+class MapReduceAnalyzer:
+    """
+    Analyzes a ParsedPipelineBundle too large for one prompt with concurrent LLM calls.
+
+    The bundle is partitioned per StageWindow (oversized stages are split) or packed
+    into chunks of `map_budget` tokens. Each chunk is summarized by a map call; the
+    summaries are then merged level by level, in groups of at most `reduce_budget`
+    tokens, until a final call writes the root-cause report. The calls of a level run
+    concurrently through `BaseLLM.acomplete_many`, so they honor the `rate_limiter` and
+    `response_cache` of the client.
+
+    Every completed call is stored in `cache`, keyed on its request. When a level fails,
+    running the analysis again with the same cache skips the finished chunks.
+
+    Attributes:
+        llm (BaseLLM): The client.
+        partition (str): 'stage' or 'tokens'.
+        map_budget (int): Maximum tokens of log entries per map call.
+        reduce_budget (int): Maximum tokens of summaries per reduce call.
+        map_max_tokens (int): Completion tokens of map calls.
+        reduce_max_tokens (int): Completion tokens of reduce and final calls.
+        max_concurrency (int): Concurrent calls per level when the client has no
+            `rate_limiter`.
+        cache (ResponseCache): Cache of completed calls.
+    """
+
+    def __init__(
+        self,
+        llm: BaseLLM,
+        *,
+        partition: str = "stage",
+        map_budget: int = 6000,
+        reduce_budget: int = 6000,
+        map_max_tokens: int = 500,
+        reduce_max_tokens: int = 1000,
+        max_concurrency: int = 8,
+        cache: Optional[ResponseCache] = None,
+        counter: Optional[TokenCounter] = None,
+        map_instructions: str = MAP_INSTRUCTIONS,
+        reduce_instructions: str = REDUCE_INSTRUCTIONS,
+        final_instructions: str = FINAL_INSTRUCTIONS,
+        **llm_kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            llm (BaseLLM): The client, e.g. an OpenAILLM.
+            partition (str): 'stage' for one chunk per stage, 'tokens' to pack entries
+                of consecutive stages into chunks of `map_budget` tokens.
+            map_budget (int): Maximum tokens of log entries per map call.
+            reduce_budget (int): Maximum tokens of summaries per reduce call.
+            map_max_tokens (int): Completion tokens of map calls.
+            reduce_max_tokens (int): Completion tokens of reduce and final calls.
+            max_concurrency (int): Concurrent calls per level when the client has no
+                `rate_limiter`.
+            cache (Optional[ResponseCache]): Cache of completed calls; pass one with a
+                `path` to resume across processes. Defaults to an in-memory cache.
+            counter (Optional[TokenCounter]): Token counter; the model's by default.
+            map_instructions (str): System prompt of map calls. May use {source},
+                {part} and {parts}.
+            reduce_instructions (str): System prompt of reduce calls. May use {source}.
+            final_instructions (str): System prompt of the final call. May use {source}.
+            **llm_kwargs: Additional arguments for every call, e.g. temperature.
+
+        Raises:
+            ValueError: If partition is unknown or a budget is not positive.
+        """
+        if partition not in ("stage", "tokens"):
+            raise ValueError("partition must be 'stage' or 'tokens'")
+        if min(map_budget, reduce_budget, map_max_tokens, reduce_max_tokens) <= 0:
+            raise ValueError("budgets must be positive")
+        self.llm = llm
+        self.partition = partition
+        self.map_budget = map_budget
+        self.reduce_budget = reduce_budget
+        self.map_max_tokens = map_max_tokens
+        self.reduce_max_tokens = reduce_max_tokens
+        self.max_concurrency = max_concurrency
+        self.cache = cache if cache is not None else ResponseCache(maxsize=4096)
+        self.counter = counter or token_counter(getattr(llm, "model", None))
+        self.map_instructions = map_instructions
+        self.reduce_instructions = reduce_instructions
+        self.final_instructions = final_instructions
+        self.llm_kwargs = llm_kwargs
+
+    def chunks(self, bundle: Any) -> List[LogChunk]:
+        """
+        Partitions the log entries of a bundle into map chunks. Stages without entries
+        are skipped.
+
+        Args:
+            bundle (ParsedPipelineBundle): The parsed logs.
+
+        Returns:
+            List[LogChunk]: The chunks, in log order.
+        """
+        chunks: List[LogChunk] = []
+        lines: List[str] = []
+        stages: List[str] = []
+        tokens = 0
+
+        def flush() -> None:
+            nonlocal lines, stages, tokens
+            if lines:
+                text = "\n".join(lines)
+                chunks.append(LogChunk(len(chunks), stages, text, tokens))
+            lines, stages, tokens = [], [], 0
+
+        for stage in bundle.stages:
+            if not stage.content:
+                continue
+            if self.partition == "stage":
+                flush()
+            header = (
+                f"## Stage: {stage.name} (lines {stage.start_line}-{stage.end_line})"
+            )
+            for entry in stage.content:
+                line = f"[{entry.line}] {entry.severity.value.upper()}: {entry.message}"
+                line_tokens = self.counter.count(line) + 1
+                if line_tokens > self.map_budget // 2:
+                    line = self.counter.truncate(line, self.map_budget // 2)
+                    line_tokens = self.counter.count(line) + 1
+                if not stages or stages[-1] != stage.name:
+                    header_tokens = self.counter.count(header) + 1
+                    if tokens + header_tokens + line_tokens > self.map_budget:
+                        flush()
+                    lines.append(header)
+                    stages.append(stage.name)
+                    tokens += header_tokens
+                elif tokens + line_tokens > self.map_budget:
+                    flush()
+                    lines.append(header + " (continued)")
+                    stages.append(stage.name)
+                    tokens += self.counter.count(lines[-1]) + 1
+                lines.append(line)
+                tokens += line_tokens
+        flush()
+        return chunks
+
+    def _groups(self, summaries: Sequence[str]) -> List[List[str]]:
+        """Packs summaries into reduce groups of at most `reduce_budget` tokens."""
+        groups: List[List[str]] = []
+        group: List[str] = []
+        tokens = 0
+        for summary in summaries:
+            size = self.counter.count(summary)
+            if size > self.reduce_budget // 2:
+                summary = self.counter.truncate(summary, self.reduce_budget // 2)
+                size = self.counter.count(summary)
+            # Every group merges at least two summaries, so each level shrinks.
+            if len(group) >= 2 and tokens + size > self.reduce_budget:
+                groups.append(group)
+                group, tokens = [], 0
+            group.append(summary)
+            tokens += size
+        if group:
+            if len(group) == 1 and groups:
+                groups[-1].extend(group)
+            else:
+                groups.append(group)
+        return groups
+
+    @staticmethod
+    def _merge_prompt(
+        instructions: str, summaries: Sequence[str]
+    ) -> List[Dict[str, str]]:
+        parts = "\n\n".join(
+            f"### Analysis {index}\n{summary}"
+            for index, summary in enumerate(summaries, start=1)
+        )
+        return [
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": parts},
+        ]
+
+    def _steps(
+        self, bundle: Any, chunks: List[LogChunk], report: AnalysisReport
+    ) -> Generator[_Batch, List[str], None]:
+        """
+        Plans the analysis level by level: yields the calls of each level and receives
+        their outputs, filling in `report`.
+        """
+        source = getattr(bundle, "source", "CI")
+        final = self.final_instructions.format(source=source)
+        map_kwargs = {**self.llm_kwargs, "max_tokens": self.map_max_tokens}
+        reduce_kwargs = {**self.llm_kwargs, "max_tokens": self.reduce_max_tokens}
+
+        if len(chunks) == 1:
+            # Small bundles are analyzed by the final call directly.
+            prompt = [
+                {"role": "system", "content": final},
+                {"role": "user", "content": chunks[0].text},
+            ]
+            report.levels.append((yield reduce_kwargs, [prompt]))
+            return
+
+        map_prompts = [
+            [
+                {
+                    "role": "system",
+                    "content": self.map_instructions.format(
+                        source=source, part=chunk.index + 1, parts=len(chunks)
+                    ),
+                },
+                {"role": "user", "content": chunk.text},
+            ]
+            for chunk in chunks
+        ]
+        summaries = yield map_kwargs, map_prompts
+        report.levels.append(summaries)
+        reduce = self.reduce_instructions.format(source=source)
+        while True:
+            groups = self._groups(summaries)
+            if len(groups) == 1:
+                prompt = self._merge_prompt(final, groups[0])
+                report.levels.append((yield reduce_kwargs, [prompt]))
+                return
+            prompts = [self._merge_prompt(reduce, group) for group in groups]
+            summaries = yield reduce_kwargs, prompts
+            report.levels.append(summaries)
+
+    def _lookup(self, batch: _Batch) -> Tuple[List[str], List[Optional[LLMResponse]]]:
+        """Returns the cache keys of the calls of a level and their cached responses."""
+        kwargs, prompts = batch
+        keys = [
+            self.cache.key(
+                {"analysis": 1, "request": self.llm.cache_request(prompt, **kwargs)}
+            )
+            for prompt in prompts
+        ]
+        return keys, [self.cache.get(key) for key in keys]
+
+    def _advance(
+        self,
+        state: "_Run",
+        fresh: Sequence[Union[LLMResponse, Exception]],
+        elapsed: float,
+    ) -> Optional[_Batch]:
+        """
+        Caches the fresh responses of a level and returns the next level, or None once
+        the report is complete.
+
+        Raises:
+            AnalysisError: If calls of the level failed.
+        """
+        report = state.report
+        report.cached += len(state.results) - len(state.pending)
+        report.calls += len(state.pending)
+        failures: Dict[int, Exception] = {}
+        for index, result in zip(state.pending, fresh):
+            if isinstance(result, Exception):
+                failures[index] = result
+                continue
+            state.results[index] = self.cache.put(state.keys[index], result, elapsed)
+        if failures:
+            raise AnalysisError(
+                state.level, failures, len(state.results) - len(failures)
+            )
+        responses: List[LLMResponse] = state.results  # type: ignore[assignment]
+        try:
+            batch = state.steps.send([response.text for response in responses])
+        except StopIteration:
+            report.response = responses[0]
+            report.text = responses[0].text
+            return None
+        state.next_level(batch)
+        return batch
+
+    def _start(self, bundle: Any) -> "_Run":
+        chunks = self.chunks(bundle)
+        report = AnalysisReport(text="", chunks=chunks)
+        state = _Run(self, report, self._steps(bundle, chunks, report))
+        if chunks:
+            state.next_level(next(state.steps))
+        return state
+
+    async def arun(self, bundle: Any) -> AnalysisReport:
+        """
+        Analyzes a bundle, running the calls of each level concurrently.
+
+        Args:
+            bundle (ParsedPipelineBundle): The parsed logs.
+
+        Returns:
+            AnalysisReport: The root-cause report and the intermediate summaries.
+
+        Raises:
+            AnalysisError: If calls of a level fail; completed calls are cached.
+        """
+        state = self._start(bundle)
+        batch = state.batch
+        while batch is not None:
+            start = time.perf_counter()
+            fresh = await self.llm.acomplete_many(
+                state.prompts(),
+                max_concurrency=self.max_concurrency,
+                return_exceptions=True,
+                **batch[0],
+            )
+            batch = self._advance(state, fresh, time.perf_counter() - start)
+        return state.report
+
+    def run(self, bundle: Any) -> AnalysisReport:
+        """
+        Synchronous counterpart of `arun`, running each level with `complete_many`.
+
+        Args:
+            bundle (ParsedPipelineBundle): The parsed logs.
+
+        Returns:
+            AnalysisReport: The root-cause report and the intermediate summaries.
+
+        Raises:
+            AnalysisError: If calls of a level fail; completed calls are cached.
+            RuntimeError: If called from a running event loop.
+        """
+        state = self._start(bundle)
+        batch = state.batch
+        while batch is not None:
+            start = time.perf_counter()
+            prompts = state.prompts()
+            fresh = (
+                self.llm.complete_many(
+                    prompts,
+                    max_concurrency=self.max_concurrency,
+                    return_exceptions=True,
+                    **batch[0],
+                )
+                if prompts
+                else []
+            )
+            batch = self._advance(state, fresh, time.perf_counter() - start)
+        return state.report
+
+
+class _Run:
+    """Progress of one analysis: the current level and its cached results."""
+
+    def __init__(
+        self,
+        analyzer: MapReduceAnalyzer,
+        report: AnalysisReport,
+        steps: Generator[_Batch, List[str], None],
+    ) -> None:
+        self.analyzer = analyzer
+        self.report = report
+        self.steps = steps
+        self.level = -1
+        self.batch: Optional[_Batch] = None
+        self.keys: List[str] = []
+        self.results: List[Optional[LLMResponse]] = []
+        self.pending: List[int] = []
+
+    def next_level(self, batch: _Batch) -> None:
+        self.level += 1
+        self.batch = batch
+        self.keys, self.results = self.analyzer._lookup(batch)
+        self.pending = [i for i, result in enumerate(self.results) if result is None]
+
+    def prompts(self) -> List[List[Dict[str, str]]]:
+        assert self.batch is not None
+        return [self.batch[1][index] for index in self.pending]
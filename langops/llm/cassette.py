@@ -0,0 +1,228 @@
+"""
+Record/replay of LLM API traffic, for deterministic offline tests and benchmarks.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from langops.llm.client_pool import ClientPool, PoolSettings, httpx
+
+CASSETTE_MODES = ("replay", "record", "auto")
+
+# Length and encoding headers no longer describe the stored, decoded body; cookies are
+# not worth keeping in a file meant to be committed.
+_DROPPED_HEADERS = {
+    "content-length",
+    "content-encoding",
+    "transfer-encoding",
+    "set-cookie",
+}
+
+_Key = Tuple[str, str, str]
+
+
+def _body_key(body: Any) -> str:
+    """Returns the matching key of a stored request body (JSON, or raw text)."""
+    if isinstance(body, str):
+        return body
+    return json.dumps(body, sort_keys=True, separators=(",", ":"))
+
+
+def _stored_body(content: bytes) -> Any:
+    try:
+        return json.loads(content) if content else None
+    except ValueError:
+        return content.decode("utf-8", "replace")
+
+
+class Cassette:
+    """
+    Records LLM API responses to a JSON file and replays them.
+
+    Requests match on method, URL path and JSON body (key order ignored); headers,
+    including the API key, are neither matched nor stored. Identical requests recorded
+    several times are replayed in recording order, the last one repeating. Streamed
+    responses are stored whole and replayed without their original timing.
+
+    Modes:
+        - 'replay': only replays; unmatched requests get a 404 error response.
+        - 'record': sends every request and records it into a fresh cassette.
+        - 'auto': replays matched requests and records the others.
+
+    Attributes:
+        path (Path): The cassette file.
+        mode (str): 'replay', 'record' or 'auto'.
+        hits (int): Requests answered from the cassette.
+        misses (int): Unmatched requests in 'replay' mode.
+        recorded (int): Requests recorded.
+    """
+
+    def __init__(self, path: str | os.PathLike, mode: str = "auto") -> None:
+        """
+        Args:
+            path (str | os.PathLike): The cassette file, created when the first
+                response is recorded.
+            mode (str): 'replay', 'record' or 'auto'. Defaults to 'auto'.
+
+        Raises:
+            ValueError: If mode is not one of CASSETTE_MODES.
+            FileNotFoundError: In 'replay' mode, if the cassette does not exist.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(CASSETTE_MODES)}")
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._interactions: List[Dict[str, Any]] = []
+        self._index: Dict[_Key, List[Dict[str, Any]]] = {}
+        self._played: Dict[_Key, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        if mode == "replay" or (mode == "auto" and self.path.exists()):
+            with open(self.path, encoding="utf-8") as f:
+                for interaction in json.load(f)["interactions"]:
+                    self._add(interaction)
+
+    def _add(self, interaction: Dict[str, Any]) -> None:
+        request = interaction["request"]
+        key = (request["method"], request["path"], _body_key(request["body"]))
+        self._interactions.append(interaction)
+        self._index.setdefault(key, []).append(interaction)
+
+    @staticmethod
+    def _key(request: Any, content: bytes) -> Tuple[_Key, Any]:
+        body = _stored_body(content)
+        return (request.method, request.url.path, _body_key(body)), body
+
+    def _replay(self, key: _Key) -> Optional[Any]:
+        with self._lock:
+            interactions = self._index.get(key)
+            if not interactions:
+                if self.mode == "replay":
+                    self.misses += 1
+                    return httpx.Response(
+                        404,
+                        json={
+                            "error": {
+                                "message": f"No recorded response for {key[0]} "
+                                f"{key[1]} in cassette {self.path}",
+                                "type": "cassette_miss",
+                                "code": "cassette_miss",
+                            }
+                        },
+                    )
+                return None
+            played = self._played.get(key, 0)
+            self._played[key] = played + 1
+            self.hits += 1
+            response = interactions[min(played, len(interactions) - 1)]["response"]
+        return httpx.Response(
+            response["status"],
+            headers=response["headers"],
+            content=response["body"].encode("utf-8"),
+        )
+
+    def _record(self, request: Any, body: Any, response: Any, content: bytes) -> Any:
+        headers = [
+            [name, value]
+            for name, value in response.headers.multi_items()
+            if name.lower() not in _DROPPED_HEADERS
+        ]
+        interaction = {
+            "request": {
+                "method": request.method,
+                "path": request.url.path,
+                "body": body,
+            },
+            "response": {
+                "status": response.status_code,
+                "headers": headers,
+                "body": content.decode("utf-8", "replace"),
+            },
+        }
+        with self._lock:
+            self._add(interaction)
+            self.recorded += 1
+            self._save()
+        return httpx.Response(response.status_code, headers=headers, content=content)
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "interactions": self._interactions}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def wrap(self, transport: Any) -> "_CassetteTransport":
+        """
+        Wraps an HTTP transport so that its requests go through the cassette.
+
+        Args:
+            transport (Any): The transport sending recorded requests.
+
+        Returns:
+            _CassetteTransport: The recording and replaying transport.
+        """
+        return _CassetteTransport(self, transport)
+
+    def client_pool(
+        self, settings: Optional[PoolSettings] = None, **options: Any
+    ) -> ClientPool:
+        """
+        Returns a ClientPool whose clients go through the cassette, e.g.
+        `OpenAILLM(api_key=key, client_pool=cassette.client_pool())`.
+
+        Args:
+            settings (Optional[PoolSettings]): Connection settings.
+            **options: Overrides of individual settings.
+
+        Returns:
+            ClientPool: A recording and replaying pool.
+        """
+        return ClientPool(settings, wrap_transport=self.wrap, **options)
+
+
+class _CassetteTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Sync and async transport recording and replaying through a Cassette."""
+
+    def __init__(self, cassette: Cassette, transport: Any) -> None:
+        self.cassette = cassette
+        self.transport = transport
+
+    def handle_request(self, request: Any) -> Any:
+        content = request.read()
+        key, body = self.cassette._key(request, content)
+        if self.cassette.mode != "record":
+            replayed = self.cassette._replay(key)
+            if replayed is not None:
+                return replayed
+        response = self.transport.handle_request(request)
+        try:
+            data = b"".join(response.iter_bytes())
+        finally:
+            response.close()
+        return self.cassette._record(request, body, response, data)
+
+    async def handle_async_request(self, request: Any) -> Any:
+        content = await request.aread()
+        key, body = self.cassette._key(request, content)
+        if self.cassette.mode != "record":
+            replayed = self.cassette._replay(key)
+            if replayed is not None:
+                return replayed
+        response = await self.transport.handle_async_request(request)
+        try:
+            data = b"".join([chunk async for chunk in response.aiter_bytes()])
+        finally:
+            await response.aclose()
+        return self.cassette._record(request, body, response, data)
+
+    def close(self) -> None:
+        self.transport.close()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
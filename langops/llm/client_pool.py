@@ -0,0 +1,384 @@
+import asyncio
+import dataclasses
+import importlib
+import importlib.util
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import openai
+
+# The HTTP library openai is built on (httpx), so that pooled clients match it.
+httpx: Any = importlib.import_module(
+    openai.DefaultHttpxClient.__mro__[1].__module__.split(".")[0]
+)
+
+_ClientKey = Tuple[Optional[str], Optional[str]]
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """
+    Connection settings of the pooled clients.
+
+    Attributes:
+        max_connections (Optional[int]): Maximum open connections per client and event
+            loop, None for unlimited.
+        max_keepalive_connections (Optional[int]): Idle connections kept open.
+        keepalive_expiry (Optional[float]): Seconds an idle connection is kept open.
+        http2 (bool): Negotiate HTTP/2 (requires the `h2` package).
+        timeout (float): Read, write and pool timeout in seconds.
+        connect_timeout (float): Connect timeout in seconds.
+    """
+
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 60.0
+    http2: bool = False
+    timeout: float = 600.0
+    connect_timeout: float = 5.0
+
+    def limits(self) -> Any:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeouts(self) -> Any:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+@dataclass
+class PoolStats:
+    """
+    Utilization of a ClientPool.
+
+    Attributes:
+        clients (int): Pooled clients (sync and async).
+        requests (int): Requests sent through the pooled clients.
+        in_flight (int): Requests waiting for their response headers.
+        connections (int): Open connections.
+        active_connections (int): Connections serving a request.
+        idle_connections (int): Keep-alive connections ready for reuse.
+    """
+
+    clients: int = 0
+    requests: int = 0
+    in_flight: int = 0
+    connections: int = 0
+    active_connections: int = 0
+    idle_connections: int = 0
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+
+    def start(self) -> None:
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+
+    def end(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+
+def _connections(transport: Any) -> List[Any]:
+    # httpx does not expose its connection pool; utilization is best effort.
+    pool = getattr(transport, "_pool", None)
+    return list(getattr(pool, "connections", ()))
+
+
+class _CountingTransport(httpx.BaseTransport):
+    """Sync transport counting the requests of its connection pool."""
+
+    def __init__(self, transport: Any, counter: _Counter) -> None:
+        self.transport = transport
+        self.counter = counter
+
+    def handle_request(self, request: Any) -> Any:
+        self.counter.start()
+        try:
+            return self.transport.handle_request(request)
+        finally:
+            self.counter.end()
+
+    def close(self) -> None:
+        self.transport.close()
+
+    def connections(self) -> List[Any]:
+        return _connections(self.transport)
+
+
+class _LoopTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport keeping one connection pool per event loop, since connections
+    cannot be shared between loops. Pools of closed loops are dropped.
+    """
+
+    def __init__(self, factory: Callable[[], Any], counter: _Counter) -> None:
+        self.factory = factory
+        self.counter = counter
+        self._lock = threading.Lock()
+        self._transports: "weakref.WeakKeyDictionary[Any, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _transport(self) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                for closed in [
+                    other for other in self._transports if other.is_closed()
+                ]:
+                    del self._transports[closed]
+                transport = self._transports[loop] = self.factory()
+            return transport
+
+    async def handle_async_request(self, request: Any) -> Any:
+        transport = self._transport()
+        self.counter.start()
+        try:
+            return await transport.handle_async_request(request)
+        finally:
+            self.counter.end()
+
+    async def aclose(self) -> None:
+        """Closes the connection pool of the running event loop."""
+        with self._lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+    def connections(self) -> List[Any]:
+        with self._lock:
+            transports = [
+                t for loop, t in self._transports.items() if not loop.is_closed()
+            ]
+        return [c for transport in transports for c in _connections(transport)]
+
+
+class ClientPool:
+    """
+    Process-wide pool of OpenAI clients keyed by API key and base URL.
+
+    Every LLM client using the same credentials and endpoint shares one `openai.Client`
+    and one `openai.AsyncClient`, and therefore their keep-alive connections, instead of
+    paying a TCP and TLS handshake for each new instance. Clients are created on first
+    use. The sync client is thread-safe; the async client keeps a separate connection
+    pool for each event loop, so it can be used from any loop or thread.
+
+    Attributes:
+        settings (PoolSettings): Connection settings of the clients.
+        wrap_transport (Optional[Callable[[Any], Any]]): Wraps every HTTP transport the
+            pool creates.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[PoolSettings] = None,
+        *,
+        wrap_transport: Optional[Callable[[Any], Any]] = None,
+        **options: Any,
+    ) -> None:
+        """
+        Args:
+            settings (Optional[PoolSettings]): Connection settings. Defaults to
+                PoolSettings().
+            wrap_transport (Optional[Callable[[Any], Any]]): Wraps every HTTP transport
+                the pool creates, e.g. to record and replay requests (Cassette) or to
+                answer them locally (FakeLLMServer). Defaults to None.
+            **options: Overrides of individual settings, e.g. max_connections=50.
+        """
+        self.settings = dataclasses.replace(settings or PoolSettings(), **options)
+        self.wrap_transport = wrap_transport
+        self._lock = threading.Lock()
+        self._clients: Dict[_ClientKey, Any] = {}
+        self._async_clients: Dict[_ClientKey, Any] = {}
+        self._transports: List[Any] = []
+        self._counter = _Counter()
+
+    def _wrap(self, transport: Any) -> Any:
+        return (
+            transport if self.wrap_transport is None else self.wrap_transport(transport)
+        )
+
+    def _transport_options(self) -> Dict[str, Any]:
+        if self.settings.http2 and importlib.util.find_spec("h2") is None:
+            raise ImportError(
+                "HTTP/2 requires the 'h2' package: pip install 'httpx[http2]'"
+            )
+        return {"limits": self.settings.limits(), "http2": self.settings.http2}
+
+    def client(
+        self, api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> openai.Client:
+        """
+        Returns the shared sync client of an API key and base URL.
+
+        Args:
+            api_key (Optional[str]): The API key; openai reads OPENAI_API_KEY if None.
+            base_url (Optional[str]): The API base URL; openai's default if None.
+
+        Returns:
+            openai.Client: The shared client.
+
+        Raises:
+            ImportError: If http2 is enabled and the h2 package is not installed.
+        """
+        key = (api_key, base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                transport = _CountingTransport(
+                    self._wrap(httpx.HTTPTransport(**self._transport_options())),
+                    self._counter,
+                )
+                client = openai.Client(
+                    api_key=api_key,
+                    base_url=base_url,
+                    http_client=openai.DefaultHttpxClient(
+                        transport=transport, timeout=self.settings.timeouts()
+                    ),
+                )
+                self._clients[key] = client
+                self._transports.append(transport)
+            return client
+
+    def async_client(
+        self, api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> openai.AsyncClient:
+        """
+        Returns the shared async client of an API key and base URL.
+
+        Args:
+            api_key (Optional[str]): The API key; openai reads OPENAI_API_KEY if None.
+            base_url (Optional[str]): The API base URL; openai's default if None.
+
+        Returns:
+            openai.AsyncClient: The shared client, usable from any event loop.
+
+        Raises:
+            ImportError: If http2 is enabled and the h2 package is not installed.
+        """
+        key = (api_key, base_url)
+        with self._lock:
+            client = self._async_clients.get(key)
+            if client is None:
+                options = self._transport_options()
+                transport = _LoopTransport(
+                    lambda: self._wrap(httpx.AsyncHTTPTransport(**options)),
+                    self._counter,
+                )
+                client = openai.AsyncClient(
+                    api_key=api_key,
+                    base_url=base_url,
+                    http_client=openai.DefaultAsyncHttpxClient(
+                        transport=transport, timeout=self.settings.timeouts()
+                    ),
+                )
+                self._async_clients[key] = client
+                self._transports.append(transport)
+            return client
+
+    def new_async_client(
+        self, api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> openai.AsyncClient:
+        """
+        Creates an unshared async client with the pool's settings, e.g. for a batch
+        running in its own event loop. The caller closes it.
+
+        Args:
+            api_key (Optional[str]): The API key.
+            base_url (Optional[str]): The API base URL.
+
+        Returns:
+            openai.AsyncClient: A new client.
+        """
+        return openai.AsyncClient(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=openai.DefaultAsyncHttpxClient(
+                transport=self._wrap(
+                    httpx.AsyncHTTPTransport(**self._transport_options())
+                ),
+                timeout=self.settings.timeouts(),
+            ),
+        )
+
+    def stats(self) -> PoolStats:
+        """
+        Returns the utilization of the pooled clients.
+
+        Returns:
+            PoolStats: Client, request and connection counts.
+        """
+        with self._lock:
+            transports = list(self._transports)
+            clients = len(self._clients) + len(self._async_clients)
+        connections = [c for t in transports for c in t.connections()]
+        idle = sum(1 for c in connections if c.is_idle())
+        return PoolStats(
+            clients=clients,
+            requests=self._counter.requests,
+            in_flight=self._counter.in_flight,
+            connections=len(connections),
+            active_connections=len(connections) - idle,
+            idle_connections=idle,
+        )
+
+    def close(self) -> None:
+        """
+        Closes the sync clients and forgets every client. Async connections are
+        released when their event loop is closed.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._async_clients.clear()
+            self._transports.clear()
+        for client in clients:
+            client.close()
+
+
+_default_pool: Optional[ClientPool] = None
+_default_lock = threading.Lock()
+
+
+def default_client_pool() -> ClientPool:
+    """
+    Returns the process-wide pool used by LLM clients created without one.
+
+    Returns:
+        ClientPool: The default pool.
+    """
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = ClientPool()
+        return _default_pool
+
+
+def configure_client_pool(
+    settings: Optional[PoolSettings] = None, **options: Any
+) -> ClientPool:
+    """
+    Replaces the default pool with one using the given settings. Clients already
+    handed out keep their connections; LLM clients created afterwards use the new pool.
+
+    Args:
+        settings (Optional[PoolSettings]): Connection settings.
+        **options: Overrides of individual settings, e.g. http2=True.
+
+    Returns:
+        ClientPool: The new default pool.
+    """
+    global _default_pool
+    with _default_lock:
+        _default_pool = ClientPool(settings, **options)
+        return _default_pool
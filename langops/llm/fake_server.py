@@ -0,0 +1,384 @@
+"""
+Local stand-in for the OpenAI API, for benchmarks and load tests that must not spend
+API quota.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
+from langops.llm.client_pool import ClientPool, PoolSettings, httpx
+from langops.llm.tokens import content_text, token_counter
+
+# Draws a delay in seconds from the server's random generator.
+LatencyFn = Callable[[random.Random], float]
+Responder = Callable[[Mapping[str, Any]], str]
+
+_WORDS = re.compile(r"\s*\S+")
+
+
+class Latency:
+    """Latency distributions for FakeLLMServer."""
+
+    @staticmethod
+    def constant(seconds: float) -> LatencyFn:
+        return lambda rng: seconds
+
+    @staticmethod
+    def uniform(low: float, high: float) -> LatencyFn:
+        return lambda rng: rng.uniform(low, high)
+
+    @staticmethod
+    def lognormal(median: float, sigma: float = 0.5) -> LatencyFn:
+        """Long-tailed latency, typical of LLM APIs: half the draws exceed `median`."""
+        return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+
+def _latency(value: Union[float, LatencyFn]) -> LatencyFn:
+    return value if callable(value) else Latency.constant(float(value))
+
+
+def prompt_text(request: Mapping[str, Any]) -> str:
+    """
+    Returns the prompt of a chat or completions request body as text.
+
+    Args:
+        request (Mapping[str, Any]): The JSON body of the request.
+
+    Returns:
+        str: The message contents, or the completion prompt.
+    """
+    if "messages" in request:
+        return "\n".join(content_text(m.get("content")) for m in request["messages"])
+    prompt = request.get("prompt", "")
+    return "\n".join(prompt) if isinstance(prompt, list) else str(prompt)
+
+
+def echo_responder(request: Mapping[str, Any]) -> str:
+    """
+    Default responder: a deterministic reply quoting the start of the last message.
+
+    Args:
+        request (Mapping[str, Any]): The JSON body of the request.
+
+    Returns:
+        str: The same text for the same request, streamed or not.
+    """
+    # Streaming options do not change the reply, so streams match plain completions.
+    fields = {k: v for k, v in request.items() if k not in ("stream", "stream_options")}
+    digest = hashlib.sha256(
+        json.dumps(fields, sort_keys=True, default=str).encode()
+    ).hexdigest()[:8]
+    if request.get("messages"):
+        last = content_text(request["messages"][-1].get("content"))
+    else:
+        last = prompt_text(request)
+    quote = " ".join(last.split()[:30])
+    return f"[{digest}] Response to: {quote}"
+
+
+@dataclass
+class _Reply:
+    status: int
+    body: Dict[str, Any]
+    delay: float
+    headers: Dict[str, str]
+    chunks: Optional[List[bytes]] = None
+    chunk_delays: Optional[List[float]] = None
+
+
+class FakeLLMServer(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    OpenAI-compatible fake of the chat completions and completions endpoints.
+
+    It answers in-process as an HTTP transport (see `client_pool`), or over HTTP on a
+    local port (see `serve`). Responses are deterministic: the text comes from
+    `responder`, and usage is counted with the local token estimator. Latency, server
+    errors and rate limiting are simulated with a seeded random generator. Injected
+    errors therefore follow the configured rates, but under concurrency the requests
+    they hit depend on scheduling.
+
+    Attributes:
+        requests (int): Requests received.
+        errors (int): Requests answered with an injected 500.
+        throttled (int): Requests answered with a 429.
+        in_flight (int): Requests being answered.
+        peak_concurrency (int): Highest number of concurrent requests.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: Union[float, LatencyFn] = 0.0,
+        chunk_latency: Union[float, LatencyFn] = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        max_concurrency: Optional[int] = None,
+        retry_after: float = 1.0,
+        responder: Responder = echo_responder,
+        seed: int = 0,
+    ) -> None:
+        """
+        Args:
+            latency (Union[float, LatencyFn]): Delay before the response headers, in
+                seconds or drawn from a distribution (see Latency). Defaults to 0.
+            chunk_latency (Union[float, LatencyFn]): Delay between the chunks of a
+                streamed response. Defaults to 0.
+            error_rate (float): Share of requests answered with a 500. Defaults to 0.
+            rate_limit_rate (float): Share of requests answered with a 429. Defaults
+                to 0.
+            max_concurrency (Optional[int]): Requests beyond this many concurrent ones
+                are answered with a 429. Defaults to None (unlimited).
+            retry_after (float): Seconds advertised by the `retry-after-ms` header of
+                429 responses. Defaults to 1.
+            responder (Responder): Returns the completion text of a request body.
+                Defaults to echo_responder.
+            seed (int): Seed of the random generator. Defaults to 0.
+        """
+        self.latency = _latency(latency)
+        self.chunk_latency = _latency(chunk_latency)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_concurrency = max_concurrency
+        self.retry_after = retry_after
+        self.responder = responder
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self.peak_concurrency = 0
+
+    def client_pool(
+        self, settings: Optional[PoolSettings] = None, **options: Any
+    ) -> ClientPool:
+        """
+        Returns a ClientPool whose clients send every request to this server, e.g.
+        `OpenAILLM(api_key="fake", client_pool=server.client_pool())`.
+
+        Args:
+            settings (Optional[PoolSettings]): Connection settings.
+            **options: Overrides of individual settings.
+
+        Returns:
+            ClientPool: A pool answering locally.
+        """
+        return ClientPool(settings, wrap_transport=lambda _: self, **options)
+
+    def _error(self, status: int, message: str, kind: str) -> _Reply:
+        headers = {}
+        if status == 429:
+            headers["retry-after-ms"] = str(int(self.retry_after * 1000))
+        body = {"error": {"message": message, "type": kind, "code": kind}}
+        return _Reply(status, body, 0.0, headers)
+
+    def _begin(self, request: Any, body: bytes) -> _Reply:
+        """Counts the request and decides its reply."""
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_concurrency = max(self.peak_concurrency, self.in_flight)
+            n = self.requests
+            delay = max(0.0, self.latency(self._rng))
+            draw = self._rng.random()
+            if (
+                self.max_concurrency is not None
+                and self.in_flight > self.max_concurrency
+            ):
+                self.throttled += 1
+                reply = self._error(429, "Too many concurrent requests", "rate_limit")
+            elif draw < self.rate_limit_rate:
+                self.throttled += 1
+                reply = self._error(429, "Rate limit reached", "rate_limit")
+            elif draw < self.rate_limit_rate + self.error_rate:
+                self.errors += 1
+                reply = self._error(500, "Injected server error", "server_error")
+            else:
+                reply = None
+        if reply is not None:
+            # Rate limits are answered immediately, like the real API does.
+            reply.delay = 0.0 if reply.status == 429 else delay
+            return reply
+        path = request.url.path
+        if request.method != "POST" or not path.endswith("completions"):
+            return _Reply(
+                404, {"error": {"message": f"Unknown endpoint {path}"}}, 0.0, {}
+            )
+        payload = json.loads(body or b"{}")
+        reply = self._complete(payload, path.endswith("/chat/completions"), n)
+        reply.delay = delay
+        return reply
+
+    def _end(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _complete(self, payload: Mapping[str, Any], chat: bool, n: int) -> _Reply:
+        model = str(payload.get("model", "fake"))
+        text = self.responder(payload)
+        counter = token_counter(model)
+        prompt = payload.get("messages") if chat else prompt_text(payload)
+        usage = {
+            "prompt_tokens": counter.count_prompt(prompt),
+            "completion_tokens": counter.count(text),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        base = {
+            "id": f"{'chatcmpl' if chat else 'cmpl'}-fake-{n}",
+            "created": int(time.time()),
+            "model": model,
+        }
+        if not payload.get("stream"):
+            if chat:
+                message = {"role": "assistant", "content": text}
+                choice = {"index": 0, "finish_reason": "stop", "message": message}
+                body = {**base, "object": "chat.completion", "choices": [choice]}
+            else:
+                choice = {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "text": text,
+                    "logprobs": None,
+                }
+                body = {**base, "object": "text_completion", "choices": [choice]}
+            return _Reply(200, {**body, "usage": usage}, 0.0, {})
+        events: List[Dict[str, Any]] = []
+        for i, piece in enumerate(_WORDS.findall(text)):
+            if chat:
+                delta: Dict[str, Any] = {"content": piece}
+                if i == 0:
+                    delta["role"] = "assistant"
+                choice = {"index": 0, "delta": delta, "finish_reason": None}
+            else:
+                choice = {"index": 0, "text": piece, "finish_reason": None}
+            events.append({"choices": [choice]})
+        last: Dict[str, Any] = {"index": 0, "finish_reason": "stop"}
+        if chat:
+            last["delta"] = {}
+        else:
+            last.update(text="", logprobs=None)
+        events.append({"choices": [last]})
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            events.append({"choices": [], "usage": usage})
+        kind = "chat.completion.chunk" if chat else "text_completion"
+        chunks = [
+            f"data: {json.dumps({**base, 'object': kind, **event})}\n\n".encode()
+            for event in events
+        ] + [b"data: [DONE]\n\n"]
+        with self._lock:
+            delays = [max(0.0, self.chunk_latency(self._rng)) for _ in chunks]
+        headers = {"content-type": "text/event-stream"}
+        return _Reply(200, {}, 0.0, headers, chunks, delays)
+
+    def handle_request(self, request: Any) -> Any:
+        reply = self._begin(request, request.read())
+        try:
+            time.sleep(reply.delay)
+        finally:
+            self._end()
+        if reply.chunks is None:
+            return httpx.Response(reply.status, headers=reply.headers, json=reply.body)
+
+        def stream() -> Iterator[bytes]:
+            for chunk, delay in zip(reply.chunks or [], reply.chunk_delays or []):
+                time.sleep(delay)
+                yield chunk
+
+        return httpx.Response(reply.status, headers=reply.headers, content=stream())
+
+    async def handle_async_request(self, request: Any) -> Any:
+        reply = self._begin(request, await request.aread())
+        try:
+            await asyncio.sleep(reply.delay)
+        finally:
+            self._end()
+        if reply.chunks is None:
+            return httpx.Response(reply.status, headers=reply.headers, json=reply.body)
+
+        async def stream() -> AsyncIterator[bytes]:
+            for chunk, delay in zip(reply.chunks or [], reply.chunk_delays or []):
+                await asyncio.sleep(delay)
+                yield chunk
+
+        return httpx.Response(reply.status, headers=reply.headers, content=stream())
+
+    @contextlib.contextmanager
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+        """
+        Serves the fake API over HTTP in a background thread, for clients and load
+        generators running outside this process.
+
+        Args:
+            host (str): Interface to listen on. Defaults to 127.0.0.1.
+            port (int): Port to listen on, 0 for a free one. Defaults to 0.
+
+        Yields:
+            str: The base URL of the API, e.g. http://127.0.0.1:8123/v1.
+        """
+        server = ThreadingHTTPServer((host, port), _handler(self))
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://{host}:{server.server_address[1]}/v1"
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+def _handler(fake: FakeLLMServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = httpx.Request(
+                self.command,
+                f"http://{self.headers.get('Host', 'localhost')}{self.path}",
+                headers=dict(self.headers),
+                content=self.rfile.read(length),
+            )
+            response = fake.handle_request(request)
+            self.send_response(response.status_code)
+            for name, value in response.headers.items():
+                if name.lower() not in ("content-length", "transfer-encoding"):
+                    self.send_header(name, value)
+            if "content-length" in response.headers:
+                body = response.read()
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in response.iter_raw():
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        do_GET = do_POST = _respond
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
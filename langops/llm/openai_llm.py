@@ -1,13 +1,38 @@
-from langops.core.base_llm import BaseLLM
+from langops.core.base_llm import BaseLLM, run_sync
+from langops.core.metrics import LLMMetrics
+from langops.core.streaming import AsyncLLMStream, LLMStream, StreamEvent
 from langops.core.types import LLMResponse
+from langops.llm.client_pool import ClientPool, default_client_pool
+from langops.llm.rate_limit import RateLimiter, parse_duration
 from langops.llm.registry import LLMRegistry
+from langops.llm.response_cache import ResponseCache
+from langops.llm.single_flight import SingleFlight
+from langops.llm.tokens import (
+    ContextOverflowError,
+    TokenCounter,
+    completion_reserve,
+    context_window,
+    fit_prompt,
+    token_counter,
+)
 
 import openai
 from openai.types.chat import (
     ChatCompletionMessageParam,
     ChatCompletionUserMessageParam,
 )
-from typing import Optional, List, Any, Dict, cast
+from typing import (
+    Optional,
+    List,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    Mapping,
+    Sequence,
+    Tuple,
+    cast,
+)
 
 
 @LLMRegistry.register(name="openai")
@@ -17,30 +42,103 @@ class OpenAILLM(BaseLLM):
 
     This class supports both synchronous and asynchronous completions using
     OpenAI's Client and AsyncClient. It automatically routes requests to the
-    correct endpoint based on the model type and prompt format.
+    correct endpoint based on the model type and prompt format. The clients come from
+    a ClientPool, created on first use and shared by every instance with the same API
+    key and base URL; assigning `client` or `async_client` overrides them.
 
     Attributes:
         CHAT_MODELS (set): A set of model names that support chat completions.
         api_key (str): The API key for authenticating with OpenAI.
         model (str): The model name to use for completions.
+        base_url (Optional[str]): The API base URL, None for OpenAI's.
+        client_pool (ClientPool): Pool providing the HTTP clients.
         client (Client): The synchronous OpenAI client.
         async_client (AsyncClient): The asynchronous OpenAI client.
+        response_cache (Optional[ResponseCache]): Cache of responses, None to disable.
+        rate_limiter (Optional[RateLimiter]): Limits of the bulk completions.
+        context_policy (Optional[str]): Pre-flight context check: None, 'error' or 'trim'.
+        single_flight (Optional[SingleFlight]): Coalescing of concurrent identical requests.
+        metrics (Optional[LLMMetrics]): Registry recording the calls of this client.
     """
 
     CHAT_MODELS = {"gpt-3.5-turbo", "gpt-4", "gpt-4-turbo", "gpt-3.5-turbo-instruct"}
 
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        context_policy: Optional[str] = None,
+        single_flight: Optional[SingleFlight] = None,
+        base_url: Optional[str] = None,
+        client_pool: Optional[ClientPool] = None,
+        metrics: Optional[LLMMetrics] = None,
+    ):
         """
         Initializes the OpenAILLM instance.
 
         Args:
             api_key (Optional[str]): The API key for OpenAI. Defaults to None.
             model (Optional[str]): The model name to use. Defaults to None.
+            response_cache (Optional[ResponseCache]): Cache of responses, keyed on the
+                model, the prepared messages and the call arguments. Defaults to None.
+            rate_limiter (Optional[RateLimiter]): Concurrency, requests-per-minute and
+                tokens-per-minute limits shared by `complete_many` and
+                `acomplete_many`. Defaults to None.
+            context_policy (Optional[str]): Checks that prompts fit the context window
+                of the model before sending them: 'error' raises ContextOverflowError,
+                'trim' drops old messages and truncates long contents to fit. None
+                sends prompts unchecked. Defaults to None.
+            single_flight (Optional[SingleFlight]): Makes concurrent identical requests
+                (same model, messages and arguments) share one API call. Can be shared
+                by several clients. Defaults to None.
+            base_url (Optional[str]): The API base URL, e.g. of an OpenAI-compatible
+                server. Defaults to None (OpenAI).
+            client_pool (Optional[ClientPool]): Pool providing the HTTP clients.
+                Defaults to the process-wide pool (see `configure_client_pool`).
+            metrics (Optional[LLMMetrics]): Registry recording latency, tokens, errors
+                and cache outcomes of the calls. Defaults to None (the process-wide
+                registry of `enable_metrics`, if enabled).
+
+        Raises:
+            ValueError: If context_policy is not None, 'error' or 'trim'.
         """
+        if context_policy not in (None, "error", "trim"):
+            raise ValueError("context_policy must be None, 'error' or 'trim'")
         self.api_key = api_key or openai.api_key
         self.model = model or self.default_model()
-        self.client = openai.Client(api_key=self.api_key)
-        self.async_client = openai.AsyncClient(api_key=self.api_key)
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter
+        self.context_policy = context_policy
+        self.single_flight = single_flight
+        self.base_url = base_url
+        self.client_pool = client_pool or default_client_pool()
+        self.metrics = metrics
+        self._client: Optional[openai.Client] = None
+        self._async_client: Optional[openai.AsyncClient] = None
+
+    @property
+    def client(self) -> openai.Client:
+        """The synchronous client, the pooled one unless overridden."""
+        if self._client is not None:
+            return self._client
+        return self.client_pool.client(self.api_key, self.base_url)
+
+    @client.setter
+    def client(self, client: openai.Client) -> None:
+        self._client = client
+
+    @property
+    def async_client(self) -> openai.AsyncClient:
+        """The asynchronous client, the pooled one unless overridden."""
+        if self._async_client is not None:
+            return self._async_client
+        return self.client_pool.async_client(self.api_key, self.base_url)
+
+    @async_client.setter
+    def async_client(self, client: openai.AsyncClient) -> None:
+        self._async_client = client
 
     def _is_chat_model(self, model_name: Optional[str] = None) -> bool:
         """
@@ -85,6 +183,76 @@ class OpenAILLM(BaseLLM):
                 )
             return prompt
 
+    @property
+    def token_counter(self) -> TokenCounter:
+        """The shared token counter of the model."""
+        return token_counter(self.model)
+
+    @property
+    def context_window(self) -> Optional[int]:
+        """The context window of the model in tokens, None if unknown."""
+        return context_window(self.model)
+
+    def count_tokens(self, prompt: str | List[ChatCompletionMessageParam]) -> int:
+        """
+        Estimates the prompt tokens of a request, as sent to the model.
+
+        Args:
+            prompt (str | List[ChatCompletionMessageParam]): The input prompt.
+
+        Returns:
+            int: The estimated token count.
+        """
+        return self.token_counter.count_prompt(self._prepare_messages(prompt))
+
+    def fit_to_context(
+        self,
+        prompt: str | List[ChatCompletionMessageParam],
+        trim: bool = True,
+        **kwargs: Any,
+    ) -> List[ChatCompletionMessageParam] | str:
+        """
+        Prepares a prompt and checks that it fits the context window of the model,
+        leaving room for the completion (`max_tokens`, `max_completion_tokens` or
+        DEFAULT_COMPLETION_RESERVE).
+
+        Args:
+            prompt (str | List[ChatCompletionMessageParam]): The input prompt.
+            trim (bool): Trim the prompt to fit instead of raising. Defaults to True.
+            **kwargs: The arguments of the API call.
+
+        Returns:
+            List[ChatCompletionMessageParam] | str: The prepared messages or prompt,
+            trimmed if needed. Unchanged if the model's window is unknown.
+
+        Raises:
+            ContextOverflowError: If the prompt does not fit and `trim` is False, or
+                cannot be trimmed enough.
+        """
+        messages_or_prompt = self._prepare_messages(prompt)
+        window = self.context_window
+        if window is None:
+            return messages_or_prompt
+        budget = window - completion_reserve(kwargs)
+        counter = self.token_counter
+        tokens = counter.count_prompt(messages_or_prompt)
+        if tokens <= budget:
+            return messages_or_prompt
+        if not trim:
+            raise ContextOverflowError(tokens, budget, self.model)
+        return cast(
+            List[ChatCompletionMessageParam] | str,
+            fit_prompt(messages_or_prompt, budget, counter),
+        )
+
+    def _request_messages(
+        self, prompt: str | List[ChatCompletionMessageParam], kwargs: Dict[str, Any]
+    ) -> List[ChatCompletionMessageParam] | str:
+        """Prepares the messages of a request, applying `context_policy`."""
+        if self.context_policy is None:
+            return self._prepare_messages(prompt)
+        return self.fit_to_context(prompt, trim=self.context_policy == "trim", **kwargs)
+
     def _extract_text_from_response(self, response: Any) -> str:
         """
         Extracts text content from an OpenAI API response.
@@ -135,6 +303,26 @@ class OpenAILLM(BaseLLM):
             "usage": getattr(response, "usage", None),
         }
 
+    def cache_request(
+        self, prompt: str | List[ChatCompletionMessageParam], **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Describes a request for the response cache key, using the prepared messages.
+
+        Args:
+            prompt (str | List[ChatCompletionMessageParam]): The input prompt.
+            **kwargs: Additional arguments for the API call.
+
+        Returns:
+            Dict[str, Any]: JSON-serializable description of the request.
+        """
+        return {
+            "provider": "openai",
+            "model": self.model,
+            "messages": self._prepare_messages(prompt),
+            "params": kwargs,
+        }
+
     def complete(
         self, prompt: str | List[ChatCompletionMessageParam], **kwargs: Any
     ) -> LLMResponse:
@@ -142,7 +330,9 @@ class OpenAILLM(BaseLLM):
         Synchronously generates a completion using OpenAI's API.
 
         Routes the request to the correct endpoint based on the model type
-        and prompt format.
+        and prompt format. Identical requests are answered from `response_cache`,
+        and concurrent identical requests share one call with `single_flight`, when
+        configured.
 
         Args:
             prompt (str | List[ChatCompletionMessageParam]): The input prompt.
@@ -151,23 +341,146 @@ class OpenAILLM(BaseLLM):
         Returns:
             LLMResponse: The structured response from the API.
         """
-        messages_or_prompt = self._prepare_messages(prompt)
+        return self._cached_complete(
+            prompt, kwargs, lambda: self._complete(prompt, **kwargs)
+        )
+
+    def _complete(
+        self, prompt: str | List[ChatCompletionMessageParam], **kwargs: Any
+    ) -> LLMResponse:
+        """Calls the API without the response cache."""
+        response = self._create(self.client, prompt, kwargs)
+        text = self._extract_text_from_response(response)
+        metadata = self._create_metadata(response)
+
+        return LLMResponse(text=str(text or ""), raw=response, metadata=metadata)
+
+    def _create(
+        self,
+        client: Any,
+        prompt: str | List[ChatCompletionMessageParam],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        """
+        Sends a request to the chat or completions endpoint of a client.
+
+        Args:
+            client (Client): The client to send the request with.
+            prompt (str | List[ChatCompletionMessageParam]): The input prompt.
+            kwargs (Dict[str, Any]): Additional arguments for the API call.
+
+        Returns:
+            Any: The API response, or a stream of chunks if `stream` is True.
+        """
+        messages_or_prompt = self._request_messages(prompt, kwargs)
 
         if self._is_chat_model():
-            response = self.client.chat.completions.create(
+            return client.chat.completions.create(
                 model=self.model,
                 messages=cast(List[ChatCompletionMessageParam], messages_or_prompt),
                 **kwargs,
             )
+        return client.completions.create(
+            model=self.model, prompt=cast(str, messages_or_prompt), **kwargs
+        )
+
+    @staticmethod
+    def _stream_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Adds the streaming arguments, requesting usage in the final chunk."""
+        stream_kwargs = {k: v for k, v in kwargs.items() if k != "stream"}
+        stream_kwargs.setdefault("stream_options", {"include_usage": True})
+        stream_kwargs["stream"] = True
+        return stream_kwargs
+
+    def _chunk_event(self, chunk: Any) -> StreamEvent:
+        """
+        Converts a streamed chunk into a text delta and metadata.
+
+        Args:
+            chunk (Any): A ChatCompletionChunk or streamed Completion.
+
+        Returns:
+            StreamEvent: The text delta and the metadata carried by the chunk.
+        """
+        metadata: Dict[str, Any] = {
+            "id": getattr(chunk, "id", None),
+            "object": getattr(chunk, "object", None),
+            "created": getattr(chunk, "created", None),
+        }
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            metadata["usage"] = usage
+        choices = getattr(chunk, "choices", None)
+        if not choices:
+            return "", metadata
+        choice = choices[0]
+        if getattr(choice, "finish_reason", None):
+            metadata["finish_reason"] = choice.finish_reason
+        if self._is_chat_model():
+            delta = getattr(choice, "delta", None)
+            text = getattr(delta, "content", None) if delta is not None else None
         else:
-            response = self.client.completions.create(
-                model=self.model, prompt=cast(str, messages_or_prompt), **kwargs
-            )
+            text = getattr(choice, "text", None)
+        return str(text or ""), metadata
 
-        text = self._extract_text_from_response(response)
-        metadata = self._create_metadata(response)
+    def stream(
+        self, prompt: str | List[ChatCompletionMessageParam], **kwargs: Any
+    ) -> LLMStream:
+        """
+        Streams a completion from the chat or completions endpoint.
 
-        return LLMResponse(text=str(text or ""), raw=response, metadata=metadata)
+        The request is sent when iteration starts. The aggregated response carries the
+        usage reported in the final chunk, the finish reason, `time_to_first_token` and
+        `total_time`. Closing the stream closes the HTTP response. Streams bypass
+        `response_cache`.
+
+        Args:
+            prompt (str | List[ChatCompletionMessageParam]): The input prompt.
+            **kwargs: Additional arguments for the API call.
+
+        Returns:
+            LLMStream: Iterator of text deltas.
+        """
+
+        def events() -> Iterator[StreamEvent]:
+            chunks = self._create(self.client, prompt, self._stream_kwargs(kwargs))
+            try:
+                for chunk in chunks:
+                    yield self._chunk_event(chunk)
+            finally:
+                chunks.close()
+
+        return LLMStream(events(), self._create_metadata(None), self._stream_observer())
+
+    def astream(
+        self, prompt: str | List[ChatCompletionMessageParam], **kwargs: Any
+    ) -> AsyncLLMStream:
+        """
+        Asynchronously streams a completion from the chat or completions endpoint.
+
+        Cancelling the consuming task or closing the stream closes the HTTP response.
+
+        Args:
+            prompt (str | List[ChatCompletionMessageParam]): The input prompt.
+            **kwargs: Additional arguments for the API call.
+
+        Returns:
+            AsyncLLMStream: Async iterator of text deltas.
+        """
+
+        async def events() -> AsyncIterator[StreamEvent]:
+            chunks = await self._acreate(
+                self.async_client, prompt, self._stream_kwargs(kwargs)
+            )
+            try:
+                async for chunk in chunks:
+                    yield self._chunk_event(chunk)
+            finally:
+                await chunks.close()
+
+        return AsyncLLMStream(
+            events(), self._create_metadata(None), self._stream_observer()
+        )
 
     async def acomplete(
         self, prompt: str | List[ChatCompletionMessageParam], **kwargs: Any
@@ -176,7 +489,9 @@ class OpenAILLM(BaseLLM):
         Asynchronously generates a completion using OpenAI's API.
 
         Routes the request to the correct endpoint based on the model type
-        and prompt format.
+        and prompt format. Identical requests are answered from `response_cache`,
+        and concurrent identical requests share one call with `single_flight`, when
+        configured.
 
         Args:
             prompt (str | List[ChatCompletionMessageParam]): The input prompt.
@@ -185,23 +500,143 @@ class OpenAILLM(BaseLLM):
         Returns:
             LLMResponse: The structured response from the API.
         """
-        messages_or_prompt = self._prepare_messages(prompt)
+        return await self._cached_acomplete(
+            prompt, kwargs, lambda: self._acomplete(prompt, **kwargs)
+        )
 
-        if self._is_chat_model():
-            response = await self.async_client.chat.completions.create(
+    async def _acomplete(
+        self, prompt: str | List[ChatCompletionMessageParam], **kwargs: Any
+    ) -> LLMResponse:
+        """Calls the API without the response cache."""
+        response = await self._acreate(self.async_client, prompt, kwargs)
+        text = self._extract_text_from_response(response)
+        metadata = self._create_metadata(response)
+
+        return LLMResponse(text=str(text or ""), raw=response, metadata=metadata)
+
+    async def _acreate(
+        self,
+        client: Any,
+        prompt: str | List[ChatCompletionMessageParam],
+        kwargs: Dict[str, Any],
+        raw_response: bool = False,
+    ) -> Any:
+        """
+        Sends a request to the chat or completions endpoint of an async client.
+
+        Args:
+            client (AsyncClient): The client to send the request with.
+            prompt (str | List[ChatCompletionMessageParam]): The input prompt.
+            kwargs (Dict[str, Any]): Additional arguments for the API call.
+            raw_response (bool): Return the raw HTTP response, which carries the headers.
+
+        Returns:
+            Any: The API response, or the raw response if `raw_response` is True.
+        """
+        messages_or_prompt = self._request_messages(prompt, kwargs)
+        chat = self._is_chat_model()
+        endpoint = client.chat.completions if chat else client.completions
+        if raw_response:
+            endpoint = endpoint.with_raw_response
+
+        if chat:
+            return await endpoint.create(
                 model=self.model,
                 messages=cast(List[ChatCompletionMessageParam], messages_or_prompt),
                 **kwargs,
             )
-        else:
-            response = await self.async_client.completions.create(
-                model=self.model, prompt=cast(str, messages_or_prompt), **kwargs
-            )
+        return await endpoint.create(
+            model=self.model, prompt=cast(str, messages_or_prompt), **kwargs
+        )
 
+    async def _abulk_request(
+        self, prompt: Any, kwargs: Dict[str, Any], client: Any
+    ) -> Tuple[LLMResponse, Mapping[str, str]]:
+        """
+        Sends one request of a bulk completion on the shared async client.
+
+        The client's own retries are disabled so that the rate limiter sees every 429
+        and the rate-limit headers of each response.
+
+        Args:
+            prompt (Any): The input prompt.
+            kwargs (Dict[str, Any]): Additional arguments for the API call.
+            client (Optional[AsyncClient]): Client of the batch; `async_client` if None.
+
+        Returns:
+            Tuple[LLMResponse, Mapping[str, str]]: The response and its headers.
+        """
+        client = (client or self.async_client).with_options(max_retries=0)
+        raw = await self._acreate(client, prompt, kwargs, raw_response=True)
+        response = raw.parse()
         text = self._extract_text_from_response(response)
         metadata = self._create_metadata(response)
+        return (
+            LLMResponse(text=str(text or ""), raw=response, metadata=metadata),
+            raw.headers,
+        )
 
-        return LLMResponse(text=str(text or ""), raw=response, metadata=metadata)
+    def _throttle_delay(self, error: BaseException) -> Optional[float]:
+        """
+        Classifies 429 responses as rate limits, reading `retry-after-ms` and
+        `retry-after`.
+
+        Args:
+            error (BaseException): The error raised by a request.
+
+        Returns:
+            Optional[float]: None for other errors, otherwise the requested delay in
+            seconds (0 if the response did not include one).
+        """
+        if not isinstance(error, openai.RateLimitError):
+            return None
+        headers = error.response.headers
+        retry_after_ms = parse_duration(headers.get("retry-after-ms"))
+        if retry_after_ms is not None:
+            return retry_after_ms / 1000
+        return parse_duration(headers.get("retry-after")) or 0.0
+
+    def complete_many(
+        self,
+        prompts: Sequence[Any],
+        *,
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> List[LLMResponse | Exception]:
+        """
+        Completes many prompts concurrently and returns the results in prompt order.
+
+        The batch runs in its own event loop on an `AsyncClient` shared by all of its
+        requests and closed afterwards, since async connections cannot outlive the loop.
+
+        Args:
+            prompts (Sequence[Any]): The input prompts.
+            max_concurrency (int): Concurrency limit when no `rate_limiter` is set.
+            return_exceptions (bool): Return errors as results instead of raising the first
+                one.
+            **kwargs: Additional arguments for every call.
+
+        Returns:
+            List[LLMResponse | Exception]: One result per prompt, in order.
+
+        Raises:
+            RuntimeError: If called from a running event loop.
+        """
+
+        async def run() -> List[LLMResponse | Exception]:
+            async with self.client_pool.new_async_client(
+                self.api_key, self.base_url
+            ) as client:
+                return await self.acomplete_many(
+                    prompts,
+                    max_concurrency=max_concurrency,
+                    return_exceptions=return_exceptions,
+                    client=client,
+                    **kwargs,
+                )
+
+        return run_sync(run())
 
     @classmethod
     def default_model(cls) -> str:
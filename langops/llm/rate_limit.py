@@ -0,0 +1,402 @@
+import asyncio
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from langops.core.types import LLMResponse
+
+# A throttle classifier returns None for errors that are not rate limits, otherwise the
+# delay requested by the provider in seconds (0 when it did not say).
+ThrottleDelay = Callable[[BaseException], Optional[float]]
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parses the durations used by rate-limit headers ('20ms', '1.5s', '6m0s', '30').
+
+    Args:
+        value (Optional[str]): The header value.
+
+    Returns:
+        Optional[float]: The duration in seconds, or None if it cannot be parsed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `per_minute` tokens per minute.
+
+    The bucket holds at most one minute of budget. A request larger than the capacity is
+    admitted once the bucket is full and leaves it in debt, so that oversized requests
+    are delayed rather than rejected.
+
+    Args:
+        per_minute (float): Budget per minute, e.g. requests or tokens.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        Waits until `amount` tokens are available and takes them.
+
+        Args:
+            amount (float): Tokens to take.
+        """
+        while True:
+            self._refill()
+            needed = min(amount, self.capacity)
+            if self.tokens >= needed:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((needed - self.tokens) / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """
+        Takes (positive) or returns (negative) tokens after the fact, e.g. to reconcile an
+        estimate with the usage reported by the provider.
+
+        Args:
+            amount (float): Tokens to take; negative values refund tokens.
+        """
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease controller of the concurrency limit.
+
+    Each success raises the limit by `increase / limit`, i.e. by about `increase` per
+    window of `limit` requests. A throttle multiplies it by `decrease`, at most once per
+    window: throttles of requests started before the last decrease are ignored, so a
+    burst of 429s from the same window does not collapse the limit.
+
+    Attributes:
+        limit (float): The current concurrency limit.
+    """
+
+    def __init__(
+        self,
+        initial: float,
+        minimum: float = 1.0,
+        maximum: Optional[float] = None,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+    ) -> None:
+        """
+        Args:
+            initial (float): Initial concurrency limit.
+            minimum (float): Lowest limit after decreases.
+            maximum (Optional[float]): Highest limit after increases. Defaults to initial.
+            increase (float): Additive increase per window of successful requests.
+            decrease (float): Multiplicative decrease factor on throttles, in (0, 1).
+
+        Raises:
+            ValueError: If the parameters are out of range.
+        """
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        if minimum < 1 or initial < minimum:
+            raise ValueError("limits must satisfy 1 <= minimum <= initial")
+        self.minimum = minimum
+        self.maximum = maximum if maximum is not None else initial
+        self.increase = increase
+        self.decrease = decrease
+        self.limit = float(initial)
+        self._decreased_at = float("-inf")
+
+    def on_success(self) -> None:
+        """Raises the limit after a successful request."""
+        self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+
+    def on_throttle(self, started_at: float) -> bool:
+        """
+        Lowers the limit after a throttled request.
+
+        Args:
+            started_at (float): `time.monotonic()` when the throttled request started.
+
+        Returns:
+            bool: Whether the limit was lowered.
+        """
+        if started_at < self._decreased_at:
+            return False
+        self.limit = max(self.minimum, self.limit * self.decrease)
+        self._decreased_at = time.monotonic()
+        return True
+
+
+@dataclass
+class RateLimitStats:
+    """
+    Counters of a RateLimiter.
+
+    Attributes:
+        requests (int): Requests sent, including retries.
+        throttled (int): Requests rejected with a rate limit.
+        retries (int): Retries after a rate limit.
+        waited_seconds (float): Time spent waiting for the limits before sending.
+    """
+
+    requests: int = 0
+    throttled: int = 0
+    retries: int = 0
+    waited_seconds: float = 0.0
+
+
+class RateLimiter:
+    """
+    Client-side limits for bulk LLM requests: an adaptive concurrency limit (AIMD), and
+    optional token buckets on requests per minute and tokens per minute.
+
+    Rate limits reported by the provider (429 responses, `retry-after` and
+    `x-ratelimit-*` headers) pause every request of the limiter until the advertised
+    reset, lower the concurrency limit, and are retried with exponential backoff. The
+    limit ramps back up as requests succeed.
+
+    A limiter can be shared by successive batches of the same client; it is driven by
+    one event loop at a time.
+
+    Attributes:
+        controller (AIMDController): The concurrency controller.
+        requests (Optional[TokenBucket]): Requests-per-minute bucket.
+        tokens (Optional[TokenBucket]): Tokens-per-minute bucket.
+        max_retries (int): Retries of a throttled request before the error is raised.
+        stats (RateLimitStats): Request, throttle and wait counters.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        min_concurrency: int = 1,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            max_concurrency (int): Upper bound of concurrent requests.
+            requests_per_minute (Optional[float]): Request budget, None for unlimited.
+            tokens_per_minute (Optional[float]): Token budget, None for unlimited.
+            min_concurrency (int): Lower bound of the adaptive concurrency limit.
+            max_retries (int): Retries of a throttled request.
+            backoff (float): First retry delay in seconds when the provider gives none.
+            max_backoff (float): Upper bound of retry delays.
+        """
+        self.controller = AIMDController(
+            initial=max_concurrency, minimum=min_concurrency
+        )
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = RateLimitStats()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+    @property
+    def concurrency(self) -> int:
+        """The current number of concurrent requests allowed."""
+        return max(1, int(self.controller.limit))
+
+    def _wake(self) -> None:
+        free = self.concurrency - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def _acquire_slot(self) -> None:
+        while self._in_flight >= self.concurrency:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass the wake-up on if this waiter was woken and cancelled.
+                self._wake()
+                raise
+        self._in_flight += 1
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    async def acquire(self, tokens: float = 0) -> None:
+        """
+        Waits for a concurrency slot, the end of any pause and the per-minute budgets.
+
+        Args:
+            tokens (float): Estimated tokens of the request.
+        """
+        start = time.monotonic()
+        await self._acquire_slot()
+        try:
+            while (delay := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            if self.requests is not None:
+                await self.requests.acquire(1)
+            if self.tokens is not None and tokens:
+                await self.tokens.acquire(tokens)
+        except BaseException:
+            self._release_slot()
+            raise
+        self.stats.waited_seconds += time.monotonic() - start
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds every request of the limiter for `seconds`.
+
+        Args:
+            seconds (float): Pause duration.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def on_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Pauses until the advertised reset when a rate-limit header reports an exhausted
+        budget.
+
+        Args:
+            headers (Mapping[str, str]): Response headers.
+        """
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is None:
+                continue
+            try:
+                exhausted = float(remaining) <= 0
+            except ValueError:
+                continue
+            if exhausted:
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                self.pause(reset if reset is not None else self.backoff)
+
+    def _backoff(self, attempt: int, advertised: Optional[float]) -> float:
+        if advertised:
+            return min(advertised, self.max_backoff)
+        delay = min(self.max_backoff, self.backoff * 2.0**attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def call(
+        self,
+        request: Callable[[], Awaitable[Tuple[LLMResponse, Mapping[str, str]]]],
+        tokens: float,
+        throttle_delay: ThrottleDelay,
+    ) -> LLMResponse:
+        """
+        Sends a request within the limits, retrying it when it is throttled.
+
+        The response metadata gets the seconds spent waiting for the limits
+        ("queue_time", including backoff) and the retries after rate limits ("retries").
+
+        Args:
+            request (Callable): Sends the request, returning the response and its headers.
+            tokens (float): Estimated tokens of the request.
+            throttle_delay (ThrottleDelay): Classifies errors as rate limits.
+
+        Returns:
+            LLMResponse: The response.
+
+        Raises:
+            Exception: The error of the request, or the rate-limit error once
+                `max_retries` is exhausted.
+        """
+        attempt = 0
+        queued = 0.0
+        while True:
+            waited_at = time.monotonic()
+            await self.acquire(tokens)
+            started_at = time.monotonic()
+            queued += started_at - waited_at
+            self.stats.requests += 1
+            try:
+                response, headers = await request()
+            except Exception as e:
+                self._release_slot()
+                # Failed and throttled requests are not billed: refund the estimate
+                # before backing off, so a retry does not pay for the same request twice.
+                if self.tokens is not None:
+                    self.tokens.adjust(-tokens)
+                delay = throttle_delay(e)
+                if delay is None:
+                    raise
+                self.stats.throttled += 1
+                self.controller.on_throttle(started_at)
+                if attempt >= self.max_retries:
+                    raise
+                self.pause(self._backoff(attempt, delay))
+                attempt += 1
+                self.stats.retries += 1
+                continue
+            except BaseException:
+                self._release_slot()
+                raise
+            self._release_slot()
+            if self.tokens is not None:
+                used = _total_tokens(response)
+                if used is not None:
+                    self.tokens.adjust(used - tokens)
+            self.on_headers(headers)
+            self.controller.on_success()
+            self._wake()
+            response.metadata["queue_time"] = queued
+            response.metadata["retries"] = attempt
+            return response
+
+
+def _total_tokens(response: LLMResponse) -> Optional[int]:
+    usage: Any = response.metadata.get("usage")
+    if usage is None:
+        return None
+    total = (
+        usage.get("total_tokens")
+        if isinstance(usage, Mapping)
+        else getattr(usage, "total_tokens", None)
+    )
+    return total if isinstance(total, int) else None
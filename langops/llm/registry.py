@@ -1,14 +1,23 @@
-from typing import Type, Dict, Optional, Callable, List
+from typing import Type, MutableMapping, Optional, Callable, List
+from langops.core.instance_cache import InstanceCacheMixin
+from langops.core.lazy import LazyRegistry
 
 # LLM registry for langops.llm
 
 
-class LLMRegistry:
+class LLMRegistry(InstanceCacheMixin):
     """
     Registry for LLM subclasses. Allows registration and retrieval of LLMs by name.
     """
 
-    _registry: Dict[str, Type] = {}
+    # Built-in components are imported on first lookup, not when the package is
+    # imported. Plugins from other distributions are listed from the 'langops.llms'
+    # entry-point group and imported when they are looked up.
+    _registry: MutableMapping[str, Type] = LazyRegistry(
+        ("langops.llm.openai_llm",), group="langops.llms"
+    )
+
+    _component_kind = "LLM"
 
     @classmethod
     def register(cls, name: Optional[str] = None) -> Callable[[Type], Type]:
@@ -24,6 +33,7 @@ class LLMRegistry:
 
         def decorator(llm_cls: Type) -> Type:
             key = name or llm_cls.__name__
+            cls._instances.invalidate(key)
             cls._registry[key] = llm_cls
             return llm_cls
 
@@ -0,0 +1,359 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+from langops.core.types import LLMResponse
+
+# Bump when the key derivation or the stored payload changes.
+CACHE_FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    expires_at REAL
+)
+"""
+
+
+def _jsonable(value: Any) -> Any:
+    # Provider objects such as openai's usage models are pydantic models.
+    dump = getattr(value, "model_dump", None)
+    if callable(dump):
+        dumped = dump()
+        if isinstance(dumped, dict):
+            return dumped
+    return repr(value)
+
+
+@dataclass
+class _Entry:
+    text: str
+    metadata: Dict[str, Any]
+    raw: Any
+    latency: float
+    expires_at: Optional[float]
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a ResponseCache.
+
+    Attributes:
+        hits (int): Lookups served from either tier.
+        memory_hits (int): Lookups served from the in-process tier.
+        disk_hits (int): Lookups served from the SQLite tier.
+        misses (int): Lookups that called the provider.
+        saved_seconds (float): Provider latency avoided by hits.
+    """
+
+    hits: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    saved_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the counters as a plain dictionary.
+
+        Returns:
+            Dict[str, Any]: The counters.
+        """
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "saved_seconds": self.saved_seconds,
+        }
+
+
+class ResponseCache:
+    """
+    Two-tier cache of LLM responses: an in-process LRU in front of an optional SQLite
+    database shared by every process pointing at the same file.
+
+    Entries are keyed by a canonical hash of the request (model, prepared messages and
+    sampling parameters), so byte-identical prompts sent by rebuilds, retries or other
+    branches are answered without calling the provider. The disk tier stores the text and
+    metadata of a response (not the provider's raw object), expires entries after `ttl`
+    seconds and evicts least-recently-used entries beyond `max_bytes`. Writes use SQLite
+    transactions in WAL mode, which makes the file safe to share between processes.
+
+    Attributes:
+        maxsize (int): Maximum number of responses kept in memory.
+        path (Optional[str]): SQLite database file of the disk tier, None for memory only.
+        ttl (Optional[float]): Lifetime of an entry in seconds, None for no expiry.
+        max_bytes (int): Approximate upper bound on the size of the disk tier.
+        stats (CacheStats): Hit, miss and latency-saved counters.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        """
+        Args:
+            maxsize (int): Maximum number of responses kept in memory.
+            path (Optional[str]): SQLite database file of the disk tier; its directory
+                is created if missing. None keeps the cache in memory only.
+            ttl (Optional[float]): Lifetime of an entry in seconds, None for no expiry.
+            max_bytes (int): Approximate upper bound on the size of the disk tier.
+
+        Raises:
+            ValueError: If maxsize, ttl or max_bytes is not positive.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive or None")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.maxsize = maxsize
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        if path is not None:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._connection()
+
+    @staticmethod
+    def key(request: Mapping[str, Any]) -> str:
+        """
+        Builds the cache key of a request.
+
+        Args:
+            request (Mapping[str, Any]): JSON-serializable description of the request,
+                e.g. {"model": ..., "messages": ..., "params": ...}.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        canonical = json.dumps(
+            {"v": CACHE_FORMAT_VERSION, **request},
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=_jsonable,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> Any:
+        # sqlite3 connections cannot cross threads or forks: one per thread and process.
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+        if self.path is None:
+            raise RuntimeError("ResponseCache has no disk tier")
+        import sqlite3
+
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(_SCHEMA)
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+    def _from_memory(self, key: str, now: float) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at is not None and entry.expires_at <= now:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry
+
+    def _from_disk(self, key: str, now: float) -> Optional[_Entry]:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT payload, expires_at FROM responses "
+            "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, now),
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            payload = json.loads(row[0])
+            entry = _Entry(
+                text=payload["text"],
+                metadata=payload["metadata"],
+                raw=None,
+                latency=payload["latency"],
+                expires_at=row[1],
+            )
+        except (ValueError, KeyError, TypeError):
+            return None  # corrupt or outdated entry, treated as a miss
+        connection.execute(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+        )
+        return entry
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """
+        Returns the cached response for a key, checking memory first, then disk.
+
+        The returned response is a new object whose metadata has a "cache" entry with
+        the tier that served it, the latency saved and the cache counters. Its "latency"
+        is the seconds the lookup took, not the latency of the original provider call.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[LLMResponse]: The cached response, or None on a miss.
+        """
+        start = time.perf_counter()
+        now = time.time()
+        tier = "memory"
+        entry = self._from_memory(key, now)
+        if entry is None and self.path is not None:
+            entry = self._from_disk(key, now)
+            tier = "disk"
+            if entry is not None:
+                self._remember(key, entry)
+        with self._stats_lock:
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            if tier == "memory":
+                self.stats.memory_hits += 1
+            else:
+                self.stats.disk_hits += 1
+            self.stats.saved_seconds += entry.latency
+            counters = self.stats.as_dict()
+        metadata = dict(entry.metadata)
+        metadata["latency"] = time.perf_counter() - start
+        metadata["cache"] = {
+            "hit": True,
+            "tier": tier,
+            "key": key,
+            "latency_saved": entry.latency,
+            **counters,
+        }
+        return LLMResponse(text=entry.text, raw=entry.raw, metadata=metadata)
+
+    def put(self, key: str, response: LLMResponse, latency: float) -> LLMResponse:
+        """
+        Stores a fresh provider response in both tiers.
+
+        Adds a "cache" entry to the metadata of the response describing the miss.
+
+        Args:
+            key (str): The cache key.
+            response (LLMResponse): The provider response.
+            latency (float): Seconds the provider took to answer.
+
+        Returns:
+            LLMResponse: The same response.
+        """
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        # The provider latency is stored separately and reported as "latency_saved".
+        metadata = {
+            k: v for k, v in response.metadata.items() if k not in ("cache", "latency")
+        }
+        self._remember(
+            key, _Entry(response.text, metadata, response.raw, latency, expires_at)
+        )
+        if self.path is not None:
+            payload = json.dumps(
+                {"text": response.text, "metadata": metadata, "latency": latency},
+                ensure_ascii=False,
+                default=_jsonable,
+            )
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, payload, size, created_at, accessed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now, expires_at),
+            )
+            self._evict(connection, now)
+        with self._stats_lock:
+            counters = self.stats.as_dict()
+        response.metadata["cache"] = {
+            "hit": False,
+            "tier": None,
+            "key": key,
+            "latency_saved": 0.0,
+            **counters,
+        }
+        return response
+
+    def _evict(self, connection: Any, now: float) -> None:
+        connection.execute(
+            "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,),
+        )
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        # Evict down to 90% of the budget so that eviction does not run on every put.
+        excess = total - int(self.max_bytes * 0.9)
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            keys = []
+            for key, size in connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+            ):
+                if excess <= 0:
+                    break
+                keys.append((key,))
+                excess -= size
+            connection.executemany("DELETE FROM responses WHERE key = ?", keys)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def clear(self) -> None:
+        """Drops every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.path is not None:
+            self._connection().execute("DELETE FROM responses")
+
+    def size(self) -> Tuple[int, int]:
+        """
+        Returns the number of entries in each tier.
+
+        Returns:
+            Tuple[int, int]: Entries in memory and on disk.
+        """
+        on_disk = 0
+        if self.path is not None:
+            (on_disk,) = (
+                self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()
+            )
+        return len(self._memory), on_disk
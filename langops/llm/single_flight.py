@@ -0,0 +1,142 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """A synchronous call in progress and its outcome."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncFlight:
+    """An asynchronous call in progress and the number of callers awaiting it."""
+
+    def __init__(self) -> None:
+        self.task: "Optional[asyncio.Task[Any]]" = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller of a key runs the call, and
+    callers arriving while it is in flight wait for it and share its outcome.
+
+    Results and errors are delivered to every caller. In the asynchronous path, the
+    call runs as its own task: a cancelled caller stops waiting without disturbing the
+    others, and the call itself is cancelled only when every caller has been cancelled.
+    Calls are shared between threads in the synchronous path, and between tasks of the
+    same event loop in the asynchronous path. A key is forgotten as soon as its call
+    completes, so later calls run again (combine with a ResponseCache to reuse results).
+
+    Attributes:
+        calls (int): Calls that ran.
+        shared (int): Callers that received the outcome of another caller's call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Tuple[Any, Hashable], _AsyncFlight] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Runs `call`, or waits for the identical call in flight in another thread.
+
+        Args:
+            key (Hashable): Identifies identical calls, e.g. a request hash.
+            call (Callable[[], T]): The call.
+
+        Returns:
+            Tuple[T, bool]: The result, and whether it was shared from another caller.
+
+        Raises:
+            BaseException: The error raised by the call, in every caller.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+        try:
+            flight.result = call()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    async def ado(
+        self, key: Hashable, call: Callable[[], Awaitable[T]]
+    ) -> Tuple[T, bool]:
+        """
+        Asynchronous counterpart of `do`, sharing calls between tasks of the running
+        event loop.
+
+        Args:
+            key (Hashable): Identifies identical calls, e.g. a request hash.
+            call (Callable[[], Awaitable[T]]): The call.
+
+        Returns:
+            Tuple[T, bool]: The result, and whether it was shared from another caller.
+
+        Raises:
+            BaseException: The error raised by the call, in every caller.
+            asyncio.CancelledError: If this caller is cancelled, or the call is.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            flight = self._async_flights.get(flight_key)
+            shared = flight is not None
+            if flight is None:
+                flight = self._async_flights[flight_key] = _AsyncFlight()
+                self.calls += 1
+            else:
+                self.shared += 1
+            flight.waiters += 1
+        if flight.task is None:
+
+            async def run() -> T:
+                try:
+                    return await call()
+                finally:
+                    self._forget(flight_key, flight)
+
+            flight.task = loop.create_task(run())
+        task = flight.task
+        try:
+            # The shield keeps the call running for the other callers if this one is
+            # cancelled.
+            return await asyncio.shield(task), shared
+        except asyncio.CancelledError:
+            if not task.done():
+                flight.waiters -= 1
+                if flight.waiters == 0:
+                    # Nobody needs the result any more; later callers start afresh.
+                    self._forget(flight_key, flight)
+                    task.cancel()
+            raise
+
+    def _forget(self, flight_key: Tuple[Any, Hashable], flight: _AsyncFlight) -> None:
+        with self._lock:
+            if self._async_flights.get(flight_key) is flight:
+                del self._async_flights[flight_key]
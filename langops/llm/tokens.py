@@ -0,0 +1,418 @@
+"""
+Local token estimation and context-window budgeting for LLM prompts.
+"""
+
+import functools
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+# Context windows (prompt + completion tokens) by model name prefix; the longest
+# matching prefix wins, so dated snapshots such as 'gpt-4-0613' resolve to their family.
+CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-3.5-turbo-instruct": 4096,
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-turbo": 128000,
+    "gpt-4-1106": 128000,
+    "gpt-4-0125": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "o1": 200000,
+    "o3": 200000,
+    "o4-mini": 200000,
+    "davinci-002": 16384,
+    "babbage-002": 16384,
+}
+
+# Completion tokens reserved when a call does not set max_tokens.
+DEFAULT_COMPLETION_RESERVE = 1024
+
+# Chat formatting overhead per message, per name field and for priming the reply.
+_TOKENS_PER_MESSAGE = 3
+_TOKENS_PER_NAME = 1
+_REPLY_PRIMING = 3
+
+# Mirrors the pre-tokenization of the OpenAI BPE encodings: words with their leading
+# space or punctuation, digit groups of up to three, punctuation runs and whitespace.
+_PIECES = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)"
+    r"|[^\r\n\w]?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?[^\s\w]+[\r\n]*"
+    r"|\s*[\r\n]+|\s+(?!\S)|\s+"
+    r"|_+"
+)
+
+
+def _piece_cost(piece: str) -> int:
+    # Common words are single tokens; long identifiers, hashes and paths are split
+    # roughly every 8 letters, punctuation every 3 characters.
+    if piece.isspace() or piece[0].isdigit():
+        return 1
+    if piece[-1].isalpha():
+        return 1 + (len(piece) - 1) // 8
+    return 1 + (len(piece) - 1) // 3
+
+
+def _heuristic_pieces(text: str) -> Iterator[Tuple[int, int, int]]:
+    # (start, end, cost) of each piece
+    for match in _PIECES.finditer(text):
+        yield match.start(), match.end(), _piece_cost(match.group())
+
+
+def context_window(model: str) -> Optional[int]:
+    """
+    Returns the context window of a model.
+
+    Args:
+        model (str): The model name, e.g. 'gpt-4' or 'gpt-4-0613'.
+
+    Returns:
+        Optional[int]: The window in tokens, or None if the model is unknown.
+    """
+    model = model.lower()
+    matches = [prefix for prefix in CONTEXT_WINDOWS if model.startswith(prefix)]
+    if not matches:
+        return None
+    return CONTEXT_WINDOWS[max(matches, key=len)]
+
+
+class ContextOverflowError(ValueError):
+    """Raised when a prompt does not fit in the context window of a model."""
+
+    def __init__(self, tokens: int, budget: int, model: Optional[str] = None) -> None:
+        self.tokens = tokens
+        self.budget = budget
+        self.model = model
+        target = f"model '{model}'" if model else "the context window"
+        super().__init__(
+            f"Prompt of about {tokens} tokens exceeds the {budget}-token budget of "
+            f"{target}."
+        )
+
+
+class TokenCounter:
+    """
+    Counts the tokens of strings and chat messages for a model.
+
+    Uses tiktoken when it is installed and its encoding can be loaded, and a fast
+    heuristic modeled on the OpenAI BPE pre-tokenization otherwise; `backend` tells
+    which. The heuristic errs on the side of counting long identifiers, hashes and
+    punctuation runs (frequent in CI logs) as several tokens. Counts of individual
+    strings are memoized, so repeated system prompts and templates are counted once.
+
+    Attributes:
+        model (Optional[str]): The model whose encoding is used.
+        backend (str): 'tiktoken' or 'heuristic'.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        use_tiktoken: bool = True,
+        cache_size: int = 4096,
+    ) -> None:
+        """
+        Args:
+            model (Optional[str]): The model whose encoding is used.
+            use_tiktoken (bool): Use tiktoken when available. Defaults to True.
+            cache_size (int): Number of string counts memoized.
+        """
+        self.model = model
+        self._use_tiktoken = use_tiktoken
+        self._encoding: Any = None
+        self._resolved = False
+        self._lock = threading.Lock()
+        self._count = functools.lru_cache(maxsize=cache_size)(self._count_uncached)
+
+    def _resolve(self) -> Any:
+        if self._resolved:
+            return self._encoding
+        with self._lock:
+            if not self._resolved:
+                self._encoding = self._load_encoding() if self._use_tiktoken else None
+                self._resolved = True
+        return self._encoding
+
+    def _load_encoding(self) -> Any:
+        try:
+            import tiktoken  # type: ignore[import-not-found]
+        except ImportError:
+            return None
+        try:
+            try:
+                return tiktoken.encoding_for_model(self.model or "")
+            except KeyError:
+                return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # Encodings are downloaded on first use; offline hosts use the heuristic.
+            return None
+
+    @property
+    def backend(self) -> str:
+        return "tiktoken" if self._resolve() is not None else "heuristic"
+
+    def _count_uncached(self, text: str) -> int:
+        encoding = self._resolve()
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return sum(cost for _, _, cost in _heuristic_pieces(text))
+
+    def count(self, text: str) -> int:
+        """
+        Counts the tokens of a string.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            int: The token count.
+        """
+        if not text:
+            return 0
+        return self._count(text)
+
+    def count_messages(self, messages: Sequence[Mapping[str, Any]]) -> int:
+        """
+        Counts the tokens of chat messages (e.g. RenderedPrompt), including the
+        per-message formatting overhead and the priming of the reply.
+
+        Args:
+            messages (Sequence[Mapping[str, Any]]): Messages with 'role' and 'content'.
+
+        Returns:
+            int: The token count.
+        """
+        total = _REPLY_PRIMING
+        for message in messages:
+            total += _TOKENS_PER_MESSAGE + self.count(str(message.get("role", "")))
+            total += self.count(content_text(message.get("content")))
+            if message.get("name"):
+                total += _TOKENS_PER_NAME + self.count(str(message["name"]))
+        return total
+
+    def count_prompt(self, prompt: Any) -> int:
+        """
+        Counts the tokens of a prompt string or a list of chat messages.
+
+        Args:
+            prompt (Any): The prompt.
+
+        Returns:
+            int: The token count.
+        """
+        if isinstance(prompt, str):
+            return self.count(prompt)
+        return self.count_messages(prompt)
+
+    def truncate(
+        self,
+        text: str,
+        max_tokens: int,
+        keep: str = "middle",
+        marker: str = "\n[...truncated...]\n",
+    ) -> str:
+        """
+        Shortens a text to at most `max_tokens` tokens.
+
+        Args:
+            text (str): The text.
+            max_tokens (int): The token budget.
+            keep (str): 'head' keeps the beginning, 'tail' the end, 'middle' both ends
+                (e.g. a log's header and its final errors) around `marker`.
+            marker (str): Inserted where text was removed.
+
+        Returns:
+            str: The text if it fits, otherwise the truncated text.
+
+        Raises:
+            ValueError: If keep is not 'head', 'tail' or 'middle'.
+        """
+        if keep not in ("head", "tail", "middle"):
+            raise ValueError("keep must be 'head', 'tail' or 'middle'")
+        if self.count(text) <= max_tokens:
+            return text
+        budget = max_tokens - self.count(marker)
+        if budget <= 0:
+            return ""
+        if keep == "head":
+            return self._head(text, budget) + marker
+        if keep == "tail":
+            return marker + self._tail(text, budget)
+        head = self._head(text, budget - budget // 2)
+        return head + marker + self._tail(text, budget // 2)
+
+    def _head(self, text: str, budget: int) -> str:
+        encoding = self._resolve()
+        if encoding is not None:
+            return encoding.decode(  # type: ignore[no-any-return]
+                encoding.encode(text, disallowed_special=())[:budget]
+            )
+        end = 0
+        for _, piece_end, cost in _heuristic_pieces(text):
+            if cost > budget:
+                break
+            budget -= cost
+            end = piece_end
+        return text[:end]
+
+    def _tail(self, text: str, budget: int) -> str:
+        if budget <= 0:
+            return ""
+        encoding = self._resolve()
+        if encoding is not None:
+            return encoding.decode(  # type: ignore[no-any-return]
+                encoding.encode(text, disallowed_special=())[-budget:]
+            )
+        start = len(text)
+        for piece_start, _, cost in reversed(list(_heuristic_pieces(text))):
+            if cost > budget:
+                break
+            budget -= cost
+            start = piece_start
+        return text[start:]
+
+
+def content_text(content: Any) -> str:
+    """
+    Returns the text of a message content: a string, or the text parts of a list of
+    content parts.
+
+    Args:
+        content (Any): The message content.
+
+    Returns:
+        str: The text.
+    """
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            str(part.get("text", "")) for part in content if isinstance(part, Mapping)
+        )
+    return str(content)
+
+
+@functools.lru_cache(maxsize=None)
+def token_counter(model: Optional[str] = None) -> TokenCounter:
+    """
+    Returns the shared TokenCounter of a model.
+
+    Args:
+        model (Optional[str]): The model name.
+
+    Returns:
+        TokenCounter: The counter, shared by every caller for the same model.
+    """
+    return TokenCounter(model)
+
+
+def completion_reserve(kwargs: Mapping[str, Any]) -> int:
+    """
+    Returns the completion tokens a call reserves in the context window.
+
+    Args:
+        kwargs (Mapping[str, Any]): The arguments of the call.
+
+    Returns:
+        int: `max_tokens` or `max_completion_tokens`, else DEFAULT_COMPLETION_RESERVE.
+    """
+    reserve = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens")
+    return int(reserve) if reserve else DEFAULT_COMPLETION_RESERVE
+
+
+def fit_messages(
+    messages: Sequence[Mapping[str, Any]],
+    budget: int,
+    counter: TokenCounter,
+    keep: str = "middle",
+) -> List[Dict[str, Any]]:
+    """
+    Trims chat messages to fit a token budget.
+
+    System messages and the last message are kept; the oldest other messages are
+    dropped first. If that is not enough, the longest remaining contents are truncated
+    (see `TokenCounter.truncate`).
+
+    Args:
+        messages (Sequence[Mapping[str, Any]]): The chat messages.
+        budget (int): Maximum tokens of the messages.
+        counter (TokenCounter): Counter of the target model.
+        keep (str): Which part of truncated contents to keep.
+
+    Returns:
+        List[Dict[str, Any]]: New messages that fit; the input is not modified.
+
+    Raises:
+        ContextOverflowError: If the messages cannot fit, e.g. the budget does not
+            even cover the message overhead.
+    """
+    fitted = [dict(message) for message in messages]
+    total = counter.count_messages(fitted)
+    if total <= budget:
+        return fitted
+
+    droppable = [
+        index
+        for index, message in enumerate(fitted[:-1])
+        if message.get("role") != "system"
+    ]
+    for index in droppable:
+        total -= _message_tokens(counter, fitted[index])
+        fitted[index] = {}
+        if total <= budget:
+            break
+    fitted = [message for message in fitted if message]
+
+    while total > budget:
+        sizes = [
+            counter.count(content_text(message.get("content"))) for message in fitted
+        ]
+        longest = max(range(len(fitted)), key=sizes.__getitem__)
+        if sizes[longest] == 0:
+            raise ContextOverflowError(total, budget, counter.model)
+        target = max(0, sizes[longest] - (total - budget))
+        text = counter.truncate(
+            content_text(fitted[longest].get("content")), target, keep=keep
+        )
+        fitted[longest]["content"] = text
+        total = counter.count_messages(fitted)
+        if counter.count(text) >= sizes[longest]:
+            raise ContextOverflowError(total, budget, counter.model)
+    return fitted
+
+
+def _message_tokens(counter: TokenCounter, message: Mapping[str, Any]) -> int:
+    return counter.count_messages([message]) - _REPLY_PRIMING
+
+
+def fit_prompt(
+    prompt: Any,
+    budget: int,
+    counter: TokenCounter,
+    keep: str = "middle",
+) -> Any:
+    """
+    Trims a prompt string or a list of chat messages to fit a token budget.
+
+    Args:
+        prompt (Any): The prompt.
+        budget (int): Maximum tokens of the prompt.
+        counter (TokenCounter): Counter of the target model.
+        keep (str): Which part of truncated text to keep.
+
+    Returns:
+        Any: The prompt if it fits, otherwise a trimmed copy.
+
+    Raises:
+        ContextOverflowError: If the prompt cannot fit.
+    """
+    if isinstance(prompt, str):
+        if budget <= 0:
+            raise ContextOverflowError(counter.count(prompt), budget, counter.model)
+        return counter.truncate(prompt, budget, keep=keep)
+    return fit_messages(prompt, budget, counter, keep=keep)
@@ -1,7 +1,31 @@
+from typing import TYPE_CHECKING
+from langops.core.lazy import lazy_exports
 from langops.parser.registry import ParserRegistry
-from langops.parser.error_parser import ErrorParser
-from langops.parser.jenkins_parser import JenkinsParser
-from langops.parser.pipeline_parser import PipelineParser
+
+if TYPE_CHECKING:  # pragma: no cover
+    from langops.parser.error_parser import ErrorParser
+    from langops.parser.jenkins_parser import JenkinsParser
+    from langops.parser.pipeline_parser import PipelineParser
+    from langops.parser.signature_index import SignatureIndex
+    from langops.parser.query import BundleCollection, Where
+    from langops.parser.diff import BundleDiff, diff_bundles
+    from langops.parser.compress import CompressedBundle, compress_bundle
+
+__getattr__, __dir__ = lazy_exports(
+    "langops.parser",
+    {
+        "ErrorParser": "langops.parser.error_parser",
+        "JenkinsParser": "langops.parser.jenkins_parser",
+        "PipelineParser": "langops.parser.pipeline_parser",
+        "SignatureIndex": "langops.parser.signature_index",
+        "BundleCollection": "langops.parser.query",
+        "Where": "langops.parser.query",
+        "BundleDiff": "langops.parser.diff",
+        "diff_bundles": "langops.parser.diff",
+        "CompressedBundle": "langops.parser.compress",
+        "compress_bundle": "langops.parser.compress",
+    },
+)
 
 __name__ = "langops.parser"
 __version__ = "0.2.0"
@@ -11,4 +35,16 @@ __description__ = (
     "langops Parser: A module for integrating and managing parsers in AI-driven workflows. "
     "Designed for extensibility and modularity, supporting registries and error handling."
 )
-__all__ = ["ParserRegistry", "ErrorParser", "JenkinsParser", "PipelineParser"]
+__all__ = [
+    "ParserRegistry",
+    "ErrorParser",
+    "JenkinsParser",
+    "PipelineParser",
+    "SignatureIndex",
+    "BundleCollection",
+    "Where",
+    "BundleDiff",
+    "diff_bundles",
+    "CompressedBundle",
+    "compress_bundle",
+]
@@ -0,0 +1,387 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from langops.parser.utils.signature import normalize_signature
+
+# Timestamps are dropped entirely: the entry order and line numbers already carry the
+# sequence of events, and every distinct timestamp defeats deduplication.
+_TIMESTAMPS = [
+    re.compile(
+        r"\[?\b\d{4}[-/]\d{2}[-/]\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?"
+        r"(?:Z|[+-]\d{2}:?\d{2})?\]?\s*"
+    ),
+    re.compile(r"\[\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\]\s*"),
+    re.compile(r"^\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\s+"),
+]
+_IDS = [
+    re.compile(
+        r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+    ),
+    re.compile(r"\b0x[0-9a-fA-F]{6,}\b"),
+    re.compile(r"\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{12,}\b"),
+]
+# Paths with at least four components; URLs are left alone.
+_PATH = re.compile(
+    r"(?<![\w:/\\.-])(?:[A-Za-z]:)?[\\/]?[\w.@+~-]+(?:[\\/][\w.@+~-]+){3,}"
+)
+_PATH_SEPARATOR = re.compile(r"[\\/]")
+_FRAME = re.compile(
+    r"^\s*(?:at\s+\S.*"  # Java, Kotlin, JavaScript, C#
+    r"|File \"[^\"]+\", line \d+.*"  # Python
+    r"|\.\.\. \d+ (?:more|frames elided)"  # Java "... 12 more", earlier elisions
+    r"|\S+\.go:\d+(?: \+0x[0-9a-f]+)?"  # Go
+    r")\s*$"
+)
+_PYTHON_FRAME = re.compile(r"^\s*File \"[^\"]+\", line \d+")
+# Banner rules such as "=====" or "_____" are cut to three characters.
+_RULE = re.compile(r"([=_*#~-])\1{3,}")
+_SPACES = re.compile(r"[ \t]+")
+_DIGITS = re.compile(r"\d+")
+_TOKEN = re.compile(r"\d+|[^\W\d]+|\s+|[^\w\s]")
+_LEVEL_PREFIX = re.compile(
+    r"^\[?(critical|fatal|error|warn(?:ing)?|info|debug)\]?:?\s+", re.IGNORECASE
+)
+_LEVELS = {
+    "critical": "CRITICAL",
+    "fatal": "CRITICAL",
+    "error": "ERROR",
+    "warn": "WARNING",
+    "warning": "WARNING",
+    "info": "INFO",
+    "debug": "DEBUG",
+}
+
+
+@dataclass
+class _Item:
+    """A cleaned line of a stage, before grouping."""
+
+    line: Optional[int]
+    label: str
+    text: str
+    frame: bool = False
+
+
+@dataclass
+class _Group:
+    """Items sharing a label and normalized signature, in log order."""
+
+    label: str
+    items: List[_Item] = field(default_factory=list)
+
+
+@dataclass
+class CompressedBundle:
+    """
+    Compact text rendering of a parsed bundle, ready to be embedded in a prompt.
+
+    Attributes:
+        text (str): The rendering.
+        entries (int): Log entries (and context lines) read from the bundle.
+        lines (int): Lines of the rendering.
+        original_tokens (int): Estimated tokens of the baseline rendering,
+            `model_dump_json(indent=2)` of the bundle.
+        tokens (int): Estimated tokens of `text`.
+    """
+
+    text: str
+    entries: int
+    lines: int
+    original_tokens: int
+    tokens: int
+
+    @property
+    def ratio(self) -> float:
+        """How many times fewer tokens the rendering takes than the baseline."""
+        return self.original_tokens / self.tokens if self.tokens else 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        """Returns the compression statistics, without the text."""
+        return {
+            "entries": self.entries,
+            "lines": self.lines,
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+            "ratio": round(self.ratio, 2),
+        }
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class _Cleaner:
+    """Strips the parts of a line that carry no diagnostic signal."""
+
+    def __init__(
+        self,
+        strip_timestamps: bool,
+        strip_ids: bool,
+        shorten_paths: bool,
+        max_line_chars: int,
+    ) -> None:
+        self.rules: List[Tuple[re.Pattern, Any]] = []
+        if strip_timestamps:
+            self.rules.extend((pattern, "") for pattern in _TIMESTAMPS)
+        if strip_ids:
+            self.rules.extend((pattern, "<id>") for pattern in _IDS)
+        if shorten_paths:
+            self.rules.append((_PATH, self._shorten))
+        self.max_line_chars = max_line_chars
+
+    @staticmethod
+    def _shorten(match: "re.Match[str]") -> str:
+        parts = [part for part in _PATH_SEPARATOR.split(match.group(0)) if part]
+        return "…/" + "/".join(parts[-2:])
+
+    def __call__(self, text: str) -> str:
+        for pattern, replacement in self.rules:
+            text = pattern.sub(replacement, text)
+        text = _SPACES.sub(" ", _RULE.sub(r"\1\1\1", text)).strip()
+        if len(text) > self.max_line_chars:
+            text = text[: self.max_line_chars - 1] + "…"
+        return text
+
+
+def _elide_frames(lines: List[_Item], max_frames: int) -> List[_Item]:
+    """
+    Keeps the first `max_frames` and the last frame of every run of consecutive stack
+    frames, replacing the others with a single "... N frames elided" line.
+
+    Python source lines following a `File "...", line N` frame belong to that frame.
+    """
+    result: List[_Item] = []
+    run: List[List[_Item]] = []
+
+    def flush() -> None:
+        if len(run) > max_frames + 1:
+            first = run[max_frames][0]
+            elided = sum(len(frame) for frame in run[max_frames:-1])
+            for frame in run[:max_frames]:
+                result.extend(frame)
+            marker = f"... {elided} frames elided"
+            result.append(_Item(first.line, first.label, marker, frame=True))
+            result.extend(run[-1])
+        else:
+            for frame in run:
+                result.extend(frame)
+        run.clear()
+
+    previous_python = False
+    for item in lines:
+        if _FRAME.match(item.text):
+            item.frame = True
+            run.append([item])
+            previous_python = bool(_PYTHON_FRAME.match(item.text))
+        elif run and previous_python and item.text[:1].isspace():
+            item.frame = True
+            run[-1].append(item)
+            previous_python = False
+        else:
+            flush()
+            previous_python = False
+            result.append(item)
+    flush()
+    return result
+
+
+def _template(texts: List[str], max_values: int) -> Tuple[str, bool]:
+    """
+    Merges the variants of a group into one line.
+
+    Variants with the same token structure are merged token by token, varying tokens
+    becoming `<*>`; when a single token varies, up to `max_values` of its values are
+    listed. Otherwise the first variant stands for the group.
+
+    Returns:
+        Tuple[str, bool]: The line, and whether it is a merged template.
+    """
+    tokens = [_TOKEN.findall(text) for text in texts]
+    if len({len(t) for t in tokens}) != 1:
+        return texts[0], False
+    columns = list(zip(*tokens))
+    varying = [i for i, column in enumerate(columns) if len(set(column)) > 1]
+    merged = "".join(
+        "<*>" if i in varying else column[0] for i, column in enumerate(columns)
+    )
+    if len(varying) == 1:
+        values = list(dict.fromkeys(columns[varying[0]]))
+        listed = ", ".join(values[:max_values])
+        if len(values) > max_values:
+            listed += f", … +{len(values) - max_values}"
+        merged += f" [<*> = {listed}]"
+    return merged, True
+
+
+def _line_span(lines: List[Optional[int]]) -> str:
+    numbers = [line for line in lines if line is not None]
+    if not numbers:
+        return ""
+    first, last = min(numbers), max(numbers)
+    return f"[{first}] " if first == last else f"[{first}-{last}] "
+
+
+def _render_groups(
+    items: Iterable[_Item], min_repeat: int, max_values: int
+) -> List[str]:
+    groups: Dict[Tuple[str, str], _Group] = {}
+    for item in items:
+        # Distinct frames are distinct call sites: only identical frames, from repeated
+        # traces, are collapsed.
+        if item.frame:
+            key = (item.label, item.text)
+        else:
+            key = (item.label, _DIGITS.sub("<n>", normalize_signature(item.text)))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = _Group(item.label)
+        group.items.append(item)
+
+    rendered: List[str] = []
+    for group in groups.values():
+        if len(group.items) < min_repeat:
+            rendered.extend(
+                f"{_line_span([item.line])}{item.label}: {item.text}"
+                for item in group.items
+            )
+            continue
+        texts = list(dict.fromkeys(item.text for item in group.items))
+        text, merged = _template(texts, max_values)
+        count = f" ×{len(group.items)}" if len(group.items) > 1 else ""
+        if len(texts) > 1 and not merged:
+            count += f" ({len(texts)} variants)"
+        lines = [item.line for item in group.items]
+        rendered.append(f"{_line_span(lines)}{group.label}{count}: {text}")
+    return rendered
+
+
+def _stage_views(
+    bundle: Any,
+) -> Iterable[Tuple[str, Optional[Tuple[int, int]], list, list]]:
+    """
+    Yields (name, line range, entries, context lines) for each stage of a
+    ParsedPipelineBundle, or of a ParsedLogBundle from JenkinsParser.
+    """
+    for stage in bundle.stages:
+        if hasattr(stage, "content"):
+            span = (stage.start_line, stage.end_line)
+            yield stage.name, span, stage.content, stage.context
+        else:
+            yield stage.name, None, stage.logs, []
+
+
+def _strip_level(text: str, label: str) -> str:
+    """Drops a leading level such as "ERROR:" that repeats the entry's severity."""
+    match = _LEVEL_PREFIX.match(text)
+    if match and _LEVELS.get(match.group(1).lower()) == label:
+        return text[match.end() :]
+    return text
+
+
+def _severity(entry: Any) -> str:
+    severity = getattr(entry.severity, "value", entry.severity)
+    return str(severity).upper()
+
+
+def compress_bundle(
+    bundle: Any,
+    *,
+    strip_timestamps: bool = True,
+    strip_ids: bool = True,
+    shorten_paths: bool = True,
+    max_frames: int = 3,
+    min_repeat: int = 2,
+    max_values: int = 8,
+    include_context: bool = True,
+    max_line_chars: int = 300,
+    model: Optional[str] = None,
+) -> CompressedBundle:
+    """
+    Renders a parsed bundle as compact text for LLM prompts.
+
+    Dumping a bundle as JSON spends most tokens on punctuation, repeated field names and
+    near-identical lines. The rendering instead writes one header per stage and one line
+    per distinct message:
+
+    - Timestamps are dropped, UUIDs and long hex IDs become `<id>`, and paths of four or
+      more components keep their last two (`…/src/App.java`).
+    - Runs of stack frames keep the first `max_frames` and the last frame.
+    - Entries of a stage sharing a severity and normalized signature (see
+      `normalize_signature`) are collapsed into one line with a `×N` count and the
+      range of their line numbers; tokens varying between them become `<*>`. Stack
+      frames are only collapsed with identical frames.
+    - A leading level that repeats the severity ("ERROR: ...") is dropped.
+
+    Args:
+        bundle (Any): A ParsedPipelineBundle, or a ParsedLogBundle from JenkinsParser.
+        strip_timestamps (bool): Drop timestamps from messages. Defaults to True.
+        strip_ids (bool): Replace UUIDs and long hex IDs with `<id>`. Defaults to True.
+        shorten_paths (bool): Keep the last two components of long paths. Defaults to
+            True.
+        max_frames (int): Leading frames kept per run of stack frames. Defaults to 3.
+        min_repeat (int): Occurrences from which a group is collapsed. Defaults to 2.
+        max_values (int): Values listed for the varying part of a collapsed group.
+            Defaults to 8.
+        include_context (bool): Render the context lines of stages. Defaults to True.
+        max_line_chars (int): Longer lines are truncated. Defaults to 300.
+        model (Optional[str]): Model whose tokenizer estimates the token counts.
+            Defaults to the heuristic counter.
+
+    Returns:
+        CompressedBundle: The rendering and its compression ratio.
+
+    Raises:
+        ValueError: If `max_frames` or `min_repeat` is less than 1.
+    """
+    if max_frames < 1 or min_repeat < 1:
+        raise ValueError("max_frames and min_repeat must be at least 1")
+    from langops.llm.tokens import token_counter
+
+    clean = _Cleaner(strip_timestamps, strip_ids, shorten_paths, max_line_chars)
+    entries = 0
+    stage_blocks: List[List[str]] = []
+    for name, span, stage_entries, context in _stage_views(bundle):
+        lines: List[_Item] = []
+        for entry in stage_entries:
+            entries += 1
+            line = getattr(entry, "line", None)
+            for offset, text in enumerate(entry.message.splitlines() or [""]):
+                number = None if line is None else line + offset
+                lines.append(_Item(number, _severity(entry), text))
+        items = []
+        for item in _elide_frames(lines, max_frames):
+            item.text = _strip_level(clean(item.text), item.label)
+            if item.text:
+                items.append(item)
+        block = _render_groups(items, min_repeat, max_values)
+        if include_context and context:
+            entries += len(context)
+            context_items = [_Item(c.line, c.kind, clean(c.message)) for c in context]
+            context_items = [item for item in context_items if item.text]
+            block.extend(
+                "  " + text
+                for text in _render_groups(context_items, min_repeat, max_values)
+            )
+        header = f"## {name}" + (f" (lines {span[0]}-{span[1]})" if span else "")
+        stage_blocks.append([header] + block)
+
+    metadata = getattr(bundle, "metadata", None) or {}
+    source = getattr(bundle, "source", None)
+    summary = [f"{len(stage_blocks)} stages", f"{entries} entries"]
+    if source:
+        summary.insert(0, f"source={source}")
+    summary.extend(
+        f"{key}={value}" for key, value in metadata.items() if value not in (None, "")
+    )
+    rendered = [" | ".join(summary)]
+    for block in stage_blocks:
+        rendered.extend(block)
+    text = "\n".join(rendered)
+
+    counter = token_counter(model)
+    return CompressedBundle(
+        text=text,
+        entries=entries,
+        lines=len(rendered),
+        original_tokens=counter.count(bundle.model_dump_json(indent=2)),
+        tokens=counter.count(text),
+    )
@@ -0,0 +1,205 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+from langops.parser.constants.pipeline_constants import SEVERITY_ORDER
+from langops.parser.types.pipeline_types import (
+    LogEntry,
+    ParsedPipelineBundle,
+    SeverityLevel,
+    StageWindow,
+)
+from langops.parser.utils.signature import normalize_signature
+
+Fingerprint = Tuple[Optional[str], str]
+
+
+@dataclass
+class DiffGroup:
+    """
+    Entries sharing one fingerprint (stage and normalized signature).
+
+    Attributes:
+        stage (Optional[str]): The stage name, or None when stages are ignored.
+        signature (str): The normalized error signature.
+        entries (List[LogEntry]): Matching entries of the current build, or of the baselines
+            for resolved groups, in log order.
+        current_count (int): Occurrences in the current build.
+        baseline_count (int): Occurrences across the baseline builds.
+    """
+
+    stage: Optional[str]
+    signature: str
+    entries: List[LogEntry] = field(default_factory=list)
+    current_count: int = 0
+    baseline_count: int = 0
+
+    @property
+    def example(self) -> LogEntry:
+        """The first entry of the group."""
+        return self.entries[0]
+
+
+@dataclass
+class BundleDiff:
+    """
+    Result of comparing a build against one or more baseline builds.
+
+    Attributes:
+        current (ParsedPipelineBundle): The build being triaged.
+        new (List[DiffGroup]): Errors absent from every baseline.
+        resolved (List[DiffGroup]): Baseline errors absent from the current build.
+        persisting (List[DiffGroup]): Errors present in both.
+    """
+
+    current: ParsedPipelineBundle
+    new: List[DiffGroup] = field(default_factory=list)
+    resolved: List[DiffGroup] = field(default_factory=list)
+    persisting: List[DiffGroup] = field(default_factory=list)
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Number of distinct fingerprints in each category."""
+        return {
+            "new": len(self.new),
+            "resolved": len(self.resolved),
+            "persisting": len(self.persisting),
+        }
+
+    def new_entries(self) -> List[LogEntry]:
+        """Returns every new entry of the current build, in log order."""
+        entries = [entry for group in self.new for entry in group.entries]
+        entries.sort(key=lambda entry: entry.line)
+        return entries
+
+    def new_messages(self) -> List[str]:
+        """
+        Returns one message per new fingerprint, ready for prompts such as
+        `JenkinsErrorPrompt.add_user_prompt`.
+        """
+        return [group.example.message for group in self.new]
+
+    def new_bundle(self) -> ParsedPipelineBundle:
+        """
+        Returns a copy of the current bundle restricted to the new entries.
+
+        The entries are shared with the current bundle; stages without new entries are dropped.
+
+        Returns:
+            ParsedPipelineBundle: A bundle to feed into prompts instead of the full build.
+        """
+        new_ids = {id(entry) for group in self.new for entry in group.entries}
+        stages = []
+        for stage in self.current.stages:
+            content = [entry for entry in stage.content if id(entry) in new_ids]
+            if content:
+                stages.append(
+                    StageWindow(
+                        name=stage.name,
+                        start_line=stage.start_line,
+                        end_line=stage.end_line,
+                        content=content,
+                    )
+                )
+        metadata = dict(self.current.metadata or {})
+        metadata["diff"] = self.counts
+        return ParsedPipelineBundle(
+            source=self.current.source, stages=stages, metadata=metadata
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        """Returns a JSON-serializable summary of the diff."""
+
+        def groups(items: List[DiffGroup]) -> List[Dict[str, object]]:
+            return [
+                {
+                    "stage": group.stage,
+                    "signature": group.signature,
+                    "example": group.example.message,
+                    "current_count": group.current_count,
+                    "baseline_count": group.baseline_count,
+                }
+                for group in items
+            ]
+
+        return {
+            "counts": self.counts,
+            "new": groups(self.new),
+            "resolved": groups(self.resolved),
+            "persisting": groups(self.persisting),
+        }
+
+
+def _entries(
+    bundle: ParsedPipelineBundle, threshold: int
+) -> Iterator[Tuple[str, LogEntry]]:
+    for stage in bundle.stages:
+        for entry in stage.content:
+            if SEVERITY_ORDER.index(entry.severity) >= threshold:
+                yield stage.name, entry
+
+
+def diff_bundles(
+    current: ParsedPipelineBundle,
+    *baselines: ParsedPipelineBundle,
+    min_severity: SeverityLevel = SeverityLevel.ERROR,
+    per_stage: bool = True,
+) -> BundleDiff:
+    """
+    Compares a build against one or more baseline builds (e.g. the last green builds).
+
+    Entries are matched by fingerprint: the normalized signature of their message, scoped
+    to their stage unless `per_stage` is False. Each bundle is scanned once and
+    fingerprints are looked up in hash maps, so the diff runs in time linear in the number
+    of entries.
+
+    Args:
+        current (ParsedPipelineBundle): The build being triaged.
+        *baselines (ParsedPipelineBundle): One or more reference builds.
+        min_severity (SeverityLevel): Entries below this severity are ignored.
+        per_stage (bool): Whether the same error in different stages counts as different.
+
+    Returns:
+        BundleDiff: New, resolved and persisting error groups.
+
+    Raises:
+        ValueError: If no baseline is given.
+    """
+    if not baselines:
+        raise ValueError("At least one baseline bundle is required.")
+    threshold = SEVERITY_ORDER.index(min_severity)
+    signatures: Dict[str, str] = {}
+
+    def fingerprint(stage: str, message: str) -> Fingerprint:
+        signature = signatures.get(message)
+        if signature is None:
+            signature = signatures[message] = normalize_signature(message)
+        return (stage if per_stage else None, signature)
+
+    baseline_groups: Dict[Fingerprint, DiffGroup] = {}
+    for baseline in baselines:
+        for stage, entry in _entries(baseline, threshold):
+            key = fingerprint(stage, entry.message)
+            group = baseline_groups.get(key)
+            if group is None:
+                group = baseline_groups[key] = DiffGroup(key[0], key[1])
+            group.entries.append(entry)
+            group.baseline_count += 1
+
+    current_groups: Dict[Fingerprint, DiffGroup] = {}
+    for stage, entry in _entries(current, threshold):
+        key = fingerprint(stage, entry.message)
+        group = current_groups.get(key)
+        if group is None:
+            known = baseline_groups.get(key)
+            group = current_groups[key] = DiffGroup(
+                key[0], key[1], baseline_count=known.baseline_count if known else 0
+            )
+        group.entries.append(entry)
+        group.current_count += 1
+
+    result = BundleDiff(current=current)
+    for group in current_groups.values():
+        (result.persisting if group.baseline_count else result.new).append(group)
+    result.resolved = [
+        group for key, group in baseline_groups.items() if key not in current_groups
+    ]
+    return result
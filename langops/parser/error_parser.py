@@ -1,11 +1,50 @@
+import json
+import re
 from langops.core.base_parser import BaseParser
 from langops.parser.registry import ParserRegistry
-from typing import List, Dict, Any
+from langops.parser.utils.result_cache import ParseResultCache
+from typing import List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Union
+
+# Lines mentioning "err"/"error" as a word; the loose pattern is the fallback used when a
+# log has no strict match. Every strict match is also a loose match.
+_STRICT_PATTERN = re.compile(r"\berr(or)?\b", re.IGNORECASE)
+_LOOSE_PATTERN = re.compile(r"err|error", re.IGNORECASE)
+
+LogSource = Union[str, Iterable[str]]
+
+
+class ErrorMatch(NamedTuple):
+    """
+    An error line together with its position in the log.
+
+    Attributes:
+        line (int): 1-based line number.
+        message (str): The line content without its line terminator.
+    """
+
+    line: int
+    message: str
+
+
+def _iter_lines(source: LogSource) -> Iterator[str]:
+    if isinstance(source, str):
+        return iter(source.splitlines())
+    return (line.rstrip("\r\n") for line in source)
 
 
 @ParserRegistry.register(name="ErrorParser")
 class ErrorParser(BaseParser):
-    """Parser that filters and returns only error logs from the input data."""
+    """Parser that filters and returns only error logs from the input data.
+
+    Lines matching "err" or "error" as a whole word are errors. If a log has no such line,
+    lines containing "err" anywhere (e.g. "stderr", "ERR_CONNECTION") are returned instead.
+
+    Args:
+        cache (Optional[ParseResultCache]): On-disk cache of parse results keyed by log content.
+    """
+
+    def __init__(self, cache: Optional[ParseResultCache] = None) -> None:
+        self.cache = cache
 
     def parse(self, data: str) -> List[str]:
         """Parse the input data and return only error log lines.
@@ -16,17 +55,65 @@ class ErrorParser(BaseParser):
         Returns:
             list: List of error log lines.
         """
-        import re
-
         self.validate_input(data)
-        error_lines = self.filter_log_lines(
-            data, pattern=r"\berr(or)?\b", flags=re.IGNORECASE
+        if self.cache is None:
+            return self._parse(data)
+
+        return self.cache.memoize(
+            data,
+            {"parser": "ErrorParser"},
+            lambda: self._parse(data),
+            json.dumps,
+            json.loads,
         )
-        if not error_lines:
-            error_lines = self.filter_log_lines(
-                data, pattern=r"err|error", flags=re.IGNORECASE
-            )
-        return error_lines
+
+    def _parse(self, data: str) -> List[str]:
+        """Runs the actual parse; see `parse` for the arguments."""
+        return [match.message for match in self.iter_errors(data)]
+
+    def find_errors(self, source: LogSource) -> List[ErrorMatch]:
+        """Returns the error lines of a log together with their line numbers.
+
+        Args:
+            source (Union[str, Iterable[str]]): The log content, an open text file or any
+                iterable of lines.
+
+        Returns:
+            List[ErrorMatch]: The error lines in log order.
+        """
+        return list(self.iter_errors(source))
+
+    @staticmethod
+    def iter_errors(source: LogSource) -> Iterator[ErrorMatch]:
+        """Streams the error lines of a log in a single pass.
+
+        Only the lines of the input currently being read are held in memory, plus the loose
+        matches seen before the first strict match: these are yielded at the end if no strict
+        match appears and dropped as soon as one does. Strict matches are yielded as soon as
+        they are read.
+
+        Args:
+            source (Union[str, Iterable[str]]): The log content, an open text file or any
+                iterable of lines. String content is split like `str.splitlines()`; lines
+                read from files or iterables have their trailing line terminator removed.
+
+        Yields:
+            ErrorMatch: The error lines in log order.
+        """
+        loose = _LOOSE_PATTERN.search
+        strict = _STRICT_PATTERN.search
+        fallback: Optional[List[ErrorMatch]] = []
+        for number, line in enumerate(_iter_lines(source), 1):
+            # The loose pattern is a cheap literal prefilter for the strict one.
+            if not loose(line):
+                continue
+            if strict(line):
+                fallback = None
+                yield ErrorMatch(number, line)
+            elif fallback is not None:
+                fallback.append(ErrorMatch(number, line))
+        if fallback:
+            yield from fallback
 
     @classmethod
     def to_dict(cls, parsed_result: List[str]) -> Dict[str, Any]:
@@ -1,6 +1,6 @@
-import re
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import Any, Dict, List, Optional, Pattern, Tuple
 from langops.core.base_parser import BaseParser
 from langops.core.constants import SEVERITY_ORDER
 from langops.core.types import SeverityLevel
@@ -9,6 +9,52 @@ from langops.core.types import LogEntry
 from langops.core.types import StageLogs
 from langops.parser.registry import ParserRegistry
 from langops.parser import jenkins_patterns
+from langops.parser.utils.pattern_set import PatternSet
+from langops.parser.utils.result_cache import (
+    ParseResultCache,
+    dump_model,
+    load_model,
+)
+from langops.parser.types.pipeline_types import SeverityLevel as PatternSeverity
+from langops.parser.utils.timestamps import TimestampExtractor
+
+# Matcher groups in first-match priority order.
+_PATTERN_GROUPS = (
+    ("groovy", "GROOVY_PATTERNS"),
+    ("java", "JAVA_PATTERNS"),
+    ("nodejs", "NODEJS_PATTERNS"),
+    ("python", "PYTHON_PATTERNS"),
+    ("dotnet", "DOTNET_PATTERNS"),
+    ("sh", "SH_PATTERNS"),
+    ("sonar", "SONAR_PATTERNS"),
+    ("jfrog", "JFROG_PATTERNS"),
+    ("docker", "DOCKER_PATTERNS"),
+    ("jenkins", "JENKINS_PATTERNS"),
+    ("http", "HTTP_PATTERNS"),
+    ("test", "TEST_PATTERNS"),
+    ("lint", "LINT_PATTERNS"),
+)
+
+# Source name selecting the original JenkinsParser stage name cleaner.
+_PATTERN_SET_SOURCE = "jenkins_legacy"
+
+JENKINS_TIMESTAMP_EXTRACTOR = TimestampExtractor(
+    [
+        (pattern, jenkins_patterns.TIMESTAMP_FORMATS)
+        for pattern in jenkins_patterns.TIMESTAMP_PATTERNS
+    ],
+    scan_all=True,
+)
+
+# PatternSet classifies with its own severity enum (INFO fallback included); levels are
+# converted by value so JenkinsParser always returns `core.types.SeverityLevel`.
+_SEVERITY_BY_VALUE: Dict[str, SeverityLevel] = {
+    level.value: level for level in SeverityLevel
+}
+
+
+def _core_severity(level: Enum) -> SeverityLevel:
+    return _SEVERITY_BY_VALUE[level.value]
 
 
 @ParserRegistry.register(name="JenkinsParser")
@@ -20,27 +66,71 @@ class JenkinsParser(BaseParser):
 
     Supports multiple Jenkins pipeline stage detection patterns and
     provides comprehensive log analysis with deduplication capabilities.
+
+    Classification and stage detection run on the same compiled `PatternSet` engine as
+    `PipelineParser` (in 'search' stage dispatch mode, with the original stage name
+    cleaner), so output and first-match priority are identical to the original parser.
+
+    Args:
+        cache (Optional[ParseResultCache]): On-disk cache of parse results keyed by log content and configuration.
+        regex_backend (str): Regex engine for the matchers: 're', 'regex', 're2' or 'auto'.
     """
 
-    def __init__(self) -> None:
-        self.patterns = (
-            jenkins_patterns.GROOVY_PATTERNS
-            + jenkins_patterns.JAVA_PATTERNS
-            + jenkins_patterns.NODEJS_PATTERNS
-            + jenkins_patterns.PYTHON_PATTERNS
-            + jenkins_patterns.DOTNET_PATTERNS
-            + jenkins_patterns.SH_PATTERNS
-            + jenkins_patterns.SONAR_PATTERNS
-            + jenkins_patterns.JFROG_PATTERNS
-            + jenkins_patterns.DOCKER_PATTERNS
-            + jenkins_patterns.JENKINS_PATTERNS
-            + jenkins_patterns.HTTP_PATTERNS
-            + jenkins_patterns.TEST_PATTERNS
-            + jenkins_patterns.LINT_PATTERNS
+    def __init__(
+        self, cache: Optional[ParseResultCache] = None, regex_backend: str = "re"
+    ) -> None:
+        self.cache = cache
+        self.pattern_set = PatternSet.build(
+            _PATTERN_SET_SOURCE,
+            {group: getattr(jenkins_patterns, name) for group, name in _PATTERN_GROUPS},
+            # Enhanced stage detection patterns for different Jenkins pipeline formats
+            jenkins_patterns.STAGE_PATTERNS,
+            stage_dispatch="search",
+            regex_backend=regex_backend,
         )
 
-        # Enhanced stage detection patterns for different Jenkins pipeline formats
-        self.stage_patterns = jenkins_patterns.STAGE_PATTERNS
+    @property
+    def patterns(self) -> List[Tuple[Pattern[str], SeverityLevel]]:
+        """
+        Flat list of (regex, severity) matchers in first-match priority order.
+        Assigning a new list replaces every matcher.
+        """
+        return [
+            (regex, _core_severity(level))
+            for _, matchers in self.pattern_set.patterns
+            for regex, level in matchers
+        ]
+
+    @patterns.setter
+    def patterns(self, matchers: List[Tuple[Pattern[str], SeverityLevel]]) -> None:
+        self.pattern_set = PatternSet.build(
+            _PATTERN_SET_SOURCE,
+            {
+                "custom": [
+                    (regex, PatternSeverity(level.value)) for regex, level in matchers
+                ]
+            },
+            self.pattern_set.stage_patterns,
+            stage_dispatch="search",
+            regex_backend=self.pattern_set.regex_backend,
+        )
+
+    @property
+    def stage_patterns(self) -> List[Pattern[str]]:
+        """
+        Stage detection patterns in priority order. Assigning a new list replaces them.
+        """
+        return list(self.pattern_set.stage_patterns)
+
+    @stage_patterns.setter
+    def stage_patterns(self, stage_patterns: List[Pattern[str]]) -> None:
+        self.pattern_set = PatternSet.build(
+            _PATTERN_SET_SOURCE,
+            self.pattern_set.as_dict(),
+            stage_patterns,
+            stage_dispatch="search",
+            regex_backend=self.pattern_set.regex_backend,
+        )
 
     def parse(
         self,
@@ -63,9 +153,30 @@ class JenkinsParser(BaseParser):
             ValueError: If input data is invalid.
         """
         self.validate_input(data)
+        if self.cache is None:
+            return self._parse(data, min_severity, deduplicate)
+
+        return self.cache.memoize(
+            data,
+            self._cache_fingerprint(min_severity, deduplicate),
+            lambda: self._parse(data, min_severity, deduplicate),
+            dump_model,
+            lambda payload: load_model(ParsedLogBundle, payload),
+        )
+
+    def _parse(
+        self, data: str, min_severity: SeverityLevel, deduplicate: bool
+    ) -> ParsedLogBundle:
+        """
+        Runs the actual parse; see `parse` for the arguments.
+        """
         current_stage = "Unknown"
         stage_map: dict[str, list[LogEntry]] = {}
         seen_messages: set[str] = set()
+        threshold = SEVERITY_ORDER.index(min_severity)
+        detect_stage = self.pattern_set.detect_stage
+        classify = self.pattern_set.classify
+        extract_timestamp = JENKINS_TIMESTAMP_EXTRACTOR.extract
 
         for line in data.splitlines():
             line = line.strip()
@@ -73,27 +184,24 @@ class JenkinsParser(BaseParser):
                 continue
 
             # Detect stage name using multiple patterns
-            detected_stage = self._detect_stage(line)
+            detected_stage = detect_stage(line)
             if detected_stage:
                 current_stage = detected_stage
                 continue
 
-            severity = self._classify_severity(line)
-            if not self._is_severity_enough(severity, min_severity):
+            severity = _core_severity(classify(line)[1])
+            if SEVERITY_ORDER.index(severity) < threshold:
                 continue
 
             # Use original line for deduplication to avoid losing context
-            if deduplicate and line in seen_messages:
-                continue
-
-            seen_messages.add(line)
-
-            if current_stage not in stage_map:
-                stage_map[current_stage] = []
+            if deduplicate:
+                if line in seen_messages:
+                    continue
+                seen_messages.add(line)
 
-            stage_map[current_stage].append(
+            stage_map.setdefault(current_stage, []).append(
                 LogEntry(
-                    timestamp=self._extract_timestamp(line),
+                    timestamp=extract_timestamp(line),
                     message=line,
                     severity=severity,
                 )
@@ -107,6 +215,22 @@ class JenkinsParser(BaseParser):
             ]
         )
 
+    def _cache_fingerprint(
+        self, min_severity: SeverityLevel, deduplicate: bool
+    ) -> Dict[str, Any]:
+        """
+        Describes everything besides the log content that affects the parse result.
+
+        Returns:
+            Dict[str, Any]: JSON-serializable configuration fingerprint.
+        """
+        return {
+            "parser": "JenkinsParser",
+            "patterns": self.pattern_set.fingerprint,
+            "min_severity": min_severity.value,
+            "deduplicate": deduplicate,
+        }
+
     def _detect_stage(self, line: str) -> Optional[str]:
         """
         Detect Jenkins pipeline stage name from a log line using multiple patterns.
@@ -117,34 +241,7 @@ class JenkinsParser(BaseParser):
         Returns:
             Optional[str]: The detected stage name or None if not found.
         """
-        for pattern in self.stage_patterns:
-            match = pattern.search(line)
-            if match:
-                stage_name = match.group(1).strip()
-
-                # Skip invalid or unwanted stage names
-                if (
-                    not stage_name
-                    or len(stage_name) < 2
-                    or stage_name.lower() in {"user", "admin", "system", "sh"}
-                ):
-                    continue
-
-                # Clean up common Jenkins artifacts from stage names
-                stage_name = re.sub(
-                    r"^\d+[\.\)]\s*", "", stage_name
-                )  # Remove numbering
-                stage_name = re.sub(
-                    r"\s*\[.*?\]$", "", stage_name
-                )  # Remove trailing bracketed annotations from stage names
-
-                # Handle Pipeline stages differently
-                if stage_name.lower() == "pipeline":
-                    # For [Pipeline] sh, return "Pipeline"
-                    return "Pipeline"
-
-                return stage_name
-        return None
+        return self.pattern_set.detect_stage(line)
 
     def _classify_severity(self, line: str) -> SeverityLevel:
         """
@@ -156,10 +253,7 @@ class JenkinsParser(BaseParser):
         Returns:
             SeverityLevel: The classified severity level.
         """
-        for pattern, level in self.patterns:
-            if pattern.search(line):
-                return level
-        return SeverityLevel.INFO
+        return _core_severity(self.pattern_set.classify(line)[1])
 
     def _is_severity_enough(
         self, level: SeverityLevel, min_level: SeverityLevel
@@ -188,30 +282,7 @@ class JenkinsParser(BaseParser):
         Returns:
             Optional[datetime]: The extracted timestamp or None if not found.
         """
-        # Multiple timestamp patterns for different Jenkins log formats
-        timestamp_patterns = [
-            r"(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[,\.]\d{3})?)",  # ISO format
-            r"(\w{3}\s+\d{1,2}\s+\d{4}\s+\d{2}:\d{2}:\d{2})",  # Mon DD YYYY HH:MM:SS
-            r"(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2})",  # MM/DD/YYYY HH:MM:SS
-        ]
-
-        format_strings = [
-            "%Y-%m-%dT%H:%M:%S.%f",  # ISO format with milliseconds
-            "%Y-%m-%dT%H:%M:%S",  # ISO format without milliseconds
-            "%b %d %Y %H:%M:%S",  # Mon DD YYYY HH:MM:SS
-            "%m/%d/%Y %H:%M:%S",  # MM/DD/YYYY HH:MM:SS
-        ]
-
-        for pattern in timestamp_patterns:
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                timestamp_str = match.group(1)
-                for fmt in format_strings:
-                    try:
-                        return datetime.strptime(timestamp_str, fmt)
-                    except ValueError:
-                        continue
-        return None
+        return JENKINS_TIMESTAMP_EXTRACTOR.extract(line)
 
     def get_stages_summary(
         self, parsed_data: ParsedLogBundle
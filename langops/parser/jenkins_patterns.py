@@ -1,159 +1,213 @@
-import re
+from typing import List
 from langops.core.types import SeverityLevel
+from langops.parser.patterns.spec import (
+    MatcherSpec,
+    StagePatternSpec,
+    compile_matchers,
+    compile_stage_patterns,
+    compiled_attributes,
+)
 
 # Jenkins Stage Detection Patterns
-STAGE_PATTERNS = [
+STAGE_PATTERN_SPECS: List[StagePatternSpec] = [
     # Primary Jenkins stage markers - highest priority
-    re.compile(
-        r"\[([A-Za-z][\w\s]*)\]\s+(.*)", re.IGNORECASE
-    ),  # [Git] Cloning..., [Poetry] Installing..., etc.
+    r"\[([A-Za-z][\w\s]*)\]\s+(.*)",  # [Git] Cloning..., [Poetry] Installing..., etc.
     # Traditional stage patterns
-    re.compile(r"\[Pipeline\]\s+\{\s*\((.+?)\)"),  # [Pipeline] { (stage_name)
+    (r"\[Pipeline\]\s+\{\s*\((.+?)\)", 0),  # [Pipeline] { (stage_name)
     # Pipeline stage markers
-    re.compile(r"\[Pipeline\]\s+(.+)"),  # [Pipeline] sh, [Pipeline] stage, etc.
-    re.compile(r"Stage\s+['\"](.+?)['\"]"),  # Stage "Build"
-    re.compile(r"Running in (.+)$"),  # Running in Build
-    re.compile(r"\+\s+(.+?)\s+\["),  # + Build [
+    (r"\[Pipeline\]\s+(.+)", 0),  # [Pipeline] sh, [Pipeline] stage, etc.
+    (r"Stage\s+['\"](.+?)['\"]", 0),  # Stage "Build"
+    (r"Running in (.+)$", 0),  # Running in Build
+    (r"\+\s+(.+?)\s+\[", 0),  # + Build [
     # Build step markers
-    re.compile(r"Build step\s+['\"](.+?)['\"]"),  # Build step 'Execute shell'
+    (r"Build step\s+['\"](.+?)['\"]", 0),  # Build step 'Execute shell'
+]
+
+# Timestamp Extraction Patterns
+# Every format is tried against every match of every pattern, in order.
+TIMESTAMP_PATTERNS = [
+    r"(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[,\.]\d{3})?)",  # ISO format
+    r"(\w{3}\s+\d{1,2}\s+\d{4}\s+\d{2}:\d{2}:\d{2})",  # Mon DD YYYY HH:MM:SS
+    r"(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2})",  # MM/DD/YYYY HH:MM:SS
+]
+
+TIMESTAMP_FORMATS = [
+    "%Y-%m-%dT%H:%M:%S.%f",  # ISO format with milliseconds
+    "%Y-%m-%dT%H:%M:%S",  # ISO format without milliseconds
+    "%b %d %Y %H:%M:%S",  # Mon DD YYYY HH:MM:SS
+    "%m/%d/%Y %H:%M:%S",  # MM/DD/YYYY HH:MM:SS
 ]
 
 # Pattern: (regex, severity)
-GROOVY_PATTERNS = [
+GROOVY_PATTERN_SPECS: List[MatcherSpec] = [
     (
-        re.compile(r".*groovy.lang.MissingPropertyException.*", re.IGNORECASE),
-        SeverityLevel.ERROR,
+        r".*groovy.lang.MissingPropertyException.*",
+        "ERROR",
     ),
-    (re.compile(r".*unable to resolve class.*", re.IGNORECASE), SeverityLevel.ERROR),
+    (r".*unable to resolve class.*", "ERROR"),
 ]
 
-JAVA_PATTERNS = [
-    (re.compile(r".*Exception in thread.*", re.IGNORECASE), SeverityLevel.CRITICAL),
+JAVA_PATTERN_SPECS: List[MatcherSpec] = [
+    (r".*Exception in thread.*", "CRITICAL"),
     (
-        re.compile(r".*java.lang.NullPointerException.*", re.IGNORECASE),
-        SeverityLevel.CRITICAL,
+        r".*java.lang.NullPointerException.*",
+        "CRITICAL",
     ),
     (
-        re.compile(r".*java.lang.OutOfMemoryError.*", re.IGNORECASE),
-        SeverityLevel.CRITICAL,
+        r".*java.lang.OutOfMemoryError.*",
+        "CRITICAL",
     ),
 ]
 
-NODEJS_PATTERNS = [
+NODEJS_PATTERN_SPECS: List[MatcherSpec] = [
     (
-        re.compile(r".*UnhandledPromiseRejectionWarning.*", re.IGNORECASE),
-        SeverityLevel.ERROR,
+        r".*UnhandledPromiseRejectionWarning.*",
+        "ERROR",
     ),
-    (re.compile(r".*TypeError:.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*ReferenceError:.*", re.IGNORECASE), SeverityLevel.ERROR),
+    (r".*TypeError:.*", "ERROR"),
+    (r".*ReferenceError:.*", "ERROR"),
 ]
 
-PYTHON_PATTERNS = [
+PYTHON_PATTERN_SPECS: List[MatcherSpec] = [
     (
-        re.compile(r".*Traceback \(most recent call last\):.*", re.IGNORECASE),
-        SeverityLevel.ERROR,
+        r".*Traceback \(most recent call last\):.*",
+        "ERROR",
     ),
-    (re.compile(r".*MemoryError.*", re.IGNORECASE), SeverityLevel.CRITICAL),
-    (re.compile(r".*ModuleNotFoundError.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*SyntaxError:.*", re.IGNORECASE), SeverityLevel.ERROR),
+    (r".*MemoryError.*", "CRITICAL"),
+    (r".*ModuleNotFoundError.*", "ERROR"),
+    (r".*SyntaxError:.*", "ERROR"),
 ]
 
-DOTNET_PATTERNS = [
+DOTNET_PATTERN_SPECS: List[MatcherSpec] = [
     (
-        re.compile(r".*System.NullReferenceException.*", re.IGNORECASE),
-        SeverityLevel.CRITICAL,
+        r".*System.NullReferenceException.*",
+        "CRITICAL",
     ),
     (
-        re.compile(r".*System.OutOfMemoryException.*", re.IGNORECASE),
-        SeverityLevel.CRITICAL,
+        r".*System.OutOfMemoryException.*",
+        "CRITICAL",
     ),
     (
-        re.compile(r".*CS\d{4}:.*", re.IGNORECASE),
-        SeverityLevel.ERROR,
+        r".*CS\d{4}:.*",
+        "ERROR",
     ),  # compiler errors like CS1001
 ]
 
-SH_PATTERNS = [
-    (re.compile(r".*command not found.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*No such file or directory.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*permission denied.*", re.IGNORECASE), SeverityLevel.ERROR),
+SH_PATTERN_SPECS: List[MatcherSpec] = [
+    (r".*command not found.*", "ERROR"),
+    (r".*No such file or directory.*", "ERROR"),
+    (r".*permission denied.*", "ERROR"),
     (
-        re.compile(r".*unexpected EOF while looking for.*", re.IGNORECASE),
-        SeverityLevel.ERROR,
+        r".*unexpected EOF while looking for.*",
+        "ERROR",
     ),
-    (re.compile(r".*syntax error:.*", re.IGNORECASE), SeverityLevel.ERROR),
+    (r".*syntax error:.*", "ERROR"),
     (
-        re.compile(r".*line \d+:.*", re.IGNORECASE),
-        SeverityLevel.ERROR,
+        r".*line \d+:.*",
+        "ERROR",
     ),  # Shell script line errors
 ]
 
 # Jenkins-specific error patterns
-JENKINS_PATTERNS = [
+JENKINS_PATTERN_SPECS: List[MatcherSpec] = [
     (
-        re.compile(r".*Build step.*marked build as FAILURE.*", re.IGNORECASE),
-        SeverityLevel.CRITICAL,
+        r".*Build step.*marked build as FAILURE.*",
+        "CRITICAL",
     ),
-    (re.compile(r".*FAILURE.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*ERROR.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*FAILED.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*marked build as UNSTABLE.*", re.IGNORECASE), SeverityLevel.WARNING),
+    (r".*FAILURE.*", "ERROR"),
+    (r".*ERROR.*", "ERROR"),
+    (r".*FAILED.*", "ERROR"),
+    (r".*marked build as UNSTABLE.*", "WARNING"),
 ]
 
 # HTTP/Network error patterns
-HTTP_PATTERNS = [
-    (re.compile(r".*curl:.*returned error:.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*401 Unauthorized.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*403 Forbidden.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*404 Not Found.*", re.IGNORECASE), SeverityLevel.ERROR),
+HTTP_PATTERN_SPECS: List[MatcherSpec] = [
+    (r".*curl:.*returned error:.*", "ERROR"),
+    (r".*401 Unauthorized.*", "ERROR"),
+    (r".*403 Forbidden.*", "ERROR"),
+    (r".*404 Not Found.*", "ERROR"),
     (
-        re.compile(r".*500 Internal Server Error.*", re.IGNORECASE),
-        SeverityLevel.CRITICAL,
+        r".*500 Internal Server Error.*",
+        "CRITICAL",
     ),
-    (re.compile(r".*Connection refused.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*timeout.*", re.IGNORECASE), SeverityLevel.WARNING),
+    (r".*Connection refused.*", "ERROR"),
+    (r".*timeout.*", "WARNING"),
 ]
 
 # Test failure patterns
-TEST_PATTERNS = [
-    (re.compile(r".*FAILURES.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*ValidationError:.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*field required.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*test.*failed.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*assertion.*error.*", re.IGNORECASE), SeverityLevel.ERROR),
+TEST_PATTERN_SPECS: List[MatcherSpec] = [
+    (r".*FAILURES.*", "ERROR"),
+    (r".*ValidationError:.*", "ERROR"),
+    (r".*field required.*", "ERROR"),
+    (r".*test.*failed.*", "ERROR"),
+    (r".*assertion.*error.*", "ERROR"),
 ]
 
 # Linting error patterns
-LINT_PATTERNS = [
+LINT_PATTERN_SPECS: List[MatcherSpec] = [
     (
-        re.compile(r".*:(\d+):(\d+):\s+([EWFCN]\d+)\s+(.*)"),
-        SeverityLevel.WARNING,
+        r".*:(\d+):(\d+):\s+([EWFCN]\d+)\s+(.*)",
+        "WARNING",
+        0,
     ),  # flake8 format
-    (re.compile(r".*imported but unused.*", re.IGNORECASE), SeverityLevel.WARNING),
-    (re.compile(r".*line too long.*", re.IGNORECASE), SeverityLevel.WARNING),
-    (re.compile(r".*do not use bare.*except.*", re.IGNORECASE), SeverityLevel.WARNING),
+    (r".*imported but unused.*", "WARNING"),
+    (r".*line too long.*", "WARNING"),
+    (r".*do not use bare.*except.*", "WARNING"),
 ]
 
-SONAR_PATTERNS = [
+SONAR_PATTERN_SPECS: List[MatcherSpec] = [
     (
-        re.compile(r".*SonarScanner.*execution failed.*", re.IGNORECASE),
-        SeverityLevel.ERROR,
+        r".*SonarScanner.*execution failed.*",
+        "ERROR",
     ),
     (
-        re.compile(r".*java.lang.IllegalStateException.*", re.IGNORECASE),
-        SeverityLevel.ERROR,
+        r".*java.lang.IllegalStateException.*",
+        "ERROR",
     ),
 ]
 
-JFROG_PATTERNS = [
-    (re.compile(r".*xray scan failed.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*unauthorized.*", re.IGNORECASE), SeverityLevel.WARNING),
-    (re.compile(r".*failed to resolve artifact.*", re.IGNORECASE), SeverityLevel.ERROR),
+JFROG_PATTERN_SPECS: List[MatcherSpec] = [
+    (r".*xray scan failed.*", "ERROR"),
+    (r".*unauthorized.*", "WARNING"),
+    (r".*failed to resolve artifact.*", "ERROR"),
 ]
 
-DOCKER_PATTERNS = [
-    (re.compile(r".*no space left on device.*", re.IGNORECASE), SeverityLevel.CRITICAL),
-    (re.compile(r".*manifest for .* not found.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*error response from daemon.*", re.IGNORECASE), SeverityLevel.ERROR),
-    (re.compile(r".*failed to pull image.*", re.IGNORECASE), SeverityLevel.ERROR),
+DOCKER_PATTERN_SPECS: List[MatcherSpec] = [
+    (r".*no space left on device.*", "CRITICAL"),
+    (r".*manifest for .* not found.*", "ERROR"),
+    (r".*error response from daemon.*", "ERROR"),
+    (r".*failed to pull image.*", "ERROR"),
 ]
+
+# Compiled on first access and cached on the module.
+__getattr__, __dir__ = compiled_attributes(
+    __name__,
+    {
+        "STAGE_PATTERNS": lambda: compile_stage_patterns(STAGE_PATTERN_SPECS),
+        "GROOVY_PATTERNS": lambda: compile_matchers(
+            GROOVY_PATTERN_SPECS, SeverityLevel
+        ),
+        "JAVA_PATTERNS": lambda: compile_matchers(JAVA_PATTERN_SPECS, SeverityLevel),
+        "NODEJS_PATTERNS": lambda: compile_matchers(
+            NODEJS_PATTERN_SPECS, SeverityLevel
+        ),
+        "PYTHON_PATTERNS": lambda: compile_matchers(
+            PYTHON_PATTERN_SPECS, SeverityLevel
+        ),
+        "DOTNET_PATTERNS": lambda: compile_matchers(
+            DOTNET_PATTERN_SPECS, SeverityLevel
+        ),
+        "SH_PATTERNS": lambda: compile_matchers(SH_PATTERN_SPECS, SeverityLevel),
+        "JENKINS_PATTERNS": lambda: compile_matchers(
+            JENKINS_PATTERN_SPECS, SeverityLevel
+        ),
+        "HTTP_PATTERNS": lambda: compile_matchers(HTTP_PATTERN_SPECS, SeverityLevel),
+        "TEST_PATTERNS": lambda: compile_matchers(TEST_PATTERN_SPECS, SeverityLevel),
+        "LINT_PATTERNS": lambda: compile_matchers(LINT_PATTERN_SPECS, SeverityLevel),
+        "SONAR_PATTERNS": lambda: compile_matchers(SONAR_PATTERN_SPECS, SeverityLevel),
+        "JFROG_PATTERNS": lambda: compile_matchers(JFROG_PATTERN_SPECS, SeverityLevel),
+        "DOCKER_PATTERNS": lambda: compile_matchers(
+            DOCKER_PATTERN_SPECS, SeverityLevel
+        ),
+    },
+)
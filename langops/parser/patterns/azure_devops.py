@@ -1,7 +1,14 @@
-import re
+from typing import List
+from langops.parser.patterns.spec import (
+    LanguageSpecs,
+    StagePatternSpec,
+    compile_language_matchers,
+    compile_stage_patterns,
+    compiled_attributes,
+)
 
 # Azure DevOps Patterns – using common patterns by language
-AZURE_DEVOPS_PATTERNS = {
+AZURE_DEVOPS_PATTERN_SPECS: LanguageSpecs = {
     "python": "common.python",
     "nodejs": "common.nodejs",
     "java": "common.java",
@@ -13,13 +20,26 @@ AZURE_DEVOPS_PATTERNS = {
     "make": "common.make",
 }
 
-AZURE_DEVOPS_STAGE_PATTERNS = [
+AZURE_DEVOPS_STAGE_PATTERN_SPECS: List[StagePatternSpec] = [
     # Match typical Azure DevOps stage/step logs
-    re.compile(r"^##\[group\]Starting: (.+)", re.IGNORECASE),
-    re.compile(r"^##\[section\]Starting: (.+)", re.IGNORECASE),
-    re.compile(r"^##\[stage\]Starting: (.+)", re.IGNORECASE),
-    re.compile(r"^##\[step\]Starting: (.+)", re.IGNORECASE),
-    re.compile(r"^##\[task\] (.+)", re.IGNORECASE),
-    re.compile(r"^\[command\] (.+)", re.IGNORECASE),
-    re.compile(r"^Starting: (.+)", re.IGNORECASE),
+    r"^##\[group\]Starting: (.+)",
+    r"^##\[section\]Starting: (.+)",
+    r"^##\[stage\]Starting: (.+)",
+    r"^##\[step\]Starting: (.+)",
+    r"^##\[task\] (.+)",
+    r"^\[command\] (.+)",
+    r"^Starting: (.+)",
 ]
+
+# Compiled on first access and cached on the module.
+__getattr__, __dir__ = compiled_attributes(
+    __name__,
+    {
+        "AZURE_DEVOPS_PATTERNS": lambda: compile_language_matchers(
+            AZURE_DEVOPS_PATTERN_SPECS
+        ),
+        "AZURE_DEVOPS_STAGE_PATTERNS": lambda: compile_stage_patterns(
+            AZURE_DEVOPS_STAGE_PATTERN_SPECS
+        ),
+    },
+)
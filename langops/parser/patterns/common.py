@@ -1,109 +1,112 @@
-import re
-from langops.parser.types.pipeline_types import SeverityLevel
-from typing import Pattern
+from langops.parser.patterns.spec import (
+    LanguageSpecs,
+    compile_language_matchers,
+    compiled_attributes,
+)
 
-
-def _p(pattern: str, flags: int = re.IGNORECASE) -> Pattern[str]:
-    return re.compile(pattern, flags)
-
-
-COMMON_PATTERNS = {
+COMMON_PATTERN_SPECS: LanguageSpecs = {
     "python": [
-        (_p(r"Traceback \(most recent call last\):"), SeverityLevel.ERROR),
-        (_p(r"MemoryError"), SeverityLevel.CRITICAL),
-        (_p(r"ModuleNotFoundError"), SeverityLevel.ERROR),
-        (_p(r"SyntaxError:"), SeverityLevel.ERROR),
+        (r"Traceback \(most recent call last\):", "ERROR"),
+        (r"MemoryError", "CRITICAL"),
+        (r"ModuleNotFoundError", "ERROR"),
+        (r"SyntaxError:", "ERROR"),
     ],
     "nodejs": [
-        (_p(r"UnhandledPromiseRejectionWarning"), SeverityLevel.ERROR),
-        (_p(r"TypeError:"), SeverityLevel.ERROR),
-        (_p(r"ReferenceError:"), SeverityLevel.ERROR),
-        (_p(r"RangeError:"), SeverityLevel.ERROR),
-        (_p(r"SyntaxError:"), SeverityLevel.ERROR),
-        (_p(r"ENOENT: no such file or directory"), SeverityLevel.ERROR),
-        (_p(r"ECONNREFUSED"), SeverityLevel.WARNING),
-        (_p(r"EADDRINUSE"), SeverityLevel.ERROR),
-        (_p(r"Cannot find module"), SeverityLevel.ERROR),
-        (_p(r"Error: listen EACCES"), SeverityLevel.ERROR),
-        (_p(r"DeprecationWarning:"), SeverityLevel.WARNING),
-        (_p(r"##\[error\]"), SeverityLevel.ERROR),  # Azure DevOps format
-        (_p(r"##\[warning\]"), SeverityLevel.WARNING),  # Azure DevOps format
-        (_p(r"error TS\d{4}:"), SeverityLevel.ERROR),  # TypeScript compiler errors
+        (r"UnhandledPromiseRejectionWarning", "ERROR"),
+        (r"TypeError:", "ERROR"),
+        (r"ReferenceError:", "ERROR"),
+        (r"RangeError:", "ERROR"),
+        (r"SyntaxError:", "ERROR"),
+        (r"ENOENT: no such file or directory", "ERROR"),
+        (r"ECONNREFUSED", "WARNING"),
+        (r"EADDRINUSE", "ERROR"),
+        (r"Cannot find module", "ERROR"),
+        (r"Error: listen EACCES", "ERROR"),
+        (r"DeprecationWarning:", "WARNING"),
+        (r"##\[error\]", "ERROR"),  # Azure DevOps format
+        (r"##\[warning\]", "WARNING"),  # Azure DevOps format
+        (r"error TS\d{4}:", "ERROR"),  # TypeScript compiler errors
         (
-            _p(r"✖ \d+ problems? \(\d+ errors?, \d+ warnings?\)"),
-            SeverityLevel.WARNING,
+            r"✖ \d+ problems? \(\d+ errors?, \d+ warnings?\)",
+            "WARNING",
         ),  # ESLint summary
         (
-            _p(r"'.+' is defined but never used"),
-            SeverityLevel.WARNING,
+            r"'.+' is defined but never used",
+            "WARNING",
         ),  # ESLint warning
-        (_p(r"undefined is not a function"), SeverityLevel.ERROR),
+        (r"undefined is not a function", "ERROR"),
         (
-            _p(r"Cannot read properties of undefined"),
-            SeverityLevel.ERROR,
+            r"Cannot read properties of undefined",
+            "ERROR",
         ),  # LLM error context
     ],
     "java": [
-        (_p(r"Exception in thread"), SeverityLevel.CRITICAL),
-        (_p(r"java\.lang\.NullPointerException"), SeverityLevel.CRITICAL),
-        (_p(r"java\.lang\.OutOfMemoryError"), SeverityLevel.CRITICAL),
-        (_p(r"java\.lang\.ArrayIndexOutOfBoundsException"), SeverityLevel.ERROR),
-        (_p(r"java\.lang\.IllegalArgumentException"), SeverityLevel.ERROR),
-        (_p(r"java\.lang\.IllegalStateException"), SeverityLevel.ERROR),
-        (_p(r"java\.lang\.ClassCastException"), SeverityLevel.ERROR),
-        (_p(r"Caused by:"), SeverityLevel.ERROR),
-        (_p(r"ExceptionMapper"), SeverityLevel.WARNING),
-        (_p(r"java\.sql\.SQLException"), SeverityLevel.ERROR),
+        (r"Exception in thread", "CRITICAL"),
+        (r"java\.lang\.NullPointerException", "CRITICAL"),
+        (r"java\.lang\.OutOfMemoryError", "CRITICAL"),
+        (r"java\.lang\.ArrayIndexOutOfBoundsException", "ERROR"),
+        (r"java\.lang\.IllegalArgumentException", "ERROR"),
+        (r"java\.lang\.IllegalStateException", "ERROR"),
+        (r"java\.lang\.ClassCastException", "ERROR"),
+        (r"Caused by:", "ERROR"),
+        (r"ExceptionMapper", "WARNING"),
+        (r"java\.sql\.SQLException", "ERROR"),
         (
-            _p(r"org\.springframework\.beans\.factory\.BeanCreationException"),
-            SeverityLevel.CRITICAL,
+            r"org\.springframework\.beans\.factory\.BeanCreationException",
+            "CRITICAL",
         ),
-        (_p(r"org\.hibernate\.Exception"), SeverityLevel.ERROR),
+        (r"org\.hibernate\.Exception", "ERROR"),
     ],
     "dotnet": [
-        (_p(r"System\.NullReferenceException"), SeverityLevel.CRITICAL),
-        (_p(r"System\.OutOfMemoryException"), SeverityLevel.CRITICAL),
-        (_p(r"System\.InvalidOperationException"), SeverityLevel.ERROR),
-        (_p(r"System\.ArgumentException"), SeverityLevel.ERROR),
-        (_p(r"System\.IO\.IOException"), SeverityLevel.WARNING),
+        (r"System\.NullReferenceException", "CRITICAL"),
+        (r"System\.OutOfMemoryException", "CRITICAL"),
+        (r"System\.InvalidOperationException", "ERROR"),
+        (r"System\.ArgumentException", "ERROR"),
+        (r"System\.IO\.IOException", "WARNING"),
     ],
     "shell": [
-        (_p(r"command not found"), SeverityLevel.ERROR),
-        (_p(r"syntax error"), SeverityLevel.ERROR),
-        (_p(r"permission denied"), SeverityLevel.ERROR),
-        (_p(r"No such file or directory"), SeverityLevel.ERROR),
-        (_p(r"operation not permitted"), SeverityLevel.ERROR),
+        (r"command not found", "ERROR"),
+        (r"syntax error", "ERROR"),
+        (r"permission denied", "ERROR"),
+        (r"No such file or directory", "ERROR"),
+        (r"operation not permitted", "ERROR"),
     ],
     "batch": [
-        (_p(r"The system cannot find the file specified"), SeverityLevel.ERROR),
-        (_p(r"Access is denied"), SeverityLevel.ERROR),
-        (_p(r"Syntax error in command line"), SeverityLevel.ERROR),
+        (r"The system cannot find the file specified", "ERROR"),
+        (r"Access is denied", "ERROR"),
+        (r"Syntax error in command line", "ERROR"),
         (
-            _p(r"is not recognized as an internal or external command"),
-            SeverityLevel.ERROR,
+            r"is not recognized as an internal or external command",
+            "ERROR",
         ),
     ],
     "docker": [
-        (_p(r"no such file or directory"), SeverityLevel.ERROR),
-        (_p(r"failed to build"), SeverityLevel.CRITICAL),
-        (_p(r"error response from daemon:"), SeverityLevel.CRITICAL),
-        (_p(r"manifest for .* not found"), SeverityLevel.ERROR),
-        (_p(r"unauthorized: authentication required"), SeverityLevel.ERROR),
-        (_p(r"pull access denied"), SeverityLevel.ERROR),
+        (r"no such file or directory", "ERROR"),
+        (r"failed to build", "CRITICAL"),
+        (r"error response from daemon:", "CRITICAL"),
+        (r"manifest for .* not found", "ERROR"),
+        (r"unauthorized: authentication required", "ERROR"),
+        (r"pull access denied", "ERROR"),
     ],
     "kubernetes": [
-        (_p(r"CrashLoopBackOff"), SeverityLevel.CRITICAL),
-        (_p(r"ImagePullBackOff"), SeverityLevel.CRITICAL),
-        (_p(r"Failed to pull image"), SeverityLevel.ERROR),
-        (_p(r"MountVolume.SetUp failed"), SeverityLevel.ERROR),
-        (_p(r"Back-off restarting failed container"), SeverityLevel.ERROR),
-        (_p(r"liveness probe failed"), SeverityLevel.WARNING),
-        (_p(r"readiness probe failed"), SeverityLevel.WARNING),
+        (r"CrashLoopBackOff", "CRITICAL"),
+        (r"ImagePullBackOff", "CRITICAL"),
+        (r"Failed to pull image", "ERROR"),
+        (r"MountVolume.SetUp failed", "ERROR"),
+        (r"Back-off restarting failed container", "ERROR"),
+        (r"liveness probe failed", "WARNING"),
+        (r"readiness probe failed", "WARNING"),
     ],
     "make": [
-        (_p(r"make: \*\*\* .* Error \d+"), SeverityLevel.ERROR),
-        (_p(r"missing separator"), SeverityLevel.ERROR),
-        (_p(r"recursive variable"), SeverityLevel.WARNING),
-        (_p(r"undefined reference to"), SeverityLevel.ERROR),
+        (r"make: \*\*\* .* Error \d+", "ERROR"),
+        (r"missing separator", "ERROR"),
+        (r"recursive variable", "WARNING"),
+        (r"undefined reference to", "ERROR"),
     ],
 }
+
+# Compiled on first access and cached on the module.
+__getattr__, __dir__ = compiled_attributes(
+    __name__,
+    {"COMMON_PATTERNS": lambda: compile_language_matchers(COMMON_PATTERN_SPECS)},
+)
@@ -1,7 +1,14 @@
-import re
+from typing import List
+from langops.parser.patterns.spec import (
+    LanguageSpecs,
+    StagePatternSpec,
+    compile_language_matchers,
+    compile_stage_patterns,
+    compiled_attributes,
+)
 
 # GitHub Actions Patterns
-GITHUB_ACTIONS_PATTERNS = {
+GITHUB_ACTIONS_PATTERN_SPECS: LanguageSpecs = {
     "python": "common.python",
     "nodejs": "common.nodejs",
     "java": "common.java",
@@ -13,15 +20,25 @@ GITHUB_ACTIONS_PATTERNS = {
     "make": "common.make",
 }
 
-GITHUB_ACTIONS_STAGE_PATTERNS = [
-    re.compile(r"\[github\]\s+job\s+'(.+?)'", re.IGNORECASE),
-    re.compile(r"\[github\]\s+step\s+'(.+?)'", re.IGNORECASE),
-    re.compile(r"\[github\]\s+run\s+'(.+?)'", re.IGNORECASE),
-    re.compile(r"\[github\]\s+Running\s+(?:job|step)\s+'(.+?)'", re.IGNORECASE),
-    re.compile(r"::group::\s*(.+)", re.IGNORECASE),
-    re.compile(r"##\[[a-z]+\]\s*Starting:\s*(.+)", re.IGNORECASE),
-    re.compile(
-        r"\[\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[.,]?\d*\]\s+\[INFO\]\s+Stage:\s+(.+)",
-        re.IGNORECASE,
-    ),
+GITHUB_ACTIONS_STAGE_PATTERN_SPECS: List[StagePatternSpec] = [
+    r"\[github\]\s+job\s+'(.+?)'",
+    r"\[github\]\s+step\s+'(.+?)'",
+    r"\[github\]\s+run\s+'(.+?)'",
+    r"\[github\]\s+Running\s+(?:job|step)\s+'(.+?)'",
+    r"::group::\s*(.+)",
+    r"##\[[a-z]+\]\s*Starting:\s*(.+)",
+    r"\[\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[.,]?\d*\]\s+\[INFO\]\s+Stage:\s+(.+)",
 ]
+
+# Compiled on first access and cached on the module.
+__getattr__, __dir__ = compiled_attributes(
+    __name__,
+    {
+        "GITHUB_ACTIONS_PATTERNS": lambda: compile_language_matchers(
+            GITHUB_ACTIONS_PATTERN_SPECS
+        ),
+        "GITHUB_ACTIONS_STAGE_PATTERNS": lambda: compile_stage_patterns(
+            GITHUB_ACTIONS_STAGE_PATTERN_SPECS
+        ),
+    },
+)
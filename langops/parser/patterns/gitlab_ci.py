@@ -1,7 +1,14 @@
-import re
+from typing import List
+from langops.parser.patterns.spec import (
+    LanguageSpecs,
+    StagePatternSpec,
+    compile_language_matchers,
+    compile_stage_patterns,
+    compiled_attributes,
+)
 
 # GitLab CI Patterns (language-level severity mapping)
-GITLAB_CI_PATTERNS = {
+GITLAB_CI_PATTERN_SPECS: LanguageSpecs = {
     "python": "common.python",
     "nodejs": "common.nodejs",
     "java": "common.java",
@@ -14,14 +21,24 @@ GITLAB_CI_PATTERNS = {
 }
 
 # GitLab CI Stage Patterns
-GITLAB_CI_STAGE_PATTERNS = [
-    re.compile(
-        r"\[\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[.,]?\d*\]\s+\[INFO\]\s+Stage:\s+(.+)",
-        re.IGNORECASE,
-    ),
-    re.compile(r"Running with gitlab-runner", re.IGNORECASE),
-    re.compile(r"Executing \"(.+?)\" stage of the job", re.IGNORECASE),
-    re.compile(r"section_(start|end):\d+:[a-zA-Z0-9_-]+", re.IGNORECASE),
-    re.compile(r"\[gitlab\]\s+\{\s*\((.+?)\)\}", re.IGNORECASE),
-    re.compile(r"\[gitlab\]\s+(.+)", re.IGNORECASE),
+GITLAB_CI_STAGE_PATTERN_SPECS: List[StagePatternSpec] = [
+    r"\[\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[.,]?\d*\]\s+\[INFO\]\s+Stage:\s+(.+)",
+    r"Running with gitlab-runner",
+    r"Executing \"(.+?)\" stage of the job",
+    r"section_(start|end):\d+:[a-zA-Z0-9_-]+",
+    r"\[gitlab\]\s+\{\s*\((.+?)\)\}",
+    r"\[gitlab\]\s+(.+)",
 ]
+
+# Compiled on first access and cached on the module.
+__getattr__, __dir__ = compiled_attributes(
+    __name__,
+    {
+        "GITLAB_CI_PATTERNS": lambda: compile_language_matchers(
+            GITLAB_CI_PATTERN_SPECS
+        ),
+        "GITLAB_CI_STAGE_PATTERNS": lambda: compile_stage_patterns(
+            GITLAB_CI_STAGE_PATTERN_SPECS
+        ),
+    },
+)
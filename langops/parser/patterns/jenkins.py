@@ -1,52 +1,52 @@
-import re
-from langops.parser.types.pipeline_types import SeverityLevel
+from typing import List
+from langops.parser.patterns.spec import (
+    LanguageSpecs,
+    StagePatternSpec,
+    compile_language_matchers,
+    compile_stage_patterns,
+    compiled_attributes,
+)
 
 # Jenkins Patterns
-JENKINS_PATTERNS = {
+JENKINS_PATTERN_SPECS: LanguageSpecs = {
     "groovy": [
         (
-            re.compile(r".*groovy\.lang\.MissingPropertyException.*", re.IGNORECASE),
-            SeverityLevel.ERROR,
+            r".*groovy\.lang\.MissingPropertyException.*",
+            "ERROR",
         ),
         (
-            re.compile(r".*unable to resolve class.*", re.IGNORECASE),
-            SeverityLevel.ERROR,
+            r".*unable to resolve class.*",
+            "ERROR",
         ),
         (
-            re.compile(r".*groovy\.lang\.MissingMethodException.*", re.IGNORECASE),
-            SeverityLevel.ERROR,
+            r".*groovy\.lang\.MissingMethodException.*",
+            "ERROR",
         ),
         (
-            re.compile(r".*groovy\.lang\.GroovyRuntimeException.*", re.IGNORECASE),
-            SeverityLevel.ERROR,
+            r".*groovy\.lang\.GroovyRuntimeException.*",
+            "ERROR",
         ),
         (
-            re.compile(r".*java\.lang\.ClassCastException.*", re.IGNORECASE),
-            SeverityLevel.ERROR,
+            r".*java\.lang\.ClassCastException.*",
+            "ERROR",
         ),
         (
-            re.compile(r".*java\.lang\.NullPointerException.*", re.IGNORECASE),
-            SeverityLevel.CRITICAL,
+            r".*java\.lang\.NullPointerException.*",
+            "CRITICAL",
         ),
-        (re.compile(r".*No such property:.*", re.IGNORECASE), SeverityLevel.ERROR),
-        (re.compile(r".*WorkflowScript.*", re.IGNORECASE), SeverityLevel.ERROR),
+        (r".*No such property:.*", "ERROR"),
+        (r".*WorkflowScript.*", "ERROR"),
         (
-            re.compile(
-                r".*org\.codehaus\.groovy\.control\.MultipleCompilationErrorsException.*",
-                re.IGNORECASE,
-            ),
-            SeverityLevel.CRITICAL,
+            r".*org\.codehaus\.groovy\.control\.MultipleCompilationErrorsException.*",
+            "CRITICAL",
         ),
         (
-            re.compile(r".*Cannot invoke method.*on null object.*", re.IGNORECASE),
-            SeverityLevel.ERROR,
+            r".*Cannot invoke method.*on null object.*",
+            "ERROR",
         ),
         (
-            re.compile(
-                r".*groovy\.lang\.MissingMethodException: No signature of method.*",
-                re.IGNORECASE,
-            ),
-            SeverityLevel.ERROR,
+            r".*groovy\.lang\.MissingMethodException: No signature of method.*",
+            "ERROR",
         ),
     ],
     "python": "common.python",
@@ -61,17 +61,23 @@ JENKINS_PATTERNS = {
 }
 
 # Jenkins Stage Patterns
-JENKINS_STAGE_PATTERNS = [
-    re.compile(
-        r"\[\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[.,]?\d*\]\s+\[INFO\]\s+Stage:\s+(.+)",
-        re.IGNORECASE,
-    ),
-    re.compile(r"^\s*\[\s*Pipeline\s*\]\s*\{\s*stage\s*\(.+?\)", re.IGNORECASE),
-    re.compile(r"^\s*\[\s*Pipeline\s*\]\s*stage\s*\('(.+?)'\)", re.IGNORECASE),
-    re.compile(r"\[jenkins\]\s+Running stage\s+'(.+?)'", re.IGNORECASE),
-    re.compile(r"\[jenkins\]\s+Entering stage\s+'(.+?)'", re.IGNORECASE),
-    re.compile(r"\[jenkins\]\s+(.+?)", re.IGNORECASE),
-    re.compile(
-        r"^\s*\[\s*Pipeline\s*\]\s*echo\s+.*Starting\s+stage:\s+(.+)", re.IGNORECASE
-    ),
+JENKINS_STAGE_PATTERN_SPECS: List[StagePatternSpec] = [
+    r"\[\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[.,]?\d*\]\s+\[INFO\]\s+Stage:\s+(.+)",
+    r"^\s*\[\s*Pipeline\s*\]\s*\{\s*stage\s*\(.+?\)",
+    r"^\s*\[\s*Pipeline\s*\]\s*stage\s*\('(.+?)'\)",
+    r"\[jenkins\]\s+Running stage\s+'(.+?)'",
+    r"\[jenkins\]\s+Entering stage\s+'(.+?)'",
+    r"\[jenkins\]\s+(.+?)",
+    r"^\s*\[\s*Pipeline\s*\]\s*echo\s+.*Starting\s+stage:\s+(.+)",
 ]
+
+# Compiled on first access and cached on the module.
+__getattr__, __dir__ = compiled_attributes(
+    __name__,
+    {
+        "JENKINS_PATTERNS": lambda: compile_language_matchers(JENKINS_PATTERN_SPECS),
+        "JENKINS_STAGE_PATTERNS": lambda: compile_stage_patterns(
+            JENKINS_STAGE_PATTERN_SPECS
+        ),
+    },
+)
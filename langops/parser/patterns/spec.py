@@ -0,0 +1,170 @@
+import importlib
+import re
+import sys
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+# Built-in pattern libraries are written as declarative specs (regex source, severity
+# name) and only compiled when a source is first used. Patterns are case-insensitive
+# unless the spec gives explicit flags.
+DEFAULT_FLAGS = re.IGNORECASE
+
+# (regex, severity name) or (regex, severity name, flags)
+MatcherSpec = Union[Tuple[str, str], Tuple[str, str, int]]
+# A language maps to its matcher specs, or to a reference such as "common.python".
+LanguageSpecs = Mapping[str, Union[str, Sequence[MatcherSpec]]]
+# regex, or (regex, flags)
+StagePatternSpec = Union[str, Tuple[str, int]]
+
+
+def _default_severity_type() -> Type[Any]:
+    from langops.parser.types.pipeline_types import SeverityLevel
+
+    return SeverityLevel
+
+
+def compile_matchers(
+    specs: Sequence[MatcherSpec], severity_type: Optional[Type[Any]] = None
+) -> List[Tuple[Pattern[str], Any]]:
+    """
+    Compiles matcher specs into (regex, severity) tuples.
+
+    Args:
+        specs (Sequence[MatcherSpec]): (regex, severity name[, flags]) tuples.
+        severity_type (Optional[Type]): Severity enum; the pipeline SeverityLevel by default.
+
+    Returns:
+        List[Tuple[Pattern[str], Any]]: The compiled matchers, in spec order.
+
+    Raises:
+        KeyError: If a severity name is not a member of the severity enum.
+    """
+    severity_type = severity_type or _default_severity_type()
+    matchers = []
+    for spec in specs:
+        flags = spec[2] if len(spec) > 2 else DEFAULT_FLAGS
+        matchers.append((re.compile(spec[0], flags), severity_type[spec[1]]))
+    return matchers
+
+
+def compile_language_matchers(
+    specs: LanguageSpecs, severity_type: Optional[Type[Any]] = None
+) -> Dict[str, Union[str, List[Tuple[Pattern[str], Any]]]]:
+    """
+    Compiles the matcher specs of every language; references to common patterns
+    (e.g. "common.python") are kept for `PatternResolver.resolve_patterns`.
+
+    Args:
+        specs (LanguageSpecs): Language to matcher specs or reference mapping.
+        severity_type (Optional[Type]): Severity enum; the pipeline SeverityLevel by default.
+
+    Returns:
+        Dict[str, Union[str, List[Tuple[Pattern[str], Any]]]]: The compiled mapping.
+    """
+    return {
+        language: (
+            language_specs
+            if isinstance(language_specs, str)
+            else compile_matchers(language_specs, severity_type)
+        )
+        for language, language_specs in specs.items()
+    }
+
+
+def compile_stage_patterns(specs: Sequence[StagePatternSpec]) -> List[Pattern[str]]:
+    """
+    Compiles stage pattern specs.
+
+    Args:
+        specs (Sequence[StagePatternSpec]): Regex strings or (regex, flags) tuples.
+
+    Returns:
+        List[Pattern[str]]: The compiled stage patterns, in spec order.
+    """
+    return [
+        (
+            re.compile(spec, DEFAULT_FLAGS)
+            if isinstance(spec, str)
+            else re.compile(spec[0], spec[1])
+        )
+        for spec in specs
+    ]
+
+
+def compiled_attributes(
+    module: str, factories: Dict[str, Callable[[], Any]]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Builds the `__getattr__` and `__dir__` (PEP 562) of a pattern module whose compiled
+    attributes are built on first access and cached on the module.
+
+    Each attribute is built once per process even under concurrent first access, so
+    every caller sees the same compiled objects.
+
+    Args:
+        module (str): The `__name__` of the pattern module.
+        factories (Dict[str, Callable[[], Any]]): Attribute name to builder mapping.
+
+    Returns:
+        Tuple[Callable, Callable]: The `__getattr__` and `__dir__` functions.
+    """
+    lock = threading.Lock()
+
+    def __getattr__(name: str) -> Any:
+        factory = factories.get(name)
+        if factory is None:
+            raise AttributeError(f"module {module!r} has no attribute {name!r}")
+        namespace = vars(sys.modules[module])
+        with lock:
+            if name not in namespace:
+                namespace[name] = factory()
+        return namespace[name]
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[module])) | set(factories))
+
+    return __getattr__, __dir__
+
+
+class LazyPatternMapping(Mapping[str, Any]):
+    """
+    Read-only mapping of source names to compiled patterns that imports the defining
+    module of a source, and compiles its patterns, only when that source is looked up.
+
+    Membership tests, iteration and `len` never import or compile anything.
+
+    Args:
+        sources (Dict[str, Tuple[str, str]]): Source name to (module, attribute) mapping.
+    """
+
+    def __init__(self, sources: Dict[str, Tuple[str, str]]) -> None:
+        self._sources = dict(sources)
+
+    def __getitem__(self, source: str) -> Any:
+        module_name, attribute = self._sources[source]
+        return getattr(importlib.import_module(module_name), attribute)
+
+    def __contains__(self, source: object) -> bool:
+        return source in self._sources
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sources)
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def __repr__(self) -> str:
+        return f"LazyPatternMapping({list(self._sources)!r})"
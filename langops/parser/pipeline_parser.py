@@ -1,8 +1,17 @@
 import re
-from typing import Optional, Dict, List, Tuple, cast, Any
+from typing import Optional, Dict, List, Any
 from langops.core.base_parser import BaseParser
 from langops.parser.registry import ParserRegistry
-from langops.parser.utils import PatternResolver, STAGE_NAME_CLEANERS, Extractor
+from langops.parser.utils import PatternResolver, PatternSet, ParseContext, Extractor
+from langops.parser.utils.pattern_set import Matcher
+from langops.parser.utils.context_sampler import ContextSampling
+from langops.parser.utils.metadata import MetadataCollector, metadata_extractors_for
+from langops.parser.utils.line_index import LineIndex
+from langops.parser.utils.result_cache import (
+    ParseResultCache,
+    dump_model,
+    load_model,
+)
 from langops.parser.constants.pipeline_constants import SEVERITY_ORDER
 from langops.parser.types.pipeline_types import (
     SeverityLevel,
@@ -22,39 +31,75 @@ class PipelineParser(BaseParser):
     """
     Initializes the PipelineParser with predefined patterns or custom patterns from a configuration file.
 
+    The compiled patterns live in an immutable, shared PatternSet and all per-parse state lives in a
+    ParseContext, so a single instance can be used from multiple threads at once.
+
     Args:
         source (Optional[str]): The source from which to load predefined patterns. Can be 'jenkins', 'github_actions', 'gitlab_ci', etc.
         config_file (Optional[str]): Path to a YAML configuration file containing custom patterns.
+        pattern_set (Optional[PatternSet]): A prebuilt pattern set to use instead of resolving `source`.
+        cache (Optional[ParseResultCache]): On-disk cache of parse results keyed by log content and configuration.
+        regex_backend (Optional[str]): Regex engine for the pattern set: 're', 'regex', 're2' or 'auto'.
+            Keeps the engine of the pattern set if None.
     """
 
-    patterns: Dict[str, List[Tuple[re.Pattern, SeverityLevel]]]
-    stage_patterns: List[re.Pattern]
+    pattern_set: PatternSet
 
     def __init__(
         self,
         source: Optional[str] = None,
         config_file: Optional[str] = None,
+        pattern_set: Optional[PatternSet] = None,
+        cache: Optional[ParseResultCache] = None,
+        regex_backend: Optional[str] = None,
         **kwargs: Any,
     ) -> None:
-        self.source = source or "unknown"
-        self.patterns = {}
-        self.stage_patterns = []
         self.additional_kwargs = kwargs
+        self.cache = cache
 
-        if source:
-            self.patterns, self.stage_patterns = self._load_source_patterns(source)
+        if pattern_set is None:
+            pattern_set = (
+                self._load_source_patterns(source, regex_backend or "re")
+                if source
+                else PatternSet(source="unknown")
+            )
 
         if config_file:
             custom_patterns = PatternResolver.load_patterns(config_file)
-            self.source = custom_patterns.get("source", self.source)
-            self.patterns.update(custom_patterns.get("patterns", {}))
-            self.stage_patterns.extend(custom_patterns.get("stage_patterns", []))
+            pattern_set = pattern_set.extend(
+                patterns=custom_patterns.get("patterns"),
+                stage_patterns=custom_patterns.get("stage_patterns"),
+                source=custom_patterns.get("source"),
+            )
+            # An explicit argument wins over the engine requested by the YAML file.
+            regex_backend = regex_backend or custom_patterns.get("regex_backend")
+
+        if regex_backend is not None:
+            pattern_set = pattern_set.with_backend(regex_backend)
+
+        self.pattern_set = pattern_set
+
+    @property
+    def source(self) -> str:
+        """The source name of the active pattern set."""
+        return self.pattern_set.source
+
+    @property
+    def patterns(self) -> Dict[str, List[Matcher]]:
+        """A copy of the active matchers grouped by language."""
+        return self.pattern_set.as_dict()
+
+    @property
+    def stage_patterns(self) -> List[re.Pattern]:
+        """A copy of the active stage detection patterns."""
+        return list(self.pattern_set.stage_patterns)
 
     def parse(
         self,
         data: str,
         min_severity: SeverityLevel = SeverityLevel.WARNING,
         deduplicate: bool = True,
+        context: Optional[ContextSampling] = None,
     ) -> ParsedPipelineBundle:
         """
         Parses the given pipeline log data into a structured format.
@@ -63,44 +108,124 @@ class PipelineParser(BaseParser):
             data (str): The raw log data to parse.
             min_severity (SeverityLevel): The minimum severity level to include in the parsed output.
             deduplicate (bool): Whether to deduplicate log entries based on their content.
+            context (Optional[ContextSampling]): When set, keeps a bounded sample of the lines filtered
+                out by `min_severity` and attaches it to each StageWindow as `context`.
 
         Returns:
             ParsedPipelineBundle: A structured representation of the parsed pipeline logs.
         """
         self.validate_input(data)
+        if self.cache is None:
+            return self._parse(data, min_severity, deduplicate, context)
+
+        return self.cache.memoize(
+            data,
+            self._cache_fingerprint(min_severity, deduplicate, context),
+            lambda: self._parse(data, min_severity, deduplicate, context),
+            dump_model,
+            lambda payload: load_model(ParsedPipelineBundle, payload),
+        )
 
-        current_stage = "Unknown"
-        stages_map: Dict[str, StageWindow] = {}
-        seen_logs: set[str] = set()
-        lines = data.splitlines()
+    def _parse(
+        self,
+        data: str,
+        min_severity: SeverityLevel,
+        deduplicate: bool,
+        context: Optional[ContextSampling],
+    ) -> ParsedPipelineBundle:
+        """
+        Runs the actual parse; see `parse` for the arguments.
+        """
+        metadata = MetadataCollector(
+            metadata_extractors_for(self.source), source=self.source
+        )
+        ctx = ParseContext(
+            lines=data.splitlines(),
+            min_severity=min_severity,
+            deduplicate=deduplicate,
+            sampling=context,
+            metadata=metadata,
+        )
 
-        for line_number, line in enumerate(lines, start=1):
+        line_number = 0
+        for line_number, line in enumerate(ctx.lines, start=1):
             line = line.strip()
             if not line:
                 continue
 
-            current_stage = self._process_line(
-                line,
-                line_number,
-                lines,
-                current_stage,
-                stages_map,
-                seen_logs,
-                min_severity,
-                deduplicate,
-            )
+            if not metadata.done:
+                metadata.feed(line)
+            self._process_context_line(ctx, line, line_number)
 
-        if current_stage in stages_map:
-            stages_map[current_stage].end_line = max(
-                stages_map[current_stage].end_line, line_number
+        if ctx.current_stage in ctx.stages_map:
+            ctx.stages_map[ctx.current_stage].end_line = max(
+                ctx.stages_map[ctx.current_stage].end_line, line_number
             )
 
+        for stage_name, sampler in ctx.samplers.items():
+            if stage_name in ctx.stages_map:
+                ctx.stages_map[stage_name].context = sampler.lines()
+
         return ParsedPipelineBundle(
             source=self.source,
-            stages=list(stages_map.values()),
-            metadata=Extractor.metadata(data),
+            stages=list(ctx.stages_map.values()),
+            metadata=metadata.result(),
         )
 
+    def _cache_fingerprint(
+        self,
+        min_severity: SeverityLevel,
+        deduplicate: bool,
+        context: Optional[ContextSampling],
+    ) -> Dict[str, Any]:
+        """
+        Describes everything besides the log content that affects the parse result.
+
+        Returns:
+            Dict[str, Any]: JSON-serializable configuration fingerprint.
+        """
+        return {
+            "parser": "pipeline_parser",
+            "source": self.source,
+            "pattern_set": self.pattern_set.fingerprint,
+            "metadata": [
+                extractor.signature
+                for extractor in metadata_extractors_for(self.source)
+            ],
+            "min_severity": min_severity.value,
+            "deduplicate": deduplicate,
+            "window_size": self.additional_kwargs.get("window_size", 20),
+            "context": repr(context),
+        }
+
+    def parse_file(
+        self,
+        file_path: str,
+        persist_index: bool = True,
+        **parse_kwargs: Any,
+    ) -> ParsedPipelineBundle:
+        """
+        Parses a log file and attaches a line-offset index to every StageWindow.
+
+        The index is reused from (or saved to) a `<file>.lidx` sidecar, so later calls to
+        `StageWindow.raw_lines()` read only the bytes of that stage. The index maps the file
+        on first use; release it with `bundle.close()`, or use the bundle as a context
+        manager.
+
+        Args:
+            file_path (str): Path to the log file.
+            persist_index (bool): Whether to load/save the index sidecar file.
+            **parse_kwargs: Arguments forwarded to `parse`.
+
+        Returns:
+            ParsedPipelineBundle: The parsed bundle with line indexes attached.
+        """
+        bundle = self.parse(self.handle_log_file(file_path), **parse_kwargs)
+        index = LineIndex.open(file_path, persist=persist_index)
+        for stage in bundle.stages:
+            stage.attach_line_index(index)
+        return bundle
+
     def _process_line(
         self,
         line: str,
@@ -115,6 +240,9 @@ class PipelineParser(BaseParser):
         """
         Processes a single line of log data to extract relevant information and update the current stage.
 
+        Kept for callers that manage parse state themselves; the state is wrapped in a ParseContext
+        that shares the given containers.
+
         Args:
             line (str): The log line to process.
             line_number (int): The current line number in the log data.
@@ -128,10 +256,33 @@ class PipelineParser(BaseParser):
         Returns:
             str: The updated current stage name after processing the line.
         """
+        ctx = ParseContext(
+            lines=lines,
+            min_severity=min_severity,
+            deduplicate=deduplicate,
+            current_stage=current_stage,
+            stages_map=stages_map,
+            seen_logs=seen_logs,
+        )
+        self._process_context_line(ctx, line, line_number)
+        return ctx.current_stage
+
+    def _process_context_line(
+        self, ctx: ParseContext, line: str, line_number: int
+    ) -> None:
+        """
+        Processes a single line of log data against the state of the current parse.
+
+        Args:
+            ctx (ParseContext): The state of the parse in progress; updated in place.
+            line (str): The log line to process.
+            line_number (int): The current line number in the log data.
+        """
+        stages_map = ctx.stages_map
         detected_stage = self._detect_stage(line)
         if detected_stage:
-            if current_stage in stages_map:
-                stages_map[current_stage].end_line = line_number - 1
+            if ctx.current_stage in stages_map:
+                stages_map[ctx.current_stage].end_line = line_number - 1
 
             if detected_stage not in stages_map:
                 stages_map[detected_stage] = StageWindow(
@@ -140,69 +291,59 @@ class PipelineParser(BaseParser):
                     end_line=line_number,
                     content=[],
                 )
-            return detected_stage
-
-        language = self._detect_language(line) or "unknown"
-        severity = self._classify_severity(language, line)
-        if not self._is_severity_enough(severity, min_severity):
-            return current_stage
-
-        if deduplicate and line in seen_logs:
-            return current_stage
-        seen_logs.add(line)
+            ctx.current_stage = detected_stage
+            return
+
+        language, severity = self.pattern_set.classify(line)
+        sampler = ctx.sampler(ctx.current_stage)
+        if not self._is_severity_enough(severity, ctx.min_severity):
+            if sampler is not None:
+                sampler.observe(line_number, line, severity)
+            return
+
+        if ctx.deduplicate and line in ctx.seen_logs:
+            return
+        ctx.seen_logs.add(line)
+        if sampler is not None:
+            sampler.mark_entry()
 
         log_entry = LogEntry(
             timestamp=Extractor.timestamp(line),
-            language=language,
+            language=language or "unknown",
             severity=severity,
             line=line_number,
             message=line,
             context_id=Extractor.context_id(
-                lines, line_number, self.additional_kwargs.get("window_size", 20)
+                ctx.lines, line_number, self.additional_kwargs.get("window_size", 20)
             ),
         )
 
-        if current_stage not in stages_map:
-            stages_map[current_stage] = StageWindow(
-                name=current_stage,
+        if ctx.current_stage not in stages_map:
+            stages_map[ctx.current_stage] = StageWindow(
+                name=ctx.current_stage,
                 start_line=line_number,
                 end_line=line_number,
                 content=[],
             )
-        stages_map[current_stage].content.append(log_entry)
-
-        return current_stage
+        stages_map[ctx.current_stage].content.append(log_entry)
 
-    def _load_source_patterns(self, source: str) -> Tuple[Dict, List]:
+    def _load_source_patterns(
+        self, source: str, regex_backend: str = "re"
+    ) -> PatternSet:
         """
-        Loads predefined patterns and stage patterns based on the specified source.
+        Loads the shared pattern set for the specified source.
 
         Args:
             source (str): The source from which to load patterns. Can be 'jenkins', 'github_actions', 'gitlab_ci', etc.
+            regex_backend (str): Regex engine, 're', 'regex', 're2' or 'auto'.
 
         Returns:
-            Tuple[Dict, List]: A tuple containing two elements:
-                - A dictionary of compiled regex patterns for different languages.
-                - A list of compiled regex patterns for stages.
+            PatternSet: The shared, immutable pattern set for the source.
 
         Raises:
             ValueError: If the source is not recognized or does not have associated patterns.
         """
-        from langops.parser.patterns import PATTERNS, STAGE_PATTERNS
-
-        if source in PATTERNS:
-            patterns = PatternResolver.resolve_patterns(
-                cast(Dict[str, Any], PATTERNS[source])
-            )
-        else:
-            raise ValueError(f"Unknown source for patterns: {source}")
-
-        if source in STAGE_PATTERNS:
-            stage_patterns = STAGE_PATTERNS[source]
-        else:
-            raise ValueError(f"Unknown source for stage patterns: {source}")
-
-        return patterns, stage_patterns
+        return PatternSet.for_source(source, regex_backend)
 
     def _detect_stage(self, line: str) -> Optional[str]:
         """
@@ -214,16 +355,7 @@ class PipelineParser(BaseParser):
         Returns:
             Optional[str]: The detected stage name, or None if no stage is detected.
         """
-        for pattern in self.stage_patterns:
-            match = pattern.match(line)
-            if match:
-                cleaner = STAGE_NAME_CLEANERS.get(
-                    self.source, STAGE_NAME_CLEANERS["default"]
-                )
-                cleaned_stage_name = cleaner(match.group(1))
-                if cleaned_stage_name:
-                    return cleaned_stage_name
-        return None
+        return self.pattern_set.detect_stage(line)
 
     def _is_severity_enough(
         self, current_severity: SeverityLevel, min_severity: SeverityLevel
@@ -252,11 +384,7 @@ class PipelineParser(BaseParser):
         Returns:
             Optional[str]: The detected programming language, or None if not recognized.
         """
-        for language, patterns in self.patterns.items():
-            for pattern, _ in patterns:
-                if pattern.search(line):
-                    return language
-        return None
+        return self.pattern_set.detect_language(line)
 
     def _classify_severity(self, language: str, line: str) -> SeverityLevel:
         """
@@ -268,7 +396,4 @@ class PipelineParser(BaseParser):
         Returns:
             SeverityLevel: The classified severity level.
         """
-        for pattern, level in self.patterns.get(language, []):
-            if pattern.search(line):
-                return level
-        return SeverityLevel.INFO
+        return self.pattern_set.classify_severity(language, line)
@@ -0,0 +1,697 @@
+import re
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+from langops.parser.constants.pipeline_constants import SEVERITY_ORDER
+from langops.parser.types.pipeline_types import (
+    LogEntry,
+    ParsedPipelineBundle,
+    SeverityLevel,
+    StageWindow,
+)
+
+
+class QueryRow(NamedTuple):
+    """
+    A query result: the matching entry together with the stage and bundle it belongs to.
+    All three are references to the original objects, never copies.
+    """
+
+    bundle: ParsedPipelineBundle
+    stage: StageWindow
+    entry: LogEntry
+
+
+_FIELD_GETTERS: Dict[str, Callable[[QueryRow], Any]] = {
+    "severity": lambda row: row.entry.severity,
+    "language": lambda row: row.entry.language,
+    "stage": lambda row: row.stage.name,
+    "source": lambda row: row.bundle.source,
+}
+
+_SEVERITY_RANK = {level: rank for rank, level in enumerate(SEVERITY_ORDER)}
+
+
+class EntryIndex:
+    """
+    Lazily built secondary indexes over the entries of one or more bundles.
+
+    Entries are addressed by their position in `rows`. Indexes by severity, language,
+    stage and source are built on first use of each field; the time index is a sorted
+    list of timestamps searched with bisect.
+
+    Attributes:
+        rows (List[QueryRow]): Every entry in document order.
+    """
+
+    def __init__(self, bundles: Sequence[ParsedPipelineBundle]) -> None:
+        """
+        Args:
+            bundles (Sequence[ParsedPipelineBundle]): The bundles to index.
+        """
+        self.rows = [
+            QueryRow(bundle, stage, entry)
+            for bundle in bundles
+            for stage in bundle.stages
+            for entry in stage.content
+        ]
+        self._fields: Dict[str, Dict[Any, List[int]]] = {}
+        self._timeline: Optional[Tuple[List[datetime], List[int]]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def is_current(self, bundles: Sequence[ParsedPipelineBundle]) -> bool:
+        """
+        Checks whether the index still describes the bundles.
+
+        Rows are compared by identity, so stages or entries that were added, removed or
+        replaced in place after indexing are detected. The rows keep every indexed object
+        alive, so identities cannot be reused by new objects.
+
+        Args:
+            bundles (Sequence[ParsedPipelineBundle]): The bundles the index was built from.
+
+        Returns:
+            bool: True if every row matches the bundles' current entries in order.
+        """
+        rows = iter(self.rows)
+        for bundle in bundles:
+            for stage in bundle.stages:
+                for entry in stage.content:
+                    row = next(rows, None)
+                    if (
+                        row is None
+                        or row.entry is not entry
+                        or row.stage is not stage
+                        or row.bundle is not bundle
+                    ):
+                        return False
+        return next(rows, None) is None
+
+    def field(self, name: str) -> Dict[Any, List[int]]:
+        """
+        Returns the index of a field, building it on first use.
+
+        Args:
+            name (str): One of 'severity', 'language', 'stage' or 'source'.
+
+        Returns:
+            Dict[Any, List[int]]: Field values mapped to ascending entry positions.
+        """
+        index = self._fields.get(name)
+        if index is None:
+            getter = _FIELD_GETTERS[name]
+            with self._lock:
+                index = self._fields.get(name)
+                if index is None:
+                    index = {}
+                    for position, row in enumerate(self.rows):
+                        index.setdefault(getter(row), []).append(position)
+                    self._fields[name] = index
+        return index
+
+    def time_range(
+        self, start: Optional[datetime], end: Optional[datetime]
+    ) -> List[int]:
+        """
+        Returns the positions of entries with a timestamp inside [start, end].
+
+        Args:
+            start (Optional[datetime]): Inclusive lower bound, or None for no bound.
+            end (Optional[datetime]): Inclusive upper bound, or None for no bound.
+
+        Returns:
+            List[int]: Matching positions, in timestamp order.
+        """
+        if self._timeline is None:
+            with self._lock:
+                if self._timeline is None:
+                    timed = sorted(
+                        (row.entry.timestamp, position)
+                        for position, row in enumerate(self.rows)
+                        if row.entry.timestamp is not None
+                    )
+                    self._timeline = (
+                        [timestamp for timestamp, _ in timed],
+                        [position for _, position in timed],
+                    )
+        times, positions = self._timeline
+        lo = bisect_left(times, start) if start is not None else 0
+        hi = bisect_right(times, end) if end is not None else len(times)
+        return positions[lo:hi]
+
+
+class Predicate(ABC):
+    """
+    Base class of composable query predicates.
+
+    Predicates combine with `&`, `|` and `~`. Predicates on indexed fields (severity,
+    language, stage, source and time) resolve to candidate sets from the `EntryIndex`;
+    any other predicate is evaluated row by row on the remaining candidates. Subclasses
+    must implement `matches`.
+    """
+
+    indexed = False
+
+    @abstractmethod
+    def matches(self, row: QueryRow) -> bool:  # pragma: no cover
+        """Returns True if the row satisfies the predicate."""
+
+    def candidates(self, index: EntryIndex) -> Optional[Set[int]]:
+        """Returns the exact set of matching positions, or None if not indexable."""
+        return None
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return _And(self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return _Or(self, other)
+
+    def __invert__(self) -> "Predicate":
+        return _Not(self)
+
+
+class _FieldPredicate(Predicate):
+    indexed = True
+
+    def __init__(self, name: str, values: Iterable[Any]) -> None:
+        self.name = name
+        self.values = frozenset(values)
+        self._getter = _FIELD_GETTERS[name]
+
+    def matches(self, row: QueryRow) -> bool:
+        return self._getter(row) in self.values
+
+    def candidates(self, index: EntryIndex) -> Optional[Set[int]]:
+        field = index.field(self.name)
+        result: Set[int] = set()
+        for value in self.values:
+            result.update(field.get(value, ()))
+        return result
+
+    def __repr__(self) -> str:
+        return f"{self.name} in {sorted(map(str, self.values))}"
+
+
+class _TimePredicate(Predicate):
+    indexed = True
+
+    def __init__(self, start: Optional[datetime], end: Optional[datetime]) -> None:
+        self.start = start
+        self.end = end
+
+    def matches(self, row: QueryRow) -> bool:
+        timestamp = row.entry.timestamp
+        if timestamp is None:
+            return False
+        if self.start is not None and timestamp < self.start:
+            return False
+        return self.end is None or timestamp <= self.end
+
+    def candidates(self, index: EntryIndex) -> Optional[Set[int]]:
+        return set(index.time_range(self.start, self.end))
+
+    def __repr__(self) -> str:
+        return f"timestamp in [{self.start}, {self.end}]"
+
+
+class _FuncPredicate(Predicate):
+
+    def __init__(self, func: Callable[[QueryRow], bool], name: str) -> None:
+        self.func = func
+        self.name = name
+
+    def matches(self, row: QueryRow) -> bool:
+        return bool(self.func(row))
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+class _And(Predicate):
+
+    def __init__(self, *parts: Predicate) -> None:
+        self.parts = parts
+        self.indexed = all(part.indexed for part in parts)
+
+    def matches(self, row: QueryRow) -> bool:
+        return all(part.matches(row) for part in self.parts)
+
+    def candidates(self, index: EntryIndex) -> Optional[Set[int]]:
+        # Intersect the indexable parts; unindexable parts are applied to the result.
+        result: Optional[Set[int]] = None
+        for part in self.parts:
+            if not part.indexed:
+                continue
+            found = part.candidates(index)
+            if found is None:
+                continue
+            result = found if result is None else result & found
+            if not result:
+                return set()
+        return result
+
+    def __repr__(self) -> str:
+        return "(" + " & ".join(map(repr, self.parts)) + ")"
+
+
+class _Or(Predicate):
+
+    def __init__(self, *parts: Predicate) -> None:
+        self.parts = parts
+        self.indexed = all(part.indexed for part in parts)
+
+    def matches(self, row: QueryRow) -> bool:
+        return any(part.matches(row) for part in self.parts)
+
+    def candidates(self, index: EntryIndex) -> Optional[Set[int]]:
+        if not self.indexed:
+            return None
+        result: Set[int] = set()
+        for part in self.parts:
+            found = part.candidates(index)
+            if found is None:
+                return None
+            result |= found
+        return result
+
+    def __repr__(self) -> str:
+        return "(" + " | ".join(map(repr, self.parts)) + ")"
+
+
+class _Not(Predicate):
+
+    def __init__(self, part: Predicate) -> None:
+        self.part = part
+        self.indexed = part.indexed
+
+    def matches(self, row: QueryRow) -> bool:
+        return not self.part.matches(row)
+
+    def candidates(self, index: EntryIndex) -> Optional[Set[int]]:
+        found = self.part.candidates(index) if self.indexed else None
+        if found is None:
+            return None
+        return set(range(len(index))) - found
+
+    def __repr__(self) -> str:
+        return f"~{self.part!r}"
+
+
+def _values(value: Any) -> Iterable[Any]:
+    if isinstance(value, (str, SeverityLevel)) or not isinstance(value, Iterable):
+        return (value,)
+    return value
+
+
+class Where:
+    """
+    Factory of query predicates.
+
+    Example:
+        (Where.severity(SeverityLevel.CRITICAL) & Where.language("nodejs")) | Where.stage("Deploy")
+    """
+
+    @staticmethod
+    def severity(*levels: Union[SeverityLevel, str]) -> Predicate:
+        """Entries with one of the given severities."""
+        return _FieldPredicate("severity", (SeverityLevel(level) for level in levels))
+
+    @staticmethod
+    def min_severity(level: Union[SeverityLevel, str]) -> Predicate:
+        """Entries at or above the given severity."""
+        rank = _SEVERITY_RANK[SeverityLevel(level)]
+        return _FieldPredicate("severity", SEVERITY_ORDER[rank:])
+
+    @staticmethod
+    def language(*languages: Optional[str]) -> Predicate:
+        """Entries detected as one of the given languages (None for undetected)."""
+        return _FieldPredicate("language", languages)
+
+    @staticmethod
+    def stage(*names: str) -> Predicate:
+        """Entries in one of the given stages."""
+        return _FieldPredicate("stage", names)
+
+    @staticmethod
+    def source(*sources: str) -> Predicate:
+        """Entries of bundles from one of the given sources."""
+        return _FieldPredicate("source", sources)
+
+    @staticmethod
+    def between(
+        since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> Predicate:
+        """Entries whose timestamp is inside [since, until]; entries without one never match."""
+        return _TimePredicate(since, until)
+
+    @staticmethod
+    def message_contains(text: str, case_sensitive: bool = True) -> Predicate:
+        """Entries whose message contains `text`."""
+        if case_sensitive:
+            return _FuncPredicate(
+                lambda row: text in row.entry.message, f"message contains {text!r}"
+            )
+        lowered = text.lower()
+        return _FuncPredicate(
+            lambda row: lowered in row.entry.message.lower(),
+            f"message icontains {text!r}",
+        )
+
+    @staticmethod
+    def message_matches(pattern: Union[str, "re.Pattern[str]"]) -> Predicate:
+        """Entries whose message matches the regular expression."""
+        compiled = re.compile(pattern) if isinstance(pattern, str) else pattern
+        return _FuncPredicate(
+            lambda row: compiled.search(row.entry.message) is not None,
+            f"message matches {compiled.pattern!r}",
+        )
+
+    @staticmethod
+    def custom(func: Callable[[QueryRow], bool], name: str = "custom") -> Predicate:
+        """Entries for which `func(row)` is truthy."""
+        return _FuncPredicate(func, name)
+
+
+def _filters_to_predicates(filters: Dict[str, Any]) -> List[Predicate]:
+    predicates = []
+    for key, value in filters.items():
+        if key == "severity":
+            predicates.append(Where.severity(*_values(value)))
+        elif key == "min_severity":
+            predicates.append(Where.min_severity(value))
+        elif key == "language":
+            predicates.append(Where.language(*_values(value)))
+        elif key == "stage":
+            predicates.append(Where.stage(*_values(value)))
+        elif key == "source":
+            predicates.append(Where.source(*_values(value)))
+        elif key == "since":
+            predicates.append(Where.between(since=value))
+        elif key == "until":
+            predicates.append(Where.between(until=value))
+        elif key == "contains":
+            predicates.append(Where.message_contains(value))
+        else:
+            raise ValueError(f"Unknown query filter: {key}")
+    return predicates
+
+
+class _Unset:
+    pass
+
+
+# Distinguishes "keep the current limit" from an explicit `limit(None)` in `_copy`.
+_UNSET = _Unset()
+
+
+_ORDER_KEYS: Dict[str, Callable[[QueryRow], Any]] = {
+    "line": lambda row: row.entry.line,
+    "severity": lambda row: _SEVERITY_RANK[row.entry.severity],
+    # entries without a timestamp sort after every timestamped entry
+    "timestamp": lambda row: (
+        row.entry.timestamp is None,
+        row.entry.timestamp or datetime.min,
+    ),
+    "stage": lambda row: row.stage.name,
+    "language": lambda row: row.entry.language or "",
+    "message": lambda row: row.entry.message,
+}
+
+
+class BundleQuery:
+    """
+    Immutable, lazily evaluated query over the entries of one or more bundles.
+
+    Every builder method returns a new query; nothing is evaluated until a terminal
+    method (`rows`, `all`, `first`, `count`, ...) is called. Results are references to
+    the original entries. Without an explicit `order_by`, results keep document order.
+
+    Example:
+        bundle.query(severity="critical", language="nodejs", stage="Test", since=t).all()
+    """
+
+    def __init__(
+        self,
+        index: EntryIndex,
+        predicate: Optional[Predicate] = None,
+        order: Tuple[Tuple[Callable[[QueryRow], Any], bool], ...] = (),
+        skip: int = 0,
+        take: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            index (EntryIndex): The index to query.
+            predicate (Optional[Predicate]): The filter, or None to match every entry.
+            order (Tuple): (key, descending) sort specifications, most significant first.
+            skip (int): Number of matching rows to skip.
+            take (Optional[int]): Maximum number of rows to return.
+        """
+        self._index = index
+        self._predicate = predicate
+        self._order = order
+        self._skip = skip
+        self._take = take
+
+    def _copy(
+        self,
+        predicate: Optional[Predicate] = None,
+        order: Optional[Tuple[Tuple[Callable[[QueryRow], Any], bool], ...]] = None,
+        skip: Optional[int] = None,
+        take: Union[Optional[int], _Unset] = _UNSET,
+    ) -> "BundleQuery":
+        return BundleQuery(
+            self._index,
+            self._predicate if predicate is None else predicate,
+            self._order if order is None else order,
+            self._skip if skip is None else skip,
+            self._take if isinstance(take, _Unset) else take,
+        )
+
+    def where(self, *predicates: Predicate, **filters: Any) -> "BundleQuery":
+        """
+        Narrows the query; all predicates and filters are combined with AND.
+
+        Args:
+            *predicates (Predicate): Predicates built with `Where`.
+            **filters (Any): Shorthand filters: severity, min_severity, language, stage,
+                source, since, until and contains. Values may be single items or iterables.
+
+        Returns:
+            BundleQuery: The narrowed query.
+
+        Raises:
+            ValueError: If an unknown filter name is given.
+        """
+        parts = list(predicates) + _filters_to_predicates(filters)
+        if self._predicate is not None:
+            parts.insert(0, self._predicate)
+        if not parts:
+            return self
+        return self._copy(predicate=parts[0] if len(parts) == 1 else _And(*parts))
+
+    def order_by(
+        self,
+        key: Union[str, Callable[[QueryRow], Any]],
+        descending: bool = False,
+    ) -> "BundleQuery":
+        """
+        Adds a sort key; earlier keys take precedence over later ones.
+
+        Args:
+            key (Union[str, Callable]): 'line', 'severity', 'timestamp', 'stage', 'language',
+                'message', or a function of a `QueryRow`.
+            descending (bool): Sort in descending order.
+
+        Returns:
+            BundleQuery: The sorted query.
+        """
+        if isinstance(key, str):
+            if key not in _ORDER_KEYS:
+                raise ValueError(f"Unknown order key: {key}")
+            key = _ORDER_KEYS[key]
+        return self._copy(order=self._order + ((key, descending),))
+
+    def offset(self, count: int) -> "BundleQuery":
+        """Skips the first `count` matching rows."""
+        if count < 0:
+            raise ValueError("offset must be non-negative")
+        return self._copy(skip=count)
+
+    def limit(self, count: Optional[int]) -> "BundleQuery":
+        """Returns at most `count` rows (None for no limit)."""
+        if count is not None and count < 0:
+            raise ValueError("limit must be non-negative")
+        return self._copy(take=count)
+
+    def page(self, number: int, size: int) -> "BundleQuery":
+        """
+        Selects one page of results.
+
+        Args:
+            number (int): The 1-based page number.
+            size (int): The page size.
+
+        Returns:
+            BundleQuery: The paginated query.
+        """
+        if number < 1 or size < 1:
+            raise ValueError("page number and size must be positive")
+        return self._copy(skip=(number - 1) * size, take=size)
+
+    def _matching(self) -> List[int]:
+        predicate, index = self._predicate, self._index
+        if predicate is None:
+            return list(range(len(index)))
+        found = predicate.candidates(index)
+        if found is not None and predicate.indexed:
+            return sorted(found)
+        positions = sorted(found) if found is not None else range(len(index))
+        rows = index.rows
+        return [position for position in positions if predicate.matches(rows[position])]
+
+    def rows(self) -> List[QueryRow]:
+        """Returns the matching rows after sorting and pagination."""
+        rows = self._index.rows
+        selected = [rows[position] for position in self._matching()]
+        # Stable sorts applied from the least significant key keep multi-key semantics.
+        for key, descending in reversed(self._order):
+            selected.sort(key=key, reverse=descending)
+        end = None if self._take is None else self._skip + self._take
+        return selected[self._skip : end]
+
+    def all(self) -> List[LogEntry]:
+        """Returns the matching entries after sorting and pagination."""
+        return [row.entry for row in self.rows()]
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(self.all())
+
+    def first(self) -> Optional[LogEntry]:
+        """Returns the first matching entry, or None."""
+        entries = self.limit(1).all()
+        return entries[0] if entries else None
+
+    def exists(self) -> bool:
+        """Returns True if any entry matches, ignoring pagination."""
+        return bool(self._matching())
+
+    def count(self) -> int:
+        """Returns the number of matching entries, ignoring pagination."""
+        predicate = self._predicate
+        if predicate is None:
+            return len(self._index)
+        found = predicate.candidates(self._index) if predicate.indexed else None
+        if found is not None:
+            return len(found)
+        return len(self._matching())
+
+    def count_by(self, field: str) -> Dict[Any, int]:
+        """
+        Counts matching entries per value of a field, ignoring pagination.
+
+        Args:
+            field (str): One of 'severity', 'language', 'stage' or 'source'.
+
+        Returns:
+            Dict[Any, int]: Field values mapped to entry counts.
+        """
+        if field not in _FIELD_GETTERS:
+            raise ValueError(f"Unknown field: {field}")
+        if self._predicate is None:
+            return {
+                value: len(positions)
+                for value, positions in self._index.field(field).items()
+            }
+        getter = _FIELD_GETTERS[field]
+        counts: Dict[Any, int] = {}
+        rows = self._index.rows
+        for position in self._matching():
+            value = getter(rows[position])
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def __repr__(self) -> str:
+        return f"BundleQuery(where={self._predicate!r}, entries={len(self._index)})"
+
+
+def index_for(bundle: ParsedPipelineBundle) -> EntryIndex:
+    """
+    Returns the cached index of a bundle, rebuilding it if the bundle's stages changed.
+
+    Args:
+        bundle (ParsedPipelineBundle): The bundle to index.
+
+    Returns:
+        EntryIndex: The bundle's index.
+    """
+    index = cast(Optional[EntryIndex], bundle._query_index)
+    if index is None or not index.is_current((bundle,)):
+        index = EntryIndex((bundle,))
+        bundle._query_index = index
+    return index
+
+
+class BundleCollection:
+    """
+    A collection of parsed bundles queried as one, e.g. every build of a job.
+
+    The combined index is built lazily on the first query and rebuilt after `add` or
+    when any bundle's stages change.
+    """
+
+    def __init__(self, bundles: Iterable[ParsedPipelineBundle] = ()) -> None:
+        """
+        Args:
+            bundles (Iterable[ParsedPipelineBundle]): The initial bundles.
+        """
+        self.bundles: List[ParsedPipelineBundle] = list(bundles)
+        self._index: Optional[EntryIndex] = None
+
+    def add(self, bundle: ParsedPipelineBundle) -> None:
+        """Adds a bundle to the collection."""
+        self.bundles.append(bundle)
+        self._index = None
+
+    def __len__(self) -> int:
+        return len(self.bundles)
+
+    def __iter__(self) -> Iterator[ParsedPipelineBundle]:
+        return iter(self.bundles)
+
+    def index(self) -> EntryIndex:
+        """Returns the combined index, building it if needed."""
+        if self._index is None or not self._index.is_current(self.bundles):
+            self._index = EntryIndex(self.bundles)
+        return self._index
+
+    def query(self, *predicates: Predicate, **filters: Any) -> BundleQuery:
+        """
+        Starts a query over every entry of every bundle.
+
+        Args:
+            *predicates (Predicate): Predicates built with `Where`.
+            **filters (Any): Shorthand filters, see `BundleQuery.where`.
+
+        Returns:
+            BundleQuery: The query.
+        """
+        return BundleQuery(self.index()).where(*predicates, **filters)
@@ -1,14 +1,28 @@
-from typing import Type, Dict, Optional, Callable, List
+from typing import Type, MutableMapping, Optional, Callable, List
+from langops.core.instance_cache import InstanceCacheMixin
+from langops.core.lazy import LazyRegistry
 
 # Parser registry for langops.parser
 
 
-class ParserRegistry:
+class ParserRegistry(InstanceCacheMixin):
     """
     Registry for parser classes. Allows registration and retrieval of parsers by name.
     """
 
-    _registry: Dict[str, Type] = {}
+    # Built-in components are imported on first lookup, not when the package is
+    # imported. Plugins from other distributions are listed from the 'langops.parsers'
+    # entry-point group and imported when they are looked up.
+    _registry: MutableMapping[str, Type] = LazyRegistry(
+        (
+            "langops.parser.error_parser",
+            "langops.parser.jenkins_parser",
+            "langops.parser.pipeline_parser",
+        ),
+        group="langops.parsers",
+    )
+
+    _component_kind = "parser"
 
     @classmethod
     def register(cls, name: Optional[str] = None) -> Callable[[Type], Type]:
@@ -24,6 +38,7 @@ class ParserRegistry:
 
         def decorator(parser_cls: Type) -> Type:
             key = name or parser_cls.__name__
+            cls._instances.invalidate(key)
             cls._registry[key] = parser_cls
             return parser_cls
 
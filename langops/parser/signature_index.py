@@ -0,0 +1,484 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from langops.parser.constants.pipeline_constants import SEVERITY_ORDER
+from langops.parser.types.pipeline_types import ParsedPipelineBundle, SeverityLevel
+from langops.parser.utils.signature import normalize_signature, signature_hash
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    job TEXT NOT NULL,
+    build TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    UNIQUE (job, build)
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    signature TEXT NOT NULL,
+    example TEXT NOT NULL,
+    occurrences INTEGER NOT NULL DEFAULT 0,
+    builds INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS postings (
+    signature_id INTEGER NOT NULL REFERENCES signatures (id),
+    build_id INTEGER NOT NULL REFERENCES builds (id) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    severity TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS signature_builds (
+    signature_id INTEGER NOT NULL REFERENCES signatures (id),
+    started_at REAL NOT NULL,
+    build_id INTEGER NOT NULL REFERENCES builds (id) ON DELETE CASCADE,
+    job TEXT NOT NULL,
+    occurrences INTEGER NOT NULL,
+    PRIMARY KEY (signature_id, started_at, build_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS signature_jobs (
+    signature_id INTEGER NOT NULL REFERENCES signatures (id),
+    job TEXT NOT NULL,
+    builds INTEGER NOT NULL,
+    PRIMARY KEY (signature_id, job)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_signature ON postings (signature_id, build_id, line);
+CREATE INDEX IF NOT EXISTS postings_by_build ON postings (build_id);
+CREATE INDEX IF NOT EXISTS signatures_by_builds ON signatures (builds);
+CREATE INDEX IF NOT EXISTS signature_builds_by_build ON signature_builds (build_id);
+CREATE INDEX IF NOT EXISTS signature_builds_by_job ON signature_builds (signature_id, job, started_at);
+CREATE INDEX IF NOT EXISTS signature_jobs_by_job ON signature_jobs (job, builds);
+"""
+
+
+@dataclass(frozen=True)
+class SignaturePosting:
+    """
+    One occurrence of an error signature.
+
+    Attributes:
+        job (str): The job (pipeline) name.
+        build (str): The build identifier within the job.
+        stage (str): The stage the entry was found in.
+        line (int): The line number of the entry in the build log.
+        severity (SeverityLevel): The severity of the entry.
+        started_at (datetime): When the build started (or was indexed).
+    """
+
+    job: str
+    build: str
+    stage: str
+    line: int
+    severity: SeverityLevel
+    started_at: datetime
+
+
+@dataclass(frozen=True)
+class SignatureSummary:
+    """
+    Aggregated view of a signature across all indexed builds.
+
+    Attributes:
+        signature (str): The normalized signature.
+        example (str): The first raw message indexed for the signature.
+        occurrences (int): Total number of postings.
+        builds (int): Number of distinct builds the signature appeared in.
+        jobs (List[str]): Jobs the signature appeared in, sorted by name.
+        first_seen (SignaturePosting): The earliest occurrence.
+        last_seen (SignaturePosting): The latest occurrence.
+    """
+
+    signature: str
+    example: str
+    occurrences: int
+    builds: int
+    jobs: List[str]
+    first_seen: SignaturePosting
+    last_seen: SignaturePosting
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+class SignatureIndex:
+    """
+    Local inverted index from normalized error signatures to the builds they occurred in.
+
+    Every `LogEntry` of an indexed `ParsedPipelineBundle` is reduced to a signature with
+    `normalize_signature` and stored in a SQLite database as a posting
+    (job, build, stage, line). Builds can be added incrementally as they finish;
+    re-indexing a build replaces its previous postings. Lookups go through the
+    signature hash into per-signature tables that are kept sorted by build start time,
+    with per-signature totals and job lists maintained on insert, so first-seen, job and
+    summary lookups stay in the millisecond range regardless of how many builds are stored.
+
+    Attributes:
+        path (str): Location of the SQLite database (':memory:' for a transient index).
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        """
+        Args:
+            path (str): Location of the SQLite database; created if missing.
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def add_bundle(
+        self,
+        bundle: ParsedPipelineBundle,
+        job: str,
+        build: Optional[str] = None,
+        started_at: Optional[datetime] = None,
+        min_severity: SeverityLevel = SeverityLevel.WARNING,
+    ) -> int:
+        """
+        Indexes the entries of a parsed build, replacing any previous postings for it.
+
+        Args:
+            bundle (ParsedPipelineBundle): The parsed build log.
+            job (str): The job (pipeline) name.
+            build (Optional[str]): The build identifier. Defaults to the bundle's 'build_id' metadata.
+            started_at (Optional[datetime]): Build start time used to order builds. Defaults to the
+                bundle's 'start_time' metadata, then to the current time.
+            min_severity (SeverityLevel): Entries below this severity are not indexed.
+
+        Returns:
+            int: The number of postings written.
+
+        Raises:
+            ValueError: If no build identifier is given or found in the metadata.
+        """
+        metadata = bundle.metadata or {}
+        build = build if build is not None else metadata.get("build_id")
+        if build is None:
+            raise ValueError("A build identifier is required to index a bundle.")
+        when = _timestamp(started_at)
+        if when is None:
+            when = _timestamp(metadata.get("start_time"))
+        if when is None:
+            when = time.time()
+
+        threshold = SEVERITY_ORDER.index(min_severity)
+        entries = [
+            (stage.name, entry)
+            for stage in bundle.stages
+            for entry in stage.content
+            if SEVERITY_ORDER.index(entry.severity) >= threshold
+        ]
+        return self._add(job, str(build), when, entries)
+
+    def _add(
+        self, job: str, build: str, when: float, entries: Iterable[Tuple[str, Any]]
+    ) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            self._delete_build(cursor, job, build)
+            cursor.execute(
+                "INSERT INTO builds (job, build, started_at) VALUES (?, ?, ?)",
+                (job, build, when),
+            )
+            build_id = cursor.lastrowid
+
+            signature_ids: Dict[str, int] = {}
+            counts: Dict[int, int] = {}
+            postings = []
+            for stage, entry in entries:
+                signature = normalize_signature(entry.message)
+                key = signature_hash(signature, normalized=True)
+                signature_id = signature_ids.get(key)
+                if signature_id is None:
+                    cursor.execute(
+                        "INSERT OR IGNORE INTO signatures (hash, signature, example) "
+                        "VALUES (?, ?, ?)",
+                        (key, signature, entry.message),
+                    )
+                    cursor.execute("SELECT id FROM signatures WHERE hash = ?", (key,))
+                    signature_id = signature_ids[key] = cursor.fetchone()[0]
+                counts[signature_id] = counts.get(signature_id, 0) + 1
+                postings.append(
+                    (signature_id, build_id, stage, entry.line, entry.severity.value)
+                )
+
+            cursor.executemany(
+                "INSERT INTO postings (signature_id, build_id, stage, line, severity) "
+                "VALUES (?, ?, ?, ?, ?)",
+                postings,
+            )
+            cursor.executemany(
+                "INSERT INTO signature_builds "
+                "(signature_id, started_at, build_id, job, occurrences) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(sid, when, build_id, job, n) for sid, n in counts.items()],
+            )
+            cursor.executemany(
+                "UPDATE signatures SET occurrences = occurrences + ?, builds = builds + 1 "
+                "WHERE id = ?",
+                [(n, sid) for sid, n in counts.items()],
+            )
+            cursor.executemany(
+                "INSERT INTO signature_jobs (signature_id, job, builds) VALUES (?, ?, 1) "
+                "ON CONFLICT (signature_id, job) DO UPDATE SET builds = builds + 1",
+                [(sid, job) for sid in counts],
+            )
+        return len(postings)
+
+    @staticmethod
+    def _delete_build(cursor: sqlite3.Cursor, job: str, build: str) -> bool:
+        row = cursor.execute(
+            "SELECT id FROM builds WHERE job = ? AND build = ?", (job, build)
+        ).fetchone()
+        if row is None:
+            return False
+        build_id = row[0]
+        aggregates = cursor.execute(
+            "SELECT signature_id, occurrences FROM signature_builds WHERE build_id = ?",
+            (build_id,),
+        ).fetchall()
+        cursor.executemany(
+            "UPDATE signatures SET occurrences = occurrences - ?, builds = builds - 1 "
+            "WHERE id = ?",
+            [(n, sid) for sid, n in aggregates],
+        )
+        cursor.executemany(
+            "UPDATE signature_jobs SET builds = builds - 1 "
+            "WHERE signature_id = ? AND job = ?",
+            [(sid, job) for sid, _ in aggregates],
+        )
+        cursor.execute(
+            "DELETE FROM signature_jobs WHERE job = ? AND builds <= 0", (job,)
+        )
+        # postings and signature_builds rows cascade
+        cursor.execute("DELETE FROM builds WHERE id = ?", (build_id,))
+        return True
+
+    def remove_build(self, job: str, build: str) -> bool:
+        """
+        Removes a build and its postings from the index.
+
+        Args:
+            job (str): The job name.
+            build (str): The build identifier.
+
+        Returns:
+            bool: True if the build was indexed.
+        """
+        with self._lock, self._conn:
+            return self._delete_build(self._conn.cursor(), job, str(build))
+
+    def _signature_id(self, message: str, normalized: bool) -> Optional[int]:
+        key = signature_hash(message, normalized=normalized)
+        row = self._conn.execute(
+            "SELECT id FROM signatures WHERE hash = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def lookup(
+        self,
+        message: str,
+        job: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+        normalized: bool = False,
+    ) -> List[SignaturePosting]:
+        """
+        Returns the postings of a message's signature, ordered by build start time.
+
+        Args:
+            message (str): A raw log message (or a normalized signature).
+            job (Optional[str]): Restrict results to a single job.
+            limit (Optional[int]): Maximum number of postings to return.
+            newest_first (bool): Return the most recent builds first.
+            normalized (bool): Whether `message` is already a normalized signature.
+
+        Returns:
+            List[SignaturePosting]: The matching postings.
+        """
+        with self._lock:
+            signature_id = self._signature_id(message, normalized)
+            if signature_id is None:
+                return []
+            order = "DESC" if newest_first else "ASC"
+            query = (
+                "SELECT b.job, b.build, p.stage, p.line, p.severity, sb.started_at "
+                # CROSS JOIN pins the join order so SQLite walks signature_builds in
+                # start-time order and LIMIT stops early instead of sorting every posting.
+                "FROM signature_builds sb "
+                "CROSS JOIN postings p ON p.signature_id = sb.signature_id "
+                "AND p.build_id = sb.build_id "
+                "CROSS JOIN builds b ON b.id = sb.build_id "
+                "WHERE sb.signature_id = ?"
+            )
+            params: List[Any] = [signature_id]
+            if job is not None:
+                query += " AND sb.job = ?"
+                params.append(job)
+            query += (
+                f" ORDER BY sb.started_at {order}, sb.build_id {order}, p.line {order}"
+            )
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._posting(row) for row in rows]
+
+    def first_seen(
+        self, message: str, job: Optional[str] = None, normalized: bool = False
+    ) -> Optional[SignaturePosting]:
+        """
+        Returns the earliest occurrence of a message's signature.
+
+        Args:
+            message (str): A raw log message (or a normalized signature).
+            job (Optional[str]): Restrict the search to a single job.
+            normalized (bool): Whether `message` is already a normalized signature.
+
+        Returns:
+            Optional[SignaturePosting]: The first occurrence, or None if never seen.
+        """
+        postings = self.lookup(message, job=job, limit=1, normalized=normalized)
+        return postings[0] if postings else None
+
+    def jobs(self, message: str, normalized: bool = False) -> List[str]:
+        """
+        Returns the jobs a message's signature appeared in.
+
+        Args:
+            message (str): A raw log message (or a normalized signature).
+            normalized (bool): Whether `message` is already a normalized signature.
+
+        Returns:
+            List[str]: Job names, sorted.
+        """
+        with self._lock:
+            signature_id = self._signature_id(message, normalized)
+            if signature_id is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT job FROM signature_jobs WHERE signature_id = ? ORDER BY job",
+                (signature_id,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def summary(
+        self, message: str, normalized: bool = False
+    ) -> Optional[SignatureSummary]:
+        """
+        Aggregates everything known about a message's signature.
+
+        Args:
+            message (str): A raw log message (or a normalized signature).
+            normalized (bool): Whether `message` is already a normalized signature.
+
+        Returns:
+            Optional[SignatureSummary]: The summary, or None if the signature was never seen.
+        """
+        with self._lock:
+            signature_id = self._signature_id(message, normalized)
+            if signature_id is None:
+                return None
+            signature, example, occurrences, builds = self._conn.execute(
+                "SELECT signature, example, occurrences, builds FROM signatures "
+                "WHERE id = ?",
+                (signature_id,),
+            ).fetchone()
+            if not occurrences:
+                return None
+            first = self.lookup(signature, limit=1, normalized=True)[0]
+            last = self.lookup(signature, limit=1, newest_first=True, normalized=True)[
+                0
+            ]
+            jobs = self.jobs(signature, normalized=True)
+        return SignatureSummary(
+            signature=signature,
+            example=example,
+            occurrences=occurrences,
+            builds=builds,
+            jobs=jobs,
+            first_seen=first,
+            last_seen=last,
+        )
+
+    def top_signatures(
+        self, limit: int = 10, job: Optional[str] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        Returns the signatures that appeared in the most builds.
+
+        Args:
+            limit (int): Maximum number of signatures to return.
+            job (Optional[str]): Restrict the ranking to a single job.
+
+        Returns:
+            List[Tuple[str, int]]: (signature, build count) pairs, most frequent first.
+        """
+        if job is None:
+            query = (
+                "SELECT signature, builds FROM signatures WHERE builds > 0 "
+                "ORDER BY builds DESC, signature LIMIT ?"
+            )
+            params: List[Any] = [limit]
+        else:
+            query = (
+                "SELECT s.signature, j.builds FROM signature_jobs j "
+                "JOIN signatures s ON s.id = j.signature_id WHERE j.job = ? "
+                "ORDER BY j.builds DESC, s.signature LIMIT ?"
+            )
+            params = [job, limit]
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def build_count(self) -> int:
+        """Returns the number of indexed builds."""
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM builds").fetchone()[0])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(
+                self._conn.execute(
+                    "SELECT COUNT(*) FROM signatures WHERE builds > 0"
+                ).fetchone()[0]
+            )
+
+    @staticmethod
+    def _posting(row: Tuple[Any, ...]) -> SignaturePosting:
+        job, build, stage, line, severity, started_at = row
+        return SignaturePosting(
+            job=job,
+            build=build,
+            stage=stage,
+            line=line,
+            severity=SeverityLevel(severity),
+            started_at=datetime.fromtimestamp(started_at),
+        )
+
+    def close(self) -> None:
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "SignatureIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"SignatureIndex(path={self.path!r})"
@@ -3,6 +3,7 @@ from langops.parser.types.pipeline_types import (
     ParsedPipelineBundle,
     LogEntry,
     StageWindow,
+    ContextLine,
 )
 
 PIPELINE_TYPES = {
@@ -10,6 +11,7 @@ PIPELINE_TYPES = {
     "ParsedPipelineBundle": ParsedPipelineBundle,
     "LogEntry": LogEntry,
     "StageWindow": StageWindow,
+    "ContextLine": ContextLine,
 }
 
 __all__ = ["PIPELINE_TYPES"]
@@ -1,7 +1,7 @@
 from enum import Enum
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel
+from typing import Optional, List, Dict, Any, Iterator, Protocol
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class SeverityLevel(str, Enum):
@@ -50,6 +50,37 @@ class LogEntry(BaseModel):
         }
 
 
+class ContextLine(BaseModel):
+    """
+    A raw log line kept as surrounding context for the entries of a stage.
+
+    Attributes:
+        line (int): The line number in the source log.
+        message (str): The (possibly truncated) content of the line.
+        kind (str): 'before' for lines preceding an emitted entry, 'sample' for reservoir-sampled lines.
+    """
+
+    line: int
+    message: str
+    kind: str
+
+    def dict(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Override the Pydantic dict method to ensure JSON serialization compatibility.
+        """
+        return {"line": self.line, "message": self.message, "kind": self.kind}
+
+
+class LineSource(Protocol):
+    """
+    Random access to the raw lines of a source log, such as `LineIndex`.
+    """
+
+    def iter_lines(self, start: int, end: int) -> Iterator[str]:
+        """Lazily yields lines `start` to `end` (1-based, inclusive)."""
+        ...  # pragma: no cover
+
+
 class StageWindow(BaseModel):
     """
     Represents a stage in a pipeline, containing logs and metadata.
@@ -59,23 +90,59 @@ class StageWindow(BaseModel):
         start_line (int): The starting line number of the stage in the source code.
         end_line (int): The ending line number of the stage in the source code.
         content (List[LogEntry]): A list of log entries associated with this stage.
+        context (List[ContextLine]): Sampled lower-severity lines kept as context, ordered by line number.
     """
 
     name: str
     start_line: int
     end_line: int
     content: List[LogEntry]
+    context: List[ContextLine] = Field(default_factory=list)
+    _line_index: Optional[LineSource] = PrivateAttr(default=None)
+
+    def attach_line_index(self, index: LineSource) -> None:
+        """
+        Attaches a line index (e.g. `LineIndex`) of the source log for lazy raw line access.
+
+        Args:
+            index (LineSource): An object providing `iter_lines(start, end)`.
+        """
+        self._line_index = index
+
+    def raw_lines(self, index: Optional[LineSource] = None) -> Iterator[str]:
+        """
+        Lazily yields the raw source lines between `start_line` and `end_line`.
+
+        Args:
+            index (Optional[LineSource]): A line index to read from. Defaults to the attached one.
+
+        Returns:
+            Iterator[str]: The raw lines of the stage, read on demand.
+
+        Raises:
+            ValueError: If no line index is given or attached.
+        """
+        source = index if index is not None else self._line_index
+        if source is None:
+            raise ValueError(
+                "No line index attached to this stage; pass one to raw_lines()."
+            )
+        return source.iter_lines(self.start_line, self.end_line)
 
     def dict(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
         """
         Override the Pydantic dict method to ensure JSON serialization compatibility.
+        The 'context' key is only present when context sampling was requested.
         """
-        return {
+        result: Dict[str, Any] = {
             "name": self.name,
             "start_line": self.start_line,
             "end_line": self.end_line,
             "content": [log.dict() for log in self.content],
         }
+        if self.context:
+            result["context"] = [line.dict() for line in self.context]
+        return result
 
 
 class ParsedPipelineBundle(BaseModel):
@@ -91,9 +158,80 @@ class ParsedPipelineBundle(BaseModel):
     source: str
     stages: List[StageWindow]
     metadata: Optional[Dict[str, Any]] = None
+    _query_index: Any = PrivateAttr(default=None)
+
+    def query(self, *predicates: Any, **filters: Any) -> Any:
+        """
+        Starts an indexed query over the entries of all stages.
+
+        Secondary indexes (severity, language, stage, time) are built lazily on first use
+        and reused by later queries until the stages change.
+
+        Args:
+            *predicates (Any): Predicates built with `langops.parser.query.Where`.
+            **filters (Any): Shorthand filters, see `BundleQuery.where`.
+
+        Returns:
+            BundleQuery: The query; results reference the bundle's own entries.
+        """
+        from langops.parser.query import BundleQuery, index_for
+
+        return BundleQuery(index_for(self)).where(*predicates, **filters)
+
+    def diff(self, *baselines: "ParsedPipelineBundle", **options: Any) -> Any:
+        """
+        Compares this build against one or more baseline builds.
+
+        Args:
+            *baselines (ParsedPipelineBundle): Reference builds, e.g. the last green build.
+            **options (Any): Options of `langops.parser.diff.diff_bundles`.
+
+        Returns:
+            BundleDiff: New, resolved and persisting error groups.
+        """
+        from langops.parser.diff import diff_bundles
+
+        return diff_bundles(self, *baselines, **options)
+
+    def close(self) -> None:
+        """
+        Releases the line indexes attached to the stages (see `PipelineParser.parse_file`).
+
+        Stages keep their index, which reopens the file on the next `raw_lines()` call.
+        """
+        indexes = {id(stage._line_index): stage._line_index for stage in self.stages}
+        for index in indexes.values():
+            close = getattr(index, "close", None)
+            if close is not None:
+                close()
+
+    def __enter__(self) -> "ParsedPipelineBundle":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def compress(self, **options: Any) -> Any:
+        """
+        Renders the bundle as compact text for LLM prompts, instead of its JSON dump.
+
+        Args:
+            **options (Any): Options of `langops.parser.compress.compress_bundle`.
+
+        Returns:
+            CompressedBundle: The rendering and its compression ratio.
+        """
+        from langops.parser.compress import compress_bundle
+
+        return compress_bundle(self, **options)
 
     def to_dict(self) -> Dict[str, Any]:
         """
         Custom to_dict method to ensure compatibility with BaseParser.to_dict.
+        Empty stage context lists are omitted, matching StageWindow.dict.
         """
-        return self.dict()
+        result = self.dict()
+        for stage in result["stages"]:
+            if not stage.get("context"):
+                stage.pop("context", None)
+        return result
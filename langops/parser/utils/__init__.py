@@ -1,11 +1,36 @@
-from langops.parser.utils.resolver import PatternResolver
-from langops.parser.utils.stage_cleaner import STAGE_NAME_CLEANERS
+from typing import TYPE_CHECKING
+from langops.core.lazy import lazy_exports
 from langops.parser.utils.extractors import (
     extract_timestamp,
     extract_context_id,
     extract_metadata,
 )
 
+if TYPE_CHECKING:  # pragma: no cover
+    from langops.parser.utils.resolver import PatternResolver
+    from langops.parser.utils.stage_cleaner import STAGE_NAME_CLEANERS
+    from langops.parser.utils.pattern_set import PatternSet, prewarm
+    from langops.parser.utils.parse_context import ParseContext
+    from langops.parser.utils.context_sampler import ContextSampling
+    from langops.parser.utils.line_index import LineIndex
+    from langops.parser.utils.result_cache import ParseResultCache
+    from langops.parser.utils.signature import normalize_signature
+
+__getattr__, __dir__ = lazy_exports(
+    "langops.parser.utils",
+    {
+        "PatternResolver": "langops.parser.utils.resolver",
+        "STAGE_NAME_CLEANERS": "langops.parser.utils.stage_cleaner",
+        "PatternSet": "langops.parser.utils.pattern_set",
+        "prewarm": "langops.parser.utils.pattern_set",
+        "ParseContext": "langops.parser.utils.parse_context",
+        "ContextSampling": "langops.parser.utils.context_sampler",
+        "LineIndex": "langops.parser.utils.line_index",
+        "ParseResultCache": "langops.parser.utils.result_cache",
+        "normalize_signature": "langops.parser.utils.signature",
+    },
+)
+
 
 class Extractor:
     timestamp = staticmethod(extract_timestamp)
@@ -13,4 +38,15 @@ class Extractor:
     metadata = staticmethod(extract_metadata)
 
 
-__all__ = ["PatternResolver", "STAGE_NAME_CLEANERS", "Extractor"]
+__all__ = [
+    "PatternResolver",
+    "STAGE_NAME_CLEANERS",
+    "PatternSet",
+    "prewarm",
+    "ParseContext",
+    "ContextSampling",
+    "LineIndex",
+    "ParseResultCache",
+    "normalize_signature",
+    "Extractor",
+]
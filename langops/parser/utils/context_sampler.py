@@ -0,0 +1,103 @@
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+from langops.parser.types.pipeline_types import ContextLine, SeverityLevel
+
+
+@dataclass(frozen=True)
+class ContextSampling:
+    """
+    Options for keeping a bounded amount of lower-severity context per stage.
+
+    Memory per stage is capped at `before + sample_size + max_lines` lines of at most
+    `max_line_length` characters each, regardless of the size of the log.
+
+    Attributes:
+        before (int): Number of filtered-out lines kept immediately before each emitted entry.
+        sample_size (int): Size of the uniform reservoir sample of the stage's INFO lines.
+        max_lines (int): Upper bound on 'before' lines attached to a single stage.
+        max_line_length (int): Lines longer than this are truncated.
+        seed (Optional[int]): Seed for the reservoir sampler, for reproducible output.
+    """
+
+    before: int = 3
+    sample_size: int = 10
+    max_lines: int = 100
+    max_line_length: int = 500
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        for name in ("before", "sample_size", "max_lines", "max_line_length"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"ContextSampling.{name} must be non-negative")
+
+
+class StageSampler:
+    """
+    Collects context for a single stage using a ring buffer and a reservoir sample.
+
+    Filtered-out lines go into a ring buffer of the last `before` lines; when an entry is
+    emitted, the buffer is flushed into the stage's 'before' context. INFO lines are also
+    offered to a reservoir (Algorithm R), so every INFO line of the stage has the same
+    probability of being kept.
+    """
+
+    def __init__(self, options: ContextSampling, rng: random.Random) -> None:
+        self.options = options
+        self._rng = rng
+        self._ring: Deque[Tuple[int, str]] = deque(maxlen=options.before)
+        self._before: Dict[int, str] = {}
+        self._reservoir: List[Tuple[int, str]] = []
+        self._info_seen = 0
+
+    def observe(self, line_number: int, line: str, severity: SeverityLevel) -> None:
+        """
+        Offers a filtered-out line to the sampler.
+
+        Args:
+            line_number (int): The line number in the source log.
+            line (str): The stripped log line.
+            severity (SeverityLevel): The classified severity of the line.
+        """
+        line = line[: self.options.max_line_length]
+        if self.options.before:
+            self._ring.append((line_number, line))
+
+        if severity != SeverityLevel.INFO or not self.options.sample_size:
+            return
+        self._info_seen += 1
+        if len(self._reservoir) < self.options.sample_size:
+            self._reservoir.append((line_number, line))
+            return
+        slot = self._rng.randrange(self._info_seen)
+        if slot < self.options.sample_size:
+            self._reservoir[slot] = (line_number, line)
+
+    def mark_entry(self) -> None:
+        """
+        Moves the buffered lines into the 'before' context of the entry just emitted.
+        """
+        while self._ring and len(self._before) < self.options.max_lines:
+            line_number, line = self._ring.popleft()
+            self._before[line_number] = line
+        self._ring.clear()
+
+    def lines(self) -> List[ContextLine]:
+        """
+        Returns the collected context ordered by line number.
+
+        Returns:
+            List[ContextLine]: 'before' lines plus reservoir samples not already included.
+        """
+        collected = [
+            ContextLine(line=number, message=text, kind="before")
+            for number, text in self._before.items()
+        ]
+        collected.extend(
+            ContextLine(line=number, message=text, kind="sample")
+            for number, text in self._reservoir
+            if number not in self._before
+        )
+        collected.sort(key=lambda context_line: context_line.line)
+        return collected
@@ -1,12 +1,14 @@
 import re
 from datetime import datetime
 from typing import Optional, Dict, Any, List
+from langops.parser.utils.timestamps import DEFAULT_TIMESTAMP_EXTRACTOR
 
 
 def extract_timestamp(line: str) -> Optional[datetime]:
     """
     Extracts a timestamp from a given line of text.
     Returns the timestamp in ISO 8601 format if found, otherwise returns None.
+    Uses the precompiled rules of `DEFAULT_TIMESTAMP_EXTRACTOR`.
 
     Args:
         line (str): The line of text to search for a timestamp.
@@ -14,36 +16,7 @@ def extract_timestamp(line: str) -> Optional[datetime]:
     Returns:
         Optional[str]: The extracted timestamp in ISO 8601 format, or None if no timestamp is found.
     """
-    # Define multiple patterns to match different timestamp formats
-    timestamp_patterns = [
-        (
-            r"\b\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\b",
-            ["%Y-%m-%d %H:%M:%S,%f", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"],
-        ),
-        (r"\b\d{2}/[A-Za-z]{3}/\d{4}:\d{2}:\d{2}:\d{2}\b", ["%d/%b/%Y:%H:%M:%S"]),
-        (r"\b\d{2}:\d{2}:\d{2}\b", ["%H:%M:%S"]),
-        (r"\b\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}\b", ["%Y/%m/%d %H:%M:%S"]),
-    ]
-
-    # Search for each pattern in the line
-    for pattern, formats in timestamp_patterns:
-        match = re.search(pattern, line)
-
-        # If a match is found, try to parse it with the provided formats
-        if match:
-            raw_timestamp = match.group(0)
-            for fmt in formats:
-                try:
-                    datetime_obj = datetime.strptime(raw_timestamp, fmt)
-                    if datetime_obj.year == 1900:
-                        now = datetime.now()
-                        datetime_obj = datetime_obj.replace(
-                            year=now.year, month=now.month, day=now.day
-                        )
-                    return datetime_obj
-                except ValueError:
-                    continue
-    return None
+    return DEFAULT_TIMESTAMP_EXTRACTOR.extract(line)
 
 
 def extract_context_id(
@@ -143,6 +116,10 @@ def extract_metadata(data: str, source: Optional[str] = None) -> Dict[str, Any]:
     """
     Extracts metadata from the pipeline log data.
 
+    Runs the per-line metadata extractors registered for the source in a single pass and
+    stops reading as soon as every extractor is satisfied. Parsers collect the same metadata
+    inside their main loop instead of calling this function.
+
     Args:
         data (str): The raw log data from which to extract metadata.
         source (Optional[str]): The source of the pipeline logs (e.g., 'jenkins', 'github_actions').
@@ -150,25 +127,11 @@ def extract_metadata(data: str, source: Optional[str] = None) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: A dictionary containing extracted metadata such as build ID, triggered by user, branch, etc.
     """
-    metadata = {}
-
-    build_match = re.search(r"BUILD_ID=([^\s]+)", data)
-    if build_match:
-        metadata["build_id"] = build_match.group(1)
-
-    user_match = re.search(r"Started by user (.+)", data)
-    if user_match:
-        metadata["triggered_by"] = user_match.group(1)
-
-    branch_match = re.search(r"[Bb]ranch[:= ]+([^\s]+)", data)
-    if branch_match:
-        metadata["branch"] = branch_match.group(1)
-
-    if source and "pipeline" in source.lower():
-        metadata["pipeline_system"] = source.lower()
-
-    first_ts = extract_timestamp(data)
-    if first_ts:
-        metadata["start_time"] = first_ts
-
-    return metadata
+    from langops.parser.utils.metadata import MetadataCollector, metadata_extractors_for
+
+    collector = MetadataCollector(metadata_extractors_for(source), source=source)
+    for line in data.splitlines():
+        collector.feed(line)
+        if collector.done:
+            break
+    return collector.result()
@@ -0,0 +1,277 @@
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+# Bumped when line boundaries change, so sidecars of older versions are rebuilt.
+_MAGIC = b"LOIDX002"
+_HEADER = struct.Struct("<8sQqQ")  # magic, file size, mtime_ns, line count
+_CHUNK_SIZE = 1 << 20
+# The UTF-8 encoded line boundaries of `str.splitlines()`; "\r\n" is one boundary.
+_BOUNDARY = re.compile(rb"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+_TRAILING_BOUNDARY = re.compile(_BOUNDARY.pattern + rb"\Z")
+# Chunk endings that may be the start of a boundary completed by the next chunk.
+_PARTIAL_BOUNDARY = re.compile(rb"(?:\r|\xc2|\xe2|\xe2\x80)\Z")
+
+
+class LineIndex:
+    """
+    Compact byte-offset index of the lines of a log file.
+
+    The index stores the start offset of every line in an `array('Q')` (8 bytes per line)
+    and serves any line range with a single slice of a memory-mapped file, so repeated
+    random access into large logs never re-reads or re-splits the whole file.
+
+    Indexes can be persisted to a sidecar file (`<log>.lidx`) which is validated against
+    the size and mtime of the log before being reused.
+
+    Line numbers are 1-based and follow `str.splitlines()` numbering ('\\n', '\\r\\n', a bare
+    '\\r' and the other Unicode line boundaries), matching the line numbers reported by the
+    parsers.
+    """
+
+    SIDECAR_SUFFIX = ".lidx"
+
+    def __init__(
+        self, path: str, offsets: "array[int]", size: int, mtime_ns: int
+    ) -> None:
+        """
+        Args:
+            path (str): Path to the indexed log file.
+            offsets (array): Start offset of every line, followed by the file size as sentinel.
+            size (int): File size in bytes when the index was built.
+            mtime_ns (int): File modification time in nanoseconds when the index was built.
+        """
+        self.path = path
+        self.offsets = offsets
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self._mmap: Optional[mmap.mmap] = None
+        self._file: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, path: str) -> "LineIndex":
+        """
+        Scans a file once and builds its line index.
+
+        Args:
+            path (str): Path to the log file.
+
+        Returns:
+            LineIndex: The freshly built index.
+        """
+        stat = os.stat(path)
+        offsets = array("Q")
+        if stat.st_size:
+            offsets.append(0)
+        position = 0  # file offset of `pending`
+        pending = b""
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(_CHUNK_SIZE)
+                data = pending + chunk
+                if chunk:
+                    # Hold back a possibly incomplete boundary for the next chunk.
+                    partial = _PARTIAL_BOUNDARY.search(data)
+                    cut = partial.start() if partial else len(data)
+                else:
+                    cut = len(data)
+                for match in _BOUNDARY.finditer(data, 0, cut):
+                    offsets.append(position + match.end())
+                position += cut
+                pending = data[cut:]
+                if not chunk:
+                    break
+        if offsets and offsets[-1] == stat.st_size:
+            offsets.pop()  # no empty line after a trailing newline
+        offsets.append(stat.st_size)
+        return cls(path, offsets, stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def sidecar_path(cls, path: str) -> str:
+        """Returns the default sidecar location for a log file."""
+        return path + cls.SIDECAR_SUFFIX
+
+    @classmethod
+    def load(cls, path: str, sidecar: Optional[str] = None) -> Optional["LineIndex"]:
+        """
+        Loads a persisted index if it is still valid for the log file.
+
+        Args:
+            path (str): Path to the log file.
+            sidecar (Optional[str]): Path to the sidecar file. Defaults to `<path>.lidx`.
+
+        Returns:
+            Optional[LineIndex]: The index, or None if missing, corrupt or stale.
+        """
+        sidecar = sidecar or cls.sidecar_path(path)
+        try:
+            stat = os.stat(path)
+            with open(sidecar, "rb") as f:
+                header = f.read(_HEADER.size)
+                if len(header) != _HEADER.size:
+                    return None
+                magic, size, mtime_ns, count = _HEADER.unpack(header)
+                if (
+                    magic != _MAGIC
+                    or size != stat.st_size
+                    or mtime_ns != stat.st_mtime_ns
+                ):
+                    return None
+                offsets = array("Q")
+                offsets.frombytes(f.read())
+        except (OSError, ValueError):
+            return None
+        if len(offsets) != count + 1:
+            return None
+        return cls(path, offsets, size, mtime_ns)
+
+    @classmethod
+    def open(
+        cls, path: str, persist: bool = True, sidecar: Optional[str] = None
+    ) -> "LineIndex":
+        """
+        Returns a valid index for a log file, reusing the sidecar when possible.
+
+        Args:
+            path (str): Path to the log file.
+            persist (bool): Whether to write a sidecar after building a new index.
+            sidecar (Optional[str]): Path to the sidecar file. Defaults to `<path>.lidx`.
+
+        Returns:
+            LineIndex: A valid index for the file.
+        """
+        index = cls.load(path, sidecar) if persist else None
+        if index is None:
+            index = cls.build(path)
+            if persist:
+                try:
+                    index.save(sidecar)
+                except OSError:
+                    pass  # read-only locations still get an in-memory index
+        return index
+
+    def save(self, sidecar: Optional[str] = None) -> str:
+        """
+        Atomically writes the index to a sidecar file.
+
+        Args:
+            sidecar (Optional[str]): Path to the sidecar file. Defaults to `<path>.lidx`.
+
+        Returns:
+            str: The path the index was written to.
+        """
+        sidecar = sidecar or self.sidecar_path(self.path)
+        tmp_path = f"{sidecar}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.size, self.mtime_ns, len(self)))
+            self.offsets.tofile(f)
+        os.replace(tmp_path, sidecar)
+        return sidecar
+
+    def is_valid(self) -> bool:
+        """True if the log file still has the size and mtime the index was built for."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def byte_range(self, start: int, end: int) -> Tuple[int, int]:
+        """
+        Returns the byte span covering lines `start` to `end` (1-based, inclusive).
+
+        Args:
+            start (int): First line number.
+            end (int): Last line number; clamped to the number of lines.
+
+        Returns:
+            Tuple[int, int]: Start and stop byte offsets.
+
+        Raises:
+            IndexError: If `start` is outside the file.
+        """
+        count = len(self)
+        if start < 1 or start > count:
+            raise IndexError(f"Line {start} out of range (1-{count})")
+        end = min(max(end, start), count)
+        return self.offsets[start - 1], self.offsets[end]
+
+    def _buffer(self) -> mmap.mmap:
+        if self._mmap is None:
+            with self._lock:
+                if self._mmap is None:
+                    self._file = open(self.path, "rb")
+                    self._mmap = mmap.mmap(
+                        self._file.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+        return self._mmap
+
+    def iter_lines(self, start: int, end: int) -> Iterator[str]:
+        """
+        Yields the decoded lines `start` to `end` (1-based, inclusive) without line terminators.
+
+        Args:
+            start (int): First line number.
+            end (int): Last line number.
+
+        Yields:
+            str: Each line in the range.
+        """
+        self.byte_range(start, end)  # validates the range
+        end = min(max(end, start), len(self))
+        buffer, offsets = self._buffer(), self.offsets
+        for i in range(start - 1, end):
+            raw = buffer[offsets[i] : offsets[i + 1]]
+            yield _TRAILING_BOUNDARY.sub(b"", raw).decode("utf-8", errors="replace")
+
+    def lines(self, start: int, end: int) -> List[str]:
+        """
+        Returns the decoded lines `start` to `end` (1-based, inclusive).
+
+        Args:
+            start (int): First line number.
+            end (int): Last line number.
+
+        Returns:
+            List[str]: The lines in the range.
+        """
+        return list(self.iter_lines(start, end))
+
+    def line(self, number: int) -> str:
+        """
+        Returns a single decoded line.
+
+        Args:
+            number (int): The 1-based line number.
+
+        Returns:
+            str: The line without its terminator.
+        """
+        return next(self.iter_lines(number, number), "")
+
+    def close(self) -> None:
+        """Releases the memory map and file handle, if open."""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "LineIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"LineIndex(path={self.path!r}, lines={len(self)})"
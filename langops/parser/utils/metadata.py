@@ -0,0 +1,189 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+from langops.parser.utils.extractors import extract_timestamp
+
+
+@dataclass(frozen=True)
+class MetadataExtractor:
+    """
+    Extracts a single metadata value from individual log lines.
+
+    Extractors are immutable and can be shared; the per-parse bookkeeping lives in a
+    MetadataCollector, which retires each extractor as soon as it has produced a value.
+
+    Attributes:
+        key (str): The metadata key the extracted value is stored under.
+        pattern (Optional[Pattern[str]]): Regex searched in each line. Group `group` is the value.
+        group (int): The regex group holding the value.
+        literal (Optional[str]): Cheap substring pre-check; lines without it are skipped.
+        func (Optional[Callable[[str], Any]]): Alternative to `pattern`; returns a value or None.
+    """
+
+    key: str
+    pattern: Optional[Pattern[str]] = None
+    group: int = 1
+    literal: Optional[str] = None
+    func: Optional[Callable[[str], Any]] = None
+
+    @property
+    def signature(self) -> str:
+        """
+        A process-independent description of the extractor, usable in cache keys.
+
+        Returns:
+            str: The key, pattern, group, literal and function name of the extractor.
+        """
+        pattern = self.pattern.pattern if self.pattern is not None else None
+        func = (
+            f"{self.func.__module__}.{self.func.__qualname__}"
+            if self.func is not None
+            else None
+        )
+        return f"{self.key}|{pattern}|{self.group}|{self.literal}|{func}"
+
+    def extract(self, line: str) -> Optional[Any]:
+        """
+        Tries to extract the value from a single line.
+
+        Args:
+            line (str): The log line to inspect.
+
+        Returns:
+            Optional[Any]: The extracted value, or None if the line does not contain it.
+        """
+        if self.literal is not None and self.literal not in line:
+            return None
+        if self.func is not None:
+            return self.func(line)
+        if self.pattern is None:
+            return None
+        match = self.pattern.search(line)
+        return match.group(self.group) if match else None
+
+
+def _first_timestamp(line: str) -> Optional[Any]:
+    # Cheap guard: every supported timestamp format contains "dd:dd".
+    if ":" not in line:
+        return None
+    return extract_timestamp(line)
+
+
+DEFAULT_METADATA_EXTRACTORS: Tuple[MetadataExtractor, ...] = (
+    MetadataExtractor(
+        "build_id", re.compile(r"BUILD_ID=([^\s]+)"), literal="BUILD_ID="
+    ),
+    MetadataExtractor(
+        "triggered_by", re.compile(r"Started by user (.+)"), literal="Started by user "
+    ),
+    MetadataExtractor(
+        "branch", re.compile(r"[Bb]ranch[:= ]+([^\s]+)"), literal="ranch"
+    ),
+    MetadataExtractor("start_time", func=_first_timestamp),
+)
+
+_SOURCE_METADATA_EXTRACTORS: Dict[str, List[MetadataExtractor]] = {
+    "gitlab_ci": [
+        MetadataExtractor(
+            "runner_version",
+            re.compile(r"Running with gitlab-runner\s+(\S+)", re.IGNORECASE),
+        ),
+    ],
+    "azure_devops": [
+        MetadataExtractor(
+            "agent_name",
+            re.compile(r"Agent name:\s*'?([^'\n]+?)'?\s*$", re.IGNORECASE),
+        ),
+    ],
+}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def register_metadata_extractor(source: str, extractor: MetadataExtractor) -> None:
+    """
+    Registers an additional metadata extractor for a pipeline source.
+
+    Args:
+        source (str): The source the extractor applies to (e.g. 'gitlab_ci').
+        extractor (MetadataExtractor): The extractor to add.
+    """
+    with _REGISTRY_LOCK:
+        extractors = list(_SOURCE_METADATA_EXTRACTORS.get(source, []))
+        extractors.append(extractor)
+        _SOURCE_METADATA_EXTRACTORS[source] = extractors
+
+
+def metadata_extractors_for(source: Optional[str]) -> Tuple[MetadataExtractor, ...]:
+    """
+    Returns the default extractors followed by those registered for a source.
+
+    Args:
+        source (Optional[str]): The pipeline source, or None for the defaults only.
+
+    Returns:
+        Tuple[MetadataExtractor, ...]: The extractors to run.
+    """
+    if not source:
+        return DEFAULT_METADATA_EXTRACTORS
+    return DEFAULT_METADATA_EXTRACTORS + tuple(
+        _SOURCE_METADATA_EXTRACTORS.get(source, ())
+    )
+
+
+class MetadataCollector:
+    """
+    Runs a set of metadata extractors line by line during a parse.
+
+    Each extractor keeps the first value it finds and is then retired, so once every
+    extractor is satisfied feeding further lines costs a single attribute check.
+    """
+
+    def __init__(
+        self,
+        extractors: Iterable[MetadataExtractor],
+        source: Optional[str] = None,
+    ) -> None:
+        self.source = source
+        self._pending: List[MetadataExtractor] = list(extractors)
+        self._found: Dict[str, Any] = {}
+
+    @property
+    def done(self) -> bool:
+        """True when every extractor has produced its value."""
+        return not self._pending
+
+    def feed(self, line: str) -> None:
+        """
+        Offers a single log line to the remaining extractors.
+
+        Args:
+            line (str): The log line to inspect.
+        """
+        if not self._pending:
+            return
+        retired = False
+        for extractor in self._pending:
+            if extractor.key in self._found:
+                retired = True
+                continue
+            value = extractor.extract(line)
+            if value is not None:
+                self._found[extractor.key] = value
+                retired = True
+        if retired:
+            self._pending = [e for e in self._pending if e.key not in self._found]
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Returns the collected metadata.
+
+        Returns:
+            Dict[str, Any]: Extracted values keyed by metadata key.
+        """
+        metadata = {k: v for k, v in self._found.items() if k != "start_time"}
+        if self.source and "pipeline" in self.source.lower():
+            metadata["pipeline_system"] = self.source.lower()
+        if "start_time" in self._found:
+            metadata["start_time"] = self._found["start_time"]
+        return metadata
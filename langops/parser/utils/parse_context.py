@@ -0,0 +1,57 @@
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+from langops.parser.types.pipeline_types import SeverityLevel, StageWindow
+from langops.parser.utils.context_sampler import ContextSampling, StageSampler
+from langops.parser.utils.metadata import MetadataCollector
+
+
+@dataclass
+class ParseContext:
+    """
+    Mutable state for a single parse run.
+
+    Parsers keep only immutable configuration on the instance and create a fresh
+    ParseContext for every call to `parse`, so concurrent parses never share state.
+
+    Attributes:
+        lines (List[str]): The complete list of log lines being parsed.
+        min_severity (SeverityLevel): The minimum severity level to include in the parsed output.
+        deduplicate (bool): Whether to deduplicate log entries based on their content.
+        current_stage (str): The name of the stage currently being processed.
+        stages_map (Dict[str, StageWindow]): Stage names mapped to their StageWindow objects.
+        seen_logs (Set[str]): Log lines already emitted, used for deduplication.
+        sampling (Optional[ContextSampling]): Context sampling options, or None to drop filtered lines.
+        samplers (Dict[str, StageSampler]): Per-stage context samplers, created on demand.
+        metadata (Optional[MetadataCollector]): Per-line metadata extractors run inside the main loop.
+    """
+
+    lines: List[str]
+    min_severity: SeverityLevel = SeverityLevel.WARNING
+    deduplicate: bool = True
+    current_stage: str = "Unknown"
+    stages_map: Dict[str, StageWindow] = field(default_factory=dict)
+    seen_logs: Set[str] = field(default_factory=set)
+    sampling: Optional[ContextSampling] = None
+    samplers: Dict[str, StageSampler] = field(default_factory=dict)
+    metadata: Optional[MetadataCollector] = None
+    _rng: Optional[random.Random] = field(default=None, repr=False)
+
+    def sampler(self, stage: str) -> Optional[StageSampler]:
+        """
+        Returns the context sampler for a stage, or None when sampling is disabled.
+
+        Args:
+            stage (str): The stage name.
+
+        Returns:
+            Optional[StageSampler]: The sampler for the stage.
+        """
+        if self.sampling is None:
+            return None
+        sampler = self.samplers.get(stage)
+        if sampler is None:
+            if self._rng is None:
+                self._rng = random.Random(self.sampling.seed)
+            sampler = self.samplers[stage] = StageSampler(self.sampling, self._rng)
+        return sampler
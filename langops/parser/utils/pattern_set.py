@@ -0,0 +1,452 @@
+import dataclasses
+import hashlib
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+)
+from langops.parser.types.pipeline_types import SeverityLevel
+from langops.parser.utils.regex_backend import CompiledRegex, get_backend
+from langops.parser.utils.resolver import PatternResolver
+from langops.parser.utils.stage_cleaner import STAGE_NAME_CLEANERS
+
+Matcher = Tuple[Pattern[str], SeverityLevel]
+StageCleaner = Callable[[str], Optional[str]]
+
+_SOURCE_CACHE: Dict[Tuple[str, str], "PatternSet"] = {}
+_SOURCE_CACHE_LOCK = threading.Lock()
+# (sources, backend) pairs with a pre-fork prewarm hook; fork hooks cannot be removed,
+# so each pair is registered once per process.
+_AT_FORK_PREWARMS: Set[Tuple[Tuple[str, ...], str]] = set()
+
+
+_STAGE_DISPATCH_MODES = ("match", "search")
+
+
+def _cleaner_for(source: str) -> StageCleaner:
+    return STAGE_NAME_CLEANERS.get(source, STAGE_NAME_CLEANERS["default"])
+
+
+def _unescaped(pattern: str, index: int) -> bool:
+    backslashes = 0
+    while index > 0 and pattern[index - 1] == "\\":
+        backslashes += 1
+        index -= 1
+    return backslashes % 2 == 0
+
+
+def searchable(pattern: Pattern[str]) -> Pattern[str]:
+    """
+    Returns an equivalent pattern for `search` with redundant leading/trailing `.*` removed.
+
+    For `search`, `.*X.*` matches exactly the lines `X` matches, but the wrapped form
+    backtracks over the whole line at every start position. Matchers are only used as
+    boolean tests, so the stripped pattern is used for classification while the original
+    object is kept for display and fingerprints.
+
+    Args:
+        pattern (Pattern[str]): A compiled matcher pattern.
+
+    Returns:
+        Pattern[str]: The stripped pattern, or the original if nothing can be removed.
+    """
+    source = pattern.pattern
+    start, end = 0, len(source)
+    if source.startswith(".*") and source[2:3] not in ("?", "+", "*", "{"):
+        start = 2
+    if (
+        end - start >= 2
+        and source.endswith(".*")
+        and _unescaped(source, end - 2)
+        and source[end - 3 : end - 2] != "["
+    ):
+        end -= 2
+    if (start, end) == (0, len(source)) or start >= end:
+        return pattern
+    try:
+        return re.compile(source[start:end], pattern.flags)
+    except re.error:
+        return pattern
+
+
+@dataclass(frozen=True)
+class PatternSet:
+    """
+    Immutable collection of compiled matchers, stage patterns and the stage name cleaner
+    for a single pipeline source.
+
+    A PatternSet never changes after construction, so one instance can be shared by any
+    number of parsers, threads or forked worker processes. Deriving a new set (for example
+    when merging custom YAML patterns) always returns a new object.
+
+    Attributes:
+        source (str): The source the patterns belong to (e.g. 'jenkins').
+        patterns (Tuple): Ordered (language, matchers) pairs; matchers are (regex, severity) tuples.
+        stage_patterns (Tuple[Pattern[str], ...]): Compiled stage detection patterns.
+        cleaner (Callable[[str], Optional[str]]): Function used to clean detected stage names.
+        stage_dispatch (str): 'match' anchors stage patterns at the start of the line and
+            skips patterns whose cleaned name is empty; 'search' finds them anywhere and the
+            first pattern the cleaner accepts (does not return None) decides, as the original
+            JenkinsParser did.
+        regex_backend (str): Engine the matchers and stage patterns run on: 're', 'regex',
+            're2' or 'auto' (see `regex_backend.get_backend`). Patterns the engine cannot
+            compile run on `re`; they are listed in `fallbacks`.
+
+    Classification runs on `searchable` copies of the matchers compiled with the regex
+    backend; `patterns` and `stage_patterns` keep the original `re` objects.
+    """
+
+    source: str = "unknown"
+    patterns: Tuple[Tuple[str, Tuple[Matcher, ...]], ...] = ()
+    stage_patterns: Tuple[Pattern[str], ...] = ()
+    cleaner: StageCleaner = STAGE_NAME_CLEANERS["default"]
+    stage_dispatch: str = "match"
+    regex_backend: str = "re"
+    fallbacks: Tuple[Pattern[str], ...] = field(
+        init=False, repr=False, compare=False, hash=False
+    )
+    _matchers: Tuple[Tuple[str, CompiledRegex, SeverityLevel], ...] = field(
+        init=False, repr=False, compare=False, hash=False
+    )
+    _by_language: Dict[str, Tuple[Tuple[CompiledRegex, SeverityLevel], ...]] = field(
+        init=False, repr=False, compare=False, hash=False
+    )
+    _stage_matchers: Tuple[CompiledRegex, ...] = field(
+        init=False, repr=False, compare=False, hash=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.stage_dispatch not in _STAGE_DISPATCH_MODES:
+            raise ValueError(f"Unknown stage dispatch mode: {self.stage_dispatch}")
+        backend = get_backend(self.regex_backend)
+        object.__setattr__(self, "regex_backend", backend.name)
+        compiled: Dict[int, CompiledRegex] = {}
+        fallbacks: List[Pattern[str]] = []
+
+        def compile_fast(pattern: Pattern[str], strip: bool) -> CompiledRegex:
+            key = id(pattern)
+            if key not in compiled:
+                fast, fell_back = backend.recompile(
+                    searchable(pattern) if strip else pattern
+                )
+                if fell_back:
+                    fallbacks.append(pattern)
+                compiled[key] = fast
+            return compiled[key]
+
+        by_language: Dict[str, Tuple[Tuple[CompiledRegex, SeverityLevel], ...]] = {}
+        matchers = []
+        for language, language_matchers in self.patterns:
+            fast = []
+            for pattern, severity in language_matchers:
+                fast_pattern = compile_fast(pattern, True)
+                fast.append((fast_pattern, severity))
+                matchers.append((language, fast_pattern, severity))
+            by_language[language] = tuple(fast)
+        # Stage patterns capture the stage name, so they are recompiled but not stripped.
+        compiled.clear()
+        stage_matchers = tuple(
+            compile_fast(pattern, False) for pattern in self.stage_patterns
+        )
+        object.__setattr__(self, "fallbacks", tuple(fallbacks))
+        object.__setattr__(self, "_matchers", tuple(matchers))
+        object.__setattr__(self, "_by_language", by_language)
+        object.__setattr__(self, "_stage_matchers", stage_matchers)
+
+    @classmethod
+    def build(
+        cls,
+        source: str,
+        patterns: Optional[Mapping[str, Iterable[Matcher]]] = None,
+        stage_patterns: Optional[Iterable[Pattern[str]]] = None,
+        stage_dispatch: str = "match",
+        regex_backend: str = "re",
+    ) -> "PatternSet":
+        """
+        Builds a PatternSet from mutable pattern containers.
+
+        Args:
+            source (str): The source name; also selects the stage name cleaner.
+            patterns (Optional[Mapping[str, Iterable[Matcher]]]): Matchers grouped by language.
+            stage_patterns (Optional[Iterable[Pattern[str]]]): Compiled stage patterns.
+            stage_dispatch (str): Stage detection mode, 'match' or 'search'.
+            regex_backend (str): Regex engine, 're', 'regex', 're2' or 'auto'.
+
+        Returns:
+            PatternSet: A frozen pattern set.
+
+        Raises:
+            ValueError: If the stage dispatch mode or regex backend is unknown.
+            ImportError: If the engine of the regex backend is not installed.
+        """
+        return cls(
+            source=source,
+            patterns=tuple(
+                (language, tuple(matchers))
+                for language, matchers in (patterns or {}).items()
+            ),
+            stage_patterns=tuple(stage_patterns or ()),
+            cleaner=_cleaner_for(source),
+            stage_dispatch=stage_dispatch,
+            regex_backend=regex_backend,
+        )
+
+    @classmethod
+    def for_source(cls, source: str, regex_backend: str = "re") -> "PatternSet":
+        """
+        Returns the shared PatternSet for one of the built-in sources.
+
+        The set is resolved once per process and backend, and the same instance is returned
+        afterwards.
+
+        Args:
+            source (str): The source from which to load patterns. Can be 'jenkins', 'github_actions', 'gitlab_ci', etc.
+            regex_backend (str): Regex engine, 're', 'regex', 're2' or 'auto'.
+
+        Returns:
+            PatternSet: The shared pattern set for the source.
+
+        Raises:
+            ValueError: If the source is not recognized or does not have associated patterns.
+            ImportError: If the engine of the regex backend is not installed.
+        """
+        regex_backend = get_backend(regex_backend).name
+        cached = _SOURCE_CACHE.get((source, regex_backend))
+        if cached is not None:
+            return cached
+
+        from langops.parser.patterns import PATTERNS, STAGE_PATTERNS
+
+        if source not in PATTERNS:
+            raise ValueError(f"Unknown source for patterns: {source}")
+        if source not in STAGE_PATTERNS:
+            raise ValueError(f"Unknown source for stage patterns: {source}")
+
+        pattern_set = cls.build(
+            source,
+            PatternResolver.resolve_patterns(dict(PATTERNS[source])),
+            STAGE_PATTERNS[source],
+            regex_backend=regex_backend,
+        )
+        with _SOURCE_CACHE_LOCK:
+            return _SOURCE_CACHE.setdefault((source, regex_backend), pattern_set)
+
+    def extend(
+        self,
+        patterns: Optional[Mapping[str, Iterable[Matcher]]] = None,
+        stage_patterns: Optional[Iterable[Pattern[str]]] = None,
+        source: Optional[str] = None,
+    ) -> "PatternSet":
+        """
+        Returns a new PatternSet with additional patterns merged in.
+
+        Languages present in `patterns` replace the existing entry for that language,
+        stage patterns are appended after the existing ones.
+
+        Args:
+            patterns (Optional[Mapping[str, Iterable[Matcher]]]): Matchers grouped by language.
+            stage_patterns (Optional[Iterable[Pattern[str]]]): Additional stage patterns.
+            source (Optional[str]): A new source name. Keeps the current one if None.
+
+        Returns:
+            PatternSet: The merged pattern set.
+        """
+        merged = self.as_dict()
+        merged.update({lang: list(m) for lang, m in (patterns or {}).items()})
+        return PatternSet.build(
+            source or self.source,
+            merged,
+            self.stage_patterns + tuple(stage_patterns or ()),
+            stage_dispatch=self.stage_dispatch,
+            regex_backend=self.regex_backend,
+        )
+
+    def with_backend(self, regex_backend: str) -> "PatternSet":
+        """
+        Returns the same patterns compiled for another regex backend.
+
+        Args:
+            regex_backend (str): Regex engine, 're', 'regex', 're2' or 'auto'.
+
+        Returns:
+            PatternSet: This set if it already uses the backend, a new set otherwise.
+
+        Raises:
+            ValueError: If the regex backend is unknown.
+            ImportError: If the engine of the regex backend is not installed.
+        """
+        if get_backend(regex_backend).name == self.regex_backend:
+            return self
+        return dataclasses.replace(self, regex_backend=regex_backend)
+
+    def as_dict(self) -> Dict[str, List[Matcher]]:
+        """
+        Returns a mutable copy of the matchers grouped by language.
+
+        Returns:
+            Dict[str, List[Matcher]]: Language to (regex, severity) list mapping.
+        """
+        return {language: list(matchers) for language, matchers in self.patterns}
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A stable hash of the pattern set contents, usable as a cache key component.
+
+        Returns:
+            str: Hex digest identifying the source, matchers, stage patterns and cleaner.
+        """
+        digest = hashlib.sha256(self.source.encode("utf-8"))
+        for language, matchers in self.patterns:
+            digest.update(f"\x00{language}".encode("utf-8"))
+            for pattern, severity in matchers:
+                digest.update(
+                    f"\x01{pattern.pattern}\x02{pattern.flags}\x02{severity.value}".encode(
+                        "utf-8"
+                    )
+                )
+        for stage_pattern in self.stage_patterns:
+            digest.update(
+                f"\x03{stage_pattern.pattern}\x02{stage_pattern.flags}".encode("utf-8")
+            )
+        digest.update(
+            f"\x04{self.cleaner.__module__}.{self.cleaner.__qualname__}".encode("utf-8")
+        )
+        digest.update(f"\x05{self.stage_dispatch}".encode("utf-8"))
+        digest.update(f"\x06{self.regex_backend}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def detect_stage(self, line: str) -> Optional[str]:
+        """
+        Detects the stage name from a log line using the stage patterns.
+
+        Args:
+            line (str): The log line to analyze.
+
+        Returns:
+            Optional[str]: The cleaned stage name, or None if no stage is detected.
+        """
+        if self.stage_dispatch == "search":
+            for pattern in self._stage_matchers:
+                match = pattern.search(line)
+                if match and pattern.groups:
+                    cleaned_stage_name = self.cleaner(match.group(1))
+                    if cleaned_stage_name is not None:
+                        return cleaned_stage_name
+            return None
+
+        for pattern in self._stage_matchers:
+            match = pattern.match(line)
+            # Marker patterns without a capture group cannot name a stage.
+            if match and pattern.groups:
+                cleaned_stage_name = self.cleaner(match.group(1))
+                if cleaned_stage_name:
+                    return cleaned_stage_name
+        return None
+
+    def detect_language(self, line: str) -> Optional[str]:
+        """
+        Detects the programming language of a log line.
+
+        Args:
+            line (str): The log line to analyze.
+
+        Returns:
+            Optional[str]: The first language with a matching pattern, or None.
+        """
+        for language, pattern, _ in self._matchers:
+            if pattern.search(line):
+                return language
+        return None
+
+    def classify_severity(self, language: str, line: str) -> SeverityLevel:
+        """
+        Classifies the severity of a log line using the matchers of one language.
+
+        Args:
+            language (str): The language whose matchers are used.
+            line (str): The log line to classify.
+
+        Returns:
+            SeverityLevel: The first matching severity, or INFO if nothing matches.
+        """
+        for pattern, level in self._by_language.get(language, ()):
+            if pattern.search(line):
+                return level
+        return SeverityLevel.INFO
+
+    def classify(self, line: str) -> Tuple[Optional[str], SeverityLevel]:
+        """
+        Detects the language and severity of a log line in a single pass.
+
+        Equivalent to `detect_language` followed by `classify_severity`, but every
+        pattern is evaluated at most once.
+
+        Args:
+            line (str): The log line to classify.
+
+        Returns:
+            Tuple[Optional[str], SeverityLevel]: The language (or None) and its severity.
+        """
+        for language, pattern, level in self._matchers:
+            if pattern.search(line):
+                return language, level
+        return None, SeverityLevel.INFO
+
+    def __repr__(self) -> str:
+        return (
+            f"PatternSet(source={self.source!r}, languages={len(self.patterns)}, "
+            f"stage_patterns={len(self.stage_patterns)}, "
+            f"regex_backend={self.regex_backend!r})"
+        )
+
+
+def prewarm(
+    *sources: str, regex_backend: str = "re", at_fork: bool = False
+) -> List[PatternSet]:
+    """
+    Compiles the shared PatternSets of built-in sources ahead of time.
+
+    Built-in pattern libraries are compiled lazily, the first time a source is used.
+    Servers and worker pools can call this at start-up so that the first parse does not
+    pay for compilation, and so that forked workers inherit the compiled patterns
+    instead of compiling their own copy. It can be passed as a `ProcessPoolExecutor`
+    or `multiprocessing.Pool` initializer.
+
+    Args:
+        *sources (str): Sources to compile. Defaults to every built-in source.
+        regex_backend (str): Regex engine, 're', 'regex', 're2' or 'auto'.
+        at_fork (bool): Defer compilation until just before the next `os.fork()`, so
+            the parent only pays for it once it starts forking workers. The hook is
+            registered once per sources and backend, however often this is called.
+
+    Returns:
+        List[PatternSet]: The compiled pattern sets, empty if compilation was deferred.
+
+    Raises:
+        ValueError: If a source is not recognized.
+        ImportError: If the engine of the regex backend is not installed.
+    """
+    from langops.parser.patterns import STAGE_PATTERNS
+
+    names = sources or tuple(STAGE_PATTERNS)
+    backend = get_backend(regex_backend).name
+    if at_fork and hasattr(os, "register_at_fork"):
+        key = (tuple(names), backend)
+        with _SOURCE_CACHE_LOCK:
+            if key in _AT_FORK_PREWARMS:
+                return []
+            _AT_FORK_PREWARMS.add(key)
+        os.register_at_fork(before=lambda: prewarm(*names, regex_backend=backend))
+        return []
+    return [PatternSet.for_source(source, regex_backend=backend) for source in names]
@@ -0,0 +1,256 @@
+import importlib
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+
+# Flags every backend understands. re.UNICODE is implied for str patterns and ignored.
+_PORTABLE_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.ASCII
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+
+# Preference order of the "auto" backend: the linear-time, ReDoS-safe engine first.
+_AUTO_ORDER = ("re2", "regex", "re")
+
+
+class CompiledRegex(Protocol):
+    """The subset of the compiled pattern API the parsers rely on."""
+
+    @property
+    def pattern(self) -> Any: ...  # pragma: no cover
+
+    @property
+    def groups(self) -> int: ...  # pragma: no cover
+
+    def search(self, string: str) -> Any: ...  # pragma: no cover
+
+    def match(self, string: str) -> Any: ...  # pragma: no cover
+
+
+class RegexBackend:
+    """
+    A regex engine used to compile the matchers of a PatternSet.
+
+    Backends compile a pattern source with `re` flags. When the engine rejects a pattern
+    (unsupported syntax such as lookarounds or backreferences in RE2, or an unsupported
+    flag), that single pattern falls back to the stdlib `re` module and loses the engine's
+    guarantees, such as RE2's linear-time matching.
+
+    Attributes:
+        name (str): The backend name ('re', 'regex' or 're2').
+        module (Any): The imported engine module.
+    """
+
+    name = "re"
+
+    def __init__(self, module: Any = re) -> None:
+        """
+        Args:
+            module (Any): The imported engine module.
+        """
+        self.module = module
+
+    def _compile(self, source: str, flags: int) -> CompiledRegex:
+        return re.compile(source, flags)
+
+    def compile(self, source: str, flags: int = 0) -> Tuple[CompiledRegex, bool]:
+        """
+        Compiles a pattern, falling back to `re` if the engine cannot compile it.
+
+        Args:
+            source (str): The pattern source.
+            flags (int): `re` flags.
+
+        Returns:
+            Tuple[CompiledRegex, bool]: The compiled pattern and whether it fell back to `re`.
+
+        Raises:
+            re.error: If the pattern is not valid for `re` either.
+        """
+        if self.name != "re" and not flags & ~(_PORTABLE_FLAGS | re.UNICODE):
+            try:
+                return self._compile(source, flags & _PORTABLE_FLAGS), False
+            except Exception:
+                pass
+        return re.compile(source, flags), self.name != "re"
+
+    def recompile(self, pattern: "re.Pattern[str]") -> Tuple[CompiledRegex, bool]:
+        """
+        Compiles the source and flags of an existing `re` pattern with this backend.
+
+        Args:
+            pattern (re.Pattern[str]): A compiled stdlib pattern.
+
+        Returns:
+            Tuple[CompiledRegex, bool]: The compiled pattern and whether it fell back to `re`.
+        """
+        if self.name == "re" or not isinstance(pattern.pattern, str):
+            return pattern, False
+        return self.compile(pattern.pattern, pattern.flags)
+
+    def __repr__(self) -> str:
+        return f"RegexBackend({self.name!r})"
+
+
+class _RegexModuleBackend(RegexBackend):
+    """The third-party `regex` module; accepts `re` flags unchanged."""
+
+    name = "regex"
+
+    def _compile(self, source: str, flags: int) -> CompiledRegex:
+        return self.module.compile(source, flags)  # type: ignore[no-any-return]
+
+
+class _RE2Backend(RegexBackend):
+    """google-re2: linear-time matching, no backtracking constructs."""
+
+    name = "re2"
+
+    def _compile(self, source: str, flags: int) -> CompiledRegex:
+        options = self.module.Options()
+        # Unsupported constructs are expected and handled by the fallback.
+        options.log_errors = False
+        prefix = "".join(letter for flag, letter in _INLINE_FLAGS if flags & flag)
+        if prefix:
+            source = f"(?{prefix}){source}"
+        return self.module.compile(source, options)  # type: ignore[no-any-return]
+
+
+_BACKEND_TYPES: Dict[str, Tuple[Callable[[Any], RegexBackend], str, str]] = {
+    "re": (RegexBackend, "re", ""),
+    "regex": (_RegexModuleBackend, "regex", "pip install regex"),
+    "re2": (_RE2Backend, "re2", "pip install google-re2"),
+}
+_BACKENDS: Dict[str, RegexBackend] = {}
+_BACKENDS_LOCK = threading.Lock()
+
+
+def available_backends() -> List[str]:
+    """
+    Returns the names of the backends whose engine is installed.
+
+    Returns:
+        List[str]: Backend names, always including 're'.
+    """
+    names = []
+    for name in _BACKEND_TYPES:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name: str = "re") -> RegexBackend:
+    """
+    Returns the shared backend instance for a name.
+
+    Args:
+        name (str): 're', 'regex', 're2', or 'auto' for the first installed of re2,
+            regex and re. 'auto' prefers the linear-time, ReDoS-safe RE2 engine, which is
+            not necessarily the fastest; patterns RE2 cannot compile fall back to `re` and
+            lose that guarantee.
+
+    Returns:
+        RegexBackend: The backend.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the engine of the backend is not installed.
+    """
+    if name == "auto":
+        for candidate in _AUTO_ORDER:
+            try:
+                return get_backend(candidate)
+            except ImportError:
+                continue
+    if name not in _BACKEND_TYPES:
+        raise ValueError(
+            f"Unknown regex backend: {name}. Expected one of "
+            f"{', '.join(list(_BACKEND_TYPES) + ['auto'])}."
+        )
+    backend = _BACKENDS.get(name)
+    if backend is not None:
+        return backend
+    factory, module_name, hint = _BACKEND_TYPES[name]
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(
+            f"The '{name}' regex backend requires the '{module_name}' module ({hint})."
+        ) from e
+    with _BACKENDS_LOCK:
+        return _BACKENDS.setdefault(name, factory(module))
+
+
+@dataclass(frozen=True)
+class BackendTiming:
+    """
+    Result of benchmarking one backend.
+
+    Attributes:
+        backend (str): The backend name.
+        seconds (float): Best wall time over the repetitions.
+        lines_per_second (float): Classification throughput.
+        fallbacks (int): Patterns the backend could not compile and ran on `re`.
+        agrees (bool): Whether every line got the same (language, severity) as with `re`.
+    """
+
+    backend: str
+    seconds: float
+    lines_per_second: float
+    fallbacks: int
+    agrees: bool
+
+
+def compare_backends(
+    pattern_set: Any,
+    lines: Sequence[str],
+    backends: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+) -> List[BackendTiming]:
+    """
+    Classifies the same lines with a pattern set compiled for each backend.
+
+    Args:
+        pattern_set (PatternSet): The pattern set to benchmark.
+        lines (Sequence[str]): The corpus, one log line per item.
+        backends (Optional[Iterable[str]]): Backends to compare. Defaults to every
+            installed backend.
+        repeat (int): Timing repetitions; the best one is reported.
+
+    Returns:
+        List[BackendTiming]: One result per backend, in the requested order.
+    """
+    reference = pattern_set.with_backend("re")
+    expected = [reference.classify(line) for line in lines]
+    results = []
+    for name in backends if backends is not None else available_backends():
+        candidate = pattern_set.with_backend(name)
+        classify = candidate.classify
+        best = float("inf")
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            actual = [classify(line) for line in lines]
+            best = min(best, time.perf_counter() - start)
+        results.append(
+            BackendTiming(
+                backend=name,
+                seconds=best,
+                lines_per_second=len(lines) / best if best else float("inf"),
+                fallbacks=len(candidate.fallbacks),
+                agrees=actual == expected,
+            )
+        )
+    return results
@@ -1,7 +1,5 @@
 import re
-import yaml
 from typing import Dict, List, Any
-from langops.parser.patterns.common import COMMON_PATTERNS
 from langops.parser.types.pipeline_types import SeverityLevel
 
 
@@ -33,6 +31,9 @@ class PatternResolver:
         resolved_patterns = {}
         for language, patterns in platform_dict.items():
             if isinstance(patterns, str) and patterns.startswith("common."):
+                # Compiled on first use, only when a source references common patterns.
+                from langops.parser.patterns.common import COMMON_PATTERNS
+
                 language_key = patterns.split(".")[1]
                 if language_key not in COMMON_PATTERNS:
                     raise KeyError(f"Missing key in COMMON_PATTERNS: '{language_key}'")
@@ -52,7 +53,9 @@ class PatternResolver:
 
         Returns:
             Dict[str, Any]:
-                A dictionary with two keys:
+                A dictionary with the following keys:
+                - 'source': The optional source name.
+                - 'regex_backend': The optional regex engine ('re', 'regex', 're2' or 'auto').
                 - 'patterns': A dictionary where keys are languages and values are lists of tuples (regex, severity).
                 - 'stage_patterns': A list of compiled regex patterns for stage detection.
 
@@ -62,6 +65,9 @@ class PatternResolver:
             KeyError: If the YAML structure is missing required keys.
             Exception: For any unexpected errors during loading.
         """
+        # yaml is only needed for custom pattern files, so it is not imported at start-up.
+        import yaml
+
         with open(config_file, "r") as file:
             try:
                 raw_data = yaml.safe_load(file)
@@ -98,4 +104,5 @@ class PatternResolver:
             "source": source,
             "patterns": patterns,
             "stage_patterns": stage_patterns,
+            "regex_backend": raw_data.get("regex_backend"),
         }
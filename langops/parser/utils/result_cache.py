@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pydantic import BaseModel
+
+T = TypeVar("T")
+M = TypeVar("M", bound="BaseModel")
+
+# Bump when the serialized form of any cached parse result changes.
+CACHE_FORMAT_VERSION = 1
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "$datetime" in obj:
+        return datetime.fromisoformat(obj["$datetime"])
+    return obj
+
+
+def dump_model(model: "BaseModel") -> str:
+    """
+    Serializes a pydantic model for the cache, keeping datetimes in free-form dicts such as metadata.
+
+    Args:
+        model (BaseModel): The parse result to serialize.
+
+    Returns:
+        str: The JSON payload.
+    """
+    return json.dumps(model.model_dump(), default=_encode, ensure_ascii=False)
+
+
+def load_model(model_cls: Type[M], payload: str) -> M:
+    """
+    Restores a pydantic model serialized with `dump_model`.
+
+    Args:
+        model_cls (Type[M]): The model class to validate into.
+        payload (str): The JSON payload.
+
+    Returns:
+        M: The restored model.
+    """
+    return model_cls.model_validate(json.loads(payload, object_hook=_decode))
+
+
+class ParseResultCache:
+    """
+    Content-addressed, size-bounded on-disk cache of serialized parse results.
+
+    Entries are keyed by a hash of the log content plus a fingerprint of the parser
+    configuration, so any change to the patterns or parse options produces a new key.
+    Files are written atomically (temp file + `os.replace`) and least-recently-used
+    entries are evicted by mtime, which makes the cache safe to share between processes.
+    Write errors (e.g. a full disk) are not raised: the entry is simply not cached.
+
+    Attributes:
+        directory (str): Root directory of the cache.
+        max_bytes (int): Approximate upper bound on the total size of cached entries.
+        hits (int): Number of cache hits served by this instance.
+        misses (int): Number of cache misses seen by this instance.
+    """
+
+    SUFFIX = ".json"
+    TMP_SUFFIX = ".tmp"
+    # Temp files older than this are left over by crashed writers and removed on eviction.
+    STALE_TMP_SECONDS = 3600.0
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Args:
+            directory (str): Root directory of the cache; created if missing.
+            max_bytes (int): Approximate upper bound on the total size of cached entries.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._approx_size: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(data: str, fingerprint: Dict[str, Any]) -> str:
+        """
+        Builds the cache key for a log and a parser configuration.
+
+        Args:
+            data (str): The raw log content.
+            fingerprint (Dict[str, Any]): JSON-serializable description of the parser configuration.
+
+        Returns:
+            str: Hex digest identifying the (content, configuration) pair.
+        """
+        digest = hashlib.blake2b(digest_size=32)
+        digest.update(
+            json.dumps(
+                {"v": CACHE_FORMAT_VERSION, **fingerprint},
+                sort_keys=True,
+                default=str,
+            ).encode("utf-8")
+        )
+        digest.update(b"\x00")
+        digest.update(data.encode("utf-8", errors="surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached payload for a key and marks it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[str]: The payload, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return payload
+
+    def put(self, key: str, payload: str) -> bool:
+        """
+        Stores a payload, evicting least-recently-used entries if the cache is over budget.
+
+        Args:
+            key (str): The cache key.
+            payload (str): The serialized parse result.
+
+        Returns:
+            bool: True if the payload was stored, False if writing it failed.
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{self.TMP_SUFFIX}"
+        encoded = payload.encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+        with self._lock:
+            if self._approx_size is None:
+                self._approx_size = self.size()
+            else:
+                self._approx_size += len(encoded)
+            if self._approx_size > self.max_bytes:
+                self._approx_size = self._evict()
+        return True
+
+    def memoize(
+        self,
+        data: str,
+        fingerprint: Dict[str, Any],
+        compute: Callable[[], T],
+        dump: Callable[[T], str],
+        load: Callable[[str], T],
+    ) -> T:
+        """
+        Returns the cached result for `data`, computing and storing it on a miss. The
+        result is returned even if it cannot be stored.
+
+        Args:
+            data (str): The raw log content.
+            fingerprint (Dict[str, Any]): Description of the parser configuration.
+            compute (Callable[[], T]): Produces the result on a miss.
+            dump (Callable[[T], str]): Serializes a result.
+            load (Callable[[str], T]): Deserializes a cached payload.
+
+        Returns:
+            T: The cached or freshly computed result.
+        """
+        key = self.key(data, fingerprint)
+        payload = self.get(key)
+        if payload is not None:
+            try:
+                return load(payload)
+            except ValueError:
+                pass  # corrupt or outdated entry, recompute below
+        result = compute()
+        self.put(key, dump(result))
+        return result
+
+    def _entries(self, suffix: Optional[str] = None) -> List[Tuple[float, int, str]]:
+        suffix = suffix or self.SUFFIX
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(suffix):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _remove_stale_tmp(self) -> None:
+        # Temp files of writes still in progress in other processes are recent.
+        cutoff = time.time() - self.STALE_TMP_SECONDS
+        for mtime, _, path in self._entries(self.TMP_SUFFIX):
+            if mtime < cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def size(self) -> int:
+        """Returns the current total size of cached entries in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> int:
+        self._remove_stale_tmp()
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # already evicted by another process
+            total -= size
+        return total
+
+    def clear(self) -> None:
+        """Removes every cached entry."""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._approx_size = 0
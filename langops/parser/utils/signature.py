@@ -0,0 +1,67 @@
+import hashlib
+import re
+from typing import List, Pattern, Tuple
+
+# Ordered (pattern, placeholder) rules; earlier rules win because their matches are
+# replaced before the broader number/path rules run.
+_SIGNATURE_RULES: List[Tuple[Pattern[str], str]] = [
+    (re.compile(r"\b[a-zA-Z][a-zA-Z0-9+.-]*://\S+"), "<url>"),
+    (
+        re.compile(
+            r"\b\d{4}[-/]\d{2}[-/]\d{2}(?:[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?"
+            r"(?:Z|[+-]\d{2}:?\d{2})?)?"
+        ),
+        "<ts>",
+    ),
+    (re.compile(r"\b\d{2}/[A-Za-z]{3}/\d{4}:\d{2}:\d{2}:\d{2}\b"), "<ts>"),
+    (re.compile(r"\b\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\b"), "<ts>"),
+    (
+        re.compile(
+            r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+        ),
+        "<id>",
+    ),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<id>"),
+    (
+        re.compile(r"\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{7,}\b"),
+        "<id>",
+    ),
+    (re.compile(r"(?:\b[A-Za-z]:)?[\w.@+~-]*(?:[\\/][\w.@+~-]+){2,}[\\/]?"), "<path>"),
+    (re.compile(r"\b[\w.-]+/[\w.@+-]+\.\w+\b"), "<path>"),
+    (re.compile(r"\b\d+(?:\.\d+)*(?:ms|[smh]|[kmg]?b)?\b", re.IGNORECASE), "<n>"),
+]
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_signature(message: str) -> str:
+    """
+    Reduces a log message to a stable error signature.
+
+    Timestamps, URLs, UUIDs and hex identifiers, file paths and numbers are replaced by
+    placeholders and whitespace is collapsed, so the same failure produces the same
+    signature across builds, agents and workspaces.
+
+    Args:
+        message (str): The raw log message.
+
+    Returns:
+        str: The normalized signature.
+    """
+    for pattern, placeholder in _SIGNATURE_RULES:
+        message = pattern.sub(placeholder, message)
+    return _WHITESPACE.sub(" ", message).strip()
+
+
+def signature_hash(message: str, normalized: bool = False) -> str:
+    """
+    Returns a short, stable hash of a message's signature.
+
+    Args:
+        message (str): The raw log message, or an already normalized signature.
+        normalized (bool): Whether `message` is already normalized.
+
+    Returns:
+        str: A 16 character hex digest.
+    """
+    signature = message if normalized else normalize_signature(message)
+    return hashlib.blake2b(signature.encode("utf-8"), digest_size=8).hexdigest()
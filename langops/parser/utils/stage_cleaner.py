@@ -59,6 +59,11 @@ def gitlab_clean_stage_name(stage_name: str) -> Optional[str]:
     return stage_name
 
 
+_JENKINS_NUMBERING = re.compile(r"^\d+[\.\)]\s*")
+_JENKINS_TRAILING_ANNOTATION = re.compile(r"\s*\[.*?\]$")
+_JENKINS_IGNORED_NAMES = frozenset({"user", "admin", "system", "sh"})
+
+
 def jenkins_clean_stage_name(stage_name: str) -> Optional[str]:
     """
     Cleans the Jenkins stage name by removing common artifacts and checking for invalid names.
@@ -70,16 +75,34 @@ def jenkins_clean_stage_name(stage_name: str) -> Optional[str]:
         Optional[str]: The cleaned stage name or None if invalid.
     """
     stage_name = stage_name.strip()
-    if stage_name.lower() in {"user", "admin", "system", "sh"}:
+    if stage_name.lower() in _JENKINS_IGNORED_NAMES:
         return None
-    stage_name = re.sub(r"^\d+[\.\)]\s*", "", stage_name)
-    stage_name = re.sub(r"\s*\[.*?\]$", "", stage_name)
+    stage_name = _JENKINS_NUMBERING.sub("", stage_name)
+    stage_name = _JENKINS_TRAILING_ANNOTATION.sub("", stage_name)
     return "Pipeline" if stage_name.lower() == "pipeline" else stage_name
 
 
+def jenkins_legacy_clean_stage_name(stage_name: str) -> Optional[str]:
+    """
+    Cleans stage names exactly like the original JenkinsParser: names shorter than two
+    characters are rejected before cleaning, and the cleaned name may be empty.
+
+    Args:
+        stage_name (str): The raw stage name captured by a stage pattern.
+
+    Returns:
+        Optional[str]: The cleaned stage name (possibly empty) or None if rejected.
+    """
+    stage_name = stage_name.strip()
+    if len(stage_name) < 2:
+        return None
+    return jenkins_clean_stage_name(stage_name)
+
+
 STAGE_NAME_CLEANERS: Dict[str, Callable[[str], Optional[str]]] = {
     "github_actions": github_clean_stage_name,
     "gitlab_ci": gitlab_clean_stage_name,
     "jenkins": jenkins_clean_stage_name,
+    "jenkins_legacy": jenkins_legacy_clean_stage_name,
     "default": default_clean_stage_name,
 }
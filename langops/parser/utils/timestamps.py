@@ -0,0 +1,101 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Pattern, Sequence, Tuple
+
+TimestampRule = Tuple[Pattern[str], Tuple[str, ...]]
+
+
+@lru_cache(maxsize=4096)
+def _strptime(text: str, fmt: str) -> Optional[datetime]:
+    # Log lines of one build share few distinct timestamps per second, and
+    # datetime.strptime is expensive, so parsed values are memoized.
+    try:
+        return datetime.strptime(text, fmt)
+    except ValueError:
+        return None
+
+
+class TimestampExtractor:
+    """
+    Precompiled, ordered timestamp extraction rules.
+
+    Each rule is a compiled pattern and the `strptime` formats tried on its match, in
+    order. Rules are tried in order and the first successfully parsed value wins.
+
+    Attributes:
+        rules (Tuple[TimestampRule, ...]): (pattern, formats) pairs; group 1 is used when
+            the pattern has a capture group, the whole match otherwise.
+        scan_all (bool): Try every match of a pattern instead of only the first one.
+        fill_date (bool): Replace the date of time-only values (year 1900) with today's date.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Tuple[str, Sequence[str]]],
+        scan_all: bool = False,
+        fill_date: bool = False,
+    ) -> None:
+        """
+        Args:
+            rules (Sequence[Tuple[str, Sequence[str]]]): (regex, formats) pairs.
+            scan_all (bool): Try every match of a pattern instead of only the first one.
+            fill_date (bool): Replace the date of time-only values with today's date.
+        """
+        self.rules: Tuple[TimestampRule, ...] = tuple(
+            (re.compile(pattern), tuple(formats)) for pattern, formats in rules
+        )
+        self.scan_all = scan_all
+        self.fill_date = fill_date
+
+    def _parse(self, text: str, formats: Tuple[str, ...]) -> Optional[datetime]:
+        for fmt in formats:
+            value = _strptime(text, fmt)
+            if value is None:
+                continue
+            if self.fill_date and value.year == 1900:
+                now = datetime.now()
+                value = value.replace(year=now.year, month=now.month, day=now.day)
+            return value
+        return None
+
+    def extract(self, line: str) -> Optional[datetime]:
+        """
+        Extracts the first parseable timestamp from a line.
+
+        Args:
+            line (str): The log line.
+
+        Returns:
+            Optional[datetime]: The timestamp, or None if no rule produced one.
+        """
+        for pattern, formats in self.rules:
+            group = 1 if pattern.groups else 0
+            if self.scan_all:
+                for match in pattern.finditer(line):
+                    value = self._parse(match.group(group), formats)
+                    if value is not None:
+                        return value
+            else:
+                found = pattern.search(line)
+                if found:
+                    value = self._parse(found.group(group), formats)
+                    if value is not None:
+                        return value
+        return None
+
+    __call__ = extract
+
+
+DEFAULT_TIMESTAMP_EXTRACTOR = TimestampExtractor(
+    [
+        (
+            r"\b\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\b",
+            ["%Y-%m-%d %H:%M:%S,%f", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"],
+        ),
+        (r"\b\d{2}/[A-Za-z]{3}/\d{4}:\d{2}:\d{2}:\d{2}\b", ["%d/%b/%Y:%H:%M:%S"]),
+        (r"\b\d{2}:\d{2}:\d{2}\b", ["%H:%M:%S"]),
+        (r"\b\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}\b", ["%Y/%m/%d %H:%M:%S"]),
+    ],
+    fill_date=True,
+)
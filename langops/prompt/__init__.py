@@ -1,5 +1,13 @@
+from typing import TYPE_CHECKING
+from langops.core.lazy import lazy_exports
 from langops.prompt.registry import PromptRegistry
-from langops.prompt.jenkins_error_prompt import JenkinsErrorPrompt
+
+if TYPE_CHECKING:  # pragma: no cover
+    from langops.prompt.jenkins_error_prompt import JenkinsErrorPrompt
+
+__getattr__, __dir__ = lazy_exports(
+    "langops.prompt", {"JenkinsErrorPrompt": "langops.prompt.jenkins_error_prompt"}
+)
 
 __name__ = "langops.prompt"
 __version__ = "0.1.0"
@@ -1,4 +1,5 @@
-from typing import Type, Dict, Optional, Callable, List
+from typing import Type, MutableMapping, Optional, Callable, List
+from langops.core.lazy import LazyRegistry
 
 # Prompt registry for langops.prompt
 
@@ -8,7 +9,12 @@ class PromptRegistry:
     Registry for prompt classes. Allows registration and retrieval of prompts by name.
     """
 
-    _registry: Dict[str, Type] = {}
+    # Built-in components are imported on first lookup, not when the package is
+    # imported. Plugins from other distributions are listed from the 'langops.prompts'
+    # entry-point group and imported when they are looked up.
+    _registry: MutableMapping[str, Type] = LazyRegistry(
+        ("langops.prompt.jenkins_error_prompt",), group="langops.prompts"
+    )
 
     @classmethod
     def register(cls, name: Optional[str] = None) -> Callable[[Type], Type]:
@@ -0,0 +1,153 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from langops.core.instance_cache import InstanceCache, InstanceCacheMixin, freeze
+
+
+class Component:
+    created = 0
+
+    def __init__(self, **config):
+        type(self).created += 1
+        self.config = config
+
+
+class TestFreeze(unittest.TestCase):
+
+    def test_equal_configs_have_equal_keys(self):
+        self.assertEqual(
+            freeze({"a": [1, {"b": {2, 3}}], "c": None}),
+            freeze({"c": None, "a": [1, {"b": {3, 2}}]}),
+        )
+
+    def test_lists_and_tuples_differ(self):
+        self.assertNotEqual(freeze([1]), freeze((1,)))
+
+    def test_unhashable_value(self):
+        with self.assertRaises(TypeError):
+            freeze({"a": bytearray()})
+
+
+class TestInstanceCache(unittest.TestCase):
+
+    def setUp(self):
+        Component.created = 0
+
+    def test_same_config_same_instance(self):
+        cache = InstanceCache()
+        first = cache.get_or_create("c", Component, {"source": "jenkins"})
+        second = cache.get_or_create("c", Component, {"source": "jenkins"})
+        other = cache.get_or_create("c", Component, {"source": "gitlab_ci"})
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 2))
+
+    def test_class_is_part_of_the_key(self):
+        class Other(Component):
+            pass
+
+        cache = InstanceCache()
+        first = cache.get_or_create("c", Component, {})
+        self.assertIsInstance(cache.get_or_create("c", Other, {}), Other)
+        self.assertIs(cache.get_or_create("c", Component, {}), first)
+
+    def test_lru_eviction(self):
+        cache = InstanceCache(maxsize=2)
+        first = cache.get_or_create("c", Component, {"n": 1})
+        cache.get_or_create("c", Component, {"n": 2})
+        cache.get_or_create("c", Component, {"n": 1})
+        cache.get_or_create("c", Component, {"n": 3})
+        self.assertIs(cache.get_or_create("c", Component, {"n": 1}), first)
+        self.assertEqual(Component.created, 3)
+        cache.get_or_create("c", Component, {"n": 2})
+        self.assertEqual(Component.created, 4)
+
+    def test_shrinking_evicts(self):
+        cache = InstanceCache()
+        for n in range(5):
+            cache.get_or_create("c", Component, {"n": n})
+        cache.maxsize = 2
+        self.assertEqual(len(cache), 2)
+        with self.assertRaises(ValueError):
+            cache.maxsize = 0
+
+    def test_invalidate(self):
+        cache = InstanceCache()
+        cache.get_or_create("a", Component, {"n": 1})
+        cache.get_or_create("a", Component, {"n": 2})
+        cache.get_or_create("b", Component, {"n": 1})
+        self.assertEqual(cache.invalidate("a", {"n": 1}), 1)
+        self.assertEqual(cache.invalidate("a"), 1)
+        self.assertEqual(cache.invalidate(), 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate_during_construction(self):
+        cache = InstanceCache()
+
+        class Invalidating(Component):
+            def __init__(self, **config):
+                super().__init__(**config)
+                cache.invalidate()
+
+        first = cache.get_or_create("i", Invalidating, {})
+        self.assertEqual(len(cache), 0)
+        self.assertIsNot(cache.get_or_create("i", Invalidating, {}), first)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_unhashable_config(self):
+        with self.assertRaises(TypeError) as cm:
+            InstanceCache().get_or_create("c", Component, {"buffer": bytearray()})
+        self.assertIn("'c'", str(cm.exception))
+
+    def test_failed_construction_is_not_cached(self):
+        class Failing:
+            calls = 0
+
+            def __init__(self):
+                type(self).calls += 1
+                raise RuntimeError("boom")
+
+        cache = InstanceCache()
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                cache.get_or_create("f", Failing, {})
+        self.assertEqual((Failing.calls, len(cache)), (2, 0))
+
+    def test_concurrent_creation_constructs_once(self):
+        class Slow(Component):
+            def __init__(self, **config):
+                time.sleep(0.05)
+                super().__init__(**config)
+
+        cache = InstanceCache()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            instances = list(
+                pool.map(lambda _: cache.get_or_create("s", Slow, {}), range(16))
+            )
+        self.assertEqual(Slow.created, 1)
+        self.assertEqual(len({id(instance) for instance in instances}), 1)
+
+
+class TestInstanceCacheMixin(unittest.TestCase):
+
+    def test_each_registry_has_its_own_cache(self):
+        class Registry(InstanceCacheMixin):
+            _component_kind = "widget"
+            _registry = {"c": Component}
+
+        class OtherRegistry(Registry):
+            pass
+
+        instance = Registry.get_instance("c", size=1)
+        self.assertIs(Registry.get_instance("c", size=1), instance)
+        self.assertIsNot(OtherRegistry.get_instance("c", size=1), instance)
+        self.assertEqual(Registry.invalidate_instances("c", size=1), 1)
+        Registry.set_max_instances(1)
+        self.assertEqual(Registry._instances.maxsize, 1)
+        self.assertIsNone(OtherRegistry._instances.maxsize)
+        with self.assertRaisesRegex(KeyError, "No widget registered under 'x'"):
+            Registry.get_instance("x")
+
+
+if __name__ == "__main__":
+    unittest.main()
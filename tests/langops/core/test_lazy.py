@@ -0,0 +1,251 @@
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+import unittest.mock
+from pathlib import Path
+from importlib.metadata import EntryPoint
+from langops.core.lazy import LazyRegistry, lazy_exports
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+HEAVY_MODULES = ("openai", "httpx", "pydantic", "yaml")
+
+# Generous wall-clock budget for `import langops`; the module checks below are the
+# precise guard, this one catches new heavy dependencies that are not listed.
+IMPORT_BUDGET_US = 150_000
+
+
+def import_profile(statement):
+    """Runs `statement` in a fresh interpreter with -X importtime.
+
+    Returns:
+        dict: Imported module name to cumulative import time in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def heavy(profile):
+    return sorted(name for name in profile if name.split(".")[0] in HEAVY_MODULES)
+
+
+class TestImportBudget(unittest.TestCase):
+
+    def test_import_langops_is_light(self):
+        profile = import_profile("import langops")
+        self.assertEqual(heavy(profile), [])
+        self.assertLess(profile["langops"], IMPORT_BUDGET_US)
+
+    def test_import_parser_package_is_light(self):
+        self.assertEqual(heavy(import_profile("import langops.parser")), [])
+
+    def test_error_parser_needs_no_heavy_modules(self):
+        profile = import_profile(
+            "from langops.parser import ErrorParser; ErrorParser().parse('ERROR x')"
+        )
+        self.assertEqual(heavy(profile), [])
+
+    def test_llm_loads_on_access(self):
+        profile = import_profile("import langops.llm as llm; llm.OpenAILLM")
+        self.assertIn("openai", profile)
+
+
+class TestLazyExports(unittest.TestCase):
+
+    def test_public_names_importable(self):
+        for package in (
+            "langops",
+            "langops.core",
+            "langops.llm",
+            "langops.prompt",
+            "langops.parser",
+            "langops.parser.utils",
+        ):
+            module = importlib.import_module(package)
+            for name in module.__all__:
+                with self.subTest(package=package, name=name):
+                    self.assertIsNotNone(getattr(module, name))
+                    self.assertIn(name, dir(module))
+
+    def test_unknown_name(self):
+        import langops
+
+        with self.assertRaises(AttributeError):
+            langops.DoesNotExist
+
+    def test_value_is_cached_on_module(self):
+        getattr_, _ = lazy_exports(__name__, {"LazyRegistry": "langops.core.lazy"})
+        self.assertIs(getattr_("LazyRegistry"), LazyRegistry)
+        self.assertIs(vars(sys.modules[__name__])["LazyRegistry"], LazyRegistry)
+
+
+class TestLazyRegistry(unittest.TestCase):
+
+    def test_loads_builtins_on_first_read(self):
+        registry = LazyRegistry(["json"])
+        self.assertFalse(registry._loaded)
+        registry["custom"] = int
+        self.assertFalse(registry._loaded)
+        self.assertEqual(registry.get("custom"), int)
+        self.assertTrue(registry._loaded)
+
+    def test_earlier_registrations_win(self):
+        registry = LazyRegistry(["tests.langops.core.test_lazy"])
+        registry["builtin"] = str
+
+        original = importlib.import_module
+
+        def import_module(name):
+            registry["builtin"] = bytes
+            return original(name)
+
+        with unittest.mock.patch("importlib.import_module", import_module):
+            self.assertEqual(registry["builtin"], str)
+
+    def test_builtins_listed_in_fresh_interpreter(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "from langops import ParserRegistry, LLMRegistry; "
+                "print(sorted(ParserRegistry.list_parsers()), LLMRegistry.list_llms())",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=REPO_ROOT,
+        )
+        self.assertEqual(
+            result.stdout.strip(),
+            "['ErrorParser', 'JenkinsParser', 'pipeline_parser'] ['openai']",
+        )
+
+
+def plugin_entry_point(name, value, group="langops.parsers"):
+    return EntryPoint(name=name, value=value, group=group)
+
+
+class TestEntryPointPlugins(unittest.TestCase):
+
+    def registry(self, *entry_points):
+        registry = LazyRegistry(group="langops.parsers")
+        patcher = unittest.mock.patch(
+            "importlib.metadata.entry_points", return_value=list(entry_points)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return registry
+
+    def test_lists_plugins_without_loading(self):
+        entry_point = plugin_entry_point("decoder", "json:JSONDecoder")
+        registry = self.registry(entry_point)
+        with unittest.mock.patch.object(EntryPoint, "load") as load:
+            self.assertIn("decoder", registry)
+            self.assertEqual(list(registry.keys()), ["decoder"])
+            self.assertEqual(len(registry), 1)
+            self.assertEqual(registry.plugins(), {"decoder": "json:JSONDecoder"})
+        load.assert_not_called()
+
+    def test_loads_plugin_on_lookup(self):
+        import json
+
+        registry = self.registry(
+            plugin_entry_point("decoder", "json:JSONDecoder"),
+            plugin_entry_point("decoder", "json:JSONEncoder"),
+        )
+        self.assertIs(registry.get("decoder"), json.JSONDecoder)
+        self.assertIs(registry["decoder"], json.JSONDecoder)
+        self.assertEqual(registry.plugins(), {})
+        self.assertIsNone(registry.get("missing"))
+
+    def test_registered_classes_win(self):
+        registry = self.registry(plugin_entry_point("decoder", "json:JSONDecoder"))
+        registry["decoder"] = str
+        with unittest.mock.patch.object(EntryPoint, "load") as load:
+            self.assertIs(registry["decoder"], str)
+            self.assertEqual(list(registry), ["decoder"])
+        load.assert_not_called()
+
+    def test_items_load_every_plugin(self):
+        import json
+
+        registry = self.registry(
+            plugin_entry_point("decoder", "json:JSONDecoder"),
+            plugin_entry_point("encoder", "json:JSONEncoder"),
+        )
+        self.assertEqual(
+            dict(registry.items()),
+            {"decoder": json.JSONDecoder, "encoder": json.JSONEncoder},
+        )
+
+    def test_delete_and_clear_do_not_load_plugins(self):
+        registry = self.registry(
+            plugin_entry_point("decoder", "json:JSONDecoder"),
+            plugin_entry_point("encoder", "json:JSONEncoder"),
+        )
+        registry["custom"] = int
+        with unittest.mock.patch.object(EntryPoint, "load") as load:
+            del registry["decoder"]
+            self.assertEqual(sorted(registry), ["custom", "encoder"])
+            with self.assertRaises(KeyError):
+                del registry["decoder"]
+            registry.clear()
+            self.assertEqual(len(registry), 0)
+        load.assert_not_called()
+
+    def test_broken_plugin_raises_on_lookup(self):
+        registry = self.registry(plugin_entry_point("broken", "no_such_module:X"))
+        self.assertIn("broken", registry)
+        with self.assertRaises(ImportError):
+            registry["broken"]
+        self.assertIn("broken", registry.plugins())
+
+    def test_installed_distribution(self):
+        with tempfile.TemporaryDirectory() as site:
+            with open(os.path.join(site, "langops_demo_plugin.py"), "w") as f:
+                f.write("class DemoParser:\n    pass\n")
+            dist_info = os.path.join(site, "langops_demo_plugin-1.0.dist-info")
+            os.mkdir(dist_info)
+            with open(os.path.join(dist_info, "METADATA"), "w") as f:
+                f.write(
+                    "Metadata-Version: 2.1\nName: langops-demo-plugin\nVersion: 1.0\n"
+                )
+            with open(os.path.join(dist_info, "entry_points.txt"), "w") as f:
+                f.write("[langops.parsers]\ndemo = langops_demo_plugin:DemoParser\n")
+            script = textwrap.dedent(
+                """
+                import sys
+                from langops import ParserRegistry
+                print("demo" in ParserRegistry.list_parsers())
+                print("langops_demo_plugin" in sys.modules)
+                print(ParserRegistry.get_parser("demo").__name__)
+                """
+            )
+            result = subprocess.run(
+                [sys.executable, "-c", script],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=REPO_ROOT,
+                env={**os.environ, "PYTHONPATH": site},
+            )
+        self.assertEqual(result.stdout.split(), ["True", "False", "DemoParser"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import pytest
+from langops.core.base_llm import BaseLLM
+from langops.core.metrics import (
+    CallRecord,
+    Histogram,
+    LLMMetrics,
+    active_metrics,
+    disable_metrics,
+    enable_metrics,
+    usage_tokens,
+)
+from langops.core.types import LLMResponse
+
+
+class CountingLLM(BaseLLM):
+    """Routes calls through the opt-in path, failing on the prompt "fail"."""
+
+    model = "counting"
+
+    def complete(self, prompt, **kwargs):
+        def complete():
+            if prompt == "fail":
+                raise TimeoutError("slow")
+            usage = {"prompt_tokens": 3, "completion_tokens": 2}
+            return LLMResponse(text=prompt.upper(), metadata={"usage": usage})
+
+        return self._cached_complete(prompt, kwargs, complete)
+
+    async def acomplete(self, prompt, **kwargs):
+        return self.complete(prompt, **kwargs)
+
+    @classmethod
+    def default_model(cls):
+        return "counting"
+
+
+@pytest.fixture(autouse=True)
+def no_process_metrics():
+    previous = active_metrics()
+    disable_metrics()
+    yield
+    if previous is not None:
+        enable_metrics(previous)
+    else:
+        disable_metrics()
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = Histogram([1.0, 2.0, 4.0])
+    assert histogram.quantile(0.5) is None
+    for value in [0.5] * 50 + [1.5] * 40 + [3.0] * 9 + [10.0]:
+        histogram.observe(value)
+    assert histogram.count == 100 and histogram.sum == pytest.approx(122.0)
+    assert histogram.quantile(0.5) == pytest.approx(1.0)
+    assert histogram.quantile(0.25) == pytest.approx(0.5)
+    assert histogram.quantile(0.95) == pytest.approx(2.0 + 2.0 * 5 / 9)
+    # The overflow bucket reports the highest finite bound.
+    assert histogram.quantile(1.0) == 4.0
+    assert histogram.cumulative()[-1] == (float("inf"), 100)
+
+
+def test_histogram_bounds_are_inclusive():
+    histogram = Histogram([1.0, 2.0])
+    histogram.observe(1.0)
+    assert histogram.cumulative()[0] == (1.0, 1)
+
+
+def test_usage_tokens():
+    assert usage_tokens(None) == (None, None)
+    assert usage_tokens({"prompt_tokens": 4, "completion_tokens": 1}) == (4, 1)
+
+    class Usage:
+        prompt_tokens = 7
+        completion_tokens = None
+
+    assert usage_tokens(Usage()) == (7, None)
+
+
+def test_registry_aggregates_calls():
+    metrics = LLMMetrics()
+    metrics.record(CallRecord("P", "m", 0.2, prompt_tokens=10, completion_tokens=5))
+    metrics.record(CallRecord("P", "m", 0.01, cache="hit"))
+    metrics.record(CallRecord("P", "m", 1.0, error="RateLimitError", retries=2))
+    metrics.record(CallRecord("P", "m", 0.3, cache="miss", queue_time=0.5))
+    summary = metrics.summary()["P/m"]
+    assert summary["calls"] == 4
+    assert summary["errors"] == {"RateLimitError": 1}
+    assert summary["error_rate"] == 0.25
+    assert summary["prompt_tokens"] == 10 and summary["completion_tokens"] == 5
+    assert summary["cache_hit_rate"] == 0.5
+    assert summary["retries"] == 2 and summary["queue_time"] == 0.5
+    assert 0.1 <= summary["p50"] <= 0.25 and summary["p99"] <= 1.0
+    metrics.reset()
+    assert metrics.summary() == {}
+
+
+def test_prometheus_export():
+    metrics = LLMMetrics(buckets=[0.1, 1.0])
+    metrics.record(CallRecord("P", 'gpt"4', 0.05, prompt_tokens=3, completion_tokens=1))
+    metrics.record(CallRecord("P", 'gpt"4', 2.0, error="APIError"))
+    text = metrics.to_prometheus()
+    labels = 'provider="P",model="gpt\\"4"'
+    assert "# TYPE langops_llm_calls_total counter" in text
+    assert f"langops_llm_calls_total{{{labels}}} 2" in text
+    assert f"langops_llm_prompt_tokens_total{{{labels}}} 3" in text
+    assert f'langops_llm_errors_total{{{labels},error="APIError"}} 1' in text
+    assert "# TYPE langops_llm_latency_seconds histogram" in text
+    assert f'langops_llm_latency_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'langops_llm_latency_seconds_bucket{{{labels},le="1.0"}} 1' in text
+    assert f'langops_llm_latency_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"langops_llm_latency_seconds_count{{{labels}}} 2" in text
+    assert text.endswith("\n")
+    assert LLMMetrics().to_prometheus(prefix="x").startswith("# HELP x_calls_total")
+
+
+def test_callbacks_receive_records_and_failures_are_contained():
+    seen = []
+    metrics = LLMMetrics(callbacks=[seen.append])
+
+    def broken(record):
+        raise ValueError("boom")
+
+    metrics.add_callback(broken)
+    with pytest.warns(RuntimeWarning, match="boom"):
+        metrics.record(CallRecord("P", "m", 0.1))
+    metrics.remove_callback(broken)
+    metrics.record(CallRecord("P", "m", 0.1))
+    assert len(seen) == 2 and seen[0].provider == "P"
+
+
+def test_registry_is_thread_safe():
+    metrics = LLMMetrics()
+
+    def work():
+        for _ in range(500):
+            metrics.record(CallRecord("P", "m", 0.1, prompt_tokens=1))
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.summary()["P/m"]["prompt_tokens"] == 4000
+
+
+def test_clients_record_calls_on_the_opt_in_path():
+    llm = CountingLLM()
+    llm.metrics = LLMMetrics()
+    response = llm.complete("hi")
+    assert response.metadata["latency"] >= 0
+    with pytest.raises(TimeoutError):
+        llm.complete("fail")
+    asyncio.run(llm.acomplete("async"))
+    summary = llm.metrics.summary()["CountingLLM/counting"]
+    assert summary["calls"] == 3
+    assert summary["errors"] == {"TimeoutError": 1}
+    assert summary["prompt_tokens"] == 6 and summary["cache_hit_rate"] is None
+
+
+def test_process_wide_metrics():
+    llm = CountingLLM()
+    llm.complete("before")
+    assert active_metrics() is None
+    metrics = enable_metrics()
+    assert enable_metrics() is metrics
+    llm.complete("during")
+    disable_metrics()
+    llm.complete("after")
+    assert metrics.summary()["CountingLLM/counting"]["calls"] == 1
+
+
+def test_latency_metadata_without_metrics():
+    assert CountingLLM().complete("hi").metadata["latency"] >= 0
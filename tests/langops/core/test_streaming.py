@@ -0,0 +1,139 @@
+import asyncio
+import unittest
+from langops.core.base_llm import BaseLLM
+from langops.core.streaming import AsyncLLMStream, LLMStream
+from langops.core.types import LLMResponse
+
+
+class EchoLLM(BaseLLM):
+    def complete(self, prompt, **kwargs):
+        return LLMResponse(text=prompt.upper(), metadata={"usage": {"total": 2}})
+
+    async def acomplete(self, prompt, **kwargs):
+        return self.complete(prompt, **kwargs)
+
+    @classmethod
+    def default_model(cls):
+        return "echo"
+
+
+class TestLLMStream(unittest.TestCase):
+
+    def test_yields_deltas_and_aggregates(self):
+        events = iter(
+            [("Hel", {"id": "1"}), ("", {}), ("lo", {}), ("", {"usage": {"total": 3}})]
+        )
+        stream = LLMStream(events, {"model_used": "m"})
+        self.assertIsNone(stream.response)
+        self.assertEqual(list(stream), ["Hel", "lo"])
+        response = stream.response
+        self.assertEqual(response.text, "Hello")
+        self.assertEqual(response.metadata["id"], "1")
+        self.assertEqual(response.metadata["model_used"], "m")
+        self.assertEqual(response.metadata["usage"], {"total": 3})
+        self.assertGreaterEqual(response.metadata["time_to_first_token"], 0)
+        self.assertGreaterEqual(
+            response.metadata["total_time"], response.metadata["time_to_first_token"]
+        )
+
+    def test_collect_and_empty_stream(self):
+        stream = LLMStream(iter([("", {})]))
+        response = stream.collect()
+        self.assertEqual(response.text, "")
+        self.assertIsNone(response.metadata["time_to_first_token"])
+
+    def test_close_runs_generator_cleanup(self):
+        closed = []
+
+        def events():
+            try:
+                yield "a", {}
+                yield "b", {}
+            finally:
+                closed.append(True)
+
+        with LLMStream(events()) as stream:
+            self.assertEqual(next(stream), "a")
+        self.assertEqual(closed, [True])
+        self.assertIsNone(stream.response)
+
+    def test_on_finish_is_called_once(self):
+        calls = []
+
+        def events():
+            yield "a", {}
+            raise ConnectionError("reset")
+
+        stream = LLMStream(events(), on_finish=lambda *args: calls.append(args))
+        self.assertEqual(next(stream), "a")
+        with self.assertRaises(ConnectionError):
+            next(stream)
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(calls[0][0])
+        self.assertIsInstance(calls[0][1], ConnectionError)
+
+        calls.clear()
+        stream = LLMStream(iter([("x", {})]), on_finish=lambda *a: calls.append(a))
+        stream.collect()
+        self.assertEqual(calls, [(stream.response, None)])
+
+    def test_base_llm_falls_back_to_complete(self):
+        llm = EchoLLM()
+        stream = llm.stream("hi")
+        self.assertEqual(list(stream), ["HI"])
+        self.assertEqual(stream.response.metadata["usage"], {"total": 2})
+
+
+class TestAsyncLLMStream(unittest.TestCase):
+
+    def test_yields_deltas_and_aggregates(self):
+        async def events():
+            yield "a", {}
+            yield "b", {"finish_reason": "stop"}
+
+        async def consume():
+            stream = AsyncLLMStream(events())
+            return [delta async for delta in stream], stream.response
+
+        deltas, response = asyncio.run(consume())
+        self.assertEqual(deltas, ["a", "b"])
+        self.assertEqual(response.text, "ab")
+        self.assertEqual(response.metadata["finish_reason"], "stop")
+
+    def test_cancelling_consumer_closes_events(self):
+        closed = []
+
+        async def events():
+            try:
+                yield "a", {}
+                await asyncio.sleep(60)
+                yield "b", {}
+            finally:
+                closed.append(True)
+
+        async def consume(stream, received):
+            async for delta in stream:
+                received.append(delta)
+
+        async def main():
+            received = []
+            task = asyncio.ensure_future(consume(AsyncLLMStream(events()), received))
+            while not received:
+                await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return received
+
+        self.assertEqual(asyncio.run(asyncio.wait_for(main(), 5)), ["a"])
+        self.assertEqual(closed, [True])
+
+    def test_base_llm_falls_back_to_acomplete(self):
+        async def consume():
+            return await EchoLLM().astream("hi").collect()
+
+        self.assertEqual(asyncio.run(consume()).text, "HI")
+
+
+if __name__ == "__main__":
+    unittest.main()
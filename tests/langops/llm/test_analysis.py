@@ -0,0 +1,152 @@
+import asyncio
+import pytest
+from langops.core.base_llm import BaseLLM
+from langops.core.types import LLMResponse
+from langops.llm.analysis import AnalysisError, MapReduceAnalyzer
+from langops.llm.response_cache import ResponseCache
+from langops.llm.tokens import TokenCounter
+from langops.parser.types.pipeline_types import (
+    LogEntry,
+    ParsedPipelineBundle,
+    SeverityLevel,
+    StageWindow,
+)
+
+
+class ScriptedLLM(BaseLLM):
+    """Answers with the kind of call and its size; fails prompts containing `fail`."""
+
+    def __init__(self, fail=None):
+        self.model = "gpt-4"
+        self.fail = fail
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def complete(self, prompt, **kwargs):  # pragma: no cover
+        raise NotImplementedError
+
+    async def acomplete(self, prompt, **kwargs):
+        system, user = prompt[0]["content"], prompt[1]["content"]
+        self.calls.append((system, user, kwargs))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        if self.fail and self.fail in user:
+            raise RuntimeError("provider error")
+        kind = system.split()[2]  # analyzing / merging / writing
+        return LLMResponse(text=f"{kind}: {user.count(chr(10)) + 1} lines")
+
+    @classmethod
+    def default_model(cls):
+        return "gpt-4"
+
+
+def make_bundle(stages=6, entries=5):
+    return ParsedPipelineBundle(
+        source="jenkins",
+        stages=[
+            StageWindow(
+                name=f"stage-{s}",
+                start_line=s * 100,
+                end_line=s * 100 + 99,
+                content=[
+                    LogEntry(
+                        timestamp=None,
+                        severity=SeverityLevel.ERROR,
+                        line=s * 100 + e,
+                        message=f"compilation of module m{s}{e} failed with code {e}",
+                    )
+                    for e in range(entries)
+                ],
+            )
+            for s in range(stages)
+        ]
+        + [StageWindow(name="empty", start_line=900, end_line=901, content=[])],
+    )
+
+
+def analyzer(llm, **kwargs):
+    return MapReduceAnalyzer(llm, counter=TokenCounter(use_tiktoken=False), **kwargs)
+
+
+def test_stage_partition_skips_empty_stages():
+    chunks = analyzer(ScriptedLLM()).chunks(make_bundle())
+    assert [chunk.stages for chunk in chunks] == [[f"stage-{s}"] for s in range(6)]
+    assert chunks[0].text.startswith("## Stage: stage-0 (lines 0-99)\n[0] ERROR:")
+
+
+def test_oversized_stage_is_split_within_budget():
+    a = analyzer(ScriptedLLM(), map_budget=60)
+    chunks = a.chunks(make_bundle(stages=1, entries=20))
+    assert len(chunks) > 1
+    assert all(chunk.tokens <= 60 for chunk in chunks)
+    assert chunks[1].text.startswith("## Stage: stage-0 (lines 0-99) (continued)")
+    entries = [line for chunk in chunks for line in chunk.text.splitlines()[1:]]
+    assert len(entries) == 20
+
+
+def test_token_partition_packs_stages():
+    a = analyzer(ScriptedLLM(), partition="tokens", map_budget=200)
+    chunks = a.chunks(make_bundle())
+    assert len(chunks) < 6
+    assert any(len(chunk.stages) > 1 for chunk in chunks)
+    assert all(chunk.tokens <= 200 for chunk in chunks)
+
+
+def test_map_reduce_levels_and_concurrency():
+    llm = ScriptedLLM()
+    a = analyzer(llm, reduce_budget=12, max_concurrency=3, temperature=0)
+    report = asyncio.run(a.arun(make_bundle()))
+
+    assert report.text.startswith("writing:")
+    assert [len(level) for level in report.levels][0] == 6
+    assert len(report.levels) >= 3  # map, at least one reduce level, final
+    assert len(report.levels[-1]) == 1
+    assert report.calls == sum(len(level) for level in report.levels)
+    assert 1 < llm.max_in_flight <= 3
+    map_call = llm.calls[0]
+    assert "part 1 of 6" in map_call[0] and "jenkins" in map_call[0]
+    assert map_call[2] == {"temperature": 0, "max_tokens": 500}
+    assert llm.calls[-1][2]["max_tokens"] == 1000
+
+
+def test_single_chunk_goes_straight_to_final_report():
+    llm = ScriptedLLM()
+    report = analyzer(llm).run(make_bundle(stages=1))
+    assert report.calls == 1
+    assert report.text.startswith("writing:")
+
+
+def test_empty_bundle_makes_no_calls():
+    llm = ScriptedLLM()
+    report = analyzer(llm).run(ParsedPipelineBundle(source="jenkins", stages=[]))
+    assert report.text == "" and report.calls == 0 and llm.calls == []
+
+
+def test_retry_only_redoes_failed_chunks():
+    cache = ResponseCache()
+    llm = ScriptedLLM(fail="m32")
+    with pytest.raises(AnalysisError) as e:
+        analyzer(llm, cache=cache).run(make_bundle())
+    assert e.value.level == 0
+    assert list(e.value.failures) == [3]
+    assert e.value.completed == 5
+
+    llm.fail = None
+    llm.calls.clear()
+    report = analyzer(llm, cache=cache).run(make_bundle())
+    assert report.cached == 5
+    map_calls = [call for call in llm.calls if "analyzing" in call[0]]
+    assert len(map_calls) == 1 and "m32" in map_calls[0][1]
+    assert report.text.startswith("writing:")
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        MapReduceAnalyzer(ScriptedLLM(), partition="lines")
+    with pytest.raises(ValueError):
+        MapReduceAnalyzer(ScriptedLLM(), map_budget=0)
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import openai
+import pytest
+from langops.llm.cassette import Cassette
+from langops.llm.client_pool import ClientPool
+from langops.llm.fake_server import FakeLLMServer
+from langops.llm.openai_llm import OpenAILLM
+
+
+def recording_llm(cassette, server):
+    # The fake server stands in for the real API behind the cassette.
+    pool = ClientPool(wrap_transport=lambda _: cassette.wrap(server))
+    return OpenAILLM(api_key="sk-secret", model="gpt-4", client_pool=pool)
+
+
+def replaying_llm(cassette):
+    llm = OpenAILLM(api_key="replay", model="gpt-4", client_pool=cassette.client_pool())
+    llm.client = llm.client.with_options(max_retries=0)
+    return llm
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "cassettes" / "analysis.json"
+
+
+def test_record_then_replay(path):
+    server = FakeLLMServer()
+    recorder = recording_llm(Cassette(path, mode="record"), server)
+    text = recorder.complete("What failed?").text
+    deltas = list(recorder.stream("Stream it"))
+    async_text = asyncio.run(recorder.acomplete("Async")).text
+    assert server.requests == 3
+
+    cassette = Cassette(path, mode="replay")
+    llm = replaying_llm(cassette)
+    assert llm.complete("What failed?").text == text
+    stream = llm.stream("Stream it")
+    assert list(stream) == deltas
+    assert stream.response.metadata["usage"].total_tokens > 0
+    assert asyncio.run(llm.acomplete("Async")).text == async_text
+    assert cassette.hits == 3 and server.requests == 3
+
+
+def test_cassette_file_does_not_store_headers(path):
+    recording_llm(Cassette(path, mode="record"), FakeLLMServer()).complete("hi")
+    content = path.read_text()
+    assert "sk-secret" not in content
+    interaction = json.loads(content)["interactions"][0]
+    assert interaction["request"]["body"]["messages"][0]["content"] == "hi"
+    assert interaction["response"]["status"] == 200
+
+
+def test_replay_miss_returns_not_found(path):
+    recording_llm(Cassette(path, mode="record"), FakeLLMServer()).complete("hi")
+    cassette = Cassette(path, mode="replay")
+    with pytest.raises(openai.NotFoundError, match="No recorded response"):
+        replaying_llm(cassette).complete("something else")
+    assert cassette.misses == 1
+
+
+def test_auto_mode_records_only_misses(path):
+    server = FakeLLMServer()
+    recording_llm(Cassette(path, mode="auto"), server).complete("hi")
+    cassette = Cassette(path, mode="auto")
+    llm = recording_llm(cassette, server)
+    llm.complete("hi")
+    llm.complete("new")
+    assert (cassette.hits, cassette.recorded, server.requests) == (1, 1, 2)
+    assert len(json.loads(path.read_text())["interactions"]) == 2
+
+
+def test_identical_requests_replay_in_order(path):
+    answers = iter(["first", "second"])
+    server = FakeLLMServer(responder=lambda request: next(answers))
+    recorder = recording_llm(Cassette(path, mode="record"), server)
+    assert [recorder.complete("same").text for _ in range(2)] == ["first", "second"]
+    llm = replaying_llm(Cassette(path, mode="replay"))
+    texts = [llm.complete("same").text for _ in range(3)]
+    assert texts == ["first", "second", "second"]
+
+
+def test_recorded_errors_are_replayed(path):
+    server = FakeLLMServer(error_rate=1.0)
+    recorder = recording_llm(Cassette(path, mode="record"), server)
+    recorder.client = recorder.client.with_options(max_retries=0)
+    with pytest.raises(openai.InternalServerError):
+        recorder.complete("boom")
+    with pytest.raises(openai.InternalServerError):
+        replaying_llm(Cassette(path, mode="replay")).complete("boom")
+
+
+def test_validation(path):
+    with pytest.raises(ValueError):
+        Cassette(path, mode="rewind")
+    with pytest.raises(FileNotFoundError):
+        Cassette(path, mode="replay")
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from langops.llm.client_pool import (
+    ClientPool,
+    PoolSettings,
+    configure_client_pool,
+    default_client_pool,
+)
+from langops.llm.openai_llm import OpenAILLM
+
+
+class ChatHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive chat completions endpoint echoing the prompt."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.ports.add(self.client_address[1])
+        payload = json.dumps(
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {
+                            "role": "assistant",
+                            "content": body["messages"][-1]["content"].upper(),
+                        },
+                    }
+                ],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ChatHandler)
+    httpd.ports = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def make_llm(pool, base_url, api_key="key"):
+    return OpenAILLM(
+        api_key=api_key, model="gpt-4", base_url=base_url, client_pool=pool
+    )
+
+
+def test_clients_are_created_lazily_and_shared_per_key():
+    pool = ClientPool()
+    first = make_llm(pool, "http://a/v1")
+    second = make_llm(pool, "http://a/v1")
+    assert pool.stats().clients == 0
+    assert first.client is second.client
+    assert pool.stats().clients == 1
+    assert first.async_client is second.async_client
+    assert make_llm(pool, "http://b/v1").client is not first.client
+    assert make_llm(pool, "http://a/v1", api_key="other").client is not first.client
+    assert pool.stats().clients == 4
+
+
+def test_settings_are_applied_to_clients():
+    pool = ClientPool(PoolSettings(timeout=30.0), connect_timeout=2.0)
+    assert pool.settings.timeout == 30.0 and pool.settings.connect_timeout == 2.0
+    timeout = pool.client("key").timeout
+    assert timeout.read == 30.0 and timeout.connect == 2.0
+    assert pool.async_client("key").timeout.connect == 2.0
+
+
+def test_overriding_a_client_keeps_the_override():
+    llm = make_llm(ClientPool(), "http://a/v1")
+    sentinel = object()
+    llm.client = sentinel
+    llm.async_client = sentinel
+    assert llm.client is sentinel and llm.async_client is sentinel
+
+
+def test_default_pool_is_process_wide_and_configurable():
+    previous = default_client_pool()
+    try:
+        assert OpenAILLM(api_key="key").client_pool is previous
+        pool = configure_client_pool(max_connections=10)
+        assert pool is default_client_pool() and pool is not previous
+        assert pool.settings.max_connections == 10
+        assert OpenAILLM(api_key="key").client_pool is pool
+    finally:
+        configure_client_pool(previous.settings)
+
+
+def test_sync_requests_reuse_keep_alive_connections(server, base_url):
+    pool = ClientPool()
+    llms = [make_llm(pool, base_url) for _ in range(3)]
+    assert [llm.complete(f"p{i}").text for i, llm in enumerate(llms)] == [
+        "P0",
+        "P1",
+        "P2",
+    ]
+    stats = pool.stats()
+    assert stats.requests == 3 and stats.in_flight == 0
+    assert stats.connections == 1 and stats.idle_connections == 1
+    assert len(server.ports) == 1
+    pool.close()
+    assert pool.stats().clients == 0
+
+
+def test_sync_client_is_thread_safe(server, base_url):
+    pool = ClientPool(max_connections=4)
+    llm = make_llm(pool, base_url)
+    with ThreadPoolExecutor(8) as executor:
+        texts = list(executor.map(lambda i: llm.complete(f"p{i}").text, range(16)))
+    assert texts == [f"P{i}" for i in range(16)]
+    stats = pool.stats()
+    assert stats.requests == 16
+    assert stats.connections <= 4 and stats.active_connections == 0
+    assert len(server.ports) <= 4
+
+
+def test_async_client_is_usable_from_several_event_loops(server, base_url):
+    pool = ClientPool()
+    llm = make_llm(pool, base_url)
+    client = llm.async_client
+
+    async def main(prefix):
+        responses = await asyncio.gather(
+            *(llm.acomplete(f"{prefix}{i}") for i in range(3))
+        )
+        return [r.text for r in responses]
+
+    assert asyncio.run(main("a")) == ["A0", "A1", "A2"]
+    assert asyncio.run(main("b")) == ["B0", "B1", "B2"]
+    assert llm.async_client is client
+    stats = pool.stats()
+    assert stats.requests == 6 and stats.in_flight == 0
+    # Connections of closed loops are dropped.
+    assert stats.connections == 0
+
+
+def test_async_connections_are_reused_within_a_loop(server, base_url):
+    pool = ClientPool()
+    llm = make_llm(pool, base_url)
+
+    async def main():
+        texts = [(await llm.acomplete(f"p{i}")).text for i in range(3)]
+        return texts, pool.stats()
+
+    texts, stats = asyncio.run(main())
+    assert texts == ["P0", "P1", "P2"]
+    assert stats.connections == 1 and stats.idle_connections == 1
+    assert len(server.ports) == 1
+
+
+def test_complete_many_uses_pool_settings(server, base_url):
+    pool = ClientPool(max_connections=2)
+    llm = make_llm(pool, base_url)
+    responses = llm.complete_many([f"p{i}" for i in range(6)], max_concurrency=6)
+    assert [r.text for r in responses] == [f"P{i}" for i in range(6)]
+    assert len(server.ports) <= 2
+
+
+def test_http2_requires_h2():
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError):
+            ClientPool(http2=True).client("key")
+    else:
+        assert ClientPool(http2=True).client("key") is not None
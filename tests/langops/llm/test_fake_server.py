@@ -0,0 +1,137 @@
+import asyncio
+import random
+import time
+import openai
+import pytest
+from langops.llm.fake_server import FakeLLMServer, Latency, echo_responder
+from langops.llm.openai_llm import OpenAILLM
+
+
+def make_llm(server, model="gpt-4", retries=True):
+    llm = OpenAILLM(api_key="fake", model=model, client_pool=server.client_pool())
+    if not retries:
+        llm.client = llm.client.with_options(max_retries=0)
+    return llm
+
+
+def test_responses_are_deterministic():
+    first = make_llm(FakeLLMServer()).complete("Why did the build fail?")
+    second = make_llm(FakeLLMServer(seed=1)).complete("Why did the build fail?")
+    assert first.text == second.text
+    assert first.text.endswith("Response to: Why did the build fail?")
+    assert first.text != make_llm(FakeLLMServer()).complete("Other").text
+    usage = first.metadata["usage"]
+    assert usage.prompt_tokens > 0 and usage.completion_tokens > 0
+    assert usage.total_tokens == usage.prompt_tokens + usage.completion_tokens
+
+
+def test_custom_responder_and_completions_endpoint():
+    server = FakeLLMServer(responder=lambda request: request["prompt"][::-1])
+    llm = make_llm(server, model="davinci-002")
+    assert llm.complete("abc").text == "cba"
+    assert server.requests == 1
+    assert echo_responder({"prompt": "x"}).endswith("Response to: x")
+
+
+def test_latency_distributions_are_seeded():
+    rng = random.Random(0)
+    draws = [Latency.uniform(0.1, 0.2)(rng) for _ in range(100)]
+    assert all(0.1 <= d <= 0.2 for d in draws)
+    lognormal = Latency.lognormal(0.5, sigma=0.5)
+    first = [lognormal(random.Random(7)) for _ in range(3)]
+    assert first == [lognormal(random.Random(7)) for _ in range(3)]
+    assert Latency.constant(0.3)(rng) == 0.3
+
+
+def test_latency_is_applied_concurrently():
+    server = FakeLLMServer(latency=0.05)
+    llm = make_llm(server)
+
+    async def main():
+        return await asyncio.gather(*(llm.acomplete(f"p{i}") for i in range(10)))
+
+    start = time.perf_counter()
+    responses = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+    assert len(responses) == 10
+    assert 0.05 <= elapsed < 0.5
+    assert server.peak_concurrency == 10 and server.in_flight == 0
+
+
+def test_streaming_with_chunk_latency():
+    server = FakeLLMServer(latency=0.02, chunk_latency=0.01)
+    llm = make_llm(server)
+    with llm.stream("stream this please") as stream:
+        deltas = list(stream)
+    assert "".join(deltas) == llm.complete("stream this please").text
+    metadata = stream.response.metadata
+    assert metadata["finish_reason"] == "stop"
+    assert metadata["usage"].completion_tokens > 0
+    assert metadata["time_to_first_token"] >= 0.02
+    assert metadata["total_time"] >= 0.02 + 0.01 * len(deltas)
+
+
+def test_async_streaming():
+    llm = make_llm(FakeLLMServer())
+
+    async def main():
+        async with llm.astream("async stream") as stream:
+            return [delta async for delta in stream]
+
+    assert "".join(asyncio.run(main())).endswith("Response to: async stream")
+
+
+def test_error_injection():
+    server = FakeLLMServer(error_rate=1.0)
+    with pytest.raises(openai.InternalServerError):
+        make_llm(server, retries=False).complete("x")
+    assert server.errors == 1
+
+
+def test_rate_limit_injection():
+    server = FakeLLMServer(rate_limit_rate=1.0, retry_after=2.5)
+    with pytest.raises(openai.RateLimitError) as info:
+        make_llm(server, retries=False).complete("x")
+    assert info.value.response.headers["retry-after-ms"] == "2500"
+    assert server.throttled == 1
+
+
+def test_injection_rates_follow_configuration():
+    server = FakeLLMServer(
+        error_rate=0.2, rate_limit_rate=0.1, retry_after=0.01, seed=3
+    )
+    llm = make_llm(server)
+    results = llm.complete_many(
+        [f"p{i}" for i in range(200)], max_concurrency=20, return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, openai.InternalServerError)]
+    assert len(errors) == server.errors
+    assert 20 <= server.errors <= 60 and 5 <= server.throttled <= 40
+    # Bulk completions retry throttled requests after the advertised delay.
+    assert server.requests == 200 + server.throttled
+    assert len(results) - len(errors) == 200 - server.errors
+
+
+def test_concurrency_limit_answers_429():
+    server = FakeLLMServer(latency=0.05, max_concurrency=3, retry_after=0.01)
+    llm = make_llm(server)
+    results = llm.complete_many([f"p{i}" for i in range(8)], max_concurrency=8)
+    assert [r.text.split()[-1] for r in results] == [f"p{i}" for i in range(8)]
+    assert server.throttled >= 5
+
+
+def test_unknown_endpoint():
+    llm = make_llm(FakeLLMServer(), retries=False)
+    with pytest.raises(openai.NotFoundError):
+        llm.client.models.list()
+
+
+def test_serve_over_http():
+    server = FakeLLMServer()
+    with server.serve() as base_url:
+        llm = OpenAILLM(api_key="fake", model="gpt-4", base_url=base_url)
+        text = llm.complete("over http").text
+        deltas = list(llm.stream("over http"))
+    assert text.endswith("Response to: over http")
+    assert "".join(deltas) == text
+    assert server.requests == 2
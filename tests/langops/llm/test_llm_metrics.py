@@ -0,0 +1,99 @@
+import asyncio
+import openai
+import pytest
+from langops.core.metrics import LLMMetrics
+from langops.llm.fake_server import FakeLLMServer
+from langops.llm.openai_llm import OpenAILLM
+from langops.llm.rate_limit import RateLimiter
+from langops.llm.response_cache import ResponseCache
+from langops.llm.single_flight import SingleFlight
+
+
+def make_llm(server, **kwargs):
+    return OpenAILLM(
+        api_key="fake",
+        model="gpt-4",
+        client_pool=server.client_pool(),
+        metrics=LLMMetrics(),
+        **kwargs,
+    )
+
+
+def summary(llm):
+    return llm.metrics.summary()["OpenAILLM/gpt-4"]
+
+
+def test_completions_record_latency_and_tokens():
+    server = FakeLLMServer(latency=0.02)
+    llm = make_llm(server)
+    response = llm.complete("hello")
+    assert response.metadata["latency"] >= 0.02
+    asyncio.run(llm.acomplete("hello again"))
+    stats = summary(llm)
+    assert stats["calls"] == 2 and stats["error_rate"] == 0
+    usage = response.metadata["usage"]
+    assert stats["prompt_tokens"] > usage.prompt_tokens
+    assert stats["p50"] >= 0.02
+
+
+def test_errors_are_counted_by_type():
+    llm = make_llm(FakeLLMServer(error_rate=1.0))
+    llm.client = llm.client.with_options(max_retries=0)
+    with pytest.raises(openai.InternalServerError):
+        llm.complete("x")
+    assert summary(llm)["errors"] == {"InternalServerError": 1}
+    assert summary(llm)["error_rate"] == 1.0
+
+
+def test_cache_hits_do_not_count_tokens():
+    llm = make_llm(FakeLLMServer(), response_cache=ResponseCache())
+    first = llm.complete("same")
+    llm.complete("same")
+    stats = summary(llm)
+    assert stats["cache_hit_rate"] == 0.5
+    assert stats["prompt_tokens"] == first.metadata["usage"].prompt_tokens
+
+
+def test_coalesced_calls_are_counted():
+    server = FakeLLMServer(latency=0.05)
+    llm = make_llm(server, single_flight=SingleFlight())
+
+    async def main():
+        await asyncio.gather(*(llm.acomplete("same") for _ in range(5)))
+
+    asyncio.run(main())
+    assert server.requests == 1
+    assert summary(llm)["calls"] == 5 and summary(llm)["coalesced"] == 4
+
+
+def test_streams_are_recorded():
+    llm = make_llm(FakeLLMServer(chunk_latency=0.005))
+    deltas = list(llm.stream("stream me"))
+    records = []
+    llm.metrics.add_callback(records.append)
+
+    async def main():
+        async with llm.astream("stream me") as stream:
+            return [delta async for delta in stream]
+
+    assert asyncio.run(main()) == deltas
+    assert summary(llm)["calls"] == 2 and summary(llm)["completion_tokens"] > 0
+    assert records[0].stream and records[0].time_to_first_token is not None
+
+
+def test_bulk_completions_record_queue_time_and_retries():
+    server = FakeLLMServer(latency=0.02, max_concurrency=2, retry_after=0.01)
+    llm = make_llm(server, rate_limiter=RateLimiter(max_concurrency=4))
+    responses = llm.complete_many([f"p{i}" for i in range(8)])
+    assert sum(r.metadata["retries"] for r in responses) == server.throttled > 0
+    assert all(r.metadata["queue_time"] >= 0 for r in responses)
+    stats = summary(llm)
+    assert stats["calls"] == 8 and stats["retries"] == server.throttled
+    assert stats["queue_time"] > 0
+
+
+def test_disabled_metrics_record_nothing():
+    llm = make_llm(FakeLLMServer())
+    llm.metrics = None
+    assert llm._stream_observer() is None
+    assert llm.complete("x").metadata["latency"] >= 0
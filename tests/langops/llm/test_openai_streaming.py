@@ -0,0 +1,205 @@
+import asyncio
+import importlib
+import json
+import openai
+import pytest
+from langops.llm import OpenAILLM
+
+# The HTTP library the installed openai package is built on (httpx, or a renamed fork).
+httpx = importlib.import_module(
+    openai.DefaultAsyncHttpxClient.__mro__[1].__module__.split(".")[0]
+)
+
+USAGE = {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5}
+
+
+def chat_chunk(content=None, finish_reason=None, usage=None):
+    choices = []
+    if content is not None or finish_reason is not None:
+        delta = {"content": content} if content is not None else {}
+        choices.append({"index": 0, "delta": delta, "finish_reason": finish_reason})
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "gpt-3.5-turbo",
+        "choices": choices,
+        "usage": usage,
+    }
+
+
+def completion_chunk(text=None, finish_reason=None, usage=None):
+    choices = []
+    if text is not None:
+        choices.append(
+            {"index": 0, "text": text, "finish_reason": finish_reason, "logprobs": None}
+        )
+    return {
+        "id": "cmpl-1",
+        "object": "text_completion",
+        "created": 0,
+        "model": "davinci-002",
+        "choices": choices,
+        "usage": usage,
+    }
+
+
+def sse(chunks):
+    body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks)
+    return (body + "data: [DONE]\n\n").encode()
+
+
+CHAT_CHUNKS = [
+    chat_chunk("Build "),
+    chat_chunk("failed"),
+    chat_chunk(finish_reason="stop"),
+    chat_chunk(usage=USAGE),
+]
+
+
+class Recorder:
+    def __init__(self, body):
+        self.body = body
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(json.loads(request.content))
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=self.body
+        )
+
+
+def make_llm(handler, model="gpt-3.5-turbo"):
+    llm = OpenAILLM(api_key="test_key", model=model)
+    llm.client = openai.Client(
+        api_key="test_key",
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    llm.async_client = openai.AsyncClient(
+        api_key="test_key",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return llm
+
+
+def test_stream_chat_deltas_and_response():
+    recorder = Recorder(sse(CHAT_CHUNKS))
+    llm = make_llm(recorder)
+
+    stream = llm.stream("why?", temperature=0)
+    assert list(stream) == ["Build ", "failed"]
+
+    response = stream.response
+    assert response.text == "Build failed"
+    assert response.metadata["model_used"] == "gpt-3.5-turbo"
+    assert response.metadata["finish_reason"] == "stop"
+    assert response.metadata["usage"].total_tokens == 5
+    assert response.metadata["time_to_first_token"] is not None
+    assert response.metadata["total_time"] >= response.metadata["time_to_first_token"]
+
+    request = recorder.requests[0]
+    assert request["stream"] is True
+    assert request["stream_options"] == {"include_usage": True}
+    assert request["messages"] == [{"role": "user", "content": "why?"}]
+    assert request["temperature"] == 0
+
+
+def test_stream_completions_endpoint():
+    recorder = Recorder(
+        sse(
+            [
+                completion_chunk("a"),
+                completion_chunk("b", finish_reason="length"),
+                completion_chunk(usage=USAGE),
+            ]
+        )
+    )
+    llm = make_llm(recorder, model="davinci-002")
+
+    response = llm.stream("p").collect()
+
+    assert response.text == "ab"
+    assert response.metadata["finish_reason"] == "length"
+    assert response.metadata["usage"].total_tokens == 5
+    assert recorder.requests[0]["prompt"] == "p"
+
+
+def test_stream_keeps_explicit_stream_options():
+    recorder = Recorder(sse(CHAT_CHUNKS[:3]))
+    llm = make_llm(recorder)
+
+    response = llm.stream("p", stream=False, stream_options={"include_usage": False})
+
+    assert response.collect().metadata["usage"] is None
+    assert recorder.requests[0]["stream"] is True
+    assert recorder.requests[0]["stream_options"] == {"include_usage": False}
+
+
+def test_stream_does_not_send_until_iterated():
+    recorder = Recorder(sse(CHAT_CHUNKS))
+    stream = make_llm(recorder).stream("p")
+    assert recorder.requests == []
+    stream.close()
+    assert recorder.requests == []
+
+
+def test_astream_chat():
+    recorder = Recorder(sse(CHAT_CHUNKS))
+    llm = make_llm(recorder)
+
+    async def consume():
+        async with llm.astream("why?") as stream:
+            deltas = [delta async for delta in stream]
+        return deltas, stream.response
+
+    deltas, response = asyncio.run(consume())
+    assert deltas == ["Build ", "failed"]
+    assert response.text == "Build failed"
+    assert response.metadata["usage"].total_tokens == 5
+
+
+class HangingBody(httpx.AsyncByteStream):
+    """Sends one chunk, then never finishes; records when it is closed."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def __aiter__(self):
+        yield f"data: {json.dumps(chat_chunk('first'))}\n\n".encode()
+        await asyncio.sleep(60)
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("cancel", [True, False])
+def test_astream_cancel_or_close_closes_http_stream(cancel):
+    body = HangingBody()
+    llm = make_llm(
+        lambda request: httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, stream=body
+        )
+    )
+
+    async def main():
+        stream = llm.astream("p")
+        received = []
+
+        async def consume():
+            async for delta in stream:
+                received.append(delta)
+
+        task = asyncio.ensure_future(consume())
+        while not received:
+            await asyncio.sleep(0.01)
+        if cancel:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        else:
+            await stream.aclose()
+            await task  # the consumer stops iterating
+        return received
+
+    assert asyncio.run(asyncio.wait_for(main(), 5)) == ["first"]
+    assert body.closed
@@ -0,0 +1,280 @@
+import asyncio
+import importlib
+import json
+from unittest.mock import patch
+import openai
+import pytest
+from langops.core.types import LLMResponse
+from langops.llm import OpenAILLM
+from langops.llm.rate_limit import (
+    AIMDController,
+    RateLimiter,
+    TokenBucket,
+    parse_duration,
+)
+
+# The HTTP library the installed openai package is built on (httpx, or a renamed fork).
+httpx = importlib.import_module(
+    openai.DefaultAsyncHttpxClient.__mro__[1].__module__.split(".")[0]
+)
+
+
+def completion(content, total_tokens=2):
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-3.5-turbo",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+        "usage": {
+            "prompt_tokens": 1,
+            "completion_tokens": 1,
+            "total_tokens": total_tokens,
+        },
+    }
+
+
+class FakeAPI:
+    """Chat completions endpoint echoing the prompt, with scripted 429s."""
+
+    def __init__(self, throttle=(), headers=None, delay=0.0):
+        self.throttle = set(throttle)
+        self.headers = headers or {}
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request):
+        prompt = json.loads(request.content)["messages"][0]["content"]
+        self.calls.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if prompt in self.throttle:
+            self.throttle.discard(prompt)
+            return httpx.Response(
+                429,
+                headers={"retry-after-ms": "10"},
+                json={"error": {"message": "Rate limit", "type": "requests"}},
+            )
+        if prompt == "bad":
+            return httpx.Response(400, json={"error": {"message": "Bad request"}})
+        return httpx.Response(
+            200, headers=self.headers, json=completion(prompt.upper())
+        )
+
+    def client(self):
+        return openai.AsyncClient(
+            api_key="test_key",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(self)),
+        )
+
+
+def llm_for(api, **kwargs):
+    llm = OpenAILLM(api_key="test_key", **kwargs)
+    llm.async_client = api.client()
+    return llm
+
+
+def test_parse_duration():
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("6m0s") == 360
+    assert parse_duration("1.5s") == 1.5
+    assert parse_duration("30") == 30
+    assert parse_duration("soon") is None
+    assert parse_duration(None) is None
+
+
+def test_token_bucket_admits_oversized_requests_in_debt():
+    bucket = TokenBucket(per_minute=60)
+    asyncio.run(bucket.acquire(100))
+    assert bucket.tokens == pytest.approx(-40, abs=0.1)
+    bucket.adjust(-50)
+    assert bucket.tokens == pytest.approx(10, abs=0.1)
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=6000)  # 100 per second
+    bucket.tokens = 0
+
+    async def acquire():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await bucket.acquire(5)
+        return loop.time() - start
+
+    assert 0.03 <= asyncio.run(acquire()) < 0.5
+
+
+def test_aimd_decreases_once_per_window():
+    controller = AIMDController(initial=8)
+    started = 0.0
+    assert controller.on_throttle(started)
+    assert controller.limit == 4
+    # Another request of the same window is throttled: no second decrease
+    assert not controller.on_throttle(started)
+    assert controller.limit == 4
+    # About one step per window of `limit` successes, capped at the initial limit
+    for _ in range(40):
+        controller.on_success()
+    assert controller.limit == 8
+
+
+def test_aimd_validation():
+    with pytest.raises(ValueError):
+        AIMDController(initial=4, decrease=1)
+    with pytest.raises(ValueError):
+        AIMDController(initial=1, minimum=2)
+
+
+def test_limiter_bounds_concurrency():
+    limiter = RateLimiter(max_concurrency=3)
+    state = {"in_flight": 0, "max": 0}
+
+    async def request():
+        state["in_flight"] += 1
+        state["max"] = max(state["max"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        return LLMResponse("ok"), {}
+
+    async def run():
+        await asyncio.gather(
+            *(limiter.call(request, 0, lambda e: None) for _ in range(12))
+        )
+
+    asyncio.run(run())
+    assert state["max"] == 3
+    assert limiter.stats.requests == 12
+
+
+def test_limiter_retries_throttled_requests():
+    limiter = RateLimiter(max_concurrency=4, backoff=0.01)
+    attempts = []
+
+    async def request():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("429")
+        return LLMResponse("ok"), {}
+
+    response = asyncio.run(limiter.call(request, 0, lambda e: 0.0))
+    assert response.text == "ok"
+    assert (limiter.stats.throttled, limiter.stats.retries) == (2, 2)
+    assert limiter.concurrency < 4
+
+
+def test_limiter_gives_up_after_max_retries():
+    limiter = RateLimiter(max_retries=1, backoff=0.001)
+
+    async def request():
+        raise RuntimeError("429")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(limiter.call(request, 0, lambda e: 0.0))
+    assert limiter.stats.requests == 2
+
+
+def test_limiter_pauses_on_exhausted_headers():
+    limiter = RateLimiter()
+    limiter.on_headers(
+        {"x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "50ms"}
+    )
+
+    async def acquire():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await limiter.acquire()
+        return loop.time() - start
+
+    assert asyncio.run(acquire()) >= 0.04
+
+
+def test_limiter_reconciles_token_usage():
+    limiter = RateLimiter(tokens_per_minute=1000)
+
+    async def request():
+        return LLMResponse("ok", metadata={"usage": {"total_tokens": 30}}), {}
+
+    asyncio.run(limiter.call(request, 100, lambda e: None))
+    assert limiter.tokens.tokens == pytest.approx(970, abs=1)
+
+
+def test_limiter_refunds_tokens_of_throttled_requests():
+    limiter = RateLimiter(tokens_per_minute=1000, backoff=0.001)
+    attempts = []
+
+    async def request():
+        attempts.append(limiter.tokens.tokens)
+        if len(attempts) < 3:
+            raise RuntimeError("429")
+        return LLMResponse("ok", metadata={"usage": {"total_tokens": 30}}), {}
+
+    asyncio.run(limiter.call(request, 100, lambda e: 0.0))
+    # Every attempt saw only its own estimate taken from the bucket.
+    assert attempts == [pytest.approx(900, abs=1)] * 3
+    assert limiter.tokens.tokens == pytest.approx(970, abs=1)
+
+
+def test_acomplete_many_in_order_with_retries():
+    api = FakeAPI(throttle={"p3", "p7"}, delay=0.005)
+    llm = llm_for(api, rate_limiter=RateLimiter(max_concurrency=4, backoff=0.01))
+    prompts = [f"p{n}" for n in range(10)]
+
+    results = asyncio.run(llm.acomplete_many(prompts))
+
+    assert [r.text for r in results] == [p.upper() for p in prompts]
+    assert api.max_in_flight <= 4
+    assert llm.rate_limiter.stats.throttled == 2
+    assert len(api.calls) == 12
+
+
+def test_aiter_complete_many_yields_as_completed():
+    api = FakeAPI()
+    llm = llm_for(api)
+
+    async def collect():
+        return [
+            (index, result.text)
+            async for index, result in llm.aiter_complete_many(["a", "b", "c"])
+        ]
+
+    assert sorted(asyncio.run(collect())) == [(0, "A"), (1, "B"), (2, "C")]
+
+
+def test_acomplete_many_return_exceptions():
+    llm = llm_for(FakeAPI())
+    results = asyncio.run(llm.acomplete_many(["ok", "bad"], return_exceptions=True))
+    assert results[0].text == "OK"
+    assert isinstance(results[1], openai.BadRequestError)
+
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(llm.acomplete_many(["ok", "bad"]))
+
+
+def test_complete_many_sync_uses_batch_client():
+    api = FakeAPI()
+    llm = OpenAILLM(api_key="test_key")
+    with patch("langops.llm.openai_llm.openai.AsyncClient", return_value=api.client()):
+        results = llm.complete_many(["x", "y"], max_concurrency=2)
+    assert [r.text for r in results] == ["X", "Y"]
+
+
+def test_complete_many_inside_event_loop():
+    llm = OpenAILLM(api_key="test_key")
+
+    async def run():
+        llm.complete_many(["x"])
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
@@ -25,6 +25,42 @@ class TestLLMRegistry(unittest.TestCase):
         self.assertIn("TestLLM1", llm_names)
         self.assertIn("TestLLM2", llm_names)
 
+    def test_get_instance(self):
+        @LLMRegistry.register("CachedLLM")
+        class CachedLLM:
+            def __init__(self, model="gpt-4o"):
+                self.model = model
+
+        llm = LLMRegistry.get_instance("CachedLLM", model="gpt-4o-mini")
+        self.assertIs(LLMRegistry.get_instance("CachedLLM", model="gpt-4o-mini"), llm)
+        self.assertEqual(llm.model, "gpt-4o-mini")
+
+        # Re-registering a name drops the instances of the previous class
+        @LLMRegistry.register("CachedLLM")
+        class ReplacedLLM(CachedLLM):
+            pass
+
+        self.assertIsInstance(
+            LLMRegistry.get_instance("CachedLLM", model="gpt-4o-mini"), ReplacedLLM
+        )
+        LLMRegistry.invalidate_instances("CachedLLM")
+
+    def test_set_max_instances(self):
+        @LLMRegistry.register("BoundedLLM")
+        class BoundedLLM:
+            def __init__(self, n):
+                self.n = n
+
+        LLMRegistry.invalidate_instances()
+        LLMRegistry.set_max_instances(1)
+        try:
+            first = LLMRegistry.get_instance("BoundedLLM", n=1)
+            LLMRegistry.get_instance("BoundedLLM", n=2)
+            self.assertIsNot(LLMRegistry.get_instance("BoundedLLM", n=1), first)
+        finally:
+            LLMRegistry.set_max_instances(None)
+            LLMRegistry.invalidate_instances()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,200 @@
+import multiprocessing
+import os
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from openai.types import CompletionUsage
+from langops.core.types import LLMResponse
+from langops.llm import OpenAILLM, ResponseCache
+
+
+def response(text="Hi there!"):
+    return LLMResponse(
+        text=text,
+        raw=object(),
+        metadata={
+            "usage": CompletionUsage(
+                prompt_tokens=3, completion_tokens=2, total_tokens=5
+            )
+        },
+    )
+
+
+def chat_response(text="Hi there!"):
+    return SimpleNamespace(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        usage=CompletionUsage(prompt_tokens=3, completion_tokens=2, total_tokens=5),
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+    )
+
+
+def _write_entries(path, worker):
+    cache = ResponseCache(path=path)
+    for n in range(20):
+        cache.put(
+            ResponseCache.key({"worker": worker, "n": n}),
+            LLMResponse(f"{worker}-{n}"),
+            0.1,
+        )
+
+
+def test_key_is_canonical():
+    first = ResponseCache.key({"model": "m", "params": {"a": 1, "b": 2}})
+    second = ResponseCache.key({"params": {"b": 2, "a": 1}, "model": "m"})
+    assert first == second
+    assert first != ResponseCache.key({"model": "m", "params": {"a": 1, "b": 3}})
+
+
+def test_memory_hit_and_counters():
+    cache = ResponseCache()
+    key = ResponseCache.key({"prompt": "x"})
+    assert cache.get(key) is None
+    original = response()
+    assert cache.put(key, original, latency=1.5) is original
+    assert original.metadata["cache"]["hit"] is False
+
+    hit = cache.get(key)
+    assert hit.text == "Hi there!"
+    assert hit.raw is original.raw
+    assert hit.metadata["cache"] == {
+        "hit": True,
+        "tier": "memory",
+        "key": key,
+        "latency_saved": 1.5,
+        "hits": 1,
+        "memory_hits": 1,
+        "disk_hits": 0,
+        "misses": 1,
+        "saved_seconds": 1.5,
+    }
+
+
+def test_hit_latency_is_lookup_time():
+    cache = ResponseCache()
+    original = response()
+    original.metadata["latency"] = 30.0
+    cache.put("k", original, latency=30.0)
+    assert original.metadata["latency"] == 30.0
+
+    hit = cache.get("k")
+    assert 0 <= hit.metadata["latency"] < 30.0
+    assert hit.metadata["cache"]["latency_saved"] == 30.0
+
+
+def test_memory_lru_eviction():
+    cache = ResponseCache(maxsize=2)
+    for n in range(3):
+        cache.put(str(n), LLMResponse(str(n)), 0.1)
+    assert cache.get("0") is None
+    assert cache.get("2").text == "2"
+    assert cache.size() == (2, 0)
+
+
+def test_ttl_expiry(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "llm.sqlite"), ttl=10)
+    with patch("langops.llm.response_cache.time.time", return_value=1000.0):
+        cache.put("k", response(), 0.2)
+    with patch("langops.llm.response_cache.time.time", return_value=1009.0):
+        assert cache.get("k") is not None
+    with patch("langops.llm.response_cache.time.time", return_value=1011.0):
+        assert cache.get("k") is None
+        assert ResponseCache(path=cache.path).get("k") is None
+
+
+def test_disk_tier_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache" / "llm.sqlite")
+    ResponseCache(path=path).put("k", response("from disk"), 2.0)
+
+    cache = ResponseCache(path=path)
+    hit = cache.get("k")
+    assert hit.text == "from disk"
+    assert hit.raw is None
+    assert hit.metadata["usage"]["total_tokens"] == 5
+    assert hit.metadata["cache"]["tier"] == "disk"
+    # Promoted to the memory tier
+    assert cache.get("k").metadata["cache"]["tier"] == "memory"
+
+
+def test_disk_size_eviction(tmp_path):
+    cache = ResponseCache(maxsize=1, path=str(tmp_path / "llm.sqlite"), max_bytes=2000)
+    for n in range(20):
+        cache.put(str(n), LLMResponse("x" * 200), 0.1)
+    with sqlite3.connect(cache.path) as connection:
+        (total,) = connection.execute("SELECT SUM(size) FROM responses").fetchone()
+    assert total <= 2000
+    assert cache.get("19") is not None
+    assert cache.get("0") is None
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ResponseCache(maxsize=1, path=str(tmp_path / "llm.sqlite"))
+    cache.put("k", LLMResponse("ok"), 0.1)
+    cache.put("other", LLMResponse("ok"), 0.1)
+    with sqlite3.connect(cache.path) as connection:
+        connection.execute("UPDATE responses SET payload = 'not json' WHERE key = 'k'")
+    assert cache.get("k") is None
+
+
+def test_concurrent_processes(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    ResponseCache(path=path)
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_write_entries, args=(path, w)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+    assert ResponseCache(path=path).size() == (0, 80)
+
+
+def test_clear(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "llm.sqlite"))
+    cache.put("k", LLMResponse("x"), 0.1)
+    cache.clear()
+    assert cache.size() == (0, 0)
+
+
+def test_invalid_arguments():
+    for kwargs in ({"maxsize": 0}, {"ttl": 0}, {"max_bytes": 0}):
+        with pytest.raises(ValueError):
+            ResponseCache(**kwargs)
+
+
+def test_openai_llm_complete_is_cached():
+    llm = OpenAILLM(api_key="test_key", response_cache=ResponseCache())
+    llm.client.chat.completions.create = MagicMock(return_value=chat_response())
+
+    first = llm.complete("Hello", temperature=0)
+    # The prepared messages are the key, so the equivalent message list hits
+    second = llm.complete([{"role": "user", "content": "Hello"}], temperature=0)
+    other = llm.complete("Hello", temperature=1)
+
+    assert llm.client.chat.completions.create.call_count == 2
+    assert first.metadata["cache"]["hit"] is False
+    assert second.text == "Hi there!"
+    assert second.metadata["cache"]["hit"] is True
+    assert other.metadata["cache"]["hit"] is False
+
+
+def test_openai_llm_stream_bypasses_cache():
+    llm = OpenAILLM(api_key="test_key", response_cache=ResponseCache())
+    llm.client.chat.completions.create = MagicMock(return_value=chat_response())
+    llm.complete("Hello", stream=True)
+    llm.complete("Hello", stream=True)
+    assert llm.client.chat.completions.create.call_count == 2
+    assert llm.response_cache.stats.misses == 0
+
+
+@pytest.mark.asyncio
+async def test_openai_llm_acomplete_is_cached(tmp_path):
+    cache = ResponseCache(path=os.path.join(tmp_path, "llm.sqlite"))
+    llm = OpenAILLM(api_key="test_key", response_cache=cache)
+    llm.async_client.chat.completions.create = AsyncMock(return_value=chat_response())
+    await llm.acomplete("Hello")
+    hit = await llm.acomplete("Hello")
+    assert llm.async_client.chat.completions.create.call_count == 1
+    assert hit.metadata["cache"]["hits"] == 1
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from langops.core.base_llm import BaseLLM
+from langops.core.types import LLMResponse
+from langops.llm.response_cache import ResponseCache
+from langops.llm.single_flight import SingleFlight
+
+
+class SlowLLM(BaseLLM):
+    """Counts provider calls; each takes `delay` seconds."""
+
+    def __init__(self, single_flight=None, response_cache=None, delay=0.05):
+        self.model = "slow"
+        self.single_flight = single_flight
+        self.response_cache = response_cache
+        self.delay = delay
+        self.calls = 0
+        self.error = None
+
+    def _call(self, prompt):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return LLMResponse(text=prompt.upper(), metadata={"n": self.calls})
+
+    def complete(self, prompt, **kwargs):
+        def complete():
+            time.sleep(self.delay)
+            return self._call(prompt)
+
+        return self._cached_complete(prompt, kwargs, complete)
+
+    async def acomplete(self, prompt, **kwargs):
+        async def acomplete():
+            await asyncio.sleep(self.delay)
+            return self._call(prompt)
+
+        return await self._cached_acomplete(prompt, kwargs, acomplete)
+
+    @classmethod
+    def default_model(cls):
+        return "slow"
+
+
+def test_concurrent_async_requests_share_one_call():
+    llm = SlowLLM(SingleFlight())
+
+    async def main():
+        return await asyncio.gather(
+            *(llm.acomplete("same") for _ in range(10)), llm.acomplete("other")
+        )
+
+    responses = asyncio.run(main())
+    assert llm.calls == 2
+    assert {r.text for r in responses[:10]} == {"SAME"}
+    assert [r.metadata.get("coalesced", False) for r in responses[:10]].count(True) == 9
+    assert llm.single_flight.calls == 2 and llm.single_flight.shared == 9
+
+
+def test_arguments_are_part_of_the_key():
+    llm = SlowLLM(SingleFlight())
+
+    async def main():
+        await asyncio.gather(
+            llm.acomplete("same", temperature=0), llm.acomplete("same", temperature=1)
+        )
+
+    asyncio.run(main())
+    assert llm.calls == 2
+
+
+def test_sequential_requests_are_not_coalesced():
+    llm = SlowLLM(SingleFlight(), delay=0)
+    llm.complete("same")
+    llm.complete("same")
+    assert llm.calls == 2
+
+
+def test_concurrent_threads_share_one_call():
+    llm = SlowLLM(SingleFlight(), delay=0.2)
+    with ThreadPoolExecutor(8) as pool:
+        responses = list(pool.map(lambda _: llm.complete("same"), range(8)))
+    assert llm.calls == 1
+    assert all(r.text == "SAME" for r in responses)
+
+
+def test_errors_reach_every_caller():
+    llm = SlowLLM(SingleFlight())
+    llm.error = ValueError("upstream failed")
+
+    async def main():
+        return await asyncio.gather(
+            *(llm.acomplete("same") for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert llm.calls == 1
+    assert all(isinstance(r, ValueError) for r in results)
+
+    barrier = threading.Barrier(3)
+
+    def call():
+        barrier.wait()
+        return llm.complete("same")
+
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(call) for _ in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    llm = SlowLLM(SingleFlight(), delay=0.1)
+
+    async def main():
+        first = asyncio.ensure_future(llm.acomplete("same"))
+        second = asyncio.ensure_future(llm.acomplete("same"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        response = await second
+        assert first.cancelled()
+        return response
+
+    assert asyncio.run(main()).text == "SAME"
+    assert llm.calls == 1
+
+
+def test_call_is_cancelled_when_every_caller_is():
+    llm = SlowLLM(SingleFlight(), delay=0.1)
+
+    async def main():
+        tasks = [asyncio.ensure_future(llm.acomplete("same")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.sleep(0.15)
+        # A new caller starts a fresh call
+        return await llm.acomplete("same")
+
+    assert asyncio.run(main()).text == "SAME"
+    assert llm.calls == 1  # the cancelled call never reached the provider
+    assert llm.single_flight.calls == 2
+
+
+def test_with_response_cache():
+    cache = ResponseCache()
+    llm = SlowLLM(SingleFlight(), response_cache=cache)
+
+    async def main():
+        await asyncio.gather(*(llm.acomplete("same") for _ in range(5)))
+        return await llm.acomplete("same")
+
+    response = asyncio.run(main())
+    assert llm.calls == 1
+    assert response.metadata["cache"]["hit"] is True
+
+
+def test_streams_are_not_coalesced():
+    llm = SlowLLM(SingleFlight(), delay=0)
+    llm.complete("same", stream=True)
+    assert llm.single_flight.calls == 0
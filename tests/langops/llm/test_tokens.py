@@ -0,0 +1,182 @@
+import sys
+from unittest.mock import MagicMock, patch
+import pytest
+from langops.llm import OpenAILLM
+from langops.llm.tokens import (
+    ContextOverflowError,
+    TokenCounter,
+    context_window,
+    fit_messages,
+    fit_prompt,
+    token_counter,
+)
+
+LOG = "\n".join(
+    f"[ERROR] 2024-05-0{i % 9 + 1} step {i}: com.example.build.Task failed (exit 1)"
+    for i in range(200)
+)
+
+
+class CharEncoding:
+    """Encoding with one token per character."""
+
+    def encode(self, text, disallowed_special=()):
+        return [ord(c) for c in text]
+
+    def decode(self, tokens):
+        return "".join(chr(t) for t in tokens)
+
+
+@pytest.fixture
+def counter():
+    return TokenCounter(use_tiktoken=False)
+
+
+def test_context_windows_cover_chat_models():
+    for model in OpenAILLM.CHAT_MODELS:
+        assert context_window(model) is not None
+    assert context_window("gpt-4-0613") == 8192
+    assert context_window("gpt-4-turbo-2024-04-09") == 128000
+    assert context_window("gpt-3.5-turbo-instruct") == 4096
+    assert context_window("my-local-model") is None
+
+
+def test_heuristic_counts(counter):
+    assert counter.backend == "heuristic"
+    assert counter.count("") == 0
+    assert counter.count("The quick brown fox jumps over the lazy dog.") == 10
+    # identifiers, hashes and digits cost more than prose of the same length
+    assert counter.count("sha256:3f2a9c0b1d4e5f60718293a4b5c6d7e8") > counter.count(
+        "the build has failed in the test st"
+    )
+
+
+def test_counts_are_memoized(counter):
+    counter.count(LOG)
+    counter.count(LOG)
+    assert counter._count.cache_info().hits == 1
+
+
+def test_tiktoken_unavailable_falls_back_to_heuristic():
+    with patch.dict(sys.modules, {"tiktoken": None}):
+        assert TokenCounter("gpt-4").backend == "heuristic"
+
+
+def test_encoding_backend():
+    counter = TokenCounter("gpt-4")
+    with patch.object(TokenCounter, "_load_encoding", return_value=CharEncoding()):
+        assert counter.backend == "tiktoken"
+        assert counter.count("hello") == 5
+        assert counter.truncate("abcdefghij", 4, keep="head", marker="") == "abcd"
+        assert counter.truncate("abcdefghij", 4, keep="tail", marker="") == "ghij"
+
+
+def test_count_messages_includes_overhead(counter):
+    messages = [{"role": "user", "content": "hello"}]
+    assert counter.count_messages(messages) == 3 + 3 + 1 + 1
+    parts = [{"role": "user", "content": [{"type": "text", "text": "hello"}]}]
+    assert counter.count_messages(parts) == counter.count_messages(messages)
+
+
+@pytest.mark.parametrize("keep", ["head", "tail", "middle"])
+def test_truncate_fits_budget(counter, keep):
+    text = counter.truncate(LOG, 100, keep=keep)
+    assert counter.count(text) <= 100
+    assert "[...truncated...]" in text
+    if keep != "tail":
+        assert text.startswith("[ERROR] 2024-05-01 step 0")
+    if keep != "head":
+        assert text.endswith("failed (exit 1)")
+
+
+def test_truncate_keeps_fitting_text(counter):
+    assert counter.truncate("short", 10) == "short"
+    with pytest.raises(ValueError):
+        counter.truncate(LOG, 10, keep="start")
+
+
+def test_fit_messages_drops_oldest_history_first(counter):
+    messages = [
+        {"role": "system", "content": "You analyze CI logs."},
+        {"role": "user", "content": LOG},
+        {"role": "assistant", "content": "It failed."},
+        {"role": "user", "content": "Why?"},
+    ]
+    budget = counter.count_messages(messages) - counter.count(LOG)
+    fitted = fit_messages(messages, budget, counter)
+    assert [m["content"] for m in fitted] == [
+        "You analyze CI logs.",
+        "It failed.",
+        "Why?",
+    ]
+    assert messages[1]["content"] == LOG  # input untouched
+
+
+def test_fit_messages_truncates_long_content(counter):
+    messages = [
+        {"role": "system", "content": "You analyze CI logs."},
+        {"role": "user", "content": LOG},
+    ]
+    fitted = fit_messages(messages, 300, counter)
+    assert counter.count_messages(fitted) <= 300
+    assert fitted[0] == messages[0]
+    assert "[...truncated...]" in fitted[1]["content"]
+
+
+def test_fit_prompt_overflow(counter):
+    with pytest.raises(ContextOverflowError) as e:
+        fit_messages([{"role": "user", "content": "hi"}], 5, counter)
+    assert e.value.budget == 5
+    with pytest.raises(ContextOverflowError):
+        fit_prompt(LOG, 0, counter)
+    assert counter.count(fit_prompt(LOG, 50, counter)) <= 50
+
+
+def test_token_counter_is_shared():
+    assert token_counter("gpt-4") is token_counter("gpt-4")
+
+
+def make_llm(**kwargs):
+    llm = OpenAILLM(api_key="test_key", model="gpt-4", **kwargs)
+    llm.client = MagicMock()
+    return llm
+
+
+def test_context_policy_error_fails_before_sending():
+    llm = make_llm(context_policy="error")
+    with pytest.raises(ContextOverflowError):
+        llm.complete(LOG * 10)
+    llm.client.chat.completions.create.assert_not_called()
+
+
+def test_context_policy_trim_sends_fitted_prompt():
+    llm = make_llm(context_policy="trim")
+    llm.complete(LOG * 10, max_tokens=500)
+    messages = llm.client.chat.completions.create.call_args.kwargs["messages"]
+    assert llm.token_counter.count_messages(messages) <= 8192 - 500
+    assert "[...truncated...]" in messages[0]["content"]
+
+
+def test_context_policy_none_sends_unchecked():
+    llm = make_llm()
+    llm.complete(LOG * 10)
+    messages = llm.client.chat.completions.create.call_args.kwargs["messages"]
+    assert messages[0]["content"] == LOG * 10
+
+
+def test_fit_to_context_and_count_tokens():
+    llm = make_llm()
+    assert llm.count_tokens("hello") == llm.token_counter.count_messages(
+        [{"role": "user", "content": "hello"}]
+    )
+    assert llm.fit_to_context("hello") == [{"role": "user", "content": "hello"}]
+    with pytest.raises(ContextOverflowError):
+        llm.fit_to_context(LOG * 10, trim=False)
+    llm.model = "my-local-model"
+    assert llm.context_window is None
+    assert llm.fit_to_context("x" * 10**5) == "x" * 10**5  # completions endpoint
+
+
+def test_invalid_context_policy():
+    with pytest.raises(ValueError):
+        OpenAILLM(api_key="test_key", context_policy="shrink")
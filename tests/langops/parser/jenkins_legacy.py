@@ -0,0 +1,246 @@
+"""
+Frozen copy of the original JenkinsParser classification, stage detection and timestamp
+logic, used as the reference for parity tests and the benchmark. Do not optimize.
+"""
+
+import os
+import random
+import re
+from datetime import datetime
+from typing import List, Optional
+from langops.core.constants import SEVERITY_ORDER
+from langops.core.types import LogEntry, ParsedLogBundle, SeverityLevel, StageLogs
+from langops.parser import jenkins_patterns
+
+SIMULATED_LOG = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "..",
+    "demo",
+    "simulate_data",
+    "jenkins_logs.txt",
+)
+
+
+class LegacyJenkinsParser:
+
+    def __init__(self) -> None:
+        self.patterns = (
+            jenkins_patterns.GROOVY_PATTERNS
+            + jenkins_patterns.JAVA_PATTERNS
+            + jenkins_patterns.NODEJS_PATTERNS
+            + jenkins_patterns.PYTHON_PATTERNS
+            + jenkins_patterns.DOTNET_PATTERNS
+            + jenkins_patterns.SH_PATTERNS
+            + jenkins_patterns.SONAR_PATTERNS
+            + jenkins_patterns.JFROG_PATTERNS
+            + jenkins_patterns.DOCKER_PATTERNS
+            + jenkins_patterns.JENKINS_PATTERNS
+            + jenkins_patterns.HTTP_PATTERNS
+            + jenkins_patterns.TEST_PATTERNS
+            + jenkins_patterns.LINT_PATTERNS
+        )
+        self.stage_patterns = jenkins_patterns.STAGE_PATTERNS
+
+    def parse(
+        self,
+        data: str,
+        min_severity: SeverityLevel = SeverityLevel.WARNING,
+        deduplicate: bool = True,
+    ) -> ParsedLogBundle:
+        current_stage = "Unknown"
+        stage_map: dict[str, list[LogEntry]] = {}
+        seen_messages: set[str] = set()
+
+        for line in data.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            detected_stage = self._detect_stage(line)
+            if detected_stage:
+                current_stage = detected_stage
+                continue
+
+            severity = self._classify_severity(line)
+            if SEVERITY_ORDER.index(severity) < SEVERITY_ORDER.index(min_severity):
+                continue
+
+            if deduplicate and line in seen_messages:
+                continue
+
+            seen_messages.add(line)
+
+            if current_stage not in stage_map:
+                stage_map[current_stage] = []
+
+            stage_map[current_stage].append(
+                LogEntry(
+                    timestamp=self._extract_timestamp(line),
+                    message=line,
+                    severity=severity,
+                )
+            )
+
+        return ParsedLogBundle(
+            stages=[
+                StageLogs(name=stage, logs=entries)
+                for stage, entries in stage_map.items()
+                if entries
+            ]
+        )
+
+    def _detect_stage(self, line: str) -> Optional[str]:
+        for pattern in self.stage_patterns:
+            match = pattern.search(line)
+            if match:
+                stage_name = match.group(1).strip()
+                if (
+                    not stage_name
+                    or len(stage_name) < 2
+                    or stage_name.lower() in {"user", "admin", "system", "sh"}
+                ):
+                    continue
+                stage_name = re.sub(r"^\d+[\.\)]\s*", "", stage_name)
+                stage_name = re.sub(r"\s*\[.*?\]$", "", stage_name)
+                if stage_name.lower() == "pipeline":
+                    return "Pipeline"
+                return stage_name
+        return None
+
+    def _classify_severity(self, line: str) -> SeverityLevel:
+        for pattern, level in self.patterns:
+            if pattern.search(line):
+                return level
+        return SeverityLevel.INFO
+
+    def _extract_timestamp(self, line: str) -> Optional[datetime]:
+        timestamp_patterns = [
+            r"(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[,\.]\d{3})?)",
+            r"(\w{3}\s+\d{1,2}\s+\d{4}\s+\d{2}:\d{2}:\d{2})",
+            r"(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2})",
+        ]
+        format_strings = [
+            "%Y-%m-%dT%H:%M:%S.%f",
+            "%Y-%m-%dT%H:%M:%S",
+            "%b %d %Y %H:%M:%S",
+            "%m/%d/%Y %H:%M:%S",
+        ]
+        for pattern in timestamp_patterns:
+            for match in re.finditer(pattern, line):
+                timestamp_str = match.group(1)
+                for fmt in format_strings:
+                    try:
+                        return datetime.strptime(timestamp_str, fmt)
+                    except ValueError:
+                        continue
+        return None
+
+
+# Lines chosen to exercise every matcher, overlapping matchers (priority), every stage
+# pattern, stage names rejected or emptied by cleaning, and every timestamp format.
+EDGE_CASE_LINES = [
+    "[Pipeline] { (Build)",
+    "[Pipeline] { (1. Compile)",
+    "[Pipeline] { (12.)",
+    "[Pipeline] [annotation]",
+    "[Pipeline] sh",
+    "[Pipeline] stage",
+    "[sh] command",
+    "[x] short",
+    "[] empty name",
+    "[   ] whitespace only",
+    "[Deploy to prod] [stable]",
+    'Stage "Build Application"',
+    "Stage 'user'",
+    "Running in Cleanup",
+    "Running in system",
+    "+ make build [",
+    "Build step 'Execute shell' marked build as FAILURE",
+    "Build step 'Execute shell'",
+    "ERROR: groovy.lang.MissingPropertyException: No such property: foo",
+    "org.codehaus.groovy: unable to resolve class Foo",
+    'Exception in thread "main" java.lang.NullPointerException',
+    "java.lang.OutOfMemoryError: Java heap space",
+    "(node:1234) UnhandledPromiseRejectionWarning: Error: boom",
+    "TypeError: Cannot read property 'x' of undefined",
+    "ReferenceError: foo is not defined",
+    "Traceback (most recent call last):",
+    "MemoryError",
+    "ModuleNotFoundError: No module named 'foo'",
+    "SyntaxError: invalid syntax",
+    "System.NullReferenceException: Object reference not set",
+    "System.OutOfMemoryException",
+    "Program.cs(12,5): error CS1002: ; expected",
+    "bash: foo: command not found",
+    "cat: missing.txt: No such file or directory",
+    "mkdir: permission denied",
+    "script.sh: line 12: unexpected EOF while looking for matching `\"'",
+    "script.sh: line 3: syntax error: unexpected end of file",
+    "script.sh: line 42: foo",
+    "Finished: FAILURE",
+    "some failed step",
+    "Build was marked build as UNSTABLE",
+    "curl: (22) The requested URL returned error: 404",
+    "HTTP/1.1 401 Unauthorized",
+    "HTTP/1.1 403 Forbidden",
+    "HTTP/1.1 404 Not Found",
+    "HTTP/1.1 500 Internal Server Error",
+    "connect: Connection refused",
+    "socket timeout after 30s",
+    "=== FAILURES ===",
+    "pydantic.ValidationError: 1 validation error",
+    "name: field required",
+    "test_login failed",
+    "AssertionError: assertion error in test",
+    "app.py:12:1: F401 'os' imported but unused",
+    "app.py:13:80: E501 line too long (92 > 79 characters)",
+    "app.py:14:5: E722 do not use bare 'except'",
+    "ERROR: SonarScanner execution failed",
+    "java.lang.IllegalStateException: bad state",
+    "[jfrog] xray scan failed",
+    "401 unauthorized from artifactory",
+    "failed to resolve artifact com.foo:bar:1.0",
+    "write /var/lib/docker: no space left on device",
+    "manifest for foo:latest not found",
+    "Error response from daemon: conflict",
+    "failed to pull image alpine:3",
+    "2024-01-15T10:30:45.123 ERROR: Build failed",
+    "2024-01-15T10:30:45,123 ERROR: comma millis",
+    "2024-01-15 10:30:45 ERROR: space separated",
+    "Jan 15 2024 10:30:45 ERROR: month name",
+    "01/15/2024 10:30:45 ERROR: us date",
+    "2024-13-45T25:70:80 ERROR: invalid then 2024-01-01T00:00:00 valid",
+    "2024-13-45T25:70:80 ERROR: Invalid timestamp",
+    "   ERROR: leading whitespace   ",
+    "plain info line",
+    "",
+]
+
+_FILLER = [
+    "Downloading artifact {n}",
+    "Resolving dependency com.example:module-{n}",
+    "npm install completed in {n}ms",
+    " > git fetch --tags --progress origin +refs/heads/main #{n}",
+    "[INFO] Compiling module {n}",
+    "ok {n} test_passes",
+]
+
+
+def build_corpus(lines: int = 5000, seed: int = 0) -> str:
+    """
+    Returns a synthetic Jenkins log mixing the simulated demo log, the edge cases and
+    filler INFO lines, deterministic for a given seed.
+    """
+    rng = random.Random(seed)
+    with open(SIMULATED_LOG, "r", encoding="utf-8") as f:
+        simulated = f.read().splitlines()
+    pool: List[str] = simulated + EDGE_CASE_LINES
+    output = []
+    for n in range(lines):
+        if rng.random() < 0.3:
+            output.append(rng.choice(pool))
+        else:
+            output.append(rng.choice(_FILLER).format(n=n))
+    return "\n".join(output)
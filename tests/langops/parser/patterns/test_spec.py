@@ -0,0 +1,187 @@
+import json
+import re
+import subprocess
+import sys
+import unittest
+import unittest.mock
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from langops.core.types import SeverityLevel as CoreSeverityLevel
+from langops.parser import jenkins_patterns
+from langops.parser.patterns import PATTERNS, STAGE_PATTERNS, common, jenkins
+from langops.parser.patterns.spec import (
+    LazyPatternMapping,
+    compile_language_matchers,
+    compile_matchers,
+    compile_stage_patterns,
+    compiled_attributes,
+)
+from langops.parser.types.pipeline_types import SeverityLevel
+from langops.parser.utils import PatternSet, prewarm
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+
+def loaded_patterns(statement):
+    """Runs `statement` in a fresh interpreter.
+
+    Returns:
+        dict: Loaded pattern module name to the names of its compiled attributes.
+    """
+    script = (
+        "import json, sys\n"
+        f"{statement}\n"
+        "print(json.dumps({name: sorted(n for n in vars(module) "
+        "if n.endswith('PATTERNS') and not n.startswith('TIMESTAMP')) "
+        "for name, module in sys.modules.items() "
+        "if name.startswith('langops.parser.patterns.') "
+        "or name == 'langops.parser.jenkins_patterns'}))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+    )
+    return json.loads(result.stdout)
+
+
+class TestCompileSpecs(unittest.TestCase):
+
+    def test_compile_matchers(self):
+        matchers = compile_matchers([("error", "ERROR"), ("Warn", "WARNING", 0)])
+        self.assertEqual(matchers[0][0], re.compile("error", re.IGNORECASE))
+        self.assertIs(matchers[0][1], SeverityLevel.ERROR)
+        self.assertEqual(matchers[1][0].flags & re.IGNORECASE, 0)
+        self.assertIs(matchers[1][1], SeverityLevel.WARNING)
+
+    def test_compile_matchers_severity_type(self):
+        ((_, level),) = compile_matchers([("x", "CRITICAL")], CoreSeverityLevel)
+        self.assertIs(level, CoreSeverityLevel.CRITICAL)
+
+    def test_compile_matchers_unknown_severity(self):
+        with self.assertRaises(KeyError):
+            compile_matchers([("x", "FATAL")])
+
+    def test_compile_language_matchers_keeps_references(self):
+        compiled = compile_language_matchers(
+            {"python": "common.python", "custom": [("boom", "ERROR")]}
+        )
+        self.assertEqual(compiled["python"], "common.python")
+        self.assertEqual(compiled["custom"][0][0].pattern, "boom")
+
+    def test_compile_stage_patterns(self):
+        first, second = compile_stage_patterns([r"^Stage (.+)", (r"^Run (.+)", 0)])
+        self.assertEqual(first.flags & re.IGNORECASE, re.IGNORECASE)
+        self.assertEqual(second.flags & re.IGNORECASE, 0)
+
+
+class TestCompiledAttributes(unittest.TestCase):
+
+    def test_attributes_compiled_once(self):
+        self.assertIs(jenkins.JENKINS_PATTERNS, jenkins.JENKINS_PATTERNS)
+        self.assertIs(PATTERNS["jenkins"], jenkins.JENKINS_PATTERNS)
+        self.assertIs(STAGE_PATTERNS["jenkins"], jenkins.JENKINS_STAGE_PATTERNS)
+        self.assertIn("COMMON_PATTERNS", dir(common))
+
+    def test_concurrent_first_access(self):
+        calls = []
+        module = type(sys)("langops_test_patterns")
+        module.__getattr__, _ = compiled_attributes(
+            module.__name__, {"PATTERNS": lambda: calls.append(1) or object()}
+        )
+        with unittest.mock.patch.dict(sys.modules, {module.__name__: module}):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(lambda _: module.PATTERNS, range(32)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(result) for result in results}), 1)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            jenkins.NOPE_PATTERNS
+
+    def test_legacy_jenkins_patterns_use_core_severity(self):
+        for name in ("GROOVY_PATTERNS", "LINT_PATTERNS", "DOCKER_PATTERNS"):
+            for _, level in getattr(jenkins_patterns, name):
+                self.assertIsInstance(level, CoreSeverityLevel)
+        self.assertEqual(
+            len(jenkins_patterns.STAGE_PATTERNS),
+            len(jenkins_patterns.STAGE_PATTERN_SPECS),
+        )
+
+
+class TestLazyPatternMapping(unittest.TestCase):
+
+    def test_mapping_protocol(self):
+        mapping = LazyPatternMapping(
+            {"jenkins": ("langops.parser.patterns.jenkins", "JENKINS_PATTERNS")}
+        )
+        self.assertIn("jenkins", mapping)
+        self.assertNotIn("nope", mapping)
+        self.assertEqual(list(mapping), ["jenkins"])
+        self.assertEqual(len(mapping), 1)
+        self.assertIs(mapping["jenkins"], jenkins.JENKINS_PATTERNS)
+        with self.assertRaises(KeyError):
+            mapping["nope"]
+
+    def test_import_compiles_nothing(self):
+        loaded = loaded_patterns(
+            "from langops.parser.patterns import PATTERNS; 'jenkins' in PATTERNS"
+        )
+        self.assertEqual(loaded, {"langops.parser.patterns.spec": []})
+
+    def test_source_compiles_only_its_patterns(self):
+        loaded = loaded_patterns(
+            "from langops.parser.utils import PatternSet\n"
+            "PatternSet.for_source('github_actions')"
+        )
+        self.assertEqual(
+            loaded,
+            {
+                "langops.parser.patterns.spec": [],
+                "langops.parser.patterns.github_actions": [
+                    "GITHUB_ACTIONS_PATTERNS",
+                    "GITHUB_ACTIONS_STAGE_PATTERNS",
+                ],
+                "langops.parser.patterns.common": ["COMMON_PATTERNS"],
+            },
+        )
+
+
+class TestPrewarm(unittest.TestCase):
+
+    def test_prewarm_sources(self):
+        (pattern_set,) = prewarm("gitlab_ci")
+        self.assertIs(pattern_set, PatternSet.for_source("gitlab_ci"))
+
+    def test_prewarm_all_sources(self):
+        self.assertEqual(
+            [pattern_set.source for pattern_set in prewarm()], list(STAGE_PATTERNS)
+        )
+
+    def test_prewarm_unknown_source(self):
+        with self.assertRaises(ValueError):
+            prewarm("nope")
+
+    def test_prewarm_at_fork(self):
+        with (
+            unittest.mock.patch("os.register_at_fork", create=True) as register,
+            unittest.mock.patch(
+                "langops.parser.utils.pattern_set._AT_FORK_PREWARMS", set()
+            ),
+        ):
+            self.assertEqual(prewarm("jenkins", at_fork=True), [])
+            # Fork hooks cannot be unregistered: repeated calls add no more hooks.
+            prewarm("jenkins", at_fork=True)
+            self.assertEqual(register.call_count, 1)
+            prewarm("jenkins", "gitlab_ci", at_fork=True)
+            self.assertEqual(register.call_count, 2)
+        (hook,) = register.call_args_list[0].kwargs.values()
+        with unittest.mock.patch.object(PatternSet, "for_source") as for_source:
+            hook()
+        for_source.assert_called_once_with("jenkins", regex_backend="re")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import unittest
+from langops.core.types import LogEntry as JenkinsEntry
+from langops.core.types import ParsedLogBundle, StageLogs
+from langops.parser import compress_bundle as lazy_compress_bundle
+from langops.parser.compress import compress_bundle
+from langops.parser.pipeline_parser import PipelineParser
+from langops.parser.types.pipeline_types import (
+    ContextLine,
+    LogEntry,
+    ParsedPipelineBundle,
+    SeverityLevel,
+    StageWindow,
+)
+
+E = SeverityLevel.ERROR
+I = SeverityLevel.INFO
+
+
+def _bundle(entries, context=()):
+    return ParsedPipelineBundle(
+        source="jenkins",
+        stages=[
+            StageWindow(
+                name="Build",
+                start_line=1,
+                end_line=500,
+                content=[
+                    LogEntry(timestamp=None, severity=severity, line=line, message=text)
+                    for line, text, severity in entries
+                ],
+                context=list(context),
+            )
+        ],
+        metadata={"build_id": "42", "status": None},
+    )
+
+
+def _repetitive_log():
+    lines = ["[Pipeline] { (Build)"]
+    for i in range(40):
+        lines.append(
+            f"2024-05-01T12:00:{i:02d}Z WARNING: getFoo() in /home/jenkins/workspace/"
+            f"app-{i % 3}/src/main/java/com/acme/Module{i}.java has been deprecated"
+        )
+    for attempt in range(4):
+        lines.append(
+            f"2024-05-01T12:01:0{attempt}Z ERROR: request "
+            f"{attempt}1f7b2a4-5b1f-4c2e-9d3a-1234567890ab failed: "
+            "java.lang.IllegalStateException: connection pool exhausted"
+        )
+        lines.extend(
+            f"\tat com.acme.pool.Layer{frame}.call(Layer{frame}.java:{100 + frame})"
+            for frame in range(30)
+        )
+    lines.append("[Pipeline] { (Test)")
+    lines.extend(f"[12:03:{i:02d}] ERROR: test_case_{i} FAILED" for i in range(25))
+    return "\n".join(lines)
+
+
+class TestCompressBundle(unittest.TestCase):
+
+    def test_repeated_lines_are_collapsed(self):
+        bundle = _bundle(
+            [
+                (10, "2024-05-01T12:00:01Z ERROR: mirror timed out", E),
+                (11, "2024-05-01T12:00:02Z ERROR: mirror timed out", E),
+                (20, "ERROR: test_case_3 failed after 12s", E),
+                (21, "ERROR: test_case_7 failed after 9s", E),
+                (30, "ERROR: disk full", E),
+            ]
+        )
+        lines = compress_bundle(bundle).text.splitlines()
+        self.assertEqual(
+            lines[0], "source=jenkins | 1 stages | 5 entries | build_id=42"
+        )
+        self.assertEqual(lines[1], "## Build (lines 1-500)")
+        self.assertEqual(lines[2], "[10-11] ERROR ×2: mirror timed out")
+        self.assertEqual(
+            lines[3],
+            "[20-21] ERROR ×2: test_case_<*> failed after <*>s",
+        )
+        self.assertEqual(lines[4], "[30] ERROR: disk full")
+
+    def test_single_varying_token_lists_values(self):
+        bundle = _bundle(
+            [(i, f"ERROR: shard {i} lost", E) for i in range(1, 13)],
+        )
+        text = compress_bundle(bundle, max_values=3).text
+        self.assertIn("[1-12] ERROR ×12: shard <*> lost [<*> = 1, 2, 3, … +9]", text)
+
+    def test_min_repeat(self):
+        bundle = _bundle([(1, "ERROR: flaky", E), (2, "ERROR: flaky", E)])
+        text = compress_bundle(bundle, min_repeat=3).text
+        self.assertIn("[1] ERROR: flaky\n[2] ERROR: flaky", text)
+
+    def test_ids_and_paths_are_stripped(self):
+        bundle = _bundle(
+            [
+                (
+                    1,
+                    "Job 123e4567-e89b-12d3-a456-426614174000 failed in "
+                    "/var/lib/jenkins/workspace/app/src/main.py, see "
+                    "https://ci.example.com/a/b/c/d",
+                    E,
+                )
+            ]
+        )
+        text = compress_bundle(bundle).text
+        self.assertIn(
+            "Job <id> failed in …/src/main.py, see https://ci.example.com/a/b/c/d",
+            text,
+        )
+        kept = compress_bundle(bundle, strip_ids=False, shorten_paths=False).text
+        self.assertIn("123e4567-e89b-12d3-a456-426614174000", kept)
+        self.assertIn("/var/lib/jenkins/workspace/app/src/main.py", kept)
+
+    def test_stack_frames_are_elided(self):
+        frames = [
+            (2 + i, f"    at com.acme.F{i}.run(F{i}.java:{i})", I) for i in range(20)
+        ]
+        bundle = _bundle([(1, "ERROR: java.lang.NullPointerException", E)] + frames)
+        lines = compress_bundle(bundle, max_frames=2).text.splitlines()[2:]
+        self.assertEqual(
+            lines,
+            [
+                "[1] ERROR: java.lang.NullPointerException",
+                "[2] INFO: at com.acme.F0.run(F0.java:0)",
+                "[3] INFO: at com.acme.F1.run(F1.java:1)",
+                "[4] INFO: ... 17 frames elided",
+                "[21] INFO: at com.acme.F19.run(F19.java:19)",
+            ],
+        )
+
+    def test_python_traceback_in_one_message(self):
+        frames = "".join(
+            f'\n  File "/app/m{i}.py", line {i}, in f{i}\n    call_{i}()'
+            for i in range(6)
+        )
+        message = f"Traceback (most recent call last):{frames}\nKeyError: 'x'"
+        text = compress_bundle(_bundle([(1, message, E)]), max_frames=1).text
+        self.assertIn('ERROR: File "/app/m0.py", line 0, in f0', text)
+        self.assertIn("ERROR: ... 8 frames elided", text)
+        self.assertIn("ERROR: call_5()", text)
+        self.assertIn("KeyError: 'x'", text)
+        self.assertNotIn("call_3", text)
+
+    def test_context_lines(self):
+        bundle = _bundle(
+            [(5, "ERROR: boom", E)],
+            context=[ContextLine(line=4, message="npm install", kind="before")],
+        )
+        self.assertIn("  [4] before: npm install", compress_bundle(bundle).text)
+        self.assertNotIn(
+            "npm install", compress_bundle(bundle, include_context=False).text
+        )
+
+    def test_legacy_jenkins_bundle(self):
+        bundle = ParsedLogBundle(
+            stages=[
+                StageLogs(
+                    name="Lint",
+                    logs=[
+                        JenkinsEntry(timestamp=None, message="E501", severity="warning")
+                    ]
+                    * 3,
+                )
+            ]
+        )
+        result = compress_bundle(bundle)
+        self.assertEqual(result.text, "1 stages | 3 entries\n## Lint\nWARNING ×3: E501")
+
+    def test_ratio_on_repetitive_log(self):
+        bundle = PipelineParser(source="jenkins").parse(
+            _repetitive_log(), min_severity=I, deduplicate=False
+        )
+        result = bundle.compress()
+        self.assertIs(lazy_compress_bundle, compress_bundle)
+        self.assertGreaterEqual(result.ratio, 3)
+        self.assertEqual(result.to_dict()["tokens"], result.tokens)
+        self.assertEqual(str(result), result.text)
+        self.assertIn("connection pool exhausted", result.text)
+        self.assertIn("test_case_<*> FAILED", result.text)
+        self.assertNotIn("2024-05-01", result.text)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            compress_bundle(_bundle([]), max_frames=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from langops.parser.diff import diff_bundles
+from langops.parser.pipeline_parser import PipelineParser
+from langops.parser.types.pipeline_types import (
+    LogEntry,
+    ParsedPipelineBundle,
+    SeverityLevel,
+    StageWindow,
+)
+
+
+def _bundle(stages, metadata=None):
+    return ParsedPipelineBundle(
+        source="jenkins",
+        stages=[
+            StageWindow(
+                name=name,
+                start_line=1,
+                end_line=100,
+                content=[
+                    LogEntry(
+                        timestamp=None, severity=severity, line=line, message=message
+                    )
+                    for line, message, severity in entries
+                ],
+            )
+            for name, entries in stages.items()
+        ],
+        metadata=metadata,
+    )
+
+
+E = SeverityLevel.ERROR
+
+
+class TestDiffBundles(unittest.TestCase):
+
+    def setUp(self):
+        self.green = _bundle(
+            {
+                "Build": [(3, "ERROR: flaky mirror 10.0.0.1 timed out after 30s", E)],
+                "Test": [(20, "ERROR: test_old failed", E)],
+            }
+        )
+        self.red = _bundle(
+            {
+                "Build": [
+                    (4, "ERROR: flaky mirror 10.0.0.7 timed out after 45s", E),
+                    (9, "TypeError: x is undefined", E),
+                    (12, "TypeError: x is undefined", E),
+                    (13, "WARNING: deprecated", SeverityLevel.WARNING),
+                ],
+                "Test": [(30, "ERROR: test_new failed", E)],
+            },
+            metadata={"build_id": "42"},
+        )
+
+    def test_new_resolved_persisting(self):
+        diff = diff_bundles(self.red, self.green)
+        self.assertEqual(diff.counts, {"new": 2, "resolved": 1, "persisting": 1})
+
+        self.assertEqual(
+            [(g.stage, g.example.message, g.current_count) for g in diff.new],
+            [
+                ("Build", "TypeError: x is undefined", 2),
+                ("Test", "ERROR: test_new failed", 1),
+            ],
+        )
+        self.assertEqual(diff.resolved[0].example.message, "ERROR: test_old failed")
+        persisting = diff.persisting[0]
+        self.assertEqual((persisting.current_count, persisting.baseline_count), (1, 1))
+        self.assertEqual(persisting.example.line, 4)
+
+    def test_per_stage_matching(self):
+        moved = _bundle({"Deploy": [(1, "ERROR: test_old failed", E)]})
+        self.assertEqual(diff_bundles(moved, self.green).counts["new"], 1)
+        self.assertEqual(
+            diff_bundles(moved, self.green, per_stage=False).counts["persisting"], 1
+        )
+
+    def test_multiple_baselines_and_min_severity(self):
+        other_green = _bundle({"Build": [(1, "TypeError: x is undefined", E)]})
+        diff = diff_bundles(self.red, self.green, other_green)
+        self.assertEqual(
+            [g.example.message for g in diff.new], ["ERROR: test_new failed"]
+        )
+
+        diff = diff_bundles(self.red, self.green, min_severity=SeverityLevel.WARNING)
+        self.assertIn("WARNING: deprecated", diff.new_messages())
+
+        with self.assertRaises(ValueError):
+            diff_bundles(self.red)
+
+    def test_new_bundle_for_prompts(self):
+        diff = self.red.diff(self.green)
+        bundle = diff.new_bundle()
+        self.assertEqual([stage.name for stage in bundle.stages], ["Build", "Test"])
+        self.assertEqual([e.line for e in bundle.stages[0].content], [9, 12])
+        self.assertIs(bundle.stages[0].content[0], self.red.stages[0].content[1])
+        self.assertEqual(bundle.metadata["build_id"], "42")
+        self.assertEqual(bundle.metadata["diff"], diff.counts)
+        self.assertEqual([e.line for e in diff.new_entries()], [9, 12, 30])
+        self.assertEqual(diff.to_dict()["counts"], diff.counts)
+
+    def test_parsed_logs(self):
+        parser = PipelineParser(source="jenkins")
+        header = "[2024-01-01T12:00:00] [INFO] Stage: Build\n"
+        green = parser.parse(
+            header + "[12:00:01] ERROR: groovy.lang.MissingPropertyException: x\n"
+        )
+        red = parser.parse(
+            header
+            + "[12:03:17] ERROR: groovy.lang.MissingPropertyException: x\n"
+            + "TypeError: Cannot read property 'id' of undefined\n"
+        )
+        diff = red.diff(green, min_severity=SeverityLevel.WARNING)
+        self.assertEqual(diff.counts["persisting"], 1)
+        self.assertEqual(
+            diff.new_messages(), ["TypeError: Cannot read property 'id' of undefined"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -78,3 +78,61 @@ def test_errorparser_validate_input(bad_input):
     parser = ErrorParser()
     with pytest.raises(ValueError):
         parser.validate_input(bad_input)
+
+
+LOOSE_ONLY_LOG = """INFO start
+stderr redirected
+INFO ERR_CONNECTION_RESET while fetching
+INFO done
+"""
+
+
+def test_errorparser_find_errors_line_numbers():
+    parser = ErrorParser()
+    matches = parser.find_errors(LOG_CONTENT)
+    assert [m.line for m in matches] == [3, 4]
+    assert matches[0].message.endswith("ERROR Failed to connect")
+
+
+def test_errorparser_loose_fallback():
+    parser = ErrorParser()
+    assert parser.find_errors(LOOSE_ONLY_LOG) == [
+        (2, "stderr redirected"),
+        (3, "INFO ERR_CONNECTION_RESET while fetching"),
+    ]
+
+
+def test_errorparser_loose_dropped_when_strict_appears_late():
+    parser = ErrorParser()
+    log = LOOSE_ONLY_LOG + "ERROR real failure\n"
+    assert parser.find_errors(log) == [(5, "ERROR real failure")]
+
+
+def test_errorparser_iter_errors_is_lazy():
+    consumed = []
+
+    def lines():
+        for i, line in enumerate(["ERROR first", "INFO ok", "ERROR second"]):
+            consumed.append(i)
+            yield line
+
+    stream = ErrorParser.iter_errors(lines())
+    assert next(stream) == (1, "ERROR first")
+    assert consumed == [0]
+
+
+def test_errorparser_iter_errors_file(tmp_path):
+    path = tmp_path / "build.log"
+    path.write_text(LOG_CONTENT.lstrip("\n").replace("\n", "\r\n"), encoding="utf-8")
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        matches = list(ErrorParser.iter_errors(f))
+    assert [m.line for m in matches] == [2, 3]
+    assert matches[1].message == "2025-06-21 10:02:00 err Disk full"
+
+
+def test_errorparser_parse_no_deprecation_warning():
+    import warnings
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert len(ErrorParser().parse(LOG_CONTENT)) == 2
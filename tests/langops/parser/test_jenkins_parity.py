@@ -0,0 +1,76 @@
+import pytest
+from langops.core.types import SeverityLevel
+from langops.parser.jenkins_parser import JenkinsParser
+from langops.parser.utils.pattern_set import PatternSet, searchable
+from tests.langops.parser.jenkins_legacy import (
+    EDGE_CASE_LINES,
+    LegacyJenkinsParser,
+    build_corpus,
+)
+
+
+class TestJenkinsParity:
+    """JenkinsParser must produce byte-identical results to the original implementation."""
+
+    def setup_method(self):
+        self.parser = JenkinsParser()
+        self.legacy = LegacyJenkinsParser()
+        self.corpus = build_corpus(lines=1500, seed=7)
+        self.lines = [line.strip() for line in self.corpus.splitlines()]
+        self.lines += [line.strip() for line in EDGE_CASE_LINES]
+
+    @pytest.mark.parametrize("deduplicate", [True, False])
+    @pytest.mark.parametrize(
+        "min_severity",
+        [
+            SeverityLevel.INFO,
+            SeverityLevel.WARNING,
+            SeverityLevel.ERROR,
+            SeverityLevel.CRITICAL,
+        ],
+    )
+    def test_parse_output_identical(self, min_severity, deduplicate):
+        expected = self.legacy.parse(self.corpus, min_severity, deduplicate)
+        actual = self.parser.parse(self.corpus, min_severity, deduplicate)
+        assert actual.model_dump_json() == expected.model_dump_json()
+
+    def test_edge_cases_parse_identical(self):
+        data = "\n".join(EDGE_CASE_LINES)
+        expected = self.legacy.parse(data, SeverityLevel.INFO, False)
+        actual = self.parser.parse(data, SeverityLevel.INFO, False)
+        assert actual.model_dump_json() == expected.model_dump_json()
+
+    def test_detect_stage_identical(self):
+        for line in self.lines:
+            assert self.parser._detect_stage(line) == self.legacy._detect_stage(
+                line
+            ), line
+
+    def test_classify_severity_identical(self):
+        for line in self.lines:
+            assert self.parser._classify_severity(
+                line
+            ) == self.legacy._classify_severity(line), line
+
+    def test_extract_timestamp_identical(self):
+        for line in self.lines:
+            assert self.parser._extract_timestamp(
+                line
+            ) == self.legacy._extract_timestamp(line), line
+
+    def test_searchable_patterns_classify_identically(self):
+        for pattern, _ in self.legacy.patterns:
+            fast = searchable(pattern)
+            for line in self.lines:
+                assert bool(fast.search(line)) == bool(pattern.search(line)), (
+                    pattern.pattern,
+                    line,
+                )
+
+    def test_custom_patterns_setter_keeps_parity(self):
+        self.parser.patterns = self.legacy.patterns
+        assert isinstance(self.parser.pattern_set, PatternSet)
+        for line in self.lines:
+            assert self.parser._classify_severity(
+                line
+            ) == self.legacy._classify_severity(line)
@@ -165,6 +165,17 @@ WARNING: line too long
         severity = self.parser._classify_severity("Regular log message")
         assert severity == SeverityLevel.INFO
 
+    def test_severity_enum_type(self):
+        """Test unmatched lines and custom matchers return core SeverityLevel members."""
+        assert type(self.parser._classify_severity("Regular log message")) is (
+            SeverityLevel
+        )
+        bundle = self.parser.parse(
+            "Regular log message", min_severity=SeverityLevel.INFO
+        )
+        assert type(bundle.stages[0].logs[0].severity) is SeverityLevel
+        assert all(type(level) is SeverityLevel for _, level in self.parser.patterns)
+
     def test_is_severity_enough_comparison(self):
         """Test severity level comparison."""
         # Test same level
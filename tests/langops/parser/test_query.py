@@ -0,0 +1,183 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+from langops.parser.query import BundleCollection, EntryIndex, Predicate, Where
+from langops.parser.types.pipeline_types import (
+    LogEntry,
+    ParsedPipelineBundle,
+    SeverityLevel,
+    StageWindow,
+)
+
+
+def _entry(line, severity, language=None, minute=None, message=None):
+    return LogEntry(
+        timestamp=datetime(2024, 1, 1, 12, minute) if minute is not None else None,
+        language=language,
+        severity=severity,
+        line=line,
+        message=message or f"message {line}",
+    )
+
+
+def _bundle(source="jenkins"):
+    return ParsedPipelineBundle(
+        source=source,
+        stages=[
+            StageWindow(
+                name="Build",
+                start_line=1,
+                end_line=10,
+                content=[
+                    _entry(1, SeverityLevel.WARNING, "python", 1),
+                    _entry(2, SeverityLevel.CRITICAL, "nodejs", 2, "FATAL heap"),
+                    _entry(3, SeverityLevel.ERROR, "nodejs", 3),
+                ],
+            ),
+            StageWindow(
+                name="Test",
+                start_line=11,
+                end_line=20,
+                content=[
+                    _entry(11, SeverityLevel.CRITICAL, "nodejs", 10, "FATAL oom"),
+                    _entry(12, SeverityLevel.ERROR, None, None),
+                    _entry(13, SeverityLevel.CRITICAL, "java", 12),
+                ],
+            ),
+        ],
+    )
+
+
+class TestBundleQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.bundle = _bundle()
+
+    def _lines(self, query):
+        return [entry.line for entry in query.all()]
+
+    def test_keyword_filters(self):
+        query = self.bundle.query(
+            severity="critical",
+            language="nodejs",
+            stage="Test",
+            since=datetime(2024, 1, 1, 12, 5),
+        )
+        self.assertEqual(self._lines(query), [11])
+        self.assertIs(query.first(), self.bundle.stages[1].content[0])
+
+    def test_composable_predicates(self):
+        predicate = (
+            Where.severity(SeverityLevel.CRITICAL) & Where.language("nodejs")
+        ) | Where.stage("Build") & ~Where.min_severity("error")
+        self.assertEqual(self._lines(self.bundle.query(predicate)), [1, 2, 11])
+
+        unindexed = Where.min_severity("error") & Where.message_contains("fatal", False)
+        self.assertEqual(self._lines(self.bundle.query(unindexed)), [2, 11])
+        self.assertEqual(
+            self._lines(self.bundle.query(Where.message_matches(r"oom$"))), [11]
+        )
+        self.assertEqual(
+            self._lines(self.bundle.query(~Where.language(None))), [1, 2, 3, 11, 13]
+        )
+
+    def test_time_range_excludes_missing_timestamps(self):
+        query = self.bundle.query(
+            Where.between(datetime(2024, 1, 1, 12, 2), datetime(2024, 1, 1, 12, 10))
+        )
+        self.assertEqual(self._lines(query), [2, 3, 11])
+
+    def test_sorting_and_pagination(self):
+        query = (
+            self.bundle.query().order_by("severity", descending=True).order_by("line")
+        )
+        self.assertEqual(self._lines(query), [2, 11, 13, 3, 12, 1])
+        self.assertEqual(self._lines(query.page(2, 2)), [13, 3])
+        self.assertEqual(self._lines(query.offset(4).limit(5)), [12, 1])
+        self.assertEqual(
+            self._lines(self.bundle.query().order_by("timestamp", descending=True)),
+            [12, 13, 11, 3, 2, 1],
+        )
+        with self.assertRaises(ValueError):
+            self.bundle.query().order_by("nope")
+
+    def test_counts_ignore_pagination(self):
+        query = self.bundle.query(min_severity="error").limit(1)
+        self.assertEqual(query.count(), 5)
+        self.assertEqual(
+            query.count_by("severity"),
+            {SeverityLevel.CRITICAL: 3, SeverityLevel.ERROR: 2},
+        )
+        self.assertEqual(self.bundle.query().count_by("stage"), {"Build": 3, "Test": 3})
+        self.assertTrue(query.exists())
+        self.assertFalse(self.bundle.query(language="go").exists())
+
+    def test_unknown_filter(self):
+        with self.assertRaises(ValueError):
+            self.bundle.query(colour="red")
+
+    def test_predicates_must_implement_matches(self):
+        class Incomplete(Predicate):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+        class Even(Predicate):
+            def matches(self, row):
+                return row.entry.line % 2 == 0
+
+        lines = [entry.line for entry in self.bundle.query(Even()).all()]
+        self.assertTrue(lines)
+        self.assertTrue(all(line % 2 == 0 for line in lines))
+
+    def test_index_is_reused_and_rebuilt_on_change(self):
+        with mock.patch(
+            "langops.parser.query.EntryIndex", wraps=EntryIndex
+        ) as index_cls:
+            self.bundle.query(severity="error").count()
+            self.bundle.query(language="nodejs").count()
+            self.assertEqual(index_cls.call_count, 1)
+
+            self.bundle.stages[0].content.append(_entry(4, SeverityLevel.ERROR))
+            self.assertEqual(self.bundle.query(severity="error").count(), 3)
+            self.assertEqual(index_cls.call_count, 2)
+
+    def test_index_rebuilt_when_entry_replaced_in_place(self):
+        self.assertEqual(self.bundle.query(severity="warning").count(), 1)
+        self.bundle.stages[0].content[1] = _entry(2, SeverityLevel.WARNING)
+        self.assertEqual(self.bundle.query(severity="warning").count(), 2)
+        self.assertEqual(self.bundle.query(severity="critical").count(), 2)
+
+    def test_limit_none_clears_limit(self):
+        query = self.bundle.query().limit(1)
+        self.assertEqual(len(query.all()), 1)
+        self.assertEqual(len(query.offset(1).all()), 1)
+        self.assertEqual(len(query.limit(None).all()), 6)
+
+    def test_index_not_serialized(self):
+        self.bundle.query(severity="error").count()
+        self.assertNotIn("_query_index", self.bundle.to_dict())
+
+
+class TestBundleCollection(unittest.TestCase):
+
+    def test_query_across_bundles(self):
+        collection = BundleCollection([_bundle("jenkins"), _bundle("gitlab_ci")])
+        self.assertEqual(len(collection), 2)
+        self.assertEqual(collection.query(severity="critical").count(), 6)
+        self.assertEqual(
+            collection.query(severity="critical").count_by("source"),
+            {"jenkins": 3, "gitlab_ci": 3},
+        )
+
+        rows = collection.query(source="gitlab_ci", stage="Test").rows()
+        self.assertEqual([row.entry.line for row in rows], [11, 12, 13])
+        self.assertTrue(all(row.bundle is collection.bundles[1] for row in rows))
+
+        collection.add(_bundle("azure_devops"))
+        self.assertEqual(collection.query(severity="critical").count(), 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import pytest
 from langops import ParserRegistry
 from langops.parser import ErrorParser
 
@@ -12,3 +13,22 @@ def test_registry_register_and_get():
 def test_registry_list_parsers():
     names = ParserRegistry.list_parsers()
     assert "ErrorParser" in names
+
+
+def test_registry_get_instance_is_shared():
+    ParserRegistry.invalidate_instances()
+    parser = ParserRegistry.get_instance("pipeline_parser", source="jenkins")
+    assert ParserRegistry.get_instance("pipeline_parser", source="jenkins") is parser
+    assert (
+        ParserRegistry.get_instance("pipeline_parser", source="gitlab_ci") is not parser
+    )
+    assert ParserRegistry.invalidate_instances("pipeline_parser", source="jenkins") == 1
+    assert (
+        ParserRegistry.get_instance("pipeline_parser", source="jenkins") is not parser
+    )
+    ParserRegistry.invalidate_instances()
+
+
+def test_registry_get_instance_unknown():
+    with pytest.raises(KeyError):
+        ParserRegistry.get_instance("NoSuchParser")
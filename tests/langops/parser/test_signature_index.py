@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from langops.parser.pipeline_parser import PipelineParser
+from langops.parser.signature_index import SignatureIndex
+from langops.parser.types.pipeline_types import (
+    LogEntry,
+    ParsedPipelineBundle,
+    SeverityLevel,
+    StageWindow,
+)
+
+
+def _bundle(*entries, stage="Build", metadata=None):
+    content = [
+        LogEntry(timestamp=None, severity=severity, line=line, message=message)
+        for line, message, severity in entries
+    ]
+    return ParsedPipelineBundle(
+        source="jenkins",
+        stages=[StageWindow(name=stage, start_line=1, end_line=100, content=content)],
+        metadata=metadata,
+    )
+
+
+class TestSignatureIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SignatureIndex()
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_first_seen_and_jobs(self):
+        self.index.add_bundle(
+            _bundle((3, "ERROR: disk full on /dev/sda1", SeverityLevel.ERROR)),
+            job="api",
+            build="10",
+            started_at=datetime(2024, 1, 2),
+        )
+        self.index.add_bundle(
+            _bundle(
+                (7, "ERROR: disk full on /dev/sdb2", SeverityLevel.ERROR), stage="Test"
+            ),
+            job="web",
+            build="3",
+            started_at=datetime(2024, 1, 1),
+        )
+
+        first = self.index.first_seen("ERROR: disk full on /dev/nvme0")
+        self.assertEqual(
+            (first.job, first.build, first.stage, first.line), ("web", "3", "Test", 7)
+        )
+        self.assertEqual(self.index.jobs("ERROR: disk full on /dev/x1"), ["api", "web"])
+        self.assertEqual(
+            len(self.index.lookup("ERROR: disk full on /dev/x", job="api")), 1
+        )
+        self.assertIsNone(self.index.first_seen("never happened"))
+
+    def test_reindexing_a_build_replaces_postings(self):
+        bundle = _bundle((1, "TypeError: boom", SeverityLevel.ERROR))
+        self.index.add_bundle(bundle, job="api", build="1")
+        self.index.add_bundle(bundle, job="api", build="1")
+        self.assertEqual(len(self.index.lookup("TypeError: boom")), 1)
+        self.assertEqual(self.index.build_count(), 1)
+
+        self.assertTrue(self.index.remove_build("api", "1"))
+        self.assertEqual(self.index.lookup("TypeError: boom"), [])
+        self.assertFalse(self.index.remove_build("api", "1"))
+
+    def test_min_severity_and_metadata_defaults(self):
+        bundle = _bundle(
+            (1, "WARNING: deprecated", SeverityLevel.WARNING),
+            (2, "ERROR: failed", SeverityLevel.ERROR),
+            metadata={"build_id": "77", "start_time": datetime(2024, 5, 1)},
+        )
+        written = self.index.add_bundle(
+            bundle, job="api", min_severity=SeverityLevel.ERROR
+        )
+        self.assertEqual(written, 1)
+        posting = self.index.first_seen("ERROR: failed")
+        self.assertEqual(posting.build, "77")
+        self.assertEqual(posting.started_at, datetime(2024, 5, 1))
+
+        with self.assertRaises(ValueError):
+            self.index.add_bundle(_bundle(), job="api")
+
+    def test_summary_and_top_signatures(self):
+        for build in range(3):
+            self.index.add_bundle(
+                _bundle(
+                    (1, f"ERROR: build {build} failed", SeverityLevel.ERROR),
+                    (2, f"ERROR: build {build} failed", SeverityLevel.ERROR),
+                ),
+                job="api",
+                build=str(build),
+                started_at=datetime(2024, 1, build + 1),
+            )
+        self.index.add_bundle(
+            _bundle((1, "TypeError: once", SeverityLevel.ERROR)), job="web", build="1"
+        )
+
+        summary = self.index.summary("ERROR: build 99 failed")
+        self.assertEqual(summary.signature, "ERROR: build <n> failed")
+        self.assertEqual(summary.example, "ERROR: build 0 failed")
+        self.assertEqual((summary.occurrences, summary.builds), (6, 3))
+        self.assertEqual(summary.first_seen.build, "0")
+        self.assertEqual(summary.last_seen.build, "2")
+        self.assertEqual(self.index.top_signatures(1), [("ERROR: build <n> failed", 3)])
+        self.assertEqual(self.index.top_signatures(job="web"), [("TypeError: once", 1)])
+
+    def test_persistent_incremental_index(self):
+        log = "[2024-01-01T12:00:00] [INFO] Stage: Build\nTypeError: x is undefined\n"
+        bundle = PipelineParser(source="jenkins").parse(log)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "signatures.db")
+            with SignatureIndex(path) as index:
+                index.add_bundle(bundle, job="api", build="1")
+            with SignatureIndex(path) as index:
+                index.add_bundle(bundle, job="api", build="2")
+                postings = index.lookup("TypeError: x is undefined")
+                self.assertEqual([p.build for p in postings], ["1", "2"])
+                self.assertEqual(postings[0].stage, "Build")
+
+
+if __name__ == "__main__":
+    unittest.main()
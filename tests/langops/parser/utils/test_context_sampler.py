@@ -0,0 +1,108 @@
+import random
+import unittest
+from langops.parser.pipeline_parser import PipelineParser
+from langops.parser.types.pipeline_types import SeverityLevel
+from langops.parser.utils.context_sampler import ContextSampling, StageSampler
+
+
+class TestStageSampler(unittest.TestCase):
+
+    def test_ring_buffer_keeps_last_k_lines(self):
+        sampler = StageSampler(
+            ContextSampling(before=2, sample_size=0), random.Random(0)
+        )
+        for number in range(1, 6):
+            sampler.observe(number, f"line {number}", SeverityLevel.INFO)
+        sampler.mark_entry()
+
+        lines = sampler.lines()
+        self.assertEqual([line.line for line in lines], [4, 5])
+        self.assertTrue(all(line.kind == "before" for line in lines))
+
+    def test_ring_buffer_cleared_between_entries(self):
+        sampler = StageSampler(
+            ContextSampling(before=3, sample_size=0), random.Random(0)
+        )
+        sampler.observe(1, "a", SeverityLevel.INFO)
+        sampler.mark_entry()
+        sampler.mark_entry()
+        self.assertEqual([line.line for line in sampler.lines()], [1])
+
+    def test_reservoir_is_bounded(self):
+        sampler = StageSampler(
+            ContextSampling(before=0, sample_size=5, seed=1), random.Random(1)
+        )
+        for number in range(1, 10001):
+            sampler.observe(number, f"info {number}", SeverityLevel.INFO)
+
+        lines = sampler.lines()
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all(line.kind == "sample" for line in lines))
+        self.assertEqual(lines, sorted(lines, key=lambda line: line.line))
+
+    def test_reservoir_only_samples_info(self):
+        sampler = StageSampler(
+            ContextSampling(before=0, sample_size=5), random.Random(0)
+        )
+        sampler.observe(1, "warn", SeverityLevel.WARNING)
+        self.assertEqual(sampler.lines(), [])
+
+    def test_before_cap_and_truncation(self):
+        options = ContextSampling(
+            before=5, sample_size=0, max_lines=3, max_line_length=4
+        )
+        sampler = StageSampler(options, random.Random(0))
+        for number in range(1, 6):
+            sampler.observe(number, "abcdefgh", SeverityLevel.INFO)
+        sampler.mark_entry()
+
+        lines = sampler.lines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0].message, "abcd")
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            ContextSampling(before=-1)
+
+
+class TestParseWithContext(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = PipelineParser(source="jenkins")
+        self.log = "\n".join(
+            ["[2024-01-01T12:00:00] [INFO] Stage: Build"]
+            + [f"compiling module {i}" for i in range(50)]
+            + ["ERROR: groovy.lang.MissingPropertyException: No such property"]
+            + [f"cleanup step {i}" for i in range(50)]
+        )
+
+    def test_no_context_by_default(self):
+        result = self.parser.parse(self.log)
+        self.assertEqual(result.stages[0].context, [])
+        self.assertNotIn("context", result.stages[0].dict())
+
+    def test_context_attached_to_stage(self):
+        result = self.parser.parse(
+            self.log, context=ContextSampling(before=2, sample_size=4, seed=7)
+        )
+        stage = result.stages[0]
+        self.assertEqual(len(stage.content), 1)
+
+        before = [line for line in stage.context if line.kind == "before"]
+        samples = [line for line in stage.context if line.kind == "sample"]
+        self.assertEqual(
+            [line.message for line in before],
+            ["compiling module 48", "compiling module 49"],
+        )
+        self.assertLessEqual(len(samples), 4)
+        self.assertIn("context", stage.dict())
+
+    def test_context_is_reproducible_with_seed(self):
+        options = ContextSampling(before=1, sample_size=4, seed=3)
+        first = self.parser.parse(self.log, context=options)
+        second = self.parser.parse(self.log, context=options)
+        self.assertEqual(first.stages[0].context, second.stages[0].context)
+
+
+if __name__ == "__main__":
+    unittest.main()
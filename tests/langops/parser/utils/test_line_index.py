@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from langops.parser.pipeline_parser import PipelineParser
+from langops.parser.types.pipeline_types import StageWindow
+from langops.parser.utils.line_index import LineIndex
+
+
+class TestLineIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "build.log")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, data: bytes) -> None:
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    def test_lines_match_splitlines(self):
+        text = "first\nsecond\r\nthird\n\nfifth"
+        self._write(text.encode("utf-8"))
+        with LineIndex.build(self.path) as index:
+            self.assertEqual(len(index), len(text.splitlines()))
+            self.assertEqual(index.lines(1, len(index)), text.splitlines())
+            self.assertEqual(index.line(2), "second")
+            self.assertEqual(index.lines(2, 3), ["second", "third"])
+
+    def test_trailing_newline_and_empty_file(self):
+        self._write(b"a\nb\n")
+        self.assertEqual(len(LineIndex.build(self.path)), 2)
+        self._write(b"")
+        self.assertEqual(len(LineIndex.build(self.path)), 0)
+
+    def test_range_clamping_and_errors(self):
+        self._write(b"a\nb\nc\n")
+        with LineIndex.build(self.path) as index:
+            self.assertEqual(index.lines(2, 99), ["b", "c"])
+            with self.assertRaises(IndexError):
+                index.line(0)
+            with self.assertRaises(IndexError):
+                index.line(4)
+
+    def test_sidecar_roundtrip_and_invalidation(self):
+        self._write(b"one\ntwo\nthree\n")
+        built = LineIndex.open(self.path)
+        self.assertTrue(os.path.exists(LineIndex.sidecar_path(self.path)))
+
+        loaded = LineIndex.load(self.path)
+        self.assertIsNotNone(loaded)
+        self.assertEqual(list(loaded.offsets), list(built.offsets))
+
+        self._write(b"one\ntwo\nthree\nfour\n")
+        self.assertFalse(built.is_valid())
+        self.assertIsNone(LineIndex.load(self.path))
+        self.assertEqual(len(LineIndex.open(self.path)), 4)
+
+    def test_corrupt_sidecar_is_ignored(self):
+        self._write(b"one\n")
+        with open(LineIndex.sidecar_path(self.path), "wb") as f:
+            f.write(b"garbage")
+        self.assertIsNone(LineIndex.load(self.path))
+        self.assertEqual(LineIndex.open(self.path).line(1), "one")
+
+
+class TestStageRawLines(unittest.TestCase):
+
+    def test_raw_lines_requires_index(self):
+        stage = StageWindow(name="Build", start_line=1, end_line=2, content=[])
+        with self.assertRaises(ValueError):
+            list(stage.raw_lines())
+
+    def test_parse_file_attaches_index(self):
+        lines = [
+            "[2024-01-01T12:00:00] [INFO] Stage: Build",
+            "compiling",
+            "ERROR: groovy.lang.MissingPropertyException: No such property",
+            "[2024-01-01T12:00:00] [INFO] Stage: Test",
+            "TypeError: boom",
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "build.log")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+            bundle = PipelineParser(source="jenkins").parse_file(path)
+            build = next(stage for stage in bundle.stages if stage.name == "Build")
+            self.assertEqual(list(build.raw_lines()), lines[0:3])
+            self.assertNotIn("_line_index", bundle.to_dict()["stages"][0])
+
+    def test_carriage_returns_match_parser_line_numbers(self):
+        for newline in ("\n", "\r\n"):
+            lines = [
+                "[2024-01-01T12:00:00] [INFO] Stage: Build",
+                "progress 10%\rprogress 100%",
+                "ERROR: groovy.lang.MissingPropertyException: No such property",
+                "[2024-01-01T12:00:00] [INFO] Stage: Test",
+                "TypeError: boom",
+            ]
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, "build.log")
+                with open(path, "wb") as f:
+                    f.write((newline.join(lines) + newline).encode("utf-8"))
+
+                with PipelineParser(source="jenkins").parse_file(path) as bundle:
+                    stages = {stage.name: stage for stage in bundle.stages}
+                    expected = "\n".join(lines).splitlines()
+                    build, test = list(stages["Build"].raw_lines()), list(
+                        stages["Test"].raw_lines()
+                    )
+                    self.assertEqual(build, expected[0:4])
+                    self.assertEqual(
+                        test[0], "[2024-01-01T12:00:00] [INFO] Stage: Test"
+                    )
+                    self.assertEqual(test, expected[4:])
+                    index = stages["Build"]._line_index
+                    self.assertIsNotNone(index._mmap)
+                self.assertIsNone(index._mmap)
+
+    def test_boundaries_split_across_chunks(self):
+        text = "a\rb\r\nc\u2028d\x85e\r"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "build.log")
+            with open(path, "wb") as f:
+                f.write(text.encode("utf-8"))
+            with mock.patch("langops.parser.utils.line_index._CHUNK_SIZE", 1):
+                with LineIndex.build(path) as index:
+                    self.assertEqual(index.lines(1, len(index)), text.splitlines())
+
+
+if __name__ == "__main__":
+    unittest.main()
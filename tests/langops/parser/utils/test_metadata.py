@@ -0,0 +1,84 @@
+import re
+import unittest
+from datetime import datetime
+from unittest import mock
+from langops.parser.pipeline_parser import PipelineParser
+from langops.parser.utils import metadata as metadata_module
+from langops.parser.utils.metadata import (
+    MetadataCollector,
+    MetadataExtractor,
+    metadata_extractors_for,
+    register_metadata_extractor,
+)
+
+
+class TestMetadataExtractors(unittest.TestCase):
+
+    def test_extractor_literal_precheck(self):
+        extractor = MetadataExtractor(
+            "build_id", re.compile(r"BUILD_ID=(\S+)"), literal="BUILD_ID="
+        )
+        self.assertEqual(extractor.extract("BUILD_ID=42"), "42")
+        self.assertIsNone(extractor.extract("nothing here"))
+
+    def test_extractor_func(self):
+        extractor = MetadataExtractor("length", func=lambda line: len(line) or None)
+        self.assertEqual(extractor.extract("abc"), 3)
+
+    def test_collector_retires_satisfied_extractors(self):
+        collector = MetadataCollector(metadata_extractors_for(None))
+        collector.feed("BUILD_ID=1")
+        collector.feed("BUILD_ID=2")
+        collector.feed("Started by user Jane")
+        collector.feed("Branch: main")
+        self.assertFalse(collector.done)
+        collector.feed("2025-07-18 12:34:56,789 INFO start")
+        self.assertTrue(collector.done)
+
+        result = collector.result()
+        self.assertEqual(result["build_id"], "1")
+        self.assertEqual(result["triggered_by"], "Jane")
+        self.assertEqual(result["branch"], "main")
+        self.assertIsInstance(result["start_time"], datetime)
+
+    def test_collector_first_timestamp_in_line_order(self):
+        collector = MetadataCollector(metadata_extractors_for(None))
+        collector.feed("first at 10:00:00")
+        collector.feed("2025-07-18 12:34:56,789 later")
+        self.assertEqual(collector.result()["start_time"].hour, 10)
+
+    def test_pipeline_system(self):
+        collector = MetadataCollector([], source="Custom_Pipeline")
+        self.assertEqual(collector.result(), {"pipeline_system": "custom_pipeline"})
+
+    def test_source_specific_extractors(self):
+        keys = [e.key for e in metadata_extractors_for("gitlab_ci")]
+        self.assertIn("runner_version", keys)
+        keys = [e.key for e in metadata_extractors_for("azure_devops")]
+        self.assertIn("agent_name", keys)
+
+    def test_register_metadata_extractor(self):
+        with mock.patch.dict(metadata_module._SOURCE_METADATA_EXTRACTORS, {}):
+            register_metadata_extractor(
+                "jenkins",
+                MetadataExtractor("node", re.compile(r"Running on (\S+)")),
+            )
+            parser = PipelineParser(source="jenkins")
+            result = parser.parse("Running on agent-7 in /ws\nERROR: boom")
+            self.assertEqual(result.metadata["node"], "agent-7")
+
+    def test_gitlab_runner_version_in_parse(self):
+        parser = PipelineParser(source="gitlab_ci")
+        result = parser.parse(
+            "Running with gitlab-runner 16.4.0 (abc)\nTypeError: x is undefined"
+        )
+        self.assertEqual(result.metadata["runner_version"], "16.4.0")
+
+    def test_azure_agent_name_in_parse(self):
+        parser = PipelineParser(source="azure_devops")
+        result = parser.parse("Agent name: 'Hosted Agent'\n##[error]failed")
+        self.assertEqual(result.metadata["agent_name"], "Hosted Agent")
+
+
+if __name__ == "__main__":
+    unittest.main()
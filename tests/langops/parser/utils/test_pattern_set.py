@@ -0,0 +1,115 @@
+import re
+import unittest
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from langops.parser.pipeline_parser import PipelineParser
+from langops.parser.types.pipeline_types import SeverityLevel
+from langops.parser.utils import PatternSet, ParseContext
+from langops.parser.utils.stage_cleaner import (
+    default_clean_stage_name,
+    jenkins_clean_stage_name,
+)
+
+
+class TestPatternSet(unittest.TestCase):
+
+    def test_for_source_is_shared(self):
+        first = PatternSet.for_source("jenkins")
+        second = PatternSet.for_source("jenkins")
+        self.assertIs(first, second)
+        self.assertEqual(first.source, "jenkins")
+        self.assertIs(first.cleaner, jenkins_clean_stage_name)
+
+    def test_for_source_unknown(self):
+        with self.assertRaises(ValueError) as cm:
+            PatternSet.for_source("nope")
+        self.assertIn("Unknown source for patterns", str(cm.exception))
+
+    def test_is_frozen(self):
+        pattern_set = PatternSet.for_source("jenkins")
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            pattern_set.source = "other"  # type: ignore[misc]
+        self.assertIsInstance(pattern_set.patterns, tuple)
+        self.assertIsInstance(pattern_set.stage_patterns, tuple)
+
+    def test_extend_returns_new_set(self):
+        base = PatternSet.for_source("jenkins")
+        extended = base.extend(
+            patterns={"custom": [(re.compile("BOOM"), SeverityLevel.CRITICAL)]},
+            stage_patterns=[re.compile(r"STAGE: (.+)")],
+            source="custom_source",
+        )
+        self.assertIsNot(base, extended)
+        self.assertNotIn("custom", base.as_dict())
+        self.assertIn("custom", extended.as_dict())
+        self.assertIn("groovy", extended.as_dict())
+        self.assertEqual(len(extended.stage_patterns), len(base.stage_patterns) + 1)
+        self.assertEqual(extended.source, "custom_source")
+        self.assertIs(extended.cleaner, default_clean_stage_name)
+
+    def test_extend_keeps_source_when_none(self):
+        extended = PatternSet.for_source("jenkins").extend(source=None)
+        self.assertEqual(extended.source, "jenkins")
+
+    def test_as_dict_is_a_copy(self):
+        pattern_set = PatternSet.for_source("jenkins")
+        copy = pattern_set.as_dict()
+        copy["groovy"].clear()
+        self.assertGreater(len(pattern_set.as_dict()["groovy"]), 0)
+
+    def test_classify_matches_two_step_detection(self):
+        pattern_set = PatternSet.for_source("jenkins")
+        lines = [
+            "ERROR: groovy.lang.MissingPropertyException: No such property",
+            "TypeError: x is not a function",
+            "CrashLoopBackOff",
+            "INFO: all good",
+        ]
+        for line in lines:
+            language = pattern_set.detect_language(line)
+            expected = pattern_set.classify_severity(language or "unknown", line)
+            self.assertEqual(pattern_set.classify(line), (language, expected))
+
+    def test_fingerprint(self):
+        base = PatternSet.for_source("jenkins")
+        self.assertEqual(base.fingerprint, PatternSet.for_source("jenkins").fingerprint)
+        self.assertNotEqual(
+            base.fingerprint, PatternSet.for_source("github_actions").fingerprint
+        )
+        extended = base.extend(stage_patterns=[re.compile(r"X (.+)")])
+        self.assertNotEqual(base.fingerprint, extended.fingerprint)
+
+    def test_parse_context_defaults(self):
+        ctx = ParseContext(lines=["a", "b"])
+        self.assertEqual(ctx.current_stage, "Unknown")
+        self.assertEqual(ctx.stages_map, {})
+        self.assertEqual(ctx.seen_logs, set())
+        self.assertEqual(ctx.min_severity, SeverityLevel.WARNING)
+
+    def test_parsers_share_pattern_set(self):
+        first = PipelineParser(source="jenkins")
+        second = PipelineParser(source="jenkins")
+        self.assertIs(first.pattern_set, second.pattern_set)
+
+    def test_concurrent_parsing_matches_sequential(self):
+        parser = PipelineParser(source="jenkins")
+        logs = [
+            "\n".join(
+                [
+                    f"[2024-01-01T12:00:00] [INFO] Stage: Build{i}",
+                    f"ERROR: groovy.lang.MissingPropertyException: prop{i}",
+                    "TypeError: undefined is not a function",
+                    f"[2024-01-01T12:00:00] [INFO] Stage: Test{i}",
+                    f"CrashLoopBackOff in pod-{i}",
+                ]
+            )
+            for i in range(32)
+        ]
+        expected = [parser.parse(log).to_dict() for log in logs]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            actual = list(pool.map(lambda log: parser.parse(log).to_dict(), logs))
+        self.assertEqual(actual, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import importlib.util
+import os
+import re
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from langops.parser.pipeline_parser import PipelineParser
+from langops.parser.types.pipeline_types import SeverityLevel
+from langops.parser.utils import PatternSet
+from langops.parser.utils import regex_backend
+from langops.parser.utils.regex_backend import (
+    available_backends,
+    compare_backends,
+    get_backend,
+)
+
+HAS_RE2 = importlib.util.find_spec("re2") is not None
+HAS_REGEX = importlib.util.find_spec("regex") is not None
+
+LINES = [
+    "[Pipeline] { (Build)",
+    "ERROR: groovy.lang.MissingPropertyException: No such property: foo",
+    'Exception in thread "main" java.lang.NullPointerException',
+    "Traceback (most recent call last):",
+    "npm ERR! code ELIFECYCLE",
+    "plain info line",
+]
+
+
+class TestRegexBackend(unittest.TestCase):
+
+    def test_default_backend_is_re(self):
+        backend = get_backend()
+        self.assertEqual(backend.name, "re")
+        self.assertIs(get_backend("re"), backend)
+        self.assertIn("re", available_backends())
+
+    def test_re_backend_keeps_pattern(self):
+        pattern = re.compile("x+", re.IGNORECASE)
+        compiled, fell_back = get_backend("re").recompile(pattern)
+        self.assertIs(compiled, pattern)
+        self.assertFalse(fell_back)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError) as cm:
+            get_backend("pcre")
+        self.assertIn("Unknown regex backend", str(cm.exception))
+
+    def test_missing_engine_raises_import_error(self):
+        with (
+            mock.patch.dict(sys.modules, {"re2": None}),
+            mock.patch.dict(regex_backend._BACKENDS, clear=True),
+        ):
+            with self.assertRaises(ImportError) as cm:
+                get_backend("re2")
+        self.assertIn("google-re2", str(cm.exception))
+
+    def test_auto_falls_back_to_re(self):
+        with (
+            mock.patch.dict(sys.modules, {"re2": None, "regex": None}),
+            mock.patch.dict(regex_backend._BACKENDS, clear=True),
+        ):
+            self.assertEqual(get_backend("auto").name, "re")
+            self.assertEqual(available_backends(), ["re"])
+
+    def test_pattern_set_backend_roundtrip(self):
+        pattern_set = PatternSet.for_source("jenkins")
+        self.assertEqual(pattern_set.regex_backend, "re")
+        self.assertIs(pattern_set.with_backend("re"), pattern_set)
+        self.assertEqual(pattern_set.fallbacks, ())
+        with self.assertRaises(ValueError):
+            PatternSet.build("custom", regex_backend="pcre")
+
+    def test_yaml_selects_backend(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "patterns.yaml")
+            with open(path, "w") as f:
+                f.write("regex_backend: pcre\npatterns: {}\n")
+            with self.assertRaises(ValueError):
+                PipelineParser(source="jenkins", config_file=path)
+            parser = PipelineParser(
+                source="jenkins", config_file=path, regex_backend="re"
+            )
+            self.assertEqual(parser.pattern_set.regex_backend, "re")
+
+    def test_compare_backends_re(self):
+        [timing] = compare_backends(
+            PatternSet.for_source("jenkins"), LINES, backends=["re"], repeat=1
+        )
+        self.assertEqual(timing.backend, "re")
+        self.assertTrue(timing.agrees)
+        self.assertEqual(timing.fallbacks, 0)
+        self.assertGreater(timing.lines_per_second, 0)
+
+
+@unittest.skipUnless(HAS_RE2 or HAS_REGEX, "no optional regex engine installed")
+class TestOptionalBackends(unittest.TestCase):
+
+    def backends(self):
+        return [name for name in available_backends() if name != "re"]
+
+    def test_builtin_sources_agree(self):
+        for source in ("jenkins", "github_actions", "gitlab_ci", "azure_devops"):
+            reference = PatternSet.for_source(source)
+            for name in self.backends():
+                with self.subTest(source=source, backend=name):
+                    candidate = PatternSet.for_source(source, regex_backend=name)
+                    self.assertIs(
+                        candidate, PatternSet.for_source(source, regex_backend=name)
+                    )
+                    self.assertNotEqual(candidate.fingerprint, reference.fingerprint)
+                    for line in LINES:
+                        self.assertEqual(
+                            candidate.classify(line), reference.classify(line)
+                        )
+                        self.assertEqual(
+                            candidate.detect_stage(line), reference.detect_stage(line)
+                        )
+
+    def test_parser_option(self):
+        for name in self.backends():
+            parser = PipelineParser(source="jenkins", regex_backend=name)
+            self.assertEqual(parser.pattern_set.regex_backend, name)
+            self.assertEqual(
+                parser.parse("\n".join(LINES)).model_dump(),
+                PipelineParser(source="jenkins").parse("\n".join(LINES)).model_dump(),
+            )
+
+    @unittest.skipUnless(HAS_RE2, "google-re2 not installed")
+    def test_re2_falls_back_per_pattern(self):
+        lookahead = re.compile(r"error(?! ignored)", re.IGNORECASE)
+        linear = re.compile(r"(a+)+$")
+        pattern_set = PatternSet.build(
+            "custom",
+            {
+                "custom": [
+                    (lookahead, SeverityLevel.ERROR),
+                    (linear, SeverityLevel.WARNING),
+                ]
+            },
+            regex_backend="re2",
+        )
+        self.assertEqual(pattern_set.fallbacks, (lookahead,))
+        self.assertEqual(pattern_set.classify("Error found")[1], SeverityLevel.ERROR)
+        self.assertEqual(pattern_set.classify("error ignored")[1], SeverityLevel.INFO)
+        # Would backtrack for minutes with `re`; RE2 runs in linear time.
+        self.assertEqual(pattern_set.classify("a" * 60 + "!")[1], SeverityLevel.INFO)
+
+
+if __name__ == "__main__":
+    unittest.main()
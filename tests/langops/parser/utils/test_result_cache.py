@@ -0,0 +1,149 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from langops.parser import ErrorParser, JenkinsParser, PipelineParser
+from langops.parser.types.pipeline_types import ParsedPipelineBundle, SeverityLevel
+from langops.parser.utils.result_cache import ParseResultCache
+
+LOG = "\n".join(
+    [
+        "[2024-01-01T12:00:00] [INFO] Stage: Build",
+        "BUILD_ID=77",
+        "2024-01-01 12:00:01 ERROR: groovy.lang.MissingPropertyException: x",
+        "TypeError: undefined is not a function",
+        "[Pipeline] sh",
+        "error: something failed",
+    ]
+)
+
+
+class TestParseResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ParseResultCache(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key_depends_on_content_and_fingerprint(self):
+        base = ParseResultCache.key("abc", {"a": 1})
+        self.assertEqual(base, ParseResultCache.key("abc", {"a": 1}))
+        self.assertNotEqual(base, ParseResultCache.key("abd", {"a": 1}))
+        self.assertNotEqual(base, ParseResultCache.key("abc", {"a": 2}))
+
+    def test_get_put(self):
+        self.assertIsNone(self.cache.get("deadbeef"))
+        self.cache.put("deadbeef", "payload")
+        self.assertEqual(self.cache.get("deadbeef"), "payload")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        cache = ParseResultCache(self.tmpdir.name, max_bytes=250)
+        for i in range(3):
+            cache.put(f"{i:02d}key", "x" * 100)
+            path = cache._path(f"{i:02d}key")
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+        cache.put("03key", "x" * 100)
+
+        self.assertLessEqual(cache.size(), 250)
+        self.assertIsNone(cache.get("00key"))
+        self.assertEqual(cache.get("03key"), "x" * 100)
+
+    def test_write_error_is_not_raised(self):
+        fingerprint = {"parser": "test"}
+
+        def failing_replace(src, dst):
+            raise OSError(28, "No space left on device")
+
+        with mock.patch(
+            "langops.parser.utils.result_cache.os.replace", failing_replace
+        ):
+            self.assertFalse(self.cache.put("abkey", "x"))
+            result = self.cache.memoize(
+                "data",
+                fingerprint,
+                lambda: ParsedPipelineBundle(source="x", stages=[]),
+                lambda bundle: bundle.model_dump_json(),
+                ParsedPipelineBundle.model_validate_json,
+            )
+        self.assertEqual(result.source, "x")
+        self.assertEqual(self.cache._entries(ParseResultCache.TMP_SUFFIX), [])
+        self.assertEqual(self.cache.size(), 0)
+
+    def test_eviction_removes_stale_tmp_files(self):
+        cache = ParseResultCache(self.tmpdir.name, max_bytes=150)
+        os.makedirs(os.path.join(self.tmpdir.name, "ab"))
+        stale = os.path.join(self.tmpdir.name, "ab", "abkey.json.1.1.tmp")
+        fresh = os.path.join(self.tmpdir.name, "ab", "abkey.json.2.2.tmp")
+        for path in (stale, fresh):
+            with open(path, "w") as f:
+                f.write("partial")
+        old = time.time() - ParseResultCache.STALE_TMP_SECONDS - 10
+        os.utime(stale, (old, old))
+
+        cache.put("00key", "x" * 100)
+        cache.put("01key", "x" * 100)
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(fresh))
+
+    def test_invalid_max_bytes(self):
+        with self.assertRaises(ValueError):
+            ParseResultCache(self.tmpdir.name, max_bytes=0)
+
+    def test_corrupt_entry_is_recomputed(self):
+        fingerprint = {"parser": "test"}
+        key = ParseResultCache.key("data", fingerprint)
+        self.cache.put(key, "not json")
+        result = self.cache.memoize(
+            "data",
+            fingerprint,
+            lambda: ParsedPipelineBundle(source="x", stages=[]),
+            lambda bundle: bundle.model_dump_json(),
+            ParsedPipelineBundle.model_validate_json,
+        )
+        self.assertEqual(result.source, "x")
+
+    def test_pipeline_parser_hit_skips_parsing(self):
+        parser = PipelineParser(source="jenkins", cache=self.cache)
+        first = parser.parse(LOG)
+        with mock.patch.object(parser, "_parse") as parse_mock:
+            second = parser.parse(LOG)
+        parse_mock.assert_not_called()
+        self.assertEqual(first.to_dict(), second.to_dict())
+        self.assertEqual(second.metadata["build_id"], "77")
+
+    def test_pipeline_parser_options_change_key(self):
+        parser = PipelineParser(source="jenkins", cache=self.cache)
+        parser.parse(LOG)
+        parser.parse(LOG, min_severity=SeverityLevel.ERROR)
+        parser.parse(LOG, deduplicate=False)
+        PipelineParser(source="jenkins", cache=self.cache, window_size=5).parse(LOG)
+        PipelineParser(source="github_actions", cache=self.cache).parse(LOG)
+        self.assertEqual(self.cache.hits, 0)
+        self.assertEqual(self.cache.misses, 5)
+
+    def test_jenkins_parser_cache(self):
+        parser = JenkinsParser(cache=self.cache)
+        first = parser.parse(LOG)
+        second = parser.parse(LOG)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(first, second)
+
+    def test_error_parser_cache(self):
+        parser = ErrorParser(cache=self.cache)
+        first = parser.parse(LOG)
+        second = parser.parse(LOG)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(first, second)
+
+    def test_clear(self):
+        self.cache.put("abkey", "x")
+        self.cache.clear()
+        self.assertEqual(self.cache.size(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
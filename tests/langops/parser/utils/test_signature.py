@@ -0,0 +1,44 @@
+import unittest
+from langops.parser.utils.signature import normalize_signature, signature_hash
+
+
+class TestNormalizeSignature(unittest.TestCase):
+
+    def test_variable_parts_are_replaced(self):
+        self.assertEqual(
+            normalize_signature(
+                "2024-01-01T12:00:00 ERROR: Build 1234 failed at /var/lib/jenkins/workspace/job-42/app.py:88"
+            ),
+            "<ts> ERROR: Build <n> failed at <path>:<n>",
+        )
+        self.assertEqual(
+            normalize_signature(
+                "request 123e4567-e89b-12d3-a456-426614174000 0xdeadBEEF"
+            ),
+            "request <id> <id>",
+        )
+        self.assertEqual(
+            normalize_signature("GET http://10.0.0.1:8080/api timed out after 30s"),
+            "GET <url> timed out after <n>",
+        )
+
+    def test_identifiers_are_kept(self):
+        message = "ERROR: groovy.lang.MissingPropertyException: No such property: foo"
+        self.assertEqual(normalize_signature(message), message)
+        self.assertEqual(
+            normalize_signature("error CS1002: ; expected"), "error CS1002: ; expected"
+        )
+
+    def test_same_failure_same_hash(self):
+        first = "10:00:01 TypeError: x is undefined at src/app/index.js:12:5"
+        second = "23:59:59  TypeError: x is undefined at lib/other/main.js:7:1"
+        self.assertEqual(signature_hash(first), signature_hash(second))
+        self.assertNotEqual(signature_hash(first), signature_hash("ValueError: x"))
+        self.assertEqual(
+            signature_hash(normalize_signature(first), normalized=True),
+            signature_hash(first),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
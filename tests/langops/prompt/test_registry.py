@@ -24,6 +24,18 @@ class TestPromptRegistry(unittest.TestCase):
         self.assertIsNotNone(retrieved_prompt)
         self.assertEqual(retrieved_prompt, MockPrompt)
 
+    def test_prompts_are_not_shared(self):
+        # Prompts accumulate per-request messages, so the registry never caches them.
+        self.assertFalse(hasattr(PromptRegistry, "get_instance"))
+        from langops.prompt.jenkins_error_prompt import JenkinsErrorPrompt
+
+        PromptRegistry.register()(JenkinsErrorPrompt)
+        prompt_cls = PromptRegistry.get_prompt("JenkinsErrorPrompt")
+        first = prompt_cls(build_id="1", timestamp="t")
+        first.add_user_prompt(["request A only"])
+        second = prompt_cls(build_id="1", timestamp="t")
+        self.assertNotIn("request A only", str(second.prompts))
+
     def test_list_prompts(self):
         class MockPrompt1:
             pass